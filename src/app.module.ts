@@ -11,16 +11,23 @@ import { ParticipationRequestsModule } from './modules/participation-requests/pa
 import { CertificatesModule } from './modules/certificates/certificates.module';
 import { NotificationsModule } from './modules/notifications/notifications.module';
 import { SuggestionsModule } from './modules/suggestions/suggestions.module';
+import { SearchModule } from './modules/search/search.module';
 import { AuthModule } from './auth/auth.module';
+import { LoadersModule } from './shared/loaders/loaders.module';
+import { MetricsModule } from './shared/metrics/metrics.module';
+import { PubSubModule } from './shared/pubsub/pubsub.module';
 import { databaseConfig } from './config/database.config';
 import { jwtConfig } from './config/jwt.config';
+import { cacheConfig } from './config/cache.config';
+import { metricsConfig } from './config/metrics.config';
+import { realtimeConfig } from './config/realtime.config';
 
 @Module({
   imports: [
     // Configuración
     ConfigModule.forRoot({
       isGlobal: true,
-      load: [databaseConfig, jwtConfig],
+      load: [databaseConfig, jwtConfig, cacheConfig, metricsConfig, realtimeConfig],
     }),
     
     // Configuración de TypeORM
@@ -30,6 +37,13 @@ import { jwtConfig } from './config/jwt.config';
       useFactory: (configService: ConfigService) => configService.get('database'),
     }),
     
+    // Loaders por petición compartidos por todos los módulos
+    LoadersModule,
+    // Consultas y tiempos por ruta: GET /api/metrics y Server-Timing
+    MetricsModule,
+    // Eventos entre servicios e instancias (notificaciones en tiempo real)
+    PubSubModule,
+
     // Módulos de la aplicación
     AuthModule, // Módulo de autenticación
     UsersModule,
@@ -42,6 +56,7 @@ import { jwtConfig } from './config/jwt.config';
     CertificatesModule,
     NotificationsModule,
     SuggestionsModule,
+    SearchModule,
   ],
 })
 export class AppModule {}
@@ -20,7 +20,7 @@ export class JwtStrategy extends PassportStrategy(Strategy) {
   async validate(payload: any) {
     try {
       // Payload contiene el userId que almacenamos al crear el token
-      const user = await this.usersService.findOne(payload.sub);
+      const user = await this.usersService.findAuthenticated(payload.sub);
       return user;
     } catch (error) {
       throw new UnauthorizedException('User no longer exists');
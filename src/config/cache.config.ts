@@ -0,0 +1,13 @@
+import { intFromEnv } from './env';
+
+export const cacheConfig = () => ({
+  cache: {
+    // 0 desactiva la caché
+    userTtlMs: intFromEnv('USER_CACHE_TTL_MS', 30000),
+    userMaxEntries: intFromEnv('USER_CACHE_MAX_ENTRIES', 10000),
+    // Franja de los listados de acciones sociales próximas y activas
+    feedBucketMs: intFromEnv('SOCIAL_ACTION_FEED_BUCKET_MS', 60000),
+    // Opcional: caché compartida entre instancias, p. ej. redis://localhost:6379/0
+    redisUrl: process.env.CACHE_REDIS_URL || null,
+  },
+});
@@ -0,0 +1,6 @@
+// DataSource para la CLI de TypeORM (npm run migration:run), con la misma
+// configuración que usa la aplicación
+import { DataSource, DataSourceOptions } from 'typeorm';
+import { databaseConfig } from './database.config';
+
+export default new DataSource(databaseConfig() as DataSourceOptions);
@@ -1,5 +1,6 @@
 import { registerAs } from '@nestjs/config';
 import { join } from 'path';
+import { AdvancedConsoleLogger } from 'typeorm';
 import { User } from '../entities/user.entity';
 import { Foundation } from '../entities/foundation.entity';
 import { Donation } from '../entities/donation.entity';
@@ -11,6 +12,9 @@ import { Certificate } from '../entities/certificate.entity';
 import { Notification } from '../entities/notification.entity';
 import { Suggestion } from '../entities/suggestion.entity';
 import { Favorite } from '../entities/favorite.entity';
+import { RatingSummary } from '../entities/rating_summary.entity';
+import { NotificationCounter } from '../entities/notification_counter.entity';
+import { QueryMetricsLogger, QueryTimingSubscriber } from '../shared/metrics/query-metrics-logger';
 
 export const databaseConfig = registerAs('database', () => ({
   type: 'postgres',
@@ -30,9 +34,24 @@ export const databaseConfig = registerAs('database', () => ({
     Certificate, 
     Notification, 
     Suggestion,
-    Favorite
+    Favorite,
+    RatingSummary,
+    NotificationCounter
   ],
   synchronize: process.env.NODE_ENV !== 'production', // No usar en producción
     // dropSchema: true,  // ¡CUIDADO! Esto borrará toda la base de datos
   logging: process.env.NODE_ENV !== 'production',
+  // Cuenta y cronometra las consultas por petición para /metrics y Server-Timing;
+  // la salida por consola sigue a `logging`
+  logger: new QueryMetricsLogger(process.env.NODE_ENV !== 'production' ? new AdvancedConsoleLogger(true) : null),
+  subscribers: [QueryTimingSubscriber],
+  // Umbral de consulta lenta en ms
+  maxQueryExecutionTime: parseInt(process.env.DB_SLOW_QUERY_MS, 10) || 200,
+  // Índices y cambios de esquema para producción, donde synchronize está apagado.
+  // synchronize no crea los índices GIN de búsqueda (migración SearchVectors):
+  // fuera de producción existen solo con DB_MIGRATIONS_RUN=true o npm run migration:run.
+  // 'each': las migraciones con CREATE INDEX CONCURRENTLY corren sin transacción
+  migrations: [join(__dirname, '../migrations/*{.ts,.js}')],
+  migrationsRun: process.env.NODE_ENV === 'production' || process.env.DB_MIGRATIONS_RUN === 'true',
+  migrationsTransactionMode: 'each',
 }));
\ No newline at end of file
@@ -0,0 +1,6 @@
+// Entero desde una variable de entorno. Un valor ausente o inválido usa el
+// predeterminado; 0 es válido (las opciones que lo admiten quedan desactivadas)
+export const intFromEnv = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name], 10);
+  return Number.isNaN(value) ? fallback : value;
+};
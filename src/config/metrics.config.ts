@@ -0,0 +1,15 @@
+import { intFromEnv } from './env';
+
+export const metricsConfig = () => ({
+  metrics: {
+    // Añade Server-Timing (tiempo de SQL y total) a cada respuesta
+    serverTiming: process.env.METRICS_SERVER_TIMING === 'true',
+    // Opcional: si se define, GET /api/metrics exige "Authorization: Bearer <token>"
+    token: process.env.METRICS_TOKEN || null,
+    // Cada cuánto se ejecuta EXPLAIN ANALYZE sobre la lectura más lenta del intervalo;
+    // 0 desactiva el muestreo
+    explainIntervalMs: intFromEnv('EXPLAIN_SAMPLE_INTERVAL_MS', 60000),
+    // Límite de cada EXPLAIN ANALYZE (statement_timeout)
+    explainTimeoutMs: intFromEnv('EXPLAIN_TIMEOUT_MS', 5000),
+  },
+});
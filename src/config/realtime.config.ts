@@ -0,0 +1,12 @@
+import { intFromEnv } from './env';
+
+export const realtimeConfig = () => ({
+  realtime: {
+    // 'local' para una sola instancia; 'postgres' reparte los eventos entre
+    // instancias con LISTEN/NOTIFY sobre la misma base de datos
+    pubsubBackend: process.env.PUBSUB_BACKEND === 'postgres' ? 'postgres' : 'local',
+    // Evento "ping" periódico en los streams SSE, para que proxies y balanceadores
+    // no corten la conexión inactiva; 0 lo desactiva
+    heartbeatMs: intFromEnv('SSE_HEARTBEAT_MS', 25000),
+  },
+});
@@ -1,8 +1,10 @@
 // certificate.entity.ts
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Index } from 'typeorm';
 import { User } from './user.entity';
 
 @Entity('certificates')
+// Creado por la migración QueryShapeIndexes; el nombre debe coincidir
+@Index('IDX_certificates_user_date', ['user_id', 'issue_date'])
 export class Certificate {
   @PrimaryGeneratedColumn('uuid')
   id: string;
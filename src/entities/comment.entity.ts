@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Check } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Check, Index } from 'typeorm';
 import { User } from './user.entity';
 import { Donation } from './donation.entity';
 import { SocialAction } from './social_action.entity';
@@ -6,6 +6,14 @@ import { Foundation } from './foundation.entity';
 
 @Entity('comments')
 @Check(`("donation_id" IS NOT NULL OR "social_action_id" IS NOT NULL OR "foundation_id" IS NOT NULL)`) 
+// Índices creados por la migración QueryShapeIndexes; los nombres deben coincidir.
+// Cada comentario tiene un solo destino, así que los de destino son parciales
+@Index('IDX_comments_user_date', ['user_id', 'comment_date'])
+@Index('IDX_comments_donation_date', ['donation_id', 'comment_date'], { where: '"donation_id" IS NOT NULL' })
+@Index('IDX_comments_social_action_date', ['social_action_id', 'comment_date'], { where: '"social_action_id" IS NOT NULL' })
+@Index('IDX_comments_foundation_date', ['foundation_id', 'comment_date'], { where: '"foundation_id" IS NOT NULL' })
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_comments_date_id', ['comment_date', 'id'])
 export class Comment {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -5,6 +5,8 @@ import { Comment } from './comment.entity';
 import { Rating } from './rating.entity';
 
 @Entity('donations')
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_donations_date_id', ['donation_date', 'id'])
 export class Donation {
   @PrimaryGeneratedColumn('uuid')
   id: string;
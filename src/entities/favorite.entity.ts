@@ -7,11 +7,12 @@ export enum FavoriteType {
 }
 
 @Entity('favorites')
+// Creado por la migración QueryShapeIndexes; cubre también las búsquedas por user_id
+@Index('IDX_favorites_user_item', ['user_id', 'item_id', 'item_type'])
 export class Favorite {
   @PrimaryGeneratedColumn('uuid')
   id: string;
 
-  @Index()
   @Column('uuid')
   user_id: string;
 
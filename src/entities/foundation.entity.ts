@@ -4,6 +4,10 @@ import { Donation } from './donation.entity';
 import { SocialAction } from './social_action.entity';
 import { Comment } from './comment.entity';
 
+export const FOUNDATION_SEARCH_VECTOR =
+  "setweight(to_tsvector('spanish', coalesce(legal_name, '')), 'A') || " +
+  "setweight(to_tsvector('spanish', coalesce(address, '')), 'B')";
+
 @Entity('foundations')
 export class Foundation {
   @PrimaryGeneratedColumn('uuid')
@@ -29,6 +33,19 @@ export class Foundation {
   @Column({ nullable: true })
   website?: string;
 
+  // Texto de búsqueda en español (razón social con más peso que la dirección);
+  // lo calcula Postgres, ver SearchService. El índice GIN lo crea la migración
+  @Index('IDX_foundations_search', { synchronize: false })
+  @Column({
+    type: 'tsvector',
+    generatedType: 'STORED',
+    asExpression: FOUNDATION_SEARCH_VECTOR,
+    select: false,
+    insert: false,
+    update: false,
+  })
+  search_vector?: string;
+
   @OneToMany(() => Donation, donation => donation.foundation)
   donations: Donation[];
 
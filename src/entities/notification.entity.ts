@@ -1,8 +1,14 @@
 // notification.entity.ts
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Index } from 'typeorm';
 import { User } from './user.entity';
 
 @Entity('notifications')
+// Índices creados por la migración QueryShapeIndexes; los nombres deben coincidir
+@Index('IDX_notifications_user_date', ['user_id', 'notification_date'])
+// No leídas: findUnreadByUser, markAllAsRead
+@Index('IDX_notifications_user_unread', ['user_id', 'notification_date'], { where: '"read" = false' })
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_notifications_date_id', ['notification_date', 'id'])
 export class Notification {
   @PrimaryGeneratedColumn('uuid')
   id: string;
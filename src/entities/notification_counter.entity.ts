@@ -0,0 +1,26 @@
+// notification_counter.entity.ts
+import { Entity, PrimaryColumn, Column, UpdateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { User } from './user.entity';
+
+// Notificaciones no leídas por usuario, mantenidas de forma incremental por
+// NotificationCountersService. Los nombres de las restricciones coinciden con
+// la migración NotificationCounters
+@Entity('notification_counters')
+export class NotificationCounter {
+  @PrimaryColumn('uuid', { primaryKeyConstraintName: 'PK_notification_counters' })
+  user_id: string;
+
+  @Column('int', { default: 0 })
+  unread_count: number;
+
+  // Sube con cada cambio del contador; es la base del ETag de /notifications/unread/count
+  @Column('int', { default: 0 })
+  version: number;
+
+  @UpdateDateColumn()
+  updated_at: Date;
+
+  @ManyToOne(() => User, { onDelete: 'CASCADE' })
+  @JoinColumn({ name: 'user_id', foreignKeyConstraintName: 'FK_notification_counters_user' })
+  user: User;
+}
@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Index } from 'typeorm';
 import { User } from './user.entity';
 import { SocialAction } from './social_action.entity';
 
@@ -9,6 +9,17 @@ export enum RequestStatus {
 }
 
 @Entity('participation_requests')
+// Índices creados por la migración QueryShapeIndexes; los nombres deben coincidir
+@Index('IDX_participation_requests_user_date', ['user_id', 'request_date'])
+@Index('IDX_participation_requests_action_date', ['social_action_id', 'request_date'])
+// Solicitud de un usuario en una acción: duplicados al crear, permisos de comentarios
+@Index('IDX_participation_requests_action_user', ['social_action_id', 'user_id', 'status'])
+// Cola de pendientes: findPendingBySocialAction
+@Index('IDX_participation_requests_action_pending', ['social_action_id', 'request_date'], {
+  where: `"status" = 'pending'`,
+})
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_participation_requests_date_id', ['request_date', 'id'])
 export class ParticipationRequest {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -1,4 +1,4 @@
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Check } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Check, Index } from 'typeorm';
 import { User } from './user.entity';
 import { Donation } from './donation.entity';
 import { SocialAction } from './social_action.entity';
@@ -6,6 +6,12 @@ import { SocialAction } from './social_action.entity';
 @Entity('ratings')
 @Check(`"rating" >= 1 AND "rating" <= 5`) // Constraint para rating
 @Check(`("donation_id" IS NOT NULL OR "social_action_id" IS NOT NULL)`) // Constraint adicional
+// Índices creados por la migración QueryShapeIndexes; los nombres deben coincidir
+@Index('IDX_ratings_user_date', ['user_id', 'rating_date'])
+@Index('IDX_ratings_donation_date', ['donation_id', 'rating_date'], { where: '"donation_id" IS NOT NULL' })
+@Index('IDX_ratings_social_action_date', ['social_action_id', 'rating_date'], { where: '"social_action_id" IS NOT NULL' })
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_ratings_date_id', ['rating_date', 'id'])
 export class Rating {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -0,0 +1,43 @@
+import { Entity, PrimaryColumn, Column, UpdateDateColumn } from 'typeorm';
+
+export enum RatingTargetType {
+  DONATION = 'donation',
+  SOCIAL_ACTION = 'social_action',
+}
+
+// Resumen de calificaciones por donación o acción social, mantenido de forma
+// incremental por RatingSummariesService. El nombre de la clave primaria
+// coincide con la migración RatingSummaries
+@Entity('rating_summaries')
+export class RatingSummary {
+  @PrimaryColumn('varchar', { length: 20, primaryKeyConstraintName: 'PK_rating_summaries' })
+  target_type: RatingTargetType;
+
+  @PrimaryColumn('uuid', { primaryKeyConstraintName: 'PK_rating_summaries' })
+  target_id: string;
+
+  @Column('int', { default: 0 })
+  rating_count: number;
+
+  @Column('int', { default: 0 })
+  rating_sum: number;
+
+  // Histograma: cantidad de calificaciones con cada valor de 1 a 5
+  @Column('int', { default: 0 })
+  count_1: number;
+
+  @Column('int', { default: 0 })
+  count_2: number;
+
+  @Column('int', { default: 0 })
+  count_3: number;
+
+  @Column('int', { default: 0 })
+  count_4: number;
+
+  @Column('int', { default: 0 })
+  count_5: number;
+
+  @UpdateDateColumn()
+  updated_at: Date;
+}
@@ -12,7 +12,11 @@ import { ParticipationRequest } from './participation_request.entity';
 import { Comment } from './comment.entity';
 import { Rating } from './rating.entity';
 
+export const SOCIAL_ACTION_SEARCH_VECTOR = "to_tsvector('spanish', coalesce(description, ''))";
+
 @Entity('social_actions')
+// Listado global paginado por (fecha, id): migración KeysetIndexes
+@Index('IDX_social_actions_start_id', ['start_date', 'id'])
 export class SocialAction {
   @PrimaryGeneratedColumn('uuid')
   id: string;
@@ -24,6 +28,19 @@ export class SocialAction {
   @Column('text')
   description: string;
 
+  // Texto de búsqueda en español; lo calcula Postgres, ver SearchService.
+  // El índice GIN lo crea la migración
+  @Index('IDX_social_actions_search', { synchronize: false })
+  @Column({
+    type: 'tsvector',
+    generatedType: 'STORED',
+    asExpression: SOCIAL_ACTION_SEARCH_VECTOR,
+    select: false,
+    insert: false,
+    update: false,
+  })
+  search_vector?: string;
+
   @Index()
   @Column('timestamp')
   start_date: Date;
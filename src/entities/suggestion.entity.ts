@@ -1,8 +1,12 @@
 // suggestion.entity.ts
-import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn } from 'typeorm';
+import { Entity, PrimaryGeneratedColumn, Column, CreateDateColumn, ManyToOne, JoinColumn, Index } from 'typeorm';
 import { User } from './user.entity';
 
 @Entity('suggestions')
+// Índices creados por la migración QueryShapeIndexes; los nombres deben coincidir
+@Index('IDX_suggestions_user_date', ['user_id', 'created_at'])
+// Cola de sugerencias sin procesar
+@Index('IDX_suggestions_unprocessed', ['created_at'], { where: '"processed" = false' })
 export class Suggestion {
   @PrimaryGeneratedColumn('uuid')
   id: string;
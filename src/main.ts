@@ -2,12 +2,17 @@ import { NestFactory } from '@nestjs/core';
 import { AppModule } from './app.module';
 import { ValidationPipe } from '@nestjs/common';
 import { Logger } from '@nestjs/common';
+import { NEXT_CURSOR_HEADER } from './shared/pagination/cursor-pagination';
+import { requestContextMiddleware } from './shared/context/request-context';
 
 async function bootstrap() {
   const app = await NestFactory.create(AppModule, {
     logger: ['log', 'error', 'warn', 'debug', 'verbose'], // Habilitar todos los logs
   });
   app.useLogger(new Logger());
+
+  // Contexto por petición para los loaders (antes de guards y controladores)
+  app.use(requestContextMiddleware);
   
   // Apply global validation pipe
   app.useGlobalPipes(new ValidationPipe({
@@ -17,7 +22,8 @@ async function bootstrap() {
   }));
   
   // Enable CORS
-  app.enableCors();
+  // Los clientes del navegador necesitan leer el cursor de paginación
+  app.enableCors({ exposedHeaders: [NEXT_CURSOR_HEADER] });
   app.setGlobalPrefix('api');
 
   
@@ -0,0 +1,61 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+// Índice de TypeORM para @Index() en favorites.user_id, reemplazado por IDX_favorites_user_item
+const LEGACY_FAVORITES_USER_INDEX = 'IDX_35a6b05ee3b624d0de01ee5059';
+
+// Nombre, tabla, columnas y condición de cada índice; deben coincidir con los @Index de las entidades
+export const QUERY_SHAPE_INDEXES: [string, string, string[], string?][] = [
+  ['IDX_notifications_user_date', 'notifications', ['user_id', 'notification_date']],
+  ['IDX_notifications_user_unread', 'notifications', ['user_id', 'notification_date'], '"read" = false'],
+  ['IDX_comments_user_date', 'comments', ['user_id', 'comment_date']],
+  ['IDX_comments_donation_date', 'comments', ['donation_id', 'comment_date'], '"donation_id" IS NOT NULL'],
+  ['IDX_comments_social_action_date', 'comments', ['social_action_id', 'comment_date'], '"social_action_id" IS NOT NULL'],
+  ['IDX_comments_foundation_date', 'comments', ['foundation_id', 'comment_date'], '"foundation_id" IS NOT NULL'],
+  ['IDX_ratings_user_date', 'ratings', ['user_id', 'rating_date']],
+  ['IDX_ratings_donation_date', 'ratings', ['donation_id', 'rating_date'], '"donation_id" IS NOT NULL'],
+  ['IDX_ratings_social_action_date', 'ratings', ['social_action_id', 'rating_date'], '"social_action_id" IS NOT NULL'],
+  ['IDX_participation_requests_user_date', 'participation_requests', ['user_id', 'request_date']],
+  ['IDX_participation_requests_action_date', 'participation_requests', ['social_action_id', 'request_date']],
+  ['IDX_participation_requests_action_user', 'participation_requests', ['social_action_id', 'user_id', 'status']],
+  [
+    'IDX_participation_requests_action_pending',
+    'participation_requests',
+    ['social_action_id', 'request_date'],
+    `"status" = 'pending'`,
+  ],
+  ['IDX_favorites_user_item', 'favorites', ['user_id', 'item_id', 'item_type']],
+  ['IDX_certificates_user_date', 'certificates', ['user_id', 'issue_date']],
+  ['IDX_suggestions_user_date', 'suggestions', ['user_id', 'created_at']],
+  ['IDX_suggestions_unprocessed', 'suggestions', ['created_at'], '"processed" = false'],
+];
+
+/**
+ * Índices compuestos y parciales según los where/order reales de los servicios.
+ *
+ * CONCURRENTLY no bloquea las escrituras mientras se construye cada índice y no
+ * puede ir dentro de una transacción; IF NOT EXISTS permite reintentar la
+ * migración y convive con `synchronize`, que crea los mismos índices en desarrollo.
+ */
+export class QueryShapeIndexes1792324800000 implements MigrationInterface {
+  name = 'QueryShapeIndexes1792324800000';
+  transaction = false;
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    for (const [name, table, columns, where] of QUERY_SHAPE_INDEXES) {
+      const columnList = columns.map((column) => `"${column}"`).join(', ');
+      await queryRunner.query(
+        `CREATE INDEX CONCURRENTLY IF NOT EXISTS "${name}" ON "${table}" (${columnList})${where ? ` WHERE ${where}` : ''}`,
+      );
+    }
+    await queryRunner.query(`DROP INDEX CONCURRENTLY IF EXISTS "${LEGACY_FAVORITES_USER_INDEX}"`);
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(
+      `CREATE INDEX CONCURRENTLY IF NOT EXISTS "${LEGACY_FAVORITES_USER_INDEX}" ON "favorites" ("user_id")`,
+    );
+    for (const [name] of [...QUERY_SHAPE_INDEXES].reverse()) {
+      await queryRunner.query(`DROP INDEX CONCURRENTLY IF EXISTS "${name}"`);
+    }
+  }
+}
@@ -0,0 +1,35 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Tabla de contadores de no leídas por usuario (NotificationCounter).
+ *
+ * La carga inicial cuenta las notificaciones que ya existen; después la
+ * mantiene NotificationsService en la misma transacción que cada cambio.
+ */
+export class NotificationCounters1792411200000 implements MigrationInterface {
+  name = 'NotificationCounters1792411200000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`
+      CREATE TABLE IF NOT EXISTS "notification_counters" (
+        "user_id" uuid NOT NULL,
+        "unread_count" integer NOT NULL DEFAULT 0,
+        "version" integer NOT NULL DEFAULT 0,
+        "updated_at" TIMESTAMP NOT NULL DEFAULT now(),
+        CONSTRAINT "PK_notification_counters" PRIMARY KEY ("user_id"),
+        CONSTRAINT "FK_notification_counters_user" FOREIGN KEY ("user_id")
+          REFERENCES "users"("id") ON DELETE CASCADE
+      )`);
+    await queryRunner.query(`
+      INSERT INTO "notification_counters" ("user_id", "unread_count", "version", "updated_at")
+      SELECT "user_id", COUNT(*), 1, now()
+      FROM "notifications"
+      WHERE "read" = false
+      GROUP BY "user_id"
+      ON CONFLICT ("user_id") DO NOTHING`);
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query('DROP TABLE IF EXISTS "notification_counters"');
+  }
+}
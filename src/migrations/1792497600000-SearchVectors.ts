@@ -0,0 +1,40 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+import { FOUNDATION_SEARCH_VECTOR } from '../entities/foundation.entity';
+import { SOCIAL_ACTION_SEARCH_VECTOR } from '../entities/social_action.entity';
+
+// Tabla, índice GIN y expresión de cada columna search_vector
+const SEARCH_VECTORS: [string, string, string][] = [
+  ['foundations', 'IDX_foundations_search', FOUNDATION_SEARCH_VECTOR],
+  ['social_actions', 'IDX_social_actions_search', SOCIAL_ACTION_SEARCH_VECTOR],
+];
+
+/**
+ * Columnas tsvector generadas para la búsqueda de texto (SearchService) y
+ * sus índices GIN.
+ *
+ * La columna STORED se calcula al agregarla y Postgres la mantiene en cada
+ * escritura. Los índices se crean CONCURRENTLY, así que la migración corre
+ * sin transacción; IF NOT EXISTS permite reintentarla.
+ */
+export class SearchVectors1792497600000 implements MigrationInterface {
+  name = 'SearchVectors1792497600000';
+  transaction = false;
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    for (const [table, index, expression] of SEARCH_VECTORS) {
+      await queryRunner.query(
+        `ALTER TABLE "${table}" ADD COLUMN IF NOT EXISTS "search_vector" tsvector GENERATED ALWAYS AS (${expression}) STORED`,
+      );
+      await queryRunner.query(
+        `CREATE INDEX CONCURRENTLY IF NOT EXISTS "${index}" ON "${table}" USING GIN ("search_vector")`,
+      );
+    }
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    for (const [table, index] of [...SEARCH_VECTORS].reverse()) {
+      await queryRunner.query(`DROP INDEX CONCURRENTLY IF EXISTS "${index}"`);
+      await queryRunner.query(`ALTER TABLE "${table}" DROP COLUMN IF EXISTS "search_vector"`);
+    }
+  }
+}
@@ -0,0 +1,38 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+// Nombre, tabla y columnas de cada índice; deben coincidir con los @Index de las entidades
+export const KEYSET_INDEXES: [string, string, string[]][] = [
+  ['IDX_donations_date_id', 'donations', ['donation_date', 'id']],
+  ['IDX_comments_date_id', 'comments', ['comment_date', 'id']],
+  ['IDX_ratings_date_id', 'ratings', ['rating_date', 'id']],
+  ['IDX_notifications_date_id', 'notifications', ['notification_date', 'id']],
+  ['IDX_participation_requests_date_id', 'participation_requests', ['request_date', 'id']],
+  ['IDX_social_actions_start_id', 'social_actions', ['start_date', 'id']],
+];
+
+/**
+ * Índices (fecha, id) de los listados globales que pagina paginateByCursor.
+ *
+ * La consulta ordena por `fecha DESC, id DESC` y filtra con
+ * `(fecha, id) < (:fecha, :id)`: el índice se recorre hacia atrás desde el
+ * cursor y cada página lee solo sus filas, sin ordenar la tabla completa.
+ * Los índices de QueryShapeIndexes empiezan por user_id o por el destino y no
+ * sirven para estos listados. Igual que allí, CONCURRENTLY y sin transacción.
+ */
+export class KeysetIndexes1792584000000 implements MigrationInterface {
+  name = 'KeysetIndexes1792584000000';
+  transaction = false;
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    for (const [name, table, columns] of KEYSET_INDEXES) {
+      const columnList = columns.map((column) => `"${column}"`).join(', ');
+      await queryRunner.query(`CREATE INDEX CONCURRENTLY IF NOT EXISTS "${name}" ON "${table}" (${columnList})`);
+    }
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    for (const [name] of [...KEYSET_INDEXES].reverse()) {
+      await queryRunner.query(`DROP INDEX CONCURRENTLY IF EXISTS "${name}"`);
+    }
+  }
+}
@@ -0,0 +1,53 @@
+import { MigrationInterface, QueryRunner } from 'typeorm';
+
+/**
+ * Tabla de resúmenes de calificaciones por donación o acción social
+ * (RatingSummary).
+ *
+ * La carga inicial agrupa las calificaciones que ya existen, igual que
+ * RatingSummariesService.rebuild; después la mantiene RatingsService en la
+ * misma transacción que cada cambio.
+ */
+export class RatingSummaries1792670400000 implements MigrationInterface {
+  name = 'RatingSummaries1792670400000';
+
+  public async up(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query(`
+      CREATE TABLE IF NOT EXISTS "rating_summaries" (
+        "target_type" character varying(20) NOT NULL,
+        "target_id" uuid NOT NULL,
+        "rating_count" integer NOT NULL DEFAULT 0,
+        "rating_sum" integer NOT NULL DEFAULT 0,
+        "count_1" integer NOT NULL DEFAULT 0,
+        "count_2" integer NOT NULL DEFAULT 0,
+        "count_3" integer NOT NULL DEFAULT 0,
+        "count_4" integer NOT NULL DEFAULT 0,
+        "count_5" integer NOT NULL DEFAULT 0,
+        "updated_at" TIMESTAMP NOT NULL DEFAULT now(),
+        CONSTRAINT "PK_rating_summaries" PRIMARY KEY ("target_type", "target_id")
+      )`);
+    await queryRunner.query(`
+      INSERT INTO "rating_summaries"
+        ("target_type", "target_id", "rating_count", "rating_sum",
+         "count_1", "count_2", "count_3", "count_4", "count_5", "updated_at")
+      SELECT
+        CASE WHEN "donation_id" IS NOT NULL THEN 'donation' ELSE 'social_action' END,
+        COALESCE("donation_id", "social_action_id"),
+        COUNT(*),
+        SUM("rating"),
+        COUNT(*) FILTER (WHERE "rating" = 1),
+        COUNT(*) FILTER (WHERE "rating" = 2),
+        COUNT(*) FILTER (WHERE "rating" = 3),
+        COUNT(*) FILTER (WHERE "rating" = 4),
+        COUNT(*) FILTER (WHERE "rating" = 5),
+        now()
+      FROM "ratings"
+      WHERE "donation_id" IS NOT NULL OR "social_action_id" IS NOT NULL
+      GROUP BY 1, 2
+      ON CONFLICT ("target_type", "target_id") DO NOTHING`);
+  }
+
+  public async down(queryRunner: QueryRunner): Promise<void> {
+    await queryRunner.query('DROP TABLE IF EXISTS "rating_summaries"');
+  }
+}
@@ -98,15 +98,13 @@ export class CertificatesService {
 
   // Método para verificar si un usuario ha participado en una acción social
   async verifyUserParticipation(userId: string, socialActionId: string): Promise<boolean> {
-    const participationRequest = await this.participationRequestsRepository.findOne({
+    return this.participationRequestsRepository.exists({
       where: {
         user_id: userId,
         social_action_id: socialActionId,
         status: RequestStatus.ACCEPTED
       }
     });
-    
-    return !!participationRequest;
   }
 
   // Método para generar un certificado de participación para una acción social
@@ -120,7 +118,8 @@ export class CertificatesService {
     
     // Obtener detalles de la acción social
     const socialAction = await this.socialActionsRepository.findOne({
-      where: { id: socialActionId }
+      where: { id: socialActionId },
+      select: { id: true, description: true },
     });
     
     if (!socialAction) {
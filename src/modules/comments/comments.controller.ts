@@ -14,6 +14,8 @@ import {
   Req,
   ForbiddenException,
   BadRequestException,
+  Query,
+  Res,
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { CommentsService } from './comments.service';
@@ -21,6 +23,8 @@ import { CreateCommentDto } from './dto/create-comment.dto';
 import { UpdateCommentDto } from './dto/update-comment.dto';
 import { Comment } from '../../entities/comment.entity';
 import { UserType } from '../../entities/user.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
+import { ExportQueryDto, sendExport } from '../../shared/export/export-stream';
 
 @Controller()
 export class CommentsController {
@@ -140,10 +144,14 @@ export class CommentsController {
   // Endpoint para listar todos los comentarios (con control de acceso)
   @UseGuards(JwtAuthGuard)
   @Get('comments')
-  async findAll(@Req() req): Promise<Comment[]> {
+  async findAll(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Comment[]> {
     // Administradores con permisos de lectura pueden ver todos los comentarios
     if (this.hasReadAccess(req)) {
-      return this.commentsService.findAll();
+      return sendPage(res, await this.commentsService.findAll(page));
     }
     
     // Solo fundaciones pueden ver todos los comentarios
@@ -152,7 +160,22 @@ export class CommentsController {
       return this.commentsService.findByUser(req.user.id);
     }
     
-    return this.commentsService.findAll();
+    return sendPage(res, await this.commentsService.findAll(page));
+  }
+
+  // Exportación completa en streaming: NDJSON por defecto o ?format=csv
+  @UseGuards(JwtAuthGuard)
+  @Get('comments/export')
+  async exportComments(
+    @Req() req,
+    @Query() query: ExportQueryDto,
+    @Res() res,
+  ): Promise<void> {
+    if (!this.hasReadAccess(req) && req.user.user_type !== UserType.FOUNDATION) {
+      throw new ForbiddenException('Only administrators and foundations can export comments');
+    }
+
+    return sendExport(res, this.commentsService.exportAll(), 'comments', query.format);
   }
 
   // Endpoint para obtener comentarios de un usuario específico
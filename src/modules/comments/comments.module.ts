@@ -1,10 +1,7 @@
 import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { Comment } from '../../entities/comment.entity';
-import { User } from '../../entities/user.entity';
-import { Donation } from '../../entities/donation.entity';
-import { SocialAction } from '../../entities/social_action.entity';
-import { Foundation } from '../../entities/foundation.entity';
+import { ParticipationRequest } from '../../entities/participation_request.entity';
 import { CommentsController } from './comments.controller';
 import { CommentsService } from './comments.service';
 import { UsersModule } from '../users/users.module';
@@ -14,7 +11,7 @@ import { FoundationsModule } from '../foundations/foundations.module';
 
 @Module({
   imports: [
-    TypeOrmModule.forFeature([Comment, User, Donation, SocialAction, Foundation]),
+    TypeOrmModule.forFeature([Comment, ParticipationRequest]),
     UsersModule,
     DonationsModule,
     SocialActionsModule,
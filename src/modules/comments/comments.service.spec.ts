@@ -3,38 +3,47 @@ import { CommentsService } from './comments.service';
 import { getRepositoryToken } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import { Comment } from '../../entities/comment.entity';
-import { User } from '../../entities/user.entity';
 import { Donation } from '../../entities/donation.entity';
-import { SocialAction } from '../../entities/social_action.entity';
-import { Foundation } from '../../entities/foundation.entity';
-import { NotFoundException, BadRequestException } from '@nestjs/common';
+import { ParticipationRequest } from '../../entities/participation_request.entity';
+import { NotFoundException, BadRequestException, ForbiddenException } from '@nestjs/common';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
 
 describe('CommentsService', () => {
   let service: CommentsService;
   let commentRepo: Repository<Comment>;
-  let userRepo: Repository<User>;
-  let donationRepo: Repository<Donation>;
-  let socialActionRepo: Repository<SocialAction>;
-  let foundationRepo: Repository<Foundation>;
+  let participationRepo: Repository<ParticipationRequest>;
+
+  // Un loader por entidad; cada test define qué devuelve `load`
+  const loaders = {
+    users: { load: jest.fn() },
+    donations: { load: jest.fn() },
+    socialActions: { load: jest.fn() },
+    foundations: { load: jest.fn() },
+  };
+  const mockEntityLoaders = {
+    users: () => loaders.users,
+    donations: () => loaders.donations,
+    socialActions: () => loaders.socialActions,
+    foundations: () => loaders.foundations,
+  };
 
   beforeEach(async () => {
     const module: TestingModule = await Test.createTestingModule({
       providers: [
         CommentsService,
         { provide: getRepositoryToken(Comment), useClass: Repository },
-        { provide: getRepositoryToken(User), useClass: Repository },
-        { provide: getRepositoryToken(Donation), useClass: Repository },
-        { provide: getRepositoryToken(SocialAction), useClass: Repository },
-        { provide: getRepositoryToken(Foundation), useClass: Repository },
+        { provide: getRepositoryToken(ParticipationRequest), useClass: Repository },
+        { provide: EntityLoaders, useValue: mockEntityLoaders },
       ],
     }).compile();
 
     service = module.get<CommentsService>(CommentsService);
     commentRepo = module.get(getRepositoryToken(Comment));
-    userRepo = module.get(getRepositoryToken(User));
-    donationRepo = module.get(getRepositoryToken(Donation));
-    socialActionRepo = module.get(getRepositoryToken(SocialAction));
-    foundationRepo = module.get(getRepositoryToken(Foundation));
+    participationRepo = module.get(getRepositoryToken(ParticipationRequest));
+  });
+
+  afterEach(() => {
+    jest.clearAllMocks();
   });
 
   it('debería estar definido', () => {
@@ -43,7 +52,7 @@ describe('CommentsService', () => {
 
   describe('create', () => {
     it('debería lanzar error si el usuario no existe', async () => {
-      jest.spyOn(userRepo, 'findOne').mockResolvedValue(null);
+      loaders.users.load.mockResolvedValue(null);
       await expect(
         service.create({
           user_id: '1',
@@ -54,7 +63,7 @@ describe('CommentsService', () => {
     });
 
     it('debería lanzar error si no se proporciona ningún ID relacionado', async () => {
-      jest.spyOn(userRepo, 'findOne').mockResolvedValue({ id: '1' } as User);
+      loaders.users.load.mockResolvedValue({ id: '1' });
       await expect(
         service.create({
           user_id: '1',
@@ -64,7 +73,7 @@ describe('CommentsService', () => {
     });
 
     it('debería lanzar error si se proporciona más de un ID relacionado', async () => {
-      jest.spyOn(userRepo, 'findOne').mockResolvedValue({ id: '1' } as User);
+      loaders.users.load.mockResolvedValue({ id: '1' });
       await expect(
         service.create({
           user_id: '1',
@@ -76,8 +85,8 @@ describe('CommentsService', () => {
     });
 
     it('debería lanzar error si la donación no existe', async () => {
-      jest.spyOn(userRepo, 'findOne').mockResolvedValue({ id: '1' } as User);
-      jest.spyOn(donationRepo, 'findOne').mockResolvedValue(null);
+      loaders.users.load.mockResolvedValue({ id: '1' });
+      loaders.donations.load.mockResolvedValue(null);
       await expect(
         service.create({
           user_id: '1',
@@ -90,8 +99,8 @@ describe('CommentsService', () => {
     it('debería crear comentario si todo es válido', async () => {
       const comentario = { id: 'c1', text: 'Todo correcto' } as Comment;
 
-      jest.spyOn(userRepo, 'findOne').mockResolvedValue({ id: '1' } as User);
-      jest.spyOn(donationRepo, 'findOne').mockResolvedValue({ id: 'd1' } as Donation);
+      loaders.users.load.mockResolvedValue({ id: '1' });
+      loaders.donations.load.mockResolvedValue({ id: 'd1' } as Donation);
       jest.spyOn(commentRepo, 'create').mockReturnValue(comentario);
       jest.spyOn(commentRepo, 'save').mockResolvedValue(comentario);
 
@@ -104,4 +113,48 @@ describe('CommentsService', () => {
       expect(resultado).toEqual(comentario);
     });
   });
+
+  describe('verifyDonationCommentPermission', () => {
+    it('debería permitir comentar al usuario de la fundación receptora', async () => {
+      loaders.donations.load.mockResolvedValue({ id: 'd1', user_id: 'u1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u2' });
+
+      await expect(service.verifyDonationCommentPermission('d1', 'u2')).resolves.toBeUndefined();
+      expect(loaders.foundations.load).toHaveBeenCalledWith('f1');
+    });
+
+    it('debería rechazar a un usuario ajeno a la donación', async () => {
+      loaders.donations.load.mockResolvedValue({ id: 'd1', user_id: 'u1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u2' });
+
+      await expect(service.verifyDonationCommentPermission('d1', 'u3')).rejects.toThrow(ForbiddenException);
+    });
+  });
+
+  describe('verifySocialActionCommentPermission', () => {
+    it('debería permitir comentar a un participante aceptado', async () => {
+      loaders.socialActions.load.mockResolvedValue({ id: 'sa1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u2' });
+      jest.spyOn(participationRepo, 'exists').mockResolvedValue(true);
+
+      await expect(service.verifySocialActionCommentPermission('sa1', 'u1')).resolves.toBeUndefined();
+    });
+
+    it('no debería consultar participaciones si comenta la fundación', async () => {
+      loaders.socialActions.load.mockResolvedValue({ id: 'sa1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u2' });
+      const exists = jest.spyOn(participationRepo, 'exists');
+
+      await service.verifySocialActionCommentPermission('sa1', 'u2');
+      expect(exists).not.toHaveBeenCalled();
+    });
+
+    it('debería rechazar a quien no participa', async () => {
+      loaders.socialActions.load.mockResolvedValue({ id: 'sa1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u2' });
+      jest.spyOn(participationRepo, 'exists').mockResolvedValue(false);
+
+      await expect(service.verifySocialActionCommentPermission('sa1', 'u1')).rejects.toThrow(ForbiddenException);
+    });
+  });
 });
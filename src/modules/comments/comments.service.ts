@@ -3,33 +3,39 @@ import { Injectable, NotFoundException, BadRequestException, ForbiddenException
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import { Comment } from '../../entities/comment.entity';
-import { User } from '../../entities/user.entity';
-import { Donation } from '../../entities/donation.entity';
-import { SocialAction } from '../../entities/social_action.entity';
-import { Foundation } from '../../entities/foundation.entity';
+import { ParticipationRequest, RequestStatus } from '../../entities/participation_request.entity';
 import { CreateCommentDto } from './dto/create-comment.dto';
 import { UpdateCommentDto } from './dto/update-comment.dto';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
+import { ExportSource, selectColumns, streamQuery } from '../../shared/export/export-stream';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
+
+// Columnas de la exportación y la expresión SQL de cada una
+const COMMENT_EXPORT_COLUMNS = {
+  id: 'comment.id',
+  text: 'comment.text',
+  comment_date: 'comment.comment_date',
+  user_id: 'comment.user_id',
+  user_name: 'user.name',
+  donation_id: 'comment.donation_id',
+  social_action_id: 'comment.social_action_id',
+  foundation_id: 'comment.foundation_id',
+};
 
 @Injectable()
 export class CommentsService {
   constructor(
     @InjectRepository(Comment)
     private commentsRepository: Repository<Comment>,
-    @InjectRepository(User)
-    private usersRepository: Repository<User>,
-    @InjectRepository(Donation)
-    private donationsRepository: Repository<Donation>,
-    @InjectRepository(SocialAction)
-    private socialActionsRepository: Repository<SocialAction>,
-    @InjectRepository(Foundation)
-    private foundationsRepository: Repository<Foundation>,
+    @InjectRepository(ParticipationRequest)
+    private participationRequestsRepository: Repository<ParticipationRequest>,
+    private readonly loaders: EntityLoaders,
   ) {}
 
   async create(createCommentDto: CreateCommentDto): Promise<Comment> {
-    // Verificar si el usuario existe
-    const user = await this.usersRepository.findOne({
-      where: { id: createCommentDto.user_id },
-    });
+    // Verificar si el usuario existe. Los loaders reutilizan lo que ya
+    // cargaron las comprobaciones de permisos de la misma petición
+    const user = await this.loaders.users().load(createCommentDto.user_id);
 
     if (!user) {
       throw new NotFoundException(`User with ID "${createCommentDto.user_id}" not found`);
@@ -53,9 +59,7 @@ export class CommentsService {
 
     // Verificar si la donación existe (si se proporciona)
     if (createCommentDto.donation_id) {
-      const donation = await this.donationsRepository.findOne({
-        where: { id: createCommentDto.donation_id },
-      });
+      const donation = await this.loaders.donations().load(createCommentDto.donation_id);
 
       if (!donation) {
         throw new NotFoundException(`Donation with ID "${createCommentDto.donation_id}" not found`);
@@ -64,9 +68,7 @@ export class CommentsService {
 
     // Verificar si la acción social existe (si se proporciona)
     if (createCommentDto.social_action_id) {
-      const socialAction = await this.socialActionsRepository.findOne({
-        where: { id: createCommentDto.social_action_id },
-      });
+      const socialAction = await this.loaders.socialActions().load(createCommentDto.social_action_id);
 
       if (!socialAction) {
         throw new NotFoundException(`Social Action with ID "${createCommentDto.social_action_id}" not found`);
@@ -75,9 +77,7 @@ export class CommentsService {
 
     // Verificar si la fundación existe (si se proporciona)
     if (createCommentDto.foundation_id) {
-      const foundation = await this.foundationsRepository.findOne({
-        where: { id: createCommentDto.foundation_id },
-      });
+      const foundation = await this.loaders.foundations().load(createCommentDto.foundation_id);
 
       if (!foundation) {
         throw new NotFoundException(`Foundation with ID "${createCommentDto.foundation_id}" not found`);
@@ -93,11 +93,30 @@ export class CommentsService {
     return this.commentsRepository.save(newComment);
   }
 
-  async findAll(): Promise<Comment[]> {
-    return this.commentsRepository.find({
-      relations: ['user', 'donation', 'social_action', 'foundation'],
-      order: { comment_date: 'DESC' },
-    });
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<Comment>> {
+    const query = this.commentsRepository
+      .createQueryBuilder('comment')
+      .leftJoinAndSelect('comment.user', 'user')
+      .leftJoinAndSelect('comment.donation', 'donation')
+      .leftJoinAndSelect('comment.social_action', 'social_action')
+      .leftJoinAndSelect('comment.foundation', 'foundation');
+
+    return paginateByCursor(query, 'comment_date', page);
+  }
+
+  // Filas planas para la exportación, sin hidratar entidades
+  exportAll(): ExportSource {
+    const query = selectColumns(
+      this.commentsRepository
+        .createQueryBuilder('comment')
+        .leftJoin('comment.user', 'user'),
+      COMMENT_EXPORT_COLUMNS,
+    ).orderBy('comment.comment_date', 'DESC');
+
+    return {
+      columns: Object.keys(COMMENT_EXPORT_COLUMNS),
+      rows: streamQuery(this.commentsRepository.manager, query),
+    };
   }
 
   async findOne(id: string): Promise<Comment> {
@@ -165,19 +184,15 @@ export class CommentsService {
 
   // Métodos de verificación
   async verifyDonationCommentPermission(donationId: string, userId: string): Promise<void> {
-    const donation = await this.donationsRepository.findOne({
-      where: { id: donationId },
-      relations: ['user', 'foundation', 'foundation.user'],
-    });
+    const donation = await this.loaders.donations().load(donationId);
     
     if (!donation) {
       throw new NotFoundException(`Donation with ID "${donationId}" not found`);
     }
     
     // Verificar que el usuario esté relacionado con la donación (donante o fundación receptora)
-    const isFoundationUser = donation.foundation && 
-                             donation.foundation.user && 
-                             donation.foundation.user.id === userId;
+    const foundation = await this.loaders.foundations().load(donation.foundation_id);
+    const isFoundationUser = foundation?.user_id === userId;
                              
     if (donation.user_id !== userId && !isFoundationUser) {
       throw new ForbiddenException('You do not have permission to comment on this donation');
@@ -185,33 +200,30 @@ export class CommentsService {
   }
   
   async verifySocialActionCommentPermission(socialActionId: string, userId: string): Promise<void> {
-    const socialAction = await this.socialActionsRepository.findOne({
-      where: { id: socialActionId },
-      relations: ['foundation', 'foundation.user', 'participation_requests'],
-    });
+    const socialAction = await this.loaders.socialActions().load(socialActionId);
     
     if (!socialAction) {
       throw new NotFoundException(`Social Action with ID "${socialActionId}" not found`);
     }
     
     // Verificar que el usuario sea la fundación o un participante aceptado
-    const isFoundationUser = socialAction.foundation && 
-                             socialAction.foundation.user && 
-                             socialAction.foundation.user.id === userId;
-                             
-    const isParticipant = socialAction.participation_requests?.some(
-      request => request.user_id === userId && request.status === 'accepted'
-    );
+    const foundation = await this.loaders.foundations().load(socialAction.foundation_id);
+    if (foundation?.user_id === userId) {
+      return;
+    }
+
+    // Solo la solicitud de este usuario, en lugar de todas las de la acción social
+    const isParticipant = await this.participationRequestsRepository.exists({
+      where: { social_action_id: socialActionId, user_id: userId, status: RequestStatus.ACCEPTED },
+    });
     
-    if (!isFoundationUser && !isParticipant) {
+    if (!isParticipant) {
       throw new ForbiddenException('You do not have permission to comment on this social action');
     }
   }
 
   async verifyFoundationCommentPermission(foundationId: string, userId: string): Promise<void> {
-    const foundation = await this.foundationsRepository.findOne({
-      where: { id: foundationId },
-    });
+    const foundation = await this.loaders.foundations().load(foundationId);
     
     if (!foundation) {
       throw new NotFoundException(`Foundation with ID "${foundationId}" not found`);
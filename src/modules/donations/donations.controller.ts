@@ -14,13 +14,18 @@ import {
   Req,
   ForbiddenException,
   Query,
+  Res,
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { DonationsService } from './donations.service';
 import { CreateDonationDto } from './dto/create-donation.dto';
+import { CreateDonationsBatchDto } from './dto/create-donations-batch.dto';
 import { UpdateDonationDto } from './dto/update-donation.dto';
 import { Donation } from '../../entities/donation.entity';
 import { UserType } from '../../entities/user.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
+import { ExportQueryDto, sendExport } from '../../shared/export/export-stream';
+import { BatchResult } from '../../shared/batch/batch';
 
 @Controller()
 export class DonationsController {
@@ -123,16 +128,37 @@ export class DonationsController {
     return this.makeDonation(createDonationDto, req);
   }
 
+  // Creación de varias donaciones en una sola petición, con un resultado por elemento
+  @UseGuards(JwtAuthGuard)
+  @Post('donations/batch')
+  @HttpCode(HttpStatus.OK)
+  async createBatch(
+    @Body() batchDto: CreateDonationsBatchDto,
+    @Req() req,
+  ): Promise<BatchResult<Donation>> {
+    // Igual que en el endpoint individual: solo los administradores con
+    // permisos de escritura pueden donar en nombre de otros usuarios
+    if (!this.hasWriteAccess(req) && batchDto.items.some((item) => item.user_id !== req.user.id)) {
+      throw new ForbiddenException('You can only make donations on your own behalf');
+    }
+
+    return this.donationsService.createMany(batchDto.items);
+  }
+
   // GET endpoints con logging básico
   @UseGuards(JwtAuthGuard)
   @Get('api/donations')
-  async listDonations(@Req() req): Promise<Donation[]> {
+  async listDonations(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Donation[]> {
     console.log('📋 Listing donations for user:', req.user.id);
     
     // Administradores con permisos de lectura pueden ver todas las donaciones
     if (this.hasReadAccess(req)) {
       console.log('📋 Admin read access, returning all donations');
-      return this.donationsService.findAll();
+      return sendPage(res, await this.donationsService.findAll(page));
     }
     
     if (req.user.user_type === UserType.FOUNDATION) {
@@ -151,21 +177,40 @@ export class DonationsController {
 
   @UseGuards(JwtAuthGuard)
   @Get('donations')
-  async findAll(@Req() req): Promise<Donation[]> {
+  async findAll(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Donation[]> {
     console.log('📋 Finding all donations for:', req.user.user_type);
     
     // Administradores con permisos de lectura pueden ver todas las donaciones
     if (this.hasReadAccess(req)) {
-      return this.donationsService.findAll();
+      return sendPage(res, await this.donationsService.findAll(page));
     }
     
     if (req.user.user_type === UserType.FOUNDATION) {
-      return this.donationsService.findAll();
+      return sendPage(res, await this.donationsService.findAll(page));
     }
     
     return this.donationsService.findByUser(req.user.id);
   }
 
+  // Exportación completa en streaming: NDJSON por defecto o ?format=csv
+  @UseGuards(JwtAuthGuard)
+  @Get('donations/export')
+  async exportDonations(
+    @Req() req,
+    @Query() query: ExportQueryDto,
+    @Res() res,
+  ): Promise<void> {
+    if (!this.hasReadAccess(req) && req.user.user_type !== UserType.FOUNDATION) {
+      throw new ForbiddenException('Only administrators and foundations can export donations');
+    }
+
+    return sendExport(res, this.donationsService.exportAll(), 'donations', query.format);
+  }
+
   @UseGuards(JwtAuthGuard)
   @Get('api/donations/user/:userId')
   async getUserDonations(
@@ -6,6 +6,8 @@ import { User } from '../../entities/user.entity';
 import { Foundation } from '../../entities/foundation.entity';
 import { Repository } from 'typeorm';
 import { NotFoundException } from '@nestjs/common';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
 
 describe('DonationsService', () => {
   let service: DonationsService;
@@ -13,6 +15,15 @@ describe('DonationsService', () => {
   let userRepo: Repository<User>;
   let foundationRepo: Repository<Foundation>;
 
+  const loaders = {
+    donations: { load: jest.fn() },
+    foundations: { load: jest.fn() },
+  };
+  const mockEntityLoaders = {
+    donations: () => loaders.donations,
+    foundations: () => loaders.foundations,
+  };
+
   beforeEach(async () => {
     const module: TestingModule = await Test.createTestingModule({
       providers: [
@@ -20,6 +31,7 @@ describe('DonationsService', () => {
         { provide: getRepositoryToken(Donation), useClass: Repository },
         { provide: getRepositoryToken(User), useClass: Repository },
         { provide: getRepositoryToken(Foundation), useClass: Repository },
+        { provide: EntityLoaders, useValue: mockEntityLoaders },
       ],
     }).compile();
 
@@ -64,13 +76,46 @@ describe('DonationsService', () => {
     });
   });
 
+  describe('createMany', () => {
+    // EntityManager de la transacción: solo u1 y f1 existen
+    const mockManager = {
+      find: jest.fn((target) => (target === User ? [{ id: 'u1' }] : [{ id: 'f1' }])),
+      create: jest.fn((_target, data) => ({ ...data })),
+      insert: jest.fn(async (_target, entities) => entities.forEach((entity, i) => (entity.id = `d${i}`))),
+      transaction: jest.fn((work) => work(mockManager)),
+    };
+
+    beforeEach(() => {
+      (donationRepo as any).manager = mockManager;
+    });
+
+    it('debería crear las donaciones válidas con un solo insert y reportar las inválidas', async () => {
+      const result = await service.createMany([
+        { user_id: 'u1', foundation_id: 'f1', amount: 10 },
+        { user_id: 'u2', foundation_id: 'f1', amount: 20 },
+        { user_id: 'u1', foundation_id: 'f2', amount: 30 },
+        { user_id: 'u1', foundation_id: 'f1', amount: 40 },
+      ]);
+
+      expect(mockManager.find).toHaveBeenCalledTimes(2);
+      expect(mockManager.insert).toHaveBeenCalledTimes(1);
+      expect(result.created).toBe(2);
+      expect(result.failed).toBe(2);
+      expect(result.results.map((item) => item.status)).toEqual([201, 404, 404, 201]);
+      expect(result.results[1].error).toBe('User with ID "u2" not found');
+      expect(result.results[3].data).toMatchObject({ id: 'd1', amount: 40 });
+    });
+  });
+
   describe('findAll', () => {
-    it('debería retornar todas las donaciones', async () => {
+    it('debería retornar la primera página de donaciones', async () => {
       const mockDonations = [{ id: 'd1' }] as Donation[];
-      jest.spyOn(donationRepo, 'find').mockResolvedValue(mockDonations);
+      const qb = mockQueryBuilder('donation', mockDonations);
+      jest.spyOn(donationRepo, 'createQueryBuilder').mockReturnValue(qb);
 
       const result = await service.findAll();
-      expect(result).toEqual(mockDonations);
+      expect(result).toEqual({ items: mockDonations, next_cursor: null });
+      expect(qb.orderBy).toHaveBeenCalledWith('donation.donation_date', 'DESC');
     });
   });
 
@@ -163,22 +208,23 @@ describe('DonationsService', () => {
 
   describe('isFoundationUserForDonation', () => {
     it('debería retornar true si el usuario es dueño de la fundación de la donación', async () => {
-      jest.spyOn(donationRepo, 'findOne').mockResolvedValue({ foundation: { id: 'f1', user_id: 'u1' }, foundation_id: 'f1' } as Donation);
-      jest.spyOn(foundationRepo, 'findOne').mockResolvedValue({ id: 'f1', user_id: 'u1' } as Foundation);
+      loaders.donations.load.mockResolvedValue({ id: 'd1', foundation_id: 'f1' } as Donation);
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u1' } as Foundation);
 
       const result = await service.isFoundationUserForDonation('d1', 'u1');
       expect(result).toBe(true);
+      expect(loaders.foundations.load).toHaveBeenCalledWith('f1');
     });
 
-    it('debería retornar false si no hay fundación asociada', async () => {
-      jest.spyOn(donationRepo, 'findOne').mockResolvedValue({ foundation: null } as Donation);
+    it('debería retornar false si la donación no existe', async () => {
+      loaders.donations.load.mockResolvedValue(null);
       const result = await service.isFoundationUserForDonation('d1', 'u1');
       expect(result).toBe(false);
     });
 
     it('debería retornar false si la fundación no coincide con el usuario', async () => {
-      jest.spyOn(donationRepo, 'findOne').mockResolvedValue({ foundation: { id: 'f1' }, foundation_id: 'f1' } as Donation);
-      jest.spyOn(foundationRepo, 'findOne').mockResolvedValue({ id: 'f1', user_id: 'otro' } as Foundation);
+      loaders.donations.load.mockResolvedValue({ id: 'd1', foundation_id: 'f1' } as Donation);
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'otro' } as Foundation);
 
       const result = await service.isFoundationUserForDonation('d1', 'u1');
       expect(result).toBe(false);
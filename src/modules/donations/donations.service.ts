@@ -7,6 +7,29 @@ import { User } from '../../entities/user.entity';
 import { Foundation } from '../../entities/foundation.entity';
 import { CreateDonationDto } from './dto/create-donation.dto';
 import { UpdateDonationDto } from './dto/update-donation.dto';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
+import { ExportSource, selectColumns, streamQuery } from '../../shared/export/export-stream';
+import {
+  BatchItemResult,
+  BatchResult,
+  batchCreated,
+  batchFailed,
+  findExistingIds,
+  toBatchResult,
+} from '../../shared/batch/batch';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
+
+// Columnas de la exportación y la expresión SQL de cada una
+const DONATION_EXPORT_COLUMNS = {
+  id: 'donation.id',
+  amount: 'donation.amount',
+  donation_date: 'donation.donation_date',
+  user_id: 'donation.user_id',
+  user_name: 'user.name',
+  user_email: 'user.email',
+  foundation_id: 'donation.foundation_id',
+  foundation_name: 'foundation.legal_name',
+};
 
 @Injectable()
 export class DonationsService {
@@ -17,6 +40,7 @@ export class DonationsService {
     private usersRepository: Repository<User>,
     @InjectRepository(Foundation)
     private foundationsRepository: Repository<Foundation>,
+    private readonly loaders: EntityLoaders,
   ) {}
 
   async create(createDonationDto: CreateDonationDto): Promise<Donation> {
@@ -47,13 +71,72 @@ export class DonationsService {
     return this.donationsRepository.save(newDonation);
   }
 
-  async findAll(): Promise<Donation[]> {
-    return this.donationsRepository.find({
-      relations: ['user', 'foundation'],
-      order: { donation_date: 'DESC' },
+  /**
+   * Crea varias donaciones en una transacción.
+   *
+   * Los usuarios y fundaciones referenciados se validan con una consulta
+   * IN (...) por tabla y las donaciones válidas se insertan con un único
+   * INSERT multi-fila. Cada elemento recibe su propio resultado; uno inválido
+   * no impide crear los demás.
+   */
+  async createMany(items: CreateDonationDto[]): Promise<BatchResult<Donation>> {
+    return this.donationsRepository.manager.transaction(async (manager) => {
+      const userIds = await findExistingIds(manager, User, items.map((item) => item.user_id));
+      const foundationIds = await findExistingIds(manager, Foundation, items.map((item) => item.foundation_id));
+
+      const results: BatchItemResult<Donation>[] = [];
+      const accepted: number[] = [];
+      items.forEach((item, index) => {
+        if (!userIds.has(item.user_id)) {
+          results.push(batchFailed(index, new NotFoundException(`User with ID "${item.user_id}" not found`)));
+        } else if (!foundationIds.has(item.foundation_id)) {
+          results.push(
+            batchFailed(index, new NotFoundException(`Foundation with ID "${item.foundation_id}" not found`)),
+          );
+        } else {
+          accepted.push(index);
+        }
+      });
+
+      const donationDate = new Date();
+      const newDonations = accepted.map((index) =>
+        manager.create(Donation, { ...items[index], donation_date: donationDate }),
+      );
+      if (newDonations.length) {
+        // insert() completa el id de cada entidad con el RETURNING del INSERT
+        await manager.insert(Donation, newDonations);
+      }
+      accepted.forEach((index, position) => results.push(batchCreated(index, newDonations[position])));
+
+      return toBatchResult(results);
     });
   }
 
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<Donation>> {
+    const query = this.donationsRepository
+      .createQueryBuilder('donation')
+      .leftJoinAndSelect('donation.user', 'user')
+      .leftJoinAndSelect('donation.foundation', 'foundation');
+
+    return paginateByCursor(query, 'donation_date', page);
+  }
+
+  // Filas planas para la exportación, sin hidratar entidades
+  exportAll(): ExportSource {
+    const query = selectColumns(
+      this.donationsRepository
+        .createQueryBuilder('donation')
+        .leftJoin('donation.user', 'user')
+        .leftJoin('donation.foundation', 'foundation'),
+      DONATION_EXPORT_COLUMNS,
+    ).orderBy('donation.donation_date', 'DESC');
+
+    return {
+      columns: Object.keys(DONATION_EXPORT_COLUMNS),
+      rows: streamQuery(this.donationsRepository.manager, query),
+    };
+  }
+
   async findOne(id: string): Promise<Donation> {
     const donation = await this.donationsRepository.findOne({
       where: { id },
@@ -138,19 +221,14 @@ export class DonationsService {
   }
 
   async isFoundationUserForDonation(donationId: string, userId: string): Promise<boolean> {
-    const donation = await this.donationsRepository.findOne({
-      where: { id: donationId },
-      relations: ['foundation'],
-    });
+    const donation = await this.loaders.donations().load(donationId);
 
-    if (!donation || !donation.foundation) {
+    if (!donation) {
       return false;
     }
 
-    const foundation = await this.foundationsRepository.findOne({
-      where: { id: donation.foundation_id },
-    });
+    const foundation = await this.loaders.foundations().load(donation.foundation_id);
 
-    return foundation && foundation.user_id === userId;
+    return foundation?.user_id === userId;
   }
 }
\ No newline at end of file
@@ -0,0 +1,13 @@
+import { Type } from 'class-transformer';
+import { ArrayMaxSize, ArrayMinSize, IsArray, ValidateNested } from 'class-validator';
+import { MAX_BATCH_SIZE } from '../../../shared/batch/batch';
+import { CreateDonationDto } from './create-donation.dto';
+
+export class CreateDonationsBatchDto {
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(MAX_BATCH_SIZE)
+  @ValidateNested({ each: true })
+  @Type(() => CreateDonationDto)
+  items: CreateDonationDto[];
+}
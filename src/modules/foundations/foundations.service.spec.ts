@@ -5,6 +5,7 @@ import { Repository } from 'typeorm';
 import { Foundation } from '../../entities/foundation.entity';
 import { User, UserType } from '../../entities/user.entity';
 import { UsersService } from '../users/users.service';
+import { PubSub } from '../../shared/pubsub/pubsub';
 import { NotFoundException, BadRequestException, ConflictException } from '@nestjs/common';
 
 describe('FoundationsService', () => {
@@ -27,6 +28,10 @@ describe('FoundationsService', () => {
 
   const mockUsersService = {};
 
+  const mockPubSub = {
+    publish: jest.fn().mockResolvedValue(undefined),
+  };
+
   beforeEach(async () => {
     const module: TestingModule = await Test.createTestingModule({
       providers: [
@@ -34,6 +39,7 @@ describe('FoundationsService', () => {
         { provide: getRepositoryToken(Foundation), useValue: mockFoundationRepo },
         { provide: getRepositoryToken(User), useValue: mockUserRepo },
         { provide: UsersService, useValue: mockUsersService },
+        { provide: PubSub, useValue: mockPubSub },
       ],
     }).compile();
 
@@ -131,6 +137,7 @@ describe('FoundationsService', () => {
 
       const result = await service.update('f1', { legal_name: 'Updated' });
       expect(result).toEqual(updatedFoundation);
+      expect(mockPubSub.publish).toHaveBeenCalledWith('social-action-feed', 'invalidate');
     });
   });
 
@@ -2,7 +2,8 @@ import {
   Injectable, 
   NotFoundException, 
   BadRequestException,
-  ConflictException
+  ConflictException,
+  Logger,
 } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
@@ -12,15 +13,20 @@ import { CreateFoundationDto } from './dto/create-foundation.dto';
 import { UpdateFoundationDto } from './dto/update-foundation.dto';
 import { UserType } from '../../entities/user.entity';
 import { UsersService } from '../users/users.service';
+import { PubSub } from '../../shared/pubsub/pubsub';
+import { SOCIAL_ACTION_FEED_CHANNEL } from '../social-actions/social-action-feed.service';
 
 @Injectable()
 export class FoundationsService {
+  private readonly logger = new Logger(FoundationsService.name);
+
   constructor(
     @InjectRepository(Foundation)
     private foundationsRepository: Repository<Foundation>,
     @InjectRepository(User)
     private usersRepository: Repository<User>,
     private usersService: UsersService,
+    private pubsub: PubSub,
   ) {}
 
   async create(createFoundationDto: CreateFoundationDto): Promise<Foundation> {
@@ -88,6 +94,7 @@ export class FoundationsService {
     
     // Actualizar la fundación
     await this.foundationsRepository.update(id, updateFoundationDto);
+    this.invalidateSocialActionFeeds();
     
     // Devolver la fundación actualizada
     return this.findOne(id);
@@ -99,5 +106,14 @@ export class FoundationsService {
     if (result.affected === 0) {
       throw new NotFoundException(`Foundation with ID "${id}" not found`);
     }
+    this.invalidateSocialActionFeeds();
+  }
+
+  // Los listados de acciones sociales incluyen la fundación (y el borrado
+  // elimina sus acciones en cascada)
+  private invalidateSocialActionFeeds(): void {
+    this.pubsub
+      .publish(SOCIAL_ACTION_FEED_CHANNEL, 'invalidate')
+      .catch((error) => this.logger.warn(`Could not publish feed invalidation: ${error.message}`));
   }
 }
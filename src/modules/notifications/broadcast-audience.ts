@@ -0,0 +1,20 @@
+// src/modules/notifications/broadcast-audience.ts
+import { RequestStatus } from '../../entities/participation_request.entity';
+import { BroadcastAudience } from './dto/broadcast-notification.dto';
+
+// Audiencias del broadcast, compartidas por el envío (NotificationsService) y
+// la entrega en tiempo real (NotificationEventsService)
+
+// Anterior a cualquier user_id: punto de partida del recorrido por tramos
+export const FIRST_UUID = '00000000-0000-0000-0000-000000000000';
+
+// Destinatarios de cada audiencia, sin usuarios repetidos. $1 es el último
+// user_id ya notificado y $2 la fundación o acción social de destino
+export const AUDIENCE_SQL: Record<BroadcastAudience, string> = {
+  [BroadcastAudience.ALL_USERS]: `SELECT id AS user_id FROM users WHERE id > $1`,
+  [BroadcastAudience.FOUNDATION_DONORS]:
+    `SELECT DISTINCT user_id FROM donations WHERE user_id > $1 AND foundation_id = $2`,
+  [BroadcastAudience.SOCIAL_ACTION_PARTICIPANTS]:
+    `SELECT DISTINCT user_id FROM participation_requests
+     WHERE user_id > $1 AND social_action_id = $2 AND status = '${RequestStatus.ACCEPTED}'`,
+};
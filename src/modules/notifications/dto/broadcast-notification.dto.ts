@@ -0,0 +1,29 @@
+import { IsEnum, IsNotEmpty, IsString, IsUUID, ValidateIf } from 'class-validator';
+
+export enum BroadcastAudience {
+  ALL_USERS = 'all_users',
+  FOUNDATION_DONORS = 'foundation_donors',
+  SOCIAL_ACTION_PARTICIPANTS = 'social_action_participants',
+}
+
+export class BroadcastNotificationDto {
+  @IsNotEmpty()
+  @IsEnum(BroadcastAudience)
+  audience: BroadcastAudience;
+
+  // Fundación cuyos donantes reciben la notificación
+  @ValidateIf((dto) => dto.audience === BroadcastAudience.FOUNDATION_DONORS)
+  @IsNotEmpty()
+  @IsUUID()
+  foundation_id?: string;
+
+  // Acción social cuyos participantes aceptados reciben la notificación
+  @ValidateIf((dto) => dto.audience === BroadcastAudience.SOCIAL_ACTION_PARTICIPANTS)
+  @IsNotEmpty()
+  @IsUUID()
+  social_action_id?: string;
+
+  @IsNotEmpty()
+  @IsString()
+  message: string;
+}
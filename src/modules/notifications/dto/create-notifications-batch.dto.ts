@@ -0,0 +1,13 @@
+import { Type } from 'class-transformer';
+import { ArrayMaxSize, ArrayMinSize, IsArray, ValidateNested } from 'class-validator';
+import { MAX_BATCH_SIZE } from '../../../shared/batch/batch';
+import { CreateNotificationDto } from './create-notification.dto';
+
+export class CreateNotificationsBatchDto {
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(MAX_BATCH_SIZE)
+  @ValidateNested({ each: true })
+  @Type(() => CreateNotificationDto)
+  items: CreateNotificationDto[];
+}
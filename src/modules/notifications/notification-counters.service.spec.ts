@@ -0,0 +1,93 @@
+import { Test, TestingModule } from '@nestjs/testing';
+import { getRepositoryToken } from '@nestjs/typeorm';
+import { Notification } from '../../entities/notification.entity';
+import { NotificationCounter } from '../../entities/notification_counter.entity';
+import { NotificationCountersService } from './notification-counters.service';
+
+describe('NotificationCountersService', () => {
+  let service: NotificationCountersService;
+
+  const mockManager = {
+    query: jest.fn(),
+  };
+
+  const mockCounterRepo = {
+    findOne: jest.fn(),
+    exists: jest.fn(),
+    count: jest.fn(),
+    manager: {
+      transaction: jest.fn((work) => work(mockManager)),
+    },
+  };
+
+  const mockNotificationRepo = {
+    exists: jest.fn(),
+  };
+
+  beforeEach(async () => {
+    const module: TestingModule = await Test.createTestingModule({
+      providers: [
+        NotificationCountersService,
+        { provide: getRepositoryToken(NotificationCounter), useValue: mockCounterRepo },
+        { provide: getRepositoryToken(Notification), useValue: mockNotificationRepo },
+      ],
+    }).compile();
+
+    service = module.get<NotificationCountersService>(NotificationCountersService);
+  });
+
+  afterEach(() => jest.clearAllMocks());
+
+  describe('onModuleInit', () => {
+    it('debería reconstruir los contadores si hay notificaciones sin contar', async () => {
+      mockCounterRepo.exists.mockResolvedValue(false);
+      mockNotificationRepo.exists.mockResolvedValue(true);
+      mockCounterRepo.count.mockResolvedValue(3);
+
+      await service.onModuleInit();
+      expect(mockManager.query).toHaveBeenCalledWith('DELETE FROM notification_counters');
+      expect(mockManager.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('no debería reconstruir si ya existen contadores', async () => {
+      mockCounterRepo.exists.mockResolvedValue(true);
+
+      await service.onModuleInit();
+      expect(mockCounterRepo.manager.transaction).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('applyMany', () => {
+    it('debería aplicar los deltas en una sola sentencia, ordenados por usuario', async () => {
+      mockManager.query.mockResolvedValueOnce([
+        { user_id: 'u1', unread_count: 0 },
+        { user_id: 'u2', unread_count: 4 },
+      ]);
+
+      const counts = await service.applyMany(mockManager as any, new Map([['u2', 1], ['u1', -3], ['u3', 0]]));
+      expect(counts).toEqual(new Map([['u1', 0], ['u2', 4]]));
+      expect(mockManager.query).toHaveBeenCalledTimes(1);
+      expect(mockManager.query).toHaveBeenCalledWith(expect.stringContaining('ON CONFLICT'), [
+        ['u1', 'u2'],
+        [-3, 1],
+      ]);
+    });
+
+    it('no debería hacer nada si ningún contador cambia', async () => {
+      await expect(service.apply(mockManager as any, 'u1', 0)).resolves.toBeNull();
+      expect(mockManager.query).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('findOne', () => {
+    it('debería devolver el contador del usuario', async () => {
+      mockCounterRepo.findOne.mockResolvedValue({ user_id: 'u1', unread_count: 2, version: 5 });
+      await expect(service.findOne('u1')).resolves.toEqual({ unread_count: 2, version: 5 });
+    });
+
+    it('debería devolver cero si el usuario no tiene contador', async () => {
+      mockCounterRepo.findOne.mockResolvedValue(null);
+      await expect(service.findOne('u1')).resolves.toEqual({ unread_count: 0, version: 0 });
+    });
+  });
+});
@@ -0,0 +1,94 @@
+// src/modules/notifications/notification-counters.service.ts
+import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { EntityManager, Repository } from 'typeorm';
+import { Notification } from '../../entities/notification.entity';
+import { NotificationCounter } from '../../entities/notification_counter.entity';
+
+export interface UnreadCount {
+  unread_count: number;
+  version: number;
+}
+
+// Suma (o resta) no leídas a varios usuarios en una sola sentencia, así dos
+// cambios simultáneos no pisan el contador. $1 son los user_id y $2 los deltas;
+// devuelve los contadores resultantes
+const APPLY_DELTAS_SQL = `
+  INSERT INTO notification_counters (user_id, unread_count, version, updated_at)
+  SELECT user_id, delta, 1, now() FROM unnest($1::uuid[], $2::int[]) AS deltas (user_id, delta)
+  ON CONFLICT (user_id) DO UPDATE SET
+    unread_count = notification_counters.unread_count + EXCLUDED.unread_count,
+    version = notification_counters.version + 1,
+    updated_at = now()
+  RETURNING user_id, unread_count`;
+
+// Recalcula todos los contadores a partir de la tabla de notificaciones
+const REBUILD_SQL = `
+  INSERT INTO notification_counters (user_id, unread_count, version, updated_at)
+  SELECT user_id, COUNT(*), 1, now()
+  FROM notifications
+  WHERE read = false
+  GROUP BY user_id`;
+
+@Injectable()
+export class NotificationCountersService implements OnModuleInit {
+  private readonly logger = new Logger(NotificationCountersService.name);
+
+  constructor(
+    @InjectRepository(NotificationCounter)
+    private countersRepository: Repository<NotificationCounter>,
+    @InjectRepository(Notification)
+    private notificationsRepository: Repository<Notification>,
+  ) {}
+
+  // Las notificaciones creadas antes de existir la tabla de contadores
+  // (o cargadas directo en la base) se cuentan al arrancar
+  async onModuleInit(): Promise<void> {
+    const hasCounters = await this.countersRepository.exists();
+    if (!hasCounters && (await this.notificationsRepository.exists())) {
+      const users = await this.rebuild();
+      this.logger.log(`Notification counters rebuilt for ${users} users`);
+    }
+  }
+
+  // Suma `delta` no leídas al contador del usuario y devuelve el nuevo valor
+  // (null si delta es 0); debe llamarse en la misma transacción que el cambio
+  // de las notificaciones
+  async apply(manager: EntityManager, userId: string, delta: number): Promise<number | null> {
+    const counts = await this.applyMany(manager, new Map([[userId, delta]]));
+    return counts.get(userId) ?? null;
+  }
+
+  // Devuelve el nuevo contador de cada usuario que cambió
+  async applyMany(manager: EntityManager, deltas: Map<string, number>): Promise<Map<string, number>> {
+    // Orden fijo de user_id: dos transacciones no se bloquean en orden cruzado
+    const userIds = [...deltas.keys()].filter((userId) => deltas.get(userId) !== 0).sort();
+    if (!userIds.length) {
+      return new Map();
+    }
+
+    const rows: { user_id: string; unread_count: number }[] = await manager.query(APPLY_DELTAS_SQL, [
+      userIds,
+      userIds.map((userId) => deltas.get(userId)),
+    ]);
+    return new Map(rows.map((row) => [row.user_id, row.unread_count]));
+  }
+
+  // Un usuario sin fila de contador no tiene notificaciones sin leer
+  async findOne(userId: string): Promise<UnreadCount> {
+    const counter = await this.countersRepository.findOne({ where: { user_id: userId } });
+    return {
+      unread_count: counter?.unread_count ?? 0,
+      version: counter?.version ?? 0,
+    };
+  }
+
+  // Vuelve a calcular todos los contadores; devuelve cuántos usuarios tienen no leídas
+  async rebuild(): Promise<number> {
+    await this.countersRepository.manager.transaction(async (manager) => {
+      await manager.query('DELETE FROM notification_counters');
+      await manager.query(REBUILD_SQL);
+    });
+    return this.countersRepository.count();
+  }
+}
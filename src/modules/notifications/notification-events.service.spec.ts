@@ -0,0 +1,133 @@
+import { MessageEvent } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Test, TestingModule } from '@nestjs/testing';
+import { getEntityManagerToken } from '@nestjs/typeorm';
+import { Notification } from '../../entities/notification.entity';
+import { LocalPubSub, PubSub } from '../../shared/pubsub/pubsub';
+import { BroadcastAudience } from './dto/broadcast-notification.dto';
+import { NotificationCountersService } from './notification-counters.service';
+import { NotificationEventsService } from './notification-events.service';
+
+describe('NotificationEventsService', () => {
+  let service: NotificationEventsService;
+  let pubsub: LocalPubSub;
+
+  const mockCountersService = {
+    findOne: jest.fn(),
+  };
+
+  const mockManager = {
+    query: jest.fn(),
+  };
+
+  // Deja llegar los eventos y las promesas pendientes
+  const settle = () => new Promise((resolve) => setImmediate(resolve));
+
+  const collect = (userId: string) => {
+    const events: MessageEvent[] = [];
+    const subscription = service.stream(userId).subscribe((event) => events.push(event));
+    return { events, subscription };
+  };
+
+  beforeEach(async () => {
+    pubsub = new LocalPubSub();
+    mockCountersService.findOne.mockResolvedValue({ unread_count: 2, version: 4 });
+
+    const module: TestingModule = await Test.createTestingModule({
+      providers: [
+        NotificationEventsService,
+        { provide: PubSub, useValue: pubsub },
+        { provide: NotificationCountersService, useValue: mockCountersService },
+        { provide: getEntityManagerToken(), useValue: mockManager },
+        { provide: ConfigService, useValue: { get: () => 0 } },
+      ],
+    }).compile();
+
+    service = module.get<NotificationEventsService>(NotificationEventsService);
+    service.onModuleInit();
+  });
+
+  afterEach(() => {
+    service.onModuleDestroy();
+    jest.clearAllMocks();
+  });
+
+  it('debería empezar el stream con el contador actual', async () => {
+    const { events } = collect('u1');
+    await settle();
+
+    expect(events).toEqual([{ type: 'unread_count', data: { unread_count: 2 } }]);
+  });
+
+  it('debería entregar las notificaciones nuevas solo a su usuario', async () => {
+    const first = collect('u1');
+    const second = collect('u2');
+    await settle();
+
+    service.publishCreated(
+      [{ id: 'n1', user_id: 'u1', message: 'Hola', read: false } as Notification],
+      new Map([['u1', 3]]),
+    );
+    await settle();
+
+    expect(first.events[1]).toMatchObject({
+      type: 'created',
+      data: { unread_count: 3, notification: { id: 'n1', message: 'Hola', truncated: false } },
+    });
+    expect(second.events).toHaveLength(1);
+  });
+
+  it('debería dejar de entregar al cerrarse el stream', async () => {
+    const { events, subscription } = collect('u1');
+    await settle();
+    subscription.unsubscribe();
+
+    service.publishReadChange('u1', null, true, 0);
+    await settle();
+    expect(events).toHaveLength(1);
+  });
+
+  it('debería entregar un tramo de broadcast a los usuarios conectados del rango', async () => {
+    const inRange = collect('20000000-0000-0000-0000-000000000000');
+    const outOfRange = collect('90000000-0000-0000-0000-000000000000');
+    await settle();
+    mockManager.query.mockResolvedValue([{ user_id: '20000000-0000-0000-0000-000000000000', unread_count: 5 }]);
+
+    service.publishBroadcastChunk(
+      BroadcastAudience.FOUNDATION_DONORS,
+      'f1',
+      '10000000-0000-0000-0000-000000000000',
+      '50000000-0000-0000-0000-000000000000',
+      'Gracias',
+    );
+    await settle();
+
+    const [sql, parameters] = mockManager.query.mock.calls[0];
+    expect(sql).toContain('FROM donations');
+    expect(parameters).toEqual([
+      '00000000-0000-0000-0000-000000000000',
+      'f1',
+      ['20000000-0000-0000-0000-000000000000'],
+    ]);
+    expect(inRange.events[1]).toMatchObject({
+      type: 'created',
+      data: { unread_count: 5, notification: { id: null, message: 'Gracias' } },
+    });
+    expect(outOfRange.events).toHaveLength(1);
+  });
+
+  it('no debería consultar la base si nadie del tramo está conectado', async () => {
+    service.publishBroadcastChunk(BroadcastAudience.ALL_USERS, null, 'a', 'b', 'Hola');
+    await settle();
+
+    expect(mockManager.query).not.toHaveBeenCalled();
+  });
+
+  it('debería cerrar los streams al destruir el módulo', async () => {
+    const complete = jest.fn();
+    service.stream('u1').subscribe({ complete });
+
+    service.onModuleDestroy();
+    expect(complete).toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,269 @@
+// src/modules/notifications/notification-events.service.ts
+import { Injectable, Logger, MessageEvent, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { InjectEntityManager } from '@nestjs/typeorm';
+import { Observable } from 'rxjs';
+import { EntityManager } from 'typeorm';
+import { Notification } from '../../entities/notification.entity';
+import { PubSub } from '../../shared/pubsub/pubsub';
+import { AUDIENCE_SQL, FIRST_UUID } from './broadcast-audience';
+import { BroadcastAudience } from './dto/broadcast-notification.dto';
+import { NotificationCountersService } from './notification-counters.service';
+
+// Canal del pub/sub con los eventos de notificaciones de todos los usuarios
+export const NOTIFICATIONS_CHANNEL = 'notifications';
+
+// El mensaje viaja recortado (NOTIFY admite menos de 8000 bytes); el cliente
+// pide la notificación completa por id si `truncated` es true
+export const MAX_EVENT_MESSAGE_LENGTH = 1000;
+
+export interface NotificationPayload {
+  id: string | null;
+  user_id: string;
+  message: string;
+  truncated: boolean;
+  read: boolean;
+  notification_date: string;
+}
+
+// Cambio en las notificaciones de un usuario, con su contador de no leídas
+// después del cambio (null si no cambió)
+export interface UserNotificationEvent {
+  type: 'created' | 'read' | 'unread' | 'removed';
+  user_id: string;
+  unread_count: number | null;
+  notification?: NotificationPayload;
+  // Notificaciones afectadas; null en "read" significa todas las del usuario
+  ids?: string[] | null;
+  sent_at: string;
+}
+
+// Un tramo de un broadcast: usuarios de la audiencia con user_id en (after_user_id, last_user_id]
+export interface BroadcastChunkEvent {
+  type: 'broadcast';
+  audience: BroadcastAudience;
+  target_id: string | null;
+  after_user_id: string;
+  last_user_id: string;
+  message: string;
+  truncated: boolean;
+  sent_at: string;
+}
+
+export type NotificationEvent = UserNotificationEvent | BroadcastChunkEvent;
+
+interface UserStream {
+  send(event: MessageEvent): void;
+  close(): void;
+}
+
+function trimMessage(message: string): { message: string; truncated: boolean } {
+  return message.length > MAX_EVENT_MESSAGE_LENGTH
+    ? { message: message.slice(0, MAX_EVENT_MESSAGE_LENGTH), truncated: true }
+    : { message, truncated: false };
+}
+
+function toPayload(notification: Notification): NotificationPayload {
+  return {
+    id: notification.id,
+    user_id: notification.user_id,
+    ...trimMessage(notification.message),
+    read: notification.read ?? false,
+    notification_date: new Date(notification.notification_date ?? Date.now()).toISOString(),
+  };
+}
+
+/**
+ * Entrega en tiempo real (SSE) de los cambios en las notificaciones.
+ *
+ * NotificationsService publica cada cambio ya confirmado en el pub/sub; cada
+ * instancia recibe todos los eventos y los reenvía a los streams abiertos en
+ * ella. Los broadcasts se publican como un evento por tramo, no uno por
+ * destinatario: cada instancia resuelve con una consulta cuáles de sus
+ * usuarios conectados pertenecen al tramo.
+ *
+ * La entrega es best effort: si el pub/sub falla, la escritura ya está hecha y
+ * el cliente se pone al día con GET /notifications/unread/count.
+ */
+@Injectable()
+export class NotificationEventsService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(NotificationEventsService.name);
+  private readonly heartbeatMs: number;
+  // Streams abiertos en esta instancia, por usuario
+  private readonly streams = new Map<string, Set<UserStream>>();
+  private unsubscribe: (() => void) | null = null;
+
+  constructor(
+    private readonly pubsub: PubSub,
+    private readonly countersService: NotificationCountersService,
+    @InjectEntityManager()
+    private readonly manager: EntityManager,
+    configService: ConfigService,
+  ) {
+    this.heartbeatMs = configService.get('realtime.heartbeatMs') ?? 25000;
+  }
+
+  onModuleInit(): void {
+    this.unsubscribe = this.pubsub.subscribe(NOTIFICATIONS_CHANNEL, (message) => this.dispatch(message));
+  }
+
+  // Cierra los streams abiertos para que el servidor pueda terminar
+  onModuleDestroy(): void {
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+    for (const streams of [...this.streams.values()]) {
+      for (const stream of [...streams]) {
+        stream.close();
+      }
+    }
+  }
+
+  /**
+   * Stream de eventos del usuario. Empieza con un evento "unread_count" con
+   * el contador actual (salvo que otro evento lo haya traído antes) y envía
+   * un "ping" cada `heartbeatMs`.
+   */
+  stream(userId: string): Observable<MessageEvent> {
+    return new Observable<MessageEvent>((subscriber) => {
+      let synced = false;
+      const stream: UserStream = {
+        send: (event) => {
+          synced = true;
+          subscriber.next(event);
+        },
+        close: () => subscriber.complete(),
+      };
+
+      let streams = this.streams.get(userId);
+      if (!streams) {
+        streams = new Set();
+        this.streams.set(userId, streams);
+      }
+      streams.add(stream);
+
+      this.countersService.findOne(userId).then(({ unread_count }) => {
+        if (!synced) {
+          subscriber.next({ type: 'unread_count', data: { unread_count } });
+        }
+      }, (error) => subscriber.error(error));
+
+      const heartbeat =
+        this.heartbeatMs > 0 ? setInterval(() => subscriber.next({ type: 'ping', data: {} }), this.heartbeatMs) : null;
+
+      return () => {
+        clearInterval(heartbeat);
+        streams.delete(stream);
+        if (!streams.size && this.streams.get(userId) === streams) {
+          this.streams.delete(userId);
+        }
+      };
+    });
+  }
+
+  // Notificaciones recién creadas, con el contador de cada usuario tras crearlas
+  publishCreated(notifications: Notification[], unreadCounts: Map<string, number>): void {
+    for (const notification of notifications) {
+      this.publish({
+        type: 'created',
+        user_id: notification.user_id,
+        unread_count: unreadCounts.get(notification.user_id) ?? null,
+        notification: toPayload(notification),
+        sent_at: new Date().toISOString(),
+      });
+    }
+  }
+
+  // Cambio de leída: `ids` null cuando se marcaron todas las del usuario
+  publishReadChange(userId: string, ids: string[] | null, read: boolean, unreadCount: number | null): void {
+    this.publish({
+      type: read ? 'read' : 'unread',
+      user_id: userId,
+      unread_count: unreadCount,
+      ids,
+      sent_at: new Date().toISOString(),
+    });
+  }
+
+  publishRemoved(userId: string, id: string, unreadCount: number | null): void {
+    this.publish({
+      type: 'removed',
+      user_id: userId,
+      unread_count: unreadCount,
+      ids: [id],
+      sent_at: new Date().toISOString(),
+    });
+  }
+
+  publishBroadcastChunk(
+    audience: BroadcastAudience,
+    targetId: string | null,
+    afterUserId: string,
+    lastUserId: string,
+    message: string,
+  ): void {
+    this.publish({
+      type: 'broadcast',
+      audience,
+      target_id: targetId,
+      after_user_id: afterUserId,
+      last_user_id: lastUserId,
+      ...trimMessage(message),
+      sent_at: new Date().toISOString(),
+    });
+  }
+
+  private publish(event: NotificationEvent): void {
+    this.pubsub
+      .publish(NOTIFICATIONS_CHANNEL, JSON.stringify(event))
+      .catch((error) => this.logger.warn(`Could not publish ${event.type} event: ${error.message}`));
+  }
+
+  private dispatch(message: string): void {
+    const event: NotificationEvent = JSON.parse(message);
+    if (event.type === 'broadcast') {
+      this.deliverBroadcast(event).catch((error) =>
+        this.logger.warn(`Could not deliver broadcast chunk: ${error.message}`),
+      );
+      return;
+    }
+
+    const { type, user_id, sent_at, ...data } = event;
+    this.deliver(user_id, { type, data: { ...data, sent_at } });
+  }
+
+  // Usuarios conectados aquí que pertenecen al tramo, con su contador en la misma consulta
+  private async deliverBroadcast(event: BroadcastChunkEvent): Promise<void> {
+    const candidates = [...this.streams.keys()].filter(
+      (userId) => userId > event.after_user_id && userId <= event.last_user_id,
+    );
+    if (!candidates.length) {
+      return;
+    }
+
+    const targetParameters = event.target_id ? [event.target_id] : [];
+    const recipients: { user_id: string; unread_count: number }[] = await this.manager.query(
+      `SELECT user_id, unread_count FROM notification_counters
+       WHERE user_id = ANY($${targetParameters.length + 2}::uuid[])
+         AND user_id IN (${AUDIENCE_SQL[event.audience]})`,
+      [FIRST_UUID, ...targetParameters, candidates],
+    );
+
+    for (const { user_id, unread_count } of recipients) {
+      const notification: NotificationPayload = {
+        id: null,
+        user_id,
+        message: event.message,
+        truncated: event.truncated,
+        read: false,
+        notification_date: event.sent_at,
+      };
+      this.deliver(user_id, { type: 'created', data: { unread_count, notification, sent_at: event.sent_at } });
+    }
+  }
+
+  private deliver(userId: string, event: MessageEvent): void {
+    for (const stream of this.streams.get(userId) ?? []) {
+      stream.send(event);
+    }
+  }
+}
@@ -0,0 +1,88 @@
+import { ExecutionContext, INestApplication, ValidationPipe } from '@nestjs/common';
+import { Test, TestingModule } from '@nestjs/testing';
+import * as request from 'supertest';
+import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
+import { UserType } from '../../entities/user.entity';
+import { NEXT_CURSOR_HEADER } from '../../shared/pagination/cursor-pagination';
+import { NotificationEventsService } from './notification-events.service';
+import { NotificationsController } from './notifications.controller';
+import { NotificationsService } from './notifications.service';
+
+describe('NotificationsController', () => {
+  let app: INestApplication;
+  let user: { id: string; email: string; user_type: UserType };
+
+  const mockNotificationsService = {
+    findByUser: jest.fn(),
+    findUnreadByUser: jest.fn(),
+    findAll: jest.fn(),
+  };
+
+  // El guard de prueba autentica siempre como `user`
+  const mockGuard = {
+    canActivate: (context: ExecutionContext) => {
+      context.switchToHttp().getRequest().user = user;
+      return true;
+    },
+  };
+
+  beforeEach(async () => {
+    user = { id: '11111111-1111-1111-1111-111111111111', email: 'ana@ejemplo.com', user_type: UserType.USER };
+
+    const module: TestingModule = await Test.createTestingModule({
+      controllers: [NotificationsController],
+      providers: [
+        { provide: NotificationsService, useValue: mockNotificationsService },
+        { provide: NotificationEventsService, useValue: {} },
+      ],
+    })
+      .overrideGuard(JwtAuthGuard)
+      .useValue(mockGuard)
+      .compile();
+
+    app = module.createNestApplication();
+    // Igual que main.ts
+    app.useGlobalPipes(new ValidationPipe({ transform: true, whitelist: true, forbidNonWhitelisted: true }));
+    await app.init();
+  });
+
+  afterEach(async () => {
+    await app.close();
+    jest.clearAllMocks();
+  });
+
+  it('debería paginar GET /notifications con el cursor en el header', async () => {
+    mockNotificationsService.findByUser.mockResolvedValue({ items: [{ id: 'n1' }], next_cursor: 'abc' });
+
+    const response = await request(app.getHttpServer()).get('/notifications?limit=1').expect(200);
+
+    expect(response.body).toEqual([{ id: 'n1' }]);
+    expect(response.headers[NEXT_CURSOR_HEADER.toLowerCase()]).toBe('abc');
+    expect(mockNotificationsService.findByUser).toHaveBeenCalledWith(user.id, { limit: 1 });
+    expect(mockNotificationsService.findAll).not.toHaveBeenCalled();
+  });
+
+  it('debería paginar GET /notifications/unread', async () => {
+    mockNotificationsService.findUnreadByUser.mockResolvedValue({ items: [], next_cursor: null });
+
+    const response = await request(app.getHttpServer()).get('/notifications/unread?cursor=abc').expect(200);
+
+    expect(response.headers[NEXT_CURSOR_HEADER.toLowerCase()]).toBeUndefined();
+    expect(mockNotificationsService.findUnreadByUser).toHaveBeenCalledWith(user.id, { cursor: 'abc' });
+  });
+
+  it('debería rechazar un límite de página fuera de rango', async () => {
+    await request(app.getHttpServer()).get('/notifications?limit=1000').expect(400);
+  });
+
+  it('debería servir el listado completo en GET /notifications/all solo a fundaciones', async () => {
+    await request(app.getHttpServer()).get('/notifications/all').expect(403);
+
+    user.user_type = UserType.FOUNDATION;
+    mockNotificationsService.findAll.mockResolvedValue({ items: [{ id: 'n2' }], next_cursor: 'def' });
+
+    const response = await request(app.getHttpServer()).get('/notifications/all').expect(200);
+    expect(response.body).toEqual([{ id: 'n2' }]);
+    expect(response.headers[NEXT_CURSOR_HEADER.toLowerCase()]).toBe('def');
+  });
+});
@@ -13,30 +13,112 @@ import {
   UseGuards,
   Req,
   ForbiddenException,
+  Query,
+  Res,
+  Headers,
+  Sse,
+  MessageEvent,
 } from '@nestjs/common';
+import { Observable } from 'rxjs';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
-import { NotificationsService } from './notifications.service';
+import { BroadcastJob, NotificationsService } from './notifications.service';
+import { UnreadCount } from './notification-counters.service';
+import { NotificationEventsService } from './notification-events.service';
 import { CreateNotificationDto } from './dto/create-notification.dto';
+import { CreateNotificationsBatchDto } from './dto/create-notifications-batch.dto';
+import { BroadcastAudience, BroadcastNotificationDto } from './dto/broadcast-notification.dto';
 import { UpdateNotificationDto } from './dto/update-notification.dto';
 import { Notification } from '../../entities/notification.entity';
 import { UserType } from '../../entities/user.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
+import { ExportQueryDto, sendExport } from '../../shared/export/export-stream';
+import { BatchResult } from '../../shared/batch/batch';
 
 @Controller()
 export class NotificationsController {
-  constructor(private readonly notificationsService: NotificationsService) {}
+  constructor(
+    private readonly notificationsService: NotificationsService,
+    private readonly notificationEventsService: NotificationEventsService,
+  ) {}
+
+  // Funciones auxiliares para verificar roles de admin
+  private isFullAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@admin.com';
+  }
+
+  private isReadOnlyAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@lector.com';
+  }
+
+  private isWriterAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@escritor.com';
+  }
+
+  private isDeleterAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@eliminador.com';
+  }
+
+  private hasReadAccess(req): boolean {
+    return this.isFullAdmin(req) || this.isReadOnlyAdmin(req) ||
+           this.isWriterAdmin(req) || this.isDeleterAdmin(req);
+  }
+
+  private hasWriteAccess(req): boolean {
+    return this.isFullAdmin(req) || this.isWriterAdmin(req);
+  }
 
   // Endpoint principal para listar las notificaciones del usuario autenticado
   @UseGuards(JwtAuthGuard)
   @Get('notifications')
-  async getMyNotifications(@Req() req): Promise<Notification[]> {
-    return this.notificationsService.findByUser(req.user.id);
+  async getMyNotifications(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Notification[]> {
+    return sendPage(res, await this.notificationsService.findByUser(req.user.id, page));
   }
 
   // Endpoint para notificaciones no leídas del usuario autenticado
   @UseGuards(JwtAuthGuard)
   @Get('notifications/unread')
-  async getMyUnreadNotifications(@Req() req): Promise<Notification[]> {
-    return this.notificationsService.findUnreadByUser(req.user.id);
+  async getMyUnreadNotifications(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Notification[]> {
+    return sendPage(res, await this.notificationsService.findUnreadByUser(req.user.id, page));
+  }
+
+  // Cantidad de no leídas para el badge, leída del contador del usuario. El
+  // ETag cambia con cada cambio del contador: un sondeo sin cambios recibe 304
+  @UseGuards(JwtAuthGuard)
+  @Get('notifications/unread/count')
+  async getMyUnreadCount(
+    @Req() req,
+    @Headers('if-none-match') ifNoneMatch: string | undefined,
+    @Res({ passthrough: true }) res,
+  ): Promise<Pick<UnreadCount, 'unread_count'> | undefined> {
+    const counter = await this.notificationsService.getUnreadCount(req.user.id);
+    const etag = `W/"${counter.version}-${counter.unread_count}"`;
+
+    res.setHeader('ETag', etag);
+    // El cliente puede guardar la respuesta, pero debe revalidarla en cada sondeo
+    res.setHeader('Cache-Control', 'private, no-cache');
+
+    if (ifNoneMatch?.split(',').some((tag) => tag.trim() === etag || tag.trim() === '*')) {
+      res.status(HttpStatus.NOT_MODIFIED);
+      return undefined;
+    }
+
+    return { unread_count: counter.unread_count };
+  }
+
+  // Stream SSE de las notificaciones del usuario autenticado: nuevas, leídas y
+  // eliminadas, con el contador de no leídas actualizado en cada evento
+  @UseGuards(JwtAuthGuard)
+  @Sse('notifications/stream')
+  streamMyNotifications(@Req() req): Observable<MessageEvent> {
+    return this.notificationEventsService.stream(req.user.id);
   }
 
   // Endpoint para marcar todas las notificaciones como leídas
@@ -81,16 +163,96 @@ export class NotificationsController {
     return this.notificationsService.create(createNotificationDto);
   }
 
-  // Endpoint administrativo para ver todas las notificaciones (solo fundaciones)
+  // Creación de varias notificaciones en una sola petición, con un resultado por elemento
   @UseGuards(JwtAuthGuard)
-  @Get('notifications')
-  async findAll(@Req() req): Promise<Notification[]> {
+  @Post('notifications/batch')
+  @HttpCode(HttpStatus.OK)
+  async createBatch(
+    @Body() batchDto: CreateNotificationsBatchDto,
+    @Req() req,
+  ): Promise<BatchResult<Notification>> {
+    // Solo fundaciones pueden crear notificaciones para otros usuarios
+    if (req.user.user_type !== UserType.FOUNDATION &&
+        batchDto.items.some((item) => item.user_id !== req.user.id)) {
+      throw new ForbiddenException('You can only create notifications for yourself');
+    }
+
+    return this.notificationsService.createMany(batchDto.items);
+  }
+
+  // Broadcast en segundo plano a todos los usuarios, a los donantes de una
+  // fundación o a los participantes aceptados de una acción social
+  @UseGuards(JwtAuthGuard)
+  @Post('notifications/broadcast')
+  @HttpCode(HttpStatus.ACCEPTED)
+  async broadcast(
+    @Body() broadcastDto: BroadcastNotificationDto,
+    @Req() req,
+  ): Promise<BroadcastJob> {
+    // También verifica que la fundación o la acción social existan
+    const ownerId = await this.notificationsService.getBroadcastOwnerId(broadcastDto);
+
+    // Los administradores con permisos de escritura pueden notificar a cualquier audiencia
+    if (!this.hasWriteAccess(req)) {
+      if (broadcastDto.audience === BroadcastAudience.ALL_USERS) {
+        throw new ForbiddenException('Only administrators can notify all users');
+      }
+
+      // Una fundación solo puede notificar a sus propios donantes y participantes
+      if (ownerId !== req.user.id) {
+        throw new ForbiddenException('You can only notify the donors and participants of your own foundation');
+      }
+    }
+
+    return this.notificationsService.broadcast(broadcastDto, req.user.id);
+  }
+
+  // Progreso de un broadcast: destinatarios totales y notificaciones ya insertadas
+  @UseGuards(JwtAuthGuard)
+  @Get('notifications/broadcast/:jobId')
+  async getBroadcast(
+    @Param('jobId', ParseUUIDPipe) jobId: string,
+    @Req() req,
+  ): Promise<BroadcastJob> {
+    const job = this.notificationsService.getBroadcast(jobId);
+
+    if (!this.hasReadAccess(req) && job.requested_by !== req.user.id) {
+      throw new ForbiddenException('You can only view your own broadcasts');
+    }
+
+    return job;
+  }
+
+  // Endpoint administrativo para ver todas las notificaciones (solo fundaciones).
+  // GET /notifications es la lista del usuario autenticado
+  @UseGuards(JwtAuthGuard)
+  @Get('notifications/all')
+  async findAll(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Notification[]> {
     // Solo fundaciones pueden ver todas las notificaciones
     if (req.user.user_type !== UserType.FOUNDATION) {
       throw new ForbiddenException('Only foundation administrators can view all notifications');
     }
     
-    return this.notificationsService.findAll();
+    return sendPage(res, await this.notificationsService.findAll(page));
+  }
+
+  // Exportación completa en streaming: NDJSON por defecto o ?format=csv
+  @UseGuards(JwtAuthGuard)
+  @Get('notifications/export')
+  async exportNotifications(
+    @Req() req,
+    @Query() query: ExportQueryDto,
+    @Res() res,
+  ): Promise<void> {
+    if (req.user.user_type !== UserType.FOUNDATION) {
+      throw new ForbiddenException('Only foundation administrators can export notifications');
+    }
+
+    return sendExport(res, this.notificationsService.exportAll(), 'notifications', query.format);
   }
 
   // Endpoint para ver notificaciones de un usuario específico
@@ -99,13 +261,15 @@ export class NotificationsController {
   async findByUser(
     @Param('userId', ParseUUIDPipe) userId: string,
     @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
   ): Promise<Notification[]> {
     // Usuario solo puede ver sus propias notificaciones, fundaciones pueden ver todas
     if (req.user.id !== userId && req.user.user_type !== UserType.FOUNDATION) {
       throw new ForbiddenException('You can only view your own notifications');
     }
     
-    return this.notificationsService.findByUser(userId);
+    return sendPage(res, await this.notificationsService.findByUser(userId, page));
   }
 
   // Endpoint para ver notificaciones no leídas de un usuario específico
@@ -114,13 +278,15 @@ export class NotificationsController {
   async findUnreadByUser(
     @Param('userId', ParseUUIDPipe) userId: string,
     @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
   ): Promise<Notification[]> {
     // Usuario solo puede ver sus propias notificaciones, fundaciones pueden ver todas
     if (req.user.id !== userId && req.user.user_type !== UserType.FOUNDATION) {
       throw new ForbiddenException('You can only view your own notifications');
     }
     
-    return this.notificationsService.findUnreadByUser(userId);
+    return sendPage(res, await this.notificationsService.findUnreadByUser(userId, page));
   }
 
   // Endpoint para marcar todas las notificaciones de un usuario como leídas
@@ -1,18 +1,21 @@
 import { Module } from '@nestjs/common';
 import { TypeOrmModule } from '@nestjs/typeorm';
 import { Notification } from '../../entities/notification.entity';
+import { NotificationCounter } from '../../entities/notification_counter.entity';
 import { User } from '../../entities/user.entity';
 import { NotificationsController } from './notifications.controller';
 import { NotificationsService } from './notifications.service';
+import { NotificationCountersService } from './notification-counters.service';
+import { NotificationEventsService } from './notification-events.service';
 import { UsersModule } from '../users/users.module';
 
 @Module({
   imports: [
-    TypeOrmModule.forFeature([Notification, User]),
+    TypeOrmModule.forFeature([Notification, NotificationCounter, User]),
     UsersModule,
   ],
   controllers: [NotificationsController],
-  providers: [NotificationsService],
+  providers: [NotificationsService, NotificationCountersService, NotificationEventsService],
   exports: [NotificationsService],
 })
 export class NotificationsModule {}
@@ -5,12 +5,49 @@ import { Repository } from 'typeorm';
 import { Notification } from '../../entities/notification.entity';
 import { User } from '../../entities/user.entity';
 import { NotFoundException } from '@nestjs/common';
+import { BroadcastAudience } from './dto/broadcast-notification.dto';
+import { NotificationCountersService } from './notification-counters.service';
+import { NotificationEventsService } from './notification-events.service';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
 
 describe('NotificationsService', () => {
   let service: NotificationsService;
   let notificationRepo: Repository<Notification>;
   let userRepo: Repository<User>;
 
+  // EntityManager de las transacciones: en createMany solo u1 existe
+  const mockManager = {
+    find: jest.fn().mockResolvedValue([{ id: 'u1' }]),
+    create: jest.fn((_target, data) => ({ ...data })),
+    insert: jest.fn(async (_target, entities) => entities.forEach((entity, i) => (entity.id = `n${i}`))),
+    save: jest.fn(async (entity) => ({ id: 'n1', read: false, ...entity })),
+    update: jest.fn(),
+    transaction: jest.fn((work) => work(mockManager)),
+    findOne: jest.fn(),
+    query: jest.fn(),
+    createQueryBuilder: jest.fn(),
+  };
+
+  const mockCountersService = {
+    apply: jest.fn(),
+    applyMany: jest.fn(),
+    findOne: jest.fn(),
+  };
+
+  const mockEvents = {
+    publishCreated: jest.fn(),
+    publishReadChange: jest.fn(),
+    publishRemoved: jest.fn(),
+    publishBroadcastChunk: jest.fn(),
+  };
+
+  // DeleteQueryBuilder encadenable de remove
+  const mockDeleteBuilder = (result: { affected: number; raw: any[] }) => {
+    const qb: any = { execute: jest.fn().mockResolvedValue(result) };
+    ['delete', 'from', 'where', 'returning'].forEach((method) => (qb[method] = jest.fn().mockReturnValue(qb)));
+    return qb;
+  };
+
   const mockNotificationRepo = {
     findOne: jest.fn(),
     find: jest.fn(),
@@ -18,6 +55,8 @@ describe('NotificationsService', () => {
     save: jest.fn(),
     update: jest.fn(),
     delete: jest.fn(),
+    createQueryBuilder: jest.fn(),
+    manager: mockManager,
   };
 
   const mockUserRepo = {
@@ -30,6 +69,8 @@ describe('NotificationsService', () => {
         NotificationsService,
         { provide: getRepositoryToken(Notification), useValue: mockNotificationRepo },
         { provide: getRepositoryToken(User), useValue: mockUserRepo },
+        { provide: NotificationCountersService, useValue: mockCountersService },
+        { provide: NotificationEventsService, useValue: mockEvents },
       ],
     }).compile();
 
@@ -51,24 +92,114 @@ describe('NotificationsService', () => {
       ).rejects.toThrow(NotFoundException);
     });
 
-    it('debería crear y retornar una notificación', async () => {
-      const notification = { id: 'n1' } as Notification;
+    it('debería crear la notificación, sumarla al contador y publicarla', async () => {
       mockUserRepo.findOne.mockResolvedValue({ id: 'u1' });
-      mockNotificationRepo.create.mockReturnValue(notification);
-      mockNotificationRepo.save.mockResolvedValue(notification);
+      mockCountersService.apply.mockResolvedValueOnce(3);
 
-      const result = await service.create({ user_id: 'u1', content: 'Hello' } as any);
-      expect(result).toBe(notification);
+      const result = await service.create({ user_id: 'u1', message: 'Hello' });
+      expect(result).toEqual({ id: 'n1', read: false, user_id: 'u1', message: 'Hello' });
+      expect(mockCountersService.apply).toHaveBeenCalledWith(mockManager, 'u1', 1);
+      expect(mockEvents.publishCreated).toHaveBeenCalledWith([result], new Map([['u1', 3]]));
+    });
+  });
+
+  describe('createMany', () => {
+    it('debería insertar las notificaciones de usuarios existentes en un solo insert', async () => {
+      const result = await service.createMany([
+        { user_id: 'u1', message: 'Hola' },
+        { user_id: 'u2', message: 'Hola' },
+      ]);
+
+      expect(mockManager.find).toHaveBeenCalledTimes(1);
+      expect(mockManager.insert).toHaveBeenCalledTimes(1);
+      expect(result.results).toEqual([
+        { index: 0, status: 201, data: { id: 'n0', user_id: 'u1', message: 'Hola' } },
+        { index: 1, status: 404, error: 'User with ID "u2" not found' },
+      ]);
+    });
+
+    it('debería sumar las no leídas de cada usuario en una sola actualización', async () => {
+      mockManager.find.mockResolvedValueOnce([{ id: 'u1' }, { id: 'u2' }]);
+
+      await service.createMany([
+        { user_id: 'u1', message: 'Hola' },
+        { user_id: 'u2', message: 'Hola' },
+        { user_id: 'u1', message: 'Chau' },
+      ]);
+
+      expect(mockCountersService.applyMany).toHaveBeenCalledWith(
+        mockManager,
+        new Map([['u1', 2], ['u2', 1]]),
+      );
+    });
+  });
+
+  describe('broadcast', () => {
+    // Deja terminar el trabajo que broadcast() lanzó en segundo plano
+    const settle = () => new Promise((resolve) => setImmediate(resolve));
+
+    it('debería insertar por tramos hasta agotar la audiencia', async () => {
+      mockManager.query
+        .mockResolvedValueOnce([{ total: 5001 }])
+        .mockResolvedValueOnce([{ inserted: 5000, last_user_id: 'u5000' }])
+        .mockResolvedValueOnce([{ inserted: 1, last_user_id: 'u5001' }]);
+
+      const job = await service.broadcast({ audience: BroadcastAudience.ALL_USERS, message: 'Hola' }, 'admin');
+      expect(job).toMatchObject({ status: 'running', total: 5001, inserted: 0 });
+
+      await settle();
+      expect(service.getBroadcast(job.id)).toMatchObject({ status: 'completed', inserted: 5001 });
+      expect(mockManager.query).toHaveBeenCalledTimes(3);
+      expect(mockManager.query.mock.calls[2][1]).toEqual(['u5000', 5000, 'Hola']);
+      // Un evento por tramo, con el rango de user_id que cubre
+      expect(mockEvents.publishBroadcastChunk.mock.calls).toEqual([
+        [BroadcastAudience.ALL_USERS, null, '00000000-0000-0000-0000-000000000000', 'u5000', 'Hola'],
+        [BroadcastAudience.ALL_USERS, null, 'u5000', 'u5001', 'Hola'],
+      ]);
+    });
+
+    it('debería pasar la fundación como parámetro de la audiencia', async () => {
+      mockManager.query.mockResolvedValueOnce([{ total: 0 }]).mockResolvedValueOnce([{ inserted: 0 }]);
+
+      await service.broadcast(
+        { audience: BroadcastAudience.FOUNDATION_DONORS, foundation_id: 'f1', message: 'Hola' },
+        'u1',
+      );
+      await settle();
+
+      expect(mockManager.query.mock.calls[1][0]).toContain('FROM donations');
+      expect(mockManager.query.mock.calls[1][1]).toEqual(['00000000-0000-0000-0000-000000000000', 'f1', 5000, 'Hola']);
+    });
+
+    it('debería marcar el trabajo como fallido si un tramo falla', async () => {
+      mockManager.query.mockResolvedValueOnce([{ total: 10 }]).mockRejectedValueOnce(new Error('deadlock'));
+
+      const job = await service.broadcast({ audience: BroadcastAudience.ALL_USERS, message: 'Hola' }, 'admin');
+      await settle();
+
+      expect(service.getBroadcast(job.id)).toMatchObject({ status: 'failed', error: 'deadlock' });
+    });
+
+    it('debería lanzar error si la fundación no existe', async () => {
+      mockManager.findOne.mockResolvedValue(null);
+
+      await expect(
+        service.getBroadcastOwnerId({ audience: BroadcastAudience.FOUNDATION_DONORS, foundation_id: 'f1', message: 'Hola' }),
+      ).rejects.toThrow(NotFoundException);
+    });
+
+    it('debería lanzar error si el broadcast no existe', () => {
+      expect(() => service.getBroadcast('b1')).toThrow(NotFoundException);
     });
   });
 
   describe('findAll', () => {
-    it('debería retornar todas las notificaciones', async () => {
+    it('debería retornar la primera página de notificaciones', async () => {
       const notifications = [{ id: 'n1' }] as Notification[];
-      mockNotificationRepo.find.mockResolvedValue(notifications);
+      mockNotificationRepo.createQueryBuilder.mockReturnValue(mockQueryBuilder('notification', notifications));
 
       const result = await service.findAll();
-      expect(result).toEqual(notifications);
+      expect(result).toEqual({ items: notifications, next_cursor: null });
     });
   });
 
@@ -88,22 +219,27 @@ describe('NotificationsService', () => {
   });
 
   describe('findByUser', () => {
-    it('debería retornar las notificaciones de un usuario', async () => {
+    it('debería retornar la primera página de notificaciones de un usuario', async () => {
       const notifications = [{ id: 'n1' }] as Notification[];
-      mockNotificationRepo.find.mockResolvedValue(notifications);
+      const qb = mockQueryBuilder('notification', notifications);
+      mockNotificationRepo.createQueryBuilder.mockReturnValue(qb);
 
-      const result = await service.findByUser('u1');
-      expect(result).toEqual(notifications);
+      const result = await service.findByUser('u1', { limit: 10 });
+      expect(result).toEqual({ items: notifications, next_cursor: null });
+      expect(qb.where).toHaveBeenCalledWith('notification.user_id = :userId', { userId: 'u1' });
+      expect(qb.limit).toHaveBeenCalledWith(11);
     });
   });
 
   describe('findUnreadByUser', () => {
-    it('debería retornar notificaciones no leídas de un usuario', async () => {
+    it('debería retornar la primera página de no leídas de un usuario', async () => {
       const notifications = [{ id: 'n1', read: false }] as Notification[];
-      mockNotificationRepo.find.mockResolvedValue(notifications);
+      const qb = mockQueryBuilder('notification', notifications);
+      mockNotificationRepo.createQueryBuilder.mockReturnValue(qb);
 
       const result = await service.findUnreadByUser('u1');
-      expect(result).toEqual(notifications);
+      expect(result).toEqual({ items: notifications, next_cursor: null });
+      expect(qb.andWhere).toHaveBeenCalledWith('notification.read = false');
     });
   });
 
@@ -113,30 +249,78 @@ describe('NotificationsService', () => {
       const updated = { id: 'n1', read: true } as Notification;
 
       mockNotificationRepo.findOne
-        .mockResolvedValueOnce(notification) // first findOne
+        .mockResolvedValueOnce({ ...notification, user_id: 'u1' }) // first findOne
         .mockResolvedValueOnce(updated);   // after update
-      mockNotificationRepo.update.mockResolvedValue(undefined);
+      mockManager.update.mockResolvedValue({ affected: 1 });
+      mockCountersService.apply.mockResolvedValueOnce(0);
 
       const result = await service.markAsRead('n1');
       expect(result).toEqual(updated);
+      expect(mockManager.update).toHaveBeenCalledWith(Notification, { id: 'n1', read: false }, { read: true });
+      expect(mockCountersService.apply).toHaveBeenCalledWith(mockManager, 'u1', -1);
+      expect(mockEvents.publishReadChange).toHaveBeenCalledWith('u1', ['n1'], true, 0);
+    });
+
+    it('no debería descontar si la notificación ya estaba leída', async () => {
+      mockNotificationRepo.findOne.mockResolvedValue({ id: 'n1', user_id: 'u1', read: true });
+      mockManager.update.mockResolvedValue({ affected: 0 });
+
+      await service.markAsRead('n1');
+      expect(mockCountersService.apply).not.toHaveBeenCalled();
+      expect(mockEvents.publishReadChange).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('update', () => {
+    it('debería volver a sumar al contador una notificación marcada como no leída', async () => {
+      mockNotificationRepo.findOne.mockResolvedValue({ id: 'n1', user_id: 'u1', read: true });
+      mockManager.update.mockResolvedValue({ affected: 1 });
+
+      await service.update('n1', { message: 'Editada', read: false });
+      expect(mockManager.update).toHaveBeenCalledWith(Notification, 'n1', { message: 'Editada' });
+      expect(mockCountersService.apply).toHaveBeenCalledWith(mockManager, 'u1', 1);
+    });
+  });
+
+  describe('getUnreadCount', () => {
+    it('debería leer el contador del usuario', async () => {
+      mockCountersService.findOne.mockResolvedValue({ unread_count: 3, version: 7 });
+
+      await expect(service.getUnreadCount('u1')).resolves.toEqual({ unread_count: 3, version: 7 });
+      expect(mockNotificationRepo.find).not.toHaveBeenCalled();
     });
   });
 
   describe('markAllAsRead', () => {
     it('debería marcar todas las notificaciones de un usuario como leídas', async () => {
-      mockNotificationRepo.update.mockResolvedValue(undefined);
+      mockManager.update.mockResolvedValue({ affected: 4 });
+
       await expect(service.markAllAsRead('u1')).resolves.toBeUndefined();
+      expect(mockCountersService.apply).toHaveBeenCalledWith(mockManager, 'u1', -4);
     });
   });
 
   describe('remove', () => {
-    it('debería eliminar una notificación si existe', async () => {
-      mockNotificationRepo.delete.mockResolvedValue({ affected: 1 });
+    it('debería eliminar una notificación no leída y descontarla', async () => {
+      mockManager.createQueryBuilder.mockReturnValue(
+        mockDeleteBuilder({ affected: 1, raw: [{ user_id: 'u1', read: false }] }),
+      );
+
       await expect(service.remove('n1')).resolves.toBeUndefined();
+      expect(mockCountersService.apply).toHaveBeenCalledWith(mockManager, 'u1', -1);
+    });
+
+    it('no debería tocar el contador al eliminar una notificación leída', async () => {
+      mockManager.createQueryBuilder.mockReturnValue(
+        mockDeleteBuilder({ affected: 1, raw: [{ user_id: 'u1', read: true }] }),
+      );
+
+      await service.remove('n1');
+      expect(mockCountersService.apply).not.toHaveBeenCalled();
     });
 
     it('debería lanzar error si no se elimina ninguna notificación', async () => {
-      mockNotificationRepo.delete.mockResolvedValue({ affected: 0 });
+      mockManager.createQueryBuilder.mockReturnValue(mockDeleteBuilder({ affected: 0, raw: [] }));
       await expect(service.remove('n1')).rejects.toThrow(NotFoundException);
     });
   });
@@ -1,18 +1,117 @@
-import { Injectable, NotFoundException } from '@nestjs/common';
+import { Injectable, Logger, NotFoundException } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { EntityManager, Repository } from 'typeorm';
+import { randomUUID } from 'crypto';
 import { Notification } from '../../entities/notification.entity';
 import { User } from '../../entities/user.entity';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
 import { CreateNotificationDto } from './dto/create-notification.dto';
 import { UpdateNotificationDto } from './dto/update-notification.dto';
+import { NotificationCountersService, UnreadCount } from './notification-counters.service';
+import { NotificationEventsService } from './notification-events.service';
+import { BroadcastAudience, BroadcastNotificationDto } from './dto/broadcast-notification.dto';
+import { AUDIENCE_SQL, FIRST_UUID } from './broadcast-audience';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
+import { ExportSource, selectColumns, streamQuery } from '../../shared/export/export-stream';
+import {
+  BatchItemResult,
+  BatchResult,
+  batchCreated,
+  batchFailed,
+  findExistingIds,
+  toBatchResult,
+} from '../../shared/batch/batch';
+
+// Columnas de la exportación y la expresión SQL de cada una
+const NOTIFICATION_EXPORT_COLUMNS = {
+  id: 'notification.id',
+  message: 'notification.message',
+  read: 'notification.read',
+  notification_date: 'notification.notification_date',
+  user_id: 'notification.user_id',
+  user_email: 'user.email',
+};
+
+export type BroadcastStatus = 'running' | 'completed' | 'failed';
+
+export interface BroadcastJob {
+  id: string;
+  audience: BroadcastAudience;
+  target_id: string | null;
+  requested_by: string;
+  status: BroadcastStatus;
+  total: number;
+  inserted: number;
+  started_at: Date;
+  finished_at: Date | null;
+  error: string | null;
+}
+
+// Destinatarios por sentencia INSERT ... SELECT del broadcast
+export const BROADCAST_CHUNK_SIZE = 5000;
+
+// Trabajos que se conservan en memoria para consultar su progreso
+const MAX_BROADCAST_JOBS = 100;
+
+// Inserta la notificación para el siguiente tramo de destinatarios (por
+// user_id), suma una no leída a sus contadores y devuelve cuántos fueron y
+// el último, para continuar desde ahí
+function broadcastChunkSql(audienceSql: string, nextParameter: number): string {
+  return `
+    WITH recipients AS (
+      ${audienceSql}
+      ORDER BY user_id
+      LIMIT $${nextParameter}
+    ), inserted AS (
+      INSERT INTO notifications (user_id, message)
+      SELECT user_id, $${nextParameter + 1} FROM recipients
+    ), counted AS (
+      INSERT INTO notification_counters (user_id, unread_count, version, updated_at)
+      SELECT user_id, 1, 1, now() FROM recipients
+      ON CONFLICT (user_id) DO UPDATE SET
+        unread_count = notification_counters.unread_count + 1,
+        version = notification_counters.version + 1,
+        updated_at = now()
+    )
+    SELECT count(*)::int AS inserted, max(user_id::text) AS last_user_id FROM recipients`;
+}
+
+// Fundación o acción social de la audiencia; solo se envía como $2 si la consulta la usa
+function broadcastTargetId(broadcastDto: BroadcastNotificationDto): string | null {
+  switch (broadcastDto.audience) {
+    case BroadcastAudience.FOUNDATION_DONORS:
+      return broadcastDto.foundation_id;
+    case BroadcastAudience.SOCIAL_ACTION_PARTICIPANTS:
+      return broadcastDto.social_action_id;
+    default:
+      return null;
+  }
+}
+
+// No leídas por usuario de un lote recién insertado
+function unreadPerUser(notifications: Notification[]): Map<string, number> {
+  const deltas = new Map<string, number>();
+  for (const notification of notifications) {
+    if (!notification.read) {
+      deltas.set(notification.user_id, (deltas.get(notification.user_id) ?? 0) + 1);
+    }
+  }
+  return deltas;
+}
 
 @Injectable()
 export class NotificationsService {
+  private readonly logger = new Logger(NotificationsService.name);
+  private readonly broadcasts = new Map<string, BroadcastJob>();
+
   constructor(
     @InjectRepository(Notification)
     private notificationsRepository: Repository<Notification>,
     @InjectRepository(User)
     private usersRepository: Repository<User>,
+    private countersService: NotificationCountersService,
+    private events: NotificationEventsService,
   ) {}
 
   async create(createNotificationDto: CreateNotificationDto): Promise<Notification> {
@@ -25,16 +124,198 @@ export class NotificationsService {
       throw new NotFoundException(`User with ID "${createNotificationDto.user_id}" not found`);
     }
 
-    // Crear y guardar la nueva notificación
-    const newNotification = this.notificationsRepository.create(createNotificationDto);
-    return this.notificationsRepository.save(newNotification);
+    // Crear y guardar la nueva notificación junto con su contador
+    const unreadCounts = new Map<string, number>();
+    const newNotification = await this.notificationsRepository.manager.transaction(async (manager) => {
+      const saved = await manager.save(manager.create(Notification, createNotificationDto));
+      if (!saved.read) {
+        unreadCounts.set(saved.user_id, await this.countersService.apply(manager, saved.user_id, 1));
+      }
+      return saved;
+    });
+
+    // Los eventos salen después del commit, cuando la notificación ya es visible
+    this.events.publishCreated([newNotification], unreadCounts);
+    return newNotification;
   }
 
-  async findAll(): Promise<Notification[]> {
-    return this.notificationsRepository.find({
-      relations: ['user'],
-      order: { notification_date: 'DESC' },
+  // Crea varias notificaciones en una transacción: una consulta IN (...) para
+  // validar los usuarios y un único INSERT multi-fila para las válidas
+  async createMany(items: CreateNotificationDto[]): Promise<BatchResult<Notification>> {
+    let created: Notification[] = [];
+    let unreadCounts = new Map<string, number>();
+    const result = await this.notificationsRepository.manager.transaction(async (manager) => {
+      const userIds = await findExistingIds(manager, User, items.map((item) => item.user_id));
+
+      const results: BatchItemResult<Notification>[] = [];
+      const accepted: number[] = [];
+      items.forEach((item, index) => {
+        if (userIds.has(item.user_id)) {
+          accepted.push(index);
+        } else {
+          results.push(batchFailed(index, new NotFoundException(`User with ID "${item.user_id}" not found`)));
+        }
+      });
+
+      const newNotifications = accepted.map((index) => manager.create(Notification, items[index]));
+      if (newNotifications.length) {
+        await manager.insert(Notification, newNotifications);
+        unreadCounts = await this.countersService.applyMany(manager, unreadPerUser(newNotifications));
+      }
+      accepted.forEach((index, position) => results.push(batchCreated(index, newNotifications[position])));
+
+      created = newNotifications;
+      return toBatchResult(results);
     });
+
+    this.events.publishCreated(created, unreadCounts);
+    return result;
+  }
+
+  // Usuario dueño de la fundación a cuya audiencia apunta el broadcast
+  // (null para todos los usuarios); lanza NotFound si el destino no existe
+  async getBroadcastOwnerId(broadcastDto: BroadcastNotificationDto): Promise<string | null> {
+    const manager = this.notificationsRepository.manager;
+
+    if (broadcastDto.audience === BroadcastAudience.FOUNDATION_DONORS) {
+      const foundation = await manager.findOne(Foundation, { where: { id: broadcastDto.foundation_id } });
+      if (!foundation) {
+        throw new NotFoundException(`Foundation with ID "${broadcastDto.foundation_id}" not found`);
+      }
+      return foundation.user_id;
+    }
+
+    if (broadcastDto.audience === BroadcastAudience.SOCIAL_ACTION_PARTICIPANTS) {
+      const socialAction = await manager.findOne(SocialAction, {
+        where: { id: broadcastDto.social_action_id },
+        relations: ['foundation'],
+      });
+      if (!socialAction) {
+        throw new NotFoundException(`Social Action with ID "${broadcastDto.social_action_id}" not found`);
+      }
+      return socialAction.foundation?.user_id ?? null;
+    }
+
+    return null;
+  }
+
+  /**
+   * Envía la misma notificación a toda una audiencia en segundo plano.
+   *
+   * Cuenta los destinatarios, registra el trabajo y lo devuelve de inmediato;
+   * las notificaciones se insertan por tramos de BROADCAST_CHUNK_SIZE con
+   * INSERT ... SELECT, sin traer los usuarios a la aplicación. Cada tramo se
+   * confirma por separado, así el progreso es visible en getBroadcast().
+   */
+  async broadcast(broadcastDto: BroadcastNotificationDto, requestedBy: string): Promise<BroadcastJob> {
+    const targetId = broadcastTargetId(broadcastDto);
+    const targetParameters = targetId ? [targetId] : [];
+    const audienceSql = AUDIENCE_SQL[broadcastDto.audience];
+
+    const [{ total }] = await this.notificationsRepository.manager.query(
+      `SELECT count(*)::int AS total FROM (${audienceSql}) audience`,
+      [FIRST_UUID, ...targetParameters],
+    );
+
+    const job: BroadcastJob = {
+      id: randomUUID(),
+      audience: broadcastDto.audience,
+      target_id: targetId,
+      requested_by: requestedBy,
+      status: 'running',
+      total,
+      inserted: 0,
+      started_at: new Date(),
+      finished_at: null,
+      error: null,
+    };
+    this.rememberBroadcast(job);
+
+    void this.runBroadcast(job, audienceSql, targetParameters, broadcastDto.message);
+    return { ...job };
+  }
+
+  getBroadcast(id: string): BroadcastJob {
+    const job = this.broadcasts.get(id);
+
+    if (!job) {
+      throw new NotFoundException(`Broadcast with ID "${id}" not found`);
+    }
+
+    return { ...job };
+  }
+
+  private async runBroadcast(
+    job: BroadcastJob,
+    audienceSql: string,
+    targetParameters: string[],
+    message: string,
+  ): Promise<void> {
+    const sql = broadcastChunkSql(audienceSql, targetParameters.length + 2);
+    let lastUserId = FIRST_UUID;
+
+    try {
+      for (;;) {
+        const [chunk] = await this.notificationsRepository.manager.query(sql, [
+          lastUserId,
+          ...targetParameters,
+          BROADCAST_CHUNK_SIZE,
+          message,
+        ]);
+        job.inserted += chunk.inserted;
+        if (chunk.inserted > 0) {
+          this.events.publishBroadcastChunk(job.audience, job.target_id, lastUserId, chunk.last_user_id, message);
+        }
+        if (chunk.inserted < BROADCAST_CHUNK_SIZE) {
+          break;
+        }
+        lastUserId = chunk.last_user_id;
+      }
+      job.status = 'completed';
+      this.logger.log(`Broadcast ${job.id} (${job.audience}) sent ${job.inserted} notifications`);
+    } catch (error) {
+      job.status = 'failed';
+      job.error = error.message;
+      this.logger.error(`Broadcast ${job.id} failed after ${job.inserted} notifications: ${error.message}`);
+    } finally {
+      job.finished_at = new Date();
+    }
+  }
+
+  // Descarta los trabajos terminados más antiguos; los que siguen en curso se conservan
+  private rememberBroadcast(job: BroadcastJob): void {
+    this.broadcasts.set(job.id, job);
+    for (const [id, stored] of this.broadcasts) {
+      if (this.broadcasts.size <= MAX_BROADCAST_JOBS) {
+        break;
+      }
+      if (stored.status !== 'running') {
+        this.broadcasts.delete(id);
+      }
+    }
+  }
+
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<Notification>> {
+    const query = this.notificationsRepository
+      .createQueryBuilder('notification')
+      .leftJoinAndSelect('notification.user', 'user');
+
+    return paginateByCursor(query, 'notification_date', page);
+  }
+
+  // Filas planas para la exportación, sin hidratar entidades
+  exportAll(): ExportSource {
+    const query = selectColumns(
+      this.notificationsRepository
+        .createQueryBuilder('notification')
+        .leftJoin('notification.user', 'user'),
+      NOTIFICATION_EXPORT_COLUMNS,
+    ).orderBy('notification.notification_date', 'DESC');
+
+    return {
+      columns: Object.keys(NOTIFICATION_EXPORT_COLUMNS),
+      rows: streamQuery(this.notificationsRepository.manager, query),
+    };
   }
 
   async findOne(id: string): Promise<Notification> {
@@ -50,55 +331,109 @@ export class NotificationsService {
     return notification;
   }
 
-  async findByUser(userId: string): Promise<Notification[]> {
-    return this.notificationsRepository.find({
-      where: { user_id: userId },
-      order: { notification_date: 'DESC' },
-    });
+  // Las listas por usuario recorren IDX_notifications_user_date (o su parcial
+  // de no leídas) en el orden de la paginación
+  async findByUser(userId: string, page: CursorPaginationDto = {}): Promise<CursorPage<Notification>> {
+    const query = this.notificationsRepository
+      .createQueryBuilder('notification')
+      .where('notification.user_id = :userId', { userId });
+
+    return paginateByCursor(query, 'notification_date', page);
   }
 
-  async findUnreadByUser(userId: string): Promise<Notification[]> {
-    return this.notificationsRepository.find({
-      where: { 
-        user_id: userId,
-        read: false
-      },
-      order: { notification_date: 'DESC' },
-    });
+  async findUnreadByUser(userId: string, page: CursorPaginationDto = {}): Promise<CursorPage<Notification>> {
+    const query = this.notificationsRepository
+      .createQueryBuilder('notification')
+      .where('notification.user_id = :userId', { userId })
+      .andWhere('notification.read = false');
+
+    return paginateByCursor(query, 'notification_date', page);
+  }
+
+  // Lectura O(1) del contador para el badge, sin tocar la tabla de notificaciones
+  async getUnreadCount(userId: string): Promise<UnreadCount> {
+    return this.countersService.findOne(userId);
   }
 
   async markAsRead(id: string): Promise<Notification> {
     const notification = await this.findOne(id);
     
     // Marcar como leída
-    await this.notificationsRepository.update(id, { read: true });
+    const unreadCount = await this.notificationsRepository.manager.transaction((manager) =>
+      this.setRead(manager, notification, true),
+    );
+    if (unreadCount !== null) {
+      this.events.publishReadChange(notification.user_id, [id], true, unreadCount);
+    }
     
     // Devolver la notificación actualizada
     return this.findOne(id);
   }
 
   async markAllAsRead(userId: string): Promise<void> {
-    await this.notificationsRepository.update(
-      { user_id: userId, read: false },
-      { read: true }
-    );
+    const unreadCount = await this.notificationsRepository.manager.transaction(async (manager) => {
+      const result = await manager.update(
+        Notification,
+        { user_id: userId, read: false },
+        { read: true }
+      );
+      return this.countersService.apply(manager, userId, -(result.affected ?? 0));
+    });
+    if (unreadCount !== null) {
+      this.events.publishReadChange(userId, null, true, unreadCount);
+    }
   }
 
   async update(id: string, updateNotificationDto: UpdateNotificationDto): Promise<Notification> {
     const notification = await this.findOne(id);
+    const { read, ...changes } = updateNotificationDto;
     
-    // Actualizar la notificación
-    await this.notificationsRepository.update(id, updateNotificationDto);
+    // Actualizar la notificación; el cambio de leída pasa por el contador
+    const unreadCount = await this.notificationsRepository.manager.transaction(async (manager) => {
+      if (Object.keys(changes).length) {
+        await manager.update(Notification, id, changes);
+      }
+      return read !== undefined ? this.setRead(manager, notification, read) : null;
+    });
+    if (unreadCount !== null) {
+      this.events.publishReadChange(notification.user_id, [id], read, unreadCount);
+    }
     
     // Devolver la notificación actualizada
     return this.findOne(id);
   }
 
   async remove(id: string): Promise<void> {
-    const result = await this.notificationsRepository.delete(id);
-    
-    if (result.affected === 0) {
-      throw new NotFoundException(`Notification with ID "${id}" not found`);
+    const deleted = await this.notificationsRepository.manager.transaction(async (manager) => {
+      // RETURNING indica si la fila borrada seguía sin leer
+      const result = await manager
+        .createQueryBuilder()
+        .delete()
+        .from(Notification)
+        .where('id = :id', { id })
+        .returning(['user_id', 'read'])
+        .execute();
+
+      if (result.affected === 0) {
+        throw new NotFoundException(`Notification with ID "${id}" not found`);
+      }
+
+      const [row] = result.raw;
+      const unreadCount = row.read ? null : await this.countersService.apply(manager, row.user_id, -1);
+      return { userId: row.user_id as string, unreadCount };
+    });
+
+    this.events.publishRemoved(deleted.userId, id, deleted.unreadCount);
+  }
+
+  // El UPDATE condicionado al valor contrario de `read` solo afecta a la fila si
+  // realmente cambia, así dos peticiones simultáneas no descuentan dos veces.
+  // Devuelve el nuevo contador, o null si la notificación ya estaba así
+  private async setRead(manager: EntityManager, notification: Notification, read: boolean): Promise<number | null> {
+    const result = await manager.update(Notification, { id: notification.id, read: !read }, { read });
+    if (!result.affected) {
+      return null;
     }
+    return this.countersService.apply(manager, notification.user_id, read ? -1 : 1);
   }
 }
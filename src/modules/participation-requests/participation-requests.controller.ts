@@ -14,6 +14,7 @@ import {
   Req,
   ForbiddenException,
   Query,
+  Res,
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { ParticipationRequestsService } from './participation-requests.service';
@@ -21,6 +22,7 @@ import { CreateParticipationRequestDto } from './dto/create-participation-reques
 import { UpdateParticipationRequestDto } from './dto/update-participation-request.dto';
 import { ParticipationRequest, RequestStatus } from '../../entities/participation_request.entity';
 import { UserType } from '../../entities/user.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
 
 @Controller()
 export class ParticipationRequestsController {
@@ -100,10 +102,14 @@ export class ParticipationRequestsController {
   // Lista todas las solicitudes (para administradores)
   @UseGuards(JwtAuthGuard)
   @Get('participation-requests')
-  async findAll(@Req() req): Promise<ParticipationRequest[]> {
+  async findAll(
+    @Req() req,
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<ParticipationRequest[]> {
     // Cualquier tipo de admin o las fundaciones pueden ver todas las solicitudes
     if (this.hasReadAccess(req) || req.user.user_type === UserType.FOUNDATION) {
-      return this.participationRequestsService.findAll();
+      return sendPage(res, await this.participationRequestsService.findAll(page));
     }
     
     throw new ForbiddenException('Only foundations and admins can view all participation requests');
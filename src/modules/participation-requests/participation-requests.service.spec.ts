@@ -8,6 +8,8 @@ import { SocialAction } from '../../entities/social_action.entity';
 import { Foundation } from '../../entities/foundation.entity';
 import { NotificationsService } from '../notifications/notifications.service';
 import { NotFoundException, ConflictException, ForbiddenException } from '@nestjs/common';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
 
 describe('ParticipationRequestsService', () => {
   let service: ParticipationRequestsService;
@@ -24,6 +26,7 @@ describe('ParticipationRequestsService', () => {
     save: jest.fn(),
     update: jest.fn(),
     delete: jest.fn(),
+    createQueryBuilder: jest.fn(),
   };
 
   const mockUserRepo = {
@@ -40,6 +43,18 @@ describe('ParticipationRequestsService', () => {
     create: jest.fn(),
   };
 
+  const loaders = {
+    users: { load: jest.fn() },
+    socialActions: { load: jest.fn() },
+    foundations: { load: jest.fn() },
+  };
+
+  const mockEntityLoaders = {
+    users: () => loaders.users,
+    socialActions: () => loaders.socialActions,
+    foundations: () => loaders.foundations,
+  };
+
   beforeEach(async () => {
     const module: TestingModule = await Test.createTestingModule({
       providers: [
@@ -49,6 +64,7 @@ describe('ParticipationRequestsService', () => {
         { provide: getRepositoryToken(SocialAction), useValue: mockSocialActionRepo },
         { provide: getRepositoryToken(Foundation), useValue: mockFoundationRepo },
         { provide: NotificationsService, useValue: mockNotificationsService },
+        { provide: EntityLoaders, useValue: mockEntityLoaders },
       ],
     }).compile();
 
@@ -101,11 +117,11 @@ describe('ParticipationRequestsService', () => {
   });
 
   describe('findAll', () => {
-    it('debería retornar todas las solicitudes', async () => {
+    it('debería retornar la primera página de solicitudes', async () => {
       const requests = [{ id: 'r1' }];
-      mockRequestRepo.find.mockResolvedValue(requests);
+      mockRequestRepo.createQueryBuilder.mockReturnValue(mockQueryBuilder('request', requests));
       const result = await service.findAll();
-      expect(result).toEqual(requests);
+      expect(result).toEqual({ items: requests, next_cursor: null });
     });
   });
 
@@ -159,8 +175,8 @@ describe('ParticipationRequestsService', () => {
       mockRequestRepo.findOne
         .mockResolvedValueOnce(request) // first findOne
         .mockResolvedValueOnce({ ...request, status: RequestStatus.ACCEPTED }); // after update
-      mockUserRepo.findOne.mockResolvedValue(user);
-      mockSocialActionRepo.findOne.mockResolvedValue(socialAction);
+      loaders.users.load.mockResolvedValue(user);
+      loaders.socialActions.load.mockResolvedValue(socialAction);
       mockRequestRepo.update.mockResolvedValue(undefined);
 
       const result = await service.update('r1', { status: RequestStatus.ACCEPTED });
@@ -196,21 +212,28 @@ describe('ParticipationRequestsService', () => {
   });
 
   describe('checkFoundationOwnership', () => {
+    it('debería lanzar error si la acción social no existe', async () => {
+      loaders.socialActions.load.mockResolvedValue(null);
+      await expect(service.checkFoundationOwnership('s1', 'u1')).rejects.toThrow(NotFoundException);
+    });
+
     it('debería lanzar error si no hay fundación asociada', async () => {
-      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1', foundation: null });
+      loaders.socialActions.load.mockResolvedValue({ id: 's1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue(null);
       await expect(service.checkFoundationOwnership('s1', 'u1')).rejects.toThrow(ForbiddenException);
     });
 
     it('debería lanzar error si el usuario no es el dueño', async () => {
-      const action = { foundation: { user: { id: 'otro' } } };
-      mockSocialActionRepo.findOne.mockResolvedValue(action);
+      loaders.socialActions.load.mockResolvedValue({ id: 's1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'otro' });
       await expect(service.checkFoundationOwnership('s1', 'u1')).rejects.toThrow(ForbiddenException);
     });
 
     it('no debería lanzar error si el usuario es dueño', async () => {
-      const action = { foundation: { user: { id: 'u1' } } };
-      mockSocialActionRepo.findOne.mockResolvedValue(action);
+      loaders.socialActions.load.mockResolvedValue({ id: 's1', foundation_id: 'f1' });
+      loaders.foundations.load.mockResolvedValue({ id: 'f1', user_id: 'u1' });
       await expect(service.checkFoundationOwnership('s1', 'u1')).resolves.toBeUndefined();
+      expect(loaders.foundations.load).toHaveBeenCalledWith('f1');
     });
   });
 });
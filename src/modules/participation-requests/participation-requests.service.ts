@@ -8,7 +8,9 @@ import { SocialAction } from '../../entities/social_action.entity';
 import { Foundation } from '../../entities/foundation.entity';
 import { CreateParticipationRequestDto } from './dto/create-participation-request.dto';
 import { UpdateParticipationRequestDto } from './dto/update-participation-request.dto';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
 import { NotificationsService } from '../notifications/notifications.service';
+import { EntityLoaders } from '../../shared/loaders/entity-loaders';
 
 @Injectable()
 export class ParticipationRequestsService {
@@ -22,6 +24,7 @@ export class ParticipationRequestsService {
     @InjectRepository(Foundation)
     private foundationsRepository: Repository<Foundation>,
     private notificationsService: NotificationsService,
+    private readonly loaders: EntityLoaders,
   ) {}
 
   async create(createParticipationRequestDto: CreateParticipationRequestDto): Promise<ParticipationRequest> {
@@ -79,11 +82,14 @@ export class ParticipationRequestsService {
     return savedRequest;
   }
 
-  async findAll(): Promise<ParticipationRequest[]> {
-    return this.participationRequestsRepository.find({
-      relations: ['user', 'social_action', 'social_action.foundation'],
-      order: { request_date: 'DESC' },
-    });
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<ParticipationRequest>> {
+    const query = this.participationRequestsRepository
+      .createQueryBuilder('request')
+      .leftJoinAndSelect('request.user', 'user')
+      .leftJoinAndSelect('request.social_action', 'social_action')
+      .leftJoinAndSelect('social_action.foundation', 'foundation');
+
+    return paginateByCursor(query, 'request_date', page);
   }
 
   async findOne(id: string): Promise<ParticipationRequest> {
@@ -155,13 +161,10 @@ export class ParticipationRequestsService {
     
     // Si el estado está cambiando, enviar notificación al usuario
     if (request.status !== updateParticipationRequestDto.status) {
-      const user = await this.usersRepository.findOne({
-        where: { id: request.user_id },
-      });
-      
-      const socialAction = await this.socialActionsRepository.findOne({
-        where: { id: request.social_action_id },
-      });
+      const [user, socialAction] = await Promise.all([
+        this.loaders.users().load(request.user_id),
+        this.loaders.socialActions().load(request.social_action_id),
+      ]);
       
       if (user && socialAction) {
         let message = '';
@@ -211,14 +214,20 @@ export class ParticipationRequestsService {
 
   // Método para verificar que un usuario (fundación) sea propietario de una acción social
   async checkFoundationOwnership(socialActionId: string, userId: string): Promise<void> {
-    const socialAction = await this.getSocialAction(socialActionId);
+    // Sin relaciones: basta con el foundation_id de la acción y el user_id de la fundación
+    const socialAction = await this.loaders.socialActions().load(socialActionId);
+
+    if (!socialAction) {
+      throw new NotFoundException(`Social Action with ID "${socialActionId}" not found`);
+    }
     
     // Verificar que la fundación sea propietaria
-    if (!socialAction.foundation || !socialAction.foundation.user) {
+    const foundation = await this.loaders.foundations().load(socialAction.foundation_id);
+    if (!foundation) {
       throw new ForbiddenException('This social action is not associated with a foundation');
     }
     
-    if (socialAction.foundation.user.id !== userId) {
+    if (foundation.user_id !== userId) {
       throw new ForbiddenException('You are not authorized to manage this social action');
     }
   }
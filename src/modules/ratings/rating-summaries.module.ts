@@ -0,0 +1,13 @@
+import { Module } from '@nestjs/common';
+import { TypeOrmModule } from '@nestjs/typeorm';
+import { Rating } from '../../entities/rating.entity';
+import { RatingSummary } from '../../entities/rating_summary.entity';
+import { RatingSummariesService } from './rating-summaries.service';
+
+// Separado de RatingsModule para que UsersModule lo use sin una dependencia circular
+@Module({
+  imports: [TypeOrmModule.forFeature([Rating, RatingSummary])],
+  providers: [RatingSummariesService],
+  exports: [RatingSummariesService],
+})
+export class RatingSummariesModule {}
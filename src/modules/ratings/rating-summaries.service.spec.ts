@@ -0,0 +1,112 @@
+import { Test, TestingModule } from '@nestjs/testing';
+import { getRepositoryToken } from '@nestjs/typeorm';
+import { Rating } from '../../entities/rating.entity';
+import { RatingSummary, RatingTargetType } from '../../entities/rating_summary.entity';
+import { RatingSummariesService } from './rating-summaries.service';
+
+describe('RatingSummariesService', () => {
+  let service: RatingSummariesService;
+
+  const mockManager = {
+    query: jest.fn(),
+  };
+
+  const mockSummaryRepo = {
+    findOne: jest.fn(),
+    exists: jest.fn(),
+    count: jest.fn(),
+    manager: {
+      transaction: jest.fn((work) => work(mockManager)),
+    },
+  };
+
+  const mockRatingRepo = {
+    exists: jest.fn(),
+  };
+
+  beforeEach(async () => {
+    const module: TestingModule = await Test.createTestingModule({
+      providers: [
+        RatingSummariesService,
+        { provide: getRepositoryToken(RatingSummary), useValue: mockSummaryRepo },
+        { provide: getRepositoryToken(Rating), useValue: mockRatingRepo },
+      ],
+    }).compile();
+
+    service = module.get<RatingSummariesService>(RatingSummariesService);
+  });
+
+  afterEach(() => jest.clearAllMocks());
+
+  describe('onModuleInit', () => {
+    it('debería reconstruir los resúmenes si hay calificaciones sin resumir', async () => {
+      mockSummaryRepo.exists.mockResolvedValue(false);
+      mockRatingRepo.exists.mockResolvedValue(true);
+      mockSummaryRepo.count.mockResolvedValue(3);
+
+      await service.onModuleInit();
+      expect(mockManager.query).toHaveBeenCalledWith('DELETE FROM rating_summaries');
+      expect(mockManager.query).toHaveBeenCalledTimes(2);
+    });
+
+    it('no debería reconstruir si ya existen resúmenes', async () => {
+      mockSummaryRepo.exists.mockResolvedValue(true);
+
+      await service.onModuleInit();
+      expect(mockSummaryRepo.manager.transaction).not.toHaveBeenCalled();
+    });
+
+    it('no debería reconstruir si no hay calificaciones', async () => {
+      mockSummaryRepo.exists.mockResolvedValue(false);
+      mockRatingRepo.exists.mockResolvedValue(false);
+
+      await service.onModuleInit();
+      expect(mockSummaryRepo.manager.transaction).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('apply', () => {
+    it('debería sumar la calificación al resumen de la acción social', async () => {
+      await service.apply(mockManager as any, { social_action_id: 's1', rating: 3 }, 1);
+      expect(mockManager.query).toHaveBeenCalledWith(expect.stringContaining('ON CONFLICT'), [
+        'social_action', 's1', 1, 3, 0, 0, 1, 0, 0,
+      ]);
+    });
+
+    it('no debería hacer nada si la calificación no tiene destino', async () => {
+      await service.apply(mockManager as any, { rating: 3 }, 1);
+      expect(mockManager.query).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('subtractUserRatings', () => {
+    it('debería descontar las calificaciones del usuario de cada resumen', async () => {
+      await service.subtractUserRatings(mockManager as any, 'u1');
+      expect(mockManager.query).toHaveBeenCalledWith(expect.stringContaining('FOR UPDATE'), ['u1']);
+      expect(mockManager.query).toHaveBeenCalledWith(
+        expect.stringContaining('rating_count = rating_summaries.rating_count - removed.rating_count'),
+        ['u1'],
+      );
+    });
+  });
+
+  describe('toView', () => {
+    it('debería devolver ceros si no hay resumen', () => {
+      const view = service.toView(RatingTargetType.DONATION, 'd1', null);
+      expect(view).toEqual({
+        target_type: 'donation',
+        target_id: 'd1',
+        count: 0,
+        average: 0,
+        histogram: { 1: 0, 2: 0, 3: 0, 4: 0, 5: 0 },
+      });
+    });
+  });
+
+  describe('rebuild', () => {
+    it('debería devolver la cantidad de destinos resumidos', async () => {
+      mockSummaryRepo.count.mockResolvedValue(7);
+      await expect(service.rebuild()).resolves.toBe(7);
+    });
+  });
+});
@@ -0,0 +1,161 @@
+// src/modules/ratings/rating-summaries.service.ts
+import { Injectable, Logger, OnModuleInit } from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { EntityManager, Repository } from 'typeorm';
+import { Rating } from '../../entities/rating.entity';
+import { RatingSummary, RatingTargetType } from '../../entities/rating_summary.entity';
+
+export interface RatingSummaryView {
+  target_type: RatingTargetType;
+  target_id: string;
+  count: number;
+  average: number;
+  histogram: Record<number, number>;
+}
+
+const RATING_VALUES = [1, 2, 3, 4, 5];
+
+// Suma (o resta) una calificación al resumen de su destino en una sola sentencia,
+// así dos calificaciones simultáneas no pisan el contador
+const APPLY_DELTA_SQL = `
+  INSERT INTO rating_summaries
+    (target_type, target_id, rating_count, rating_sum, count_1, count_2, count_3, count_4, count_5, updated_at)
+  VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, now())
+  ON CONFLICT (target_type, target_id) DO UPDATE SET
+    rating_count = rating_summaries.rating_count + EXCLUDED.rating_count,
+    rating_sum = rating_summaries.rating_sum + EXCLUDED.rating_sum,
+    count_1 = rating_summaries.count_1 + EXCLUDED.count_1,
+    count_2 = rating_summaries.count_2 + EXCLUDED.count_2,
+    count_3 = rating_summaries.count_3 + EXCLUDED.count_3,
+    count_4 = rating_summaries.count_4 + EXCLUDED.count_4,
+    count_5 = rating_summaries.count_5 + EXCLUDED.count_5,
+    updated_at = now()`;
+
+// Columnas del resumen agrupadas por destino; va seguido de FROM ... GROUP BY 1, 2
+const SUMMARY_SELECT = `
+  SELECT
+    CASE WHEN donation_id IS NOT NULL THEN '${RatingTargetType.DONATION}' ELSE '${RatingTargetType.SOCIAL_ACTION}' END AS target_type,
+    COALESCE(donation_id, social_action_id) AS target_id,
+    COUNT(*) AS rating_count,
+    SUM(rating) AS rating_sum,
+    COUNT(*) FILTER (WHERE rating = 1) AS count_1,
+    COUNT(*) FILTER (WHERE rating = 2) AS count_2,
+    COUNT(*) FILTER (WHERE rating = 3) AS count_3,
+    COUNT(*) FILTER (WHERE rating = 4) AS count_4,
+    COUNT(*) FILTER (WHERE rating = 5) AS count_5`;
+
+// Recalcula todos los resúmenes a partir de la tabla de calificaciones
+const REBUILD_SQL = `
+  INSERT INTO rating_summaries
+    (target_type, target_id, rating_count, rating_sum, count_1, count_2, count_3, count_4, count_5)
+  ${SUMMARY_SELECT}
+  FROM ratings
+  WHERE donation_id IS NOT NULL OR social_action_id IS NOT NULL
+  GROUP BY 1, 2`;
+
+// Resta de cada resumen las calificaciones de un usuario. Las filas se bloquean
+// primero para que una edición simultánea no cambie el valor que se descuenta
+const SUBTRACT_USER_RATINGS_SQL = `
+  WITH locked AS (
+    SELECT donation_id, social_action_id, rating
+    FROM ratings
+    WHERE user_id = $1 AND (donation_id IS NOT NULL OR social_action_id IS NOT NULL)
+    FOR UPDATE
+  ), removed AS (
+    ${SUMMARY_SELECT}
+    FROM locked
+    GROUP BY 1, 2
+  )
+  UPDATE rating_summaries SET
+    rating_count = rating_summaries.rating_count - removed.rating_count,
+    rating_sum = rating_summaries.rating_sum - removed.rating_sum,
+    count_1 = rating_summaries.count_1 - removed.count_1,
+    count_2 = rating_summaries.count_2 - removed.count_2,
+    count_3 = rating_summaries.count_3 - removed.count_3,
+    count_4 = rating_summaries.count_4 - removed.count_4,
+    count_5 = rating_summaries.count_5 - removed.count_5,
+    updated_at = now()
+  FROM removed
+  WHERE rating_summaries.target_type = removed.target_type
+    AND rating_summaries.target_id = removed.target_id`;
+
+@Injectable()
+export class RatingSummariesService implements OnModuleInit {
+  private readonly logger = new Logger(RatingSummariesService.name);
+
+  constructor(
+    @InjectRepository(RatingSummary)
+    private summariesRepository: Repository<RatingSummary>,
+    @InjectRepository(Rating)
+    private ratingsRepository: Repository<Rating>,
+  ) {}
+
+  // La migración RatingSummaries crea y carga la tabla; las calificaciones
+  // cargadas directo en la base sin resúmenes (synchronize) se resumen al arrancar
+  async onModuleInit(): Promise<void> {
+    const hasSummaries = await this.summariesRepository.exists();
+    if (!hasSummaries && (await this.ratingsRepository.exists())) {
+      const targets = await this.rebuild();
+      this.logger.log(`Rating summaries rebuilt for ${targets} targets`);
+    }
+  }
+
+  // Aplica una calificación al resumen: sign = 1 al crearla, -1 al eliminarla
+  async apply(
+    manager: EntityManager,
+    rating: Pick<Rating, 'donation_id' | 'social_action_id' | 'rating'>,
+    sign: 1 | -1,
+  ): Promise<void> {
+    const targetType = rating.donation_id ? RatingTargetType.DONATION : RatingTargetType.SOCIAL_ACTION;
+    const targetId = rating.donation_id ?? rating.social_action_id;
+    if (!targetId) {
+      return;
+    }
+
+    const histogram = RATING_VALUES.map((value) => (value === rating.rating ? sign : 0));
+    await manager.query(APPLY_DELTA_SQL, [
+      targetType,
+      targetId,
+      sign,
+      sign * rating.rating,
+      ...histogram,
+    ]);
+  }
+
+  // Al eliminar un usuario, el ON DELETE CASCADE borra sus calificaciones sin
+  // pasar por RatingsService: se descuentan antes, en la transacción del borrado
+  async subtractUserRatings(manager: EntityManager, userId: string): Promise<void> {
+    await manager.query(SUBTRACT_USER_RATINGS_SQL, [userId]);
+  }
+
+  async findOne(targetType: RatingTargetType, targetId: string): Promise<RatingSummary | null> {
+    return this.summariesRepository.findOne({
+      where: { target_type: targetType, target_id: targetId },
+    });
+  }
+
+  toView(targetType: RatingTargetType, targetId: string, summary: RatingSummary | null): RatingSummaryView {
+    const count = summary?.rating_count ?? 0;
+    const histogram: Record<number, number> = {};
+    for (const value of RATING_VALUES) {
+      histogram[value] = summary?.[`count_${value}`] ?? 0;
+    }
+
+    return {
+      target_type: targetType,
+      target_id: targetId,
+      count,
+      average: count > 0 ? summary.rating_sum / count : 0,
+      histogram,
+    };
+  }
+
+  // Vuelve a calcular todos los resúmenes; devuelve cuántos destinos tienen calificaciones
+  async rebuild(): Promise<number> {
+    await this.summariesRepository.manager.transaction(async (manager) => {
+      await manager.query('DELETE FROM rating_summaries');
+      await manager.query(REBUILD_SQL);
+    });
+    return this.summariesRepository.count();
+  }
+}
@@ -13,12 +13,16 @@ import {
   UseGuards,
   Req,
   ForbiddenException,
+  Query,
+  Res,
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { RatingsService } from './ratings.service';
 import { CreateRatingDto } from './dto/create-rating.dto';
 import { UpdateRatingDto } from './dto/update-rating.dto';
 import { Rating } from '../../entities/rating.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
+import { RatingSummaryView } from './rating-summaries.service';
 
 @Controller('ratings')
 export class RatingsController {
@@ -77,8 +81,11 @@ export class RatingsController {
 
   // Las consultas de calificaciones pueden ser públicas
   @Get()
-  findAll(): Promise<Rating[]> {
-    return this.ratingsService.findAll();
+  async findAll(
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Rating[]> {
+    return sendPage(res, await this.ratingsService.findAll(page));
   }
 
   @Get('user/:userId')
@@ -96,6 +103,11 @@ export class RatingsController {
     return this.ratingsService.getAverageForDonation(donationId);
   }
 
+  @Get('donation/:donationId/summary')
+  getSummaryForDonation(@Param('donationId', ParseUUIDPipe) donationId: string): Promise<RatingSummaryView> {
+    return this.ratingsService.getSummaryForDonation(donationId);
+  }
+
   @Get('social-action/:socialActionId')
   findBySocialAction(@Param('socialActionId', ParseUUIDPipe) socialActionId: string): Promise<Rating[]> {
     return this.ratingsService.findBySocialAction(socialActionId);
@@ -106,6 +118,22 @@ export class RatingsController {
     return this.ratingsService.getAverageForSocialAction(socialActionId);
   }
 
+  @Get('social-action/:socialActionId/summary')
+  getSummaryForSocialAction(@Param('socialActionId', ParseUUIDPipe) socialActionId: string): Promise<RatingSummaryView> {
+    return this.ratingsService.getSummaryForSocialAction(socialActionId);
+  }
+
+  // Recalcula los resúmenes desde la tabla de calificaciones (p. ej. tras una carga directa en la base)
+  @UseGuards(JwtAuthGuard)
+  @Post('summaries/rebuild')
+  async rebuildSummaries(@Req() req): Promise<{ targets: number }> {
+    if (!this.hasWriteAccess(req)) {
+      throw new ForbiddenException('Only administrators can rebuild rating summaries');
+    }
+
+    return { targets: await this.ratingsService.rebuildSummaries() };
+  }
+
   // Estas rutas también pueden ser públicas para la consulta
   @Get(':id')
   findOne(@Param('id', ParseUUIDPipe) id: string): Promise<Rating> {
@@ -164,4 +192,9 @@ export class RatingsController {
   getAverageForOpportunity(@Param('opportunityId', ParseUUIDPipe) opportunityId: string): Promise<number> {
     return this.ratingsService.getAverageForSocialAction(opportunityId);
   }
+
+  @Get('opportunity/:opportunityId/summary')
+  getSummaryForOpportunity(@Param('opportunityId', ParseUUIDPipe) opportunityId: string): Promise<RatingSummaryView> {
+    return this.ratingsService.getSummaryForSocialAction(opportunityId);
+  }
 }
\ No newline at end of file
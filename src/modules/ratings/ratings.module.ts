@@ -6,6 +6,7 @@ import { Donation } from '../../entities/donation.entity';
 import { SocialAction } from '../../entities/social_action.entity';
 import { RatingsController } from './ratings.controller';
 import { RatingsService } from './ratings.service';
+import { RatingSummariesModule } from './rating-summaries.module';
 import { UsersModule } from '../users/users.module';
 import { DonationsModule } from '../donations/donations.module';
 import { SocialActionsModule } from '../social-actions/social-actions.module';
@@ -13,6 +14,7 @@ import { SocialActionsModule } from '../social-actions/social-actions.module';
 @Module({
   imports: [
     TypeOrmModule.forFeature([Rating, User, Donation, SocialAction]),
+    RatingSummariesModule,
     UsersModule,
     DonationsModule,
     SocialActionsModule,
@@ -6,7 +6,10 @@ import { Rating } from '../../entities/rating.entity';
 import { User } from '../../entities/user.entity';
 import { Donation } from '../../entities/donation.entity';
 import { SocialAction } from '../../entities/social_action.entity';
+import { RatingSummary } from '../../entities/rating_summary.entity';
+import { RatingSummariesService } from './rating-summaries.service';
 import { NotFoundException, BadRequestException, ConflictException, ForbiddenException } from '@nestjs/common';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
 
 describe('RatingsService', () => {
   let service: RatingsService;
@@ -22,6 +25,22 @@ describe('RatingsService', () => {
     save: jest.fn(),
     update: jest.fn(),
     delete: jest.fn(),
+    createQueryBuilder: jest.fn(),
+    manager: {
+      transaction: jest.fn((work) => work(mockManager)),
+    },
+  };
+
+  // EntityManager de la transacción: usa el mismo repositorio simulado
+  const mockManager = {
+    getRepository: jest.fn(() => mockRatingRepo),
+    query: jest.fn(),
+  };
+
+  const mockSummaryRepo = {
+    findOne: jest.fn(),
+    exists: jest.fn(),
+    count: jest.fn(),
   };
 
   const mockUserRepo = {
@@ -30,10 +49,12 @@ describe('RatingsService', () => {
 
   const mockDonationRepo = {
     findOne: jest.fn(),
+    exists: jest.fn(),
   };
 
   const mockSocialActionRepo = {
     findOne: jest.fn(),
+    exists: jest.fn(),
   };
 
   beforeEach(async () => {
@@ -44,6 +65,8 @@ describe('RatingsService', () => {
         { provide: getRepositoryToken(User), useValue: mockUserRepo },
         { provide: getRepositoryToken(Donation), useValue: mockDonationRepo },
         { provide: getRepositoryToken(SocialAction), useValue: mockSocialActionRepo },
+        { provide: getRepositoryToken(RatingSummary), useValue: mockSummaryRepo },
+        RatingSummariesService,
       ],
     }).compile();
 
@@ -81,6 +104,19 @@ describe('RatingsService', () => {
       expect(result.id).toBe('r1');
     });
 
+    it('should add the new rating to the target summary', async () => {
+      mockUserRepo.findOne.mockResolvedValue({ id: 'u1' });
+      mockDonationRepo.findOne.mockResolvedValue({ id: 'd1', user_id: 'u1' });
+      mockRatingRepo.findOne.mockResolvedValue(null);
+      mockRatingRepo.create.mockReturnValue({ id: 'r1' });
+      mockRatingRepo.save.mockResolvedValue({ id: 'r1', donation_id: 'd1', rating: 5 });
+
+      await service.create({ user_id: 'u1', donation_id: 'd1', rating: 5 });
+      expect(mockManager.query).toHaveBeenCalledWith(expect.any(String), [
+        'donation', 'd1', 1, 5, 0, 0, 0, 0, 1,
+      ]);
+    });
+
     it('should throw if donation not found', async () => {
       mockUserRepo.findOne.mockResolvedValue({ id: 'u1' });
       mockDonationRepo.findOne.mockResolvedValue(null);
@@ -125,10 +161,11 @@ describe('RatingsService', () => {
   });
 
   describe('findAll', () => {
-    it('should return all ratings', async () => {
-      mockRatingRepo.find.mockResolvedValue([{ id: 'r1' }]);
+    it('should return the first page of ratings', async () => {
+      mockRatingRepo.createQueryBuilder.mockReturnValue(mockQueryBuilder('rating', [{ id: 'r1' }]));
       const result = await service.findAll();
-      expect(result.length).toBe(1);
+      expect(result.items.length).toBe(1);
+      expect(result.next_cursor).toBeNull();
     });
   });
 
@@ -171,46 +208,85 @@ describe('RatingsService', () => {
 
   describe('getAverageForDonation', () => {
     it('should return 0 if no ratings', async () => {
-      mockDonationRepo.findOne.mockResolvedValue({ id: 'd1' });
-      mockRatingRepo.find.mockResolvedValue([]);
+      mockSummaryRepo.findOne.mockResolvedValue(null);
+      mockDonationRepo.exists.mockResolvedValue(true);
       const result = await service.getAverageForDonation('d1');
       expect(result).toBe(0);
     });
 
-    it('should return average rating', async () => {
-      mockDonationRepo.findOne.mockResolvedValue({ id: 'd1' });
-      mockRatingRepo.find.mockResolvedValue([{ rating: 4 }, { rating: 2 }]);
+    it('should return average rating from the summary', async () => {
+      mockDonationRepo.exists.mockResolvedValue(true);
+      mockSummaryRepo.findOne.mockResolvedValue({ rating_count: 2, rating_sum: 6, count_2: 1, count_4: 1 });
       const result = await service.getAverageForDonation('d1');
       expect(result).toBe(3);
+      expect(mockRatingRepo.find).not.toHaveBeenCalled();
     });
 
     it('should throw if donation not found', async () => {
-      mockDonationRepo.findOne.mockResolvedValue(null);
+      mockSummaryRepo.findOne.mockResolvedValue(null);
+      mockDonationRepo.exists.mockResolvedValue(false);
       await expect(service.getAverageForDonation('d1')).rejects.toThrow(NotFoundException);
     });
   });
 
   describe('getAverageForSocialAction', () => {
     it('should return 0 if no ratings', async () => {
-      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1' });
-      mockRatingRepo.find.mockResolvedValue([]);
+      mockSummaryRepo.findOne.mockResolvedValue(null);
+      mockSocialActionRepo.exists.mockResolvedValue(true);
       const result = await service.getAverageForSocialAction('s1');
       expect(result).toBe(0);
     });
 
-    it('should return average rating', async () => {
-      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1' });
-      mockRatingRepo.find.mockResolvedValue([{ rating: 5 }, { rating: 3 }]);
+    it('should return average rating from the summary', async () => {
+      mockSocialActionRepo.exists.mockResolvedValue(true);
+      mockSummaryRepo.findOne.mockResolvedValue({ rating_count: 2, rating_sum: 8, count_3: 1, count_5: 1 });
       const result = await service.getAverageForSocialAction('s1');
       expect(result).toBe(4);
     });
 
     it('should throw if social action not found', async () => {
-      mockSocialActionRepo.findOne.mockResolvedValue(null);
+      mockSummaryRepo.findOne.mockResolvedValue(null);
+      mockSocialActionRepo.exists.mockResolvedValue(false);
       await expect(service.getAverageForSocialAction('s1')).rejects.toThrow(NotFoundException);
     });
   });
 
+  describe('getSummaryForDonation', () => {
+    it('should return count, average and histogram', async () => {
+      mockDonationRepo.exists.mockResolvedValue(true);
+      mockSummaryRepo.findOne.mockResolvedValue({
+        rating_count: 3, rating_sum: 11, count_1: 0, count_2: 0, count_3: 1, count_4: 1, count_5: 1,
+      });
+      const result = await service.getSummaryForDonation('d1');
+      expect(result).toEqual({
+        target_type: 'donation',
+        target_id: 'd1',
+        count: 3,
+        average: 11 / 3,
+        histogram: { 1: 0, 2: 0, 3: 1, 4: 1, 5: 1 },
+      });
+    });
+
+    it('should throw NotFoundException once a rated donation is deleted', async () => {
+      // El resumen de la donación eliminada sigue en la tabla
+      mockDonationRepo.exists.mockResolvedValue(false);
+      mockSummaryRepo.findOne.mockResolvedValue({
+        rating_count: 1, rating_sum: 5, count_1: 0, count_2: 0, count_3: 0, count_4: 0, count_5: 1,
+      });
+      await expect(service.getSummaryForDonation('d1')).rejects.toThrow(NotFoundException);
+    });
+  });
+
+  describe('getSummaryForSocialAction', () => {
+    it('should throw NotFoundException once a rated social action is deleted', async () => {
+      mockSocialActionRepo.exists.mockResolvedValue(false);
+      mockSummaryRepo.findOne.mockResolvedValue({
+        rating_count: 2, rating_sum: 7, count_1: 0, count_2: 0, count_3: 1, count_4: 1, count_5: 0,
+      });
+      await expect(service.getSummaryForSocialAction('s1')).rejects.toThrow(NotFoundException);
+    });
+  });
+
   describe('update', () => {
     it('should update and return the updated rating', async () => {
       const rating = { id: 'r1' };
@@ -222,6 +298,31 @@ describe('RatingsService', () => {
       const result = await service.update('r1', { rating: 5 });
       expect(result.rating).toBe(5);
     });
+
+    it('should move the rating between histogram buckets', async () => {
+      const rating = { id: 'r1', social_action_id: 's1', rating: 2 };
+      mockRatingRepo.findOne
+        .mockResolvedValueOnce(rating)
+        .mockResolvedValueOnce({ ...rating, rating: 4 });
+      mockRatingRepo.update.mockResolvedValue(undefined);
+
+      await service.update('r1', { rating: 4 });
+      expect(mockManager.query).toHaveBeenNthCalledWith(1, expect.any(String), [
+        'social_action', 's1', -1, -2, 0, -1, 0, 0, 0,
+      ]);
+      expect(mockManager.query).toHaveBeenNthCalledWith(2, expect.any(String), [
+        'social_action', 's1', 1, 4, 0, 0, 0, 1, 0,
+      ]);
+    });
+
+    it('should not touch the summary if the value did not change', async () => {
+      const rating = { id: 'r1', donation_id: 'd1', rating: 3 };
+      mockRatingRepo.findOne.mockResolvedValue(rating);
+      mockRatingRepo.update.mockResolvedValue(undefined);
+
+      await service.update('r1', { rating: 3 });
+      expect(mockManager.query).not.toHaveBeenCalled();
+    });
   });
 
   describe('remove', () => {
@@ -231,6 +332,16 @@ describe('RatingsService', () => {
       await expect(service.remove('r1')).resolves.toBeUndefined();
     });
 
+    it('should subtract the removed rating from the summary', async () => {
+      mockRatingRepo.findOne.mockResolvedValue({ id: 'r1', donation_id: 'd1', rating: 1 });
+      mockRatingRepo.delete.mockResolvedValue({ affected: 1 });
+
+      await service.remove('r1');
+      expect(mockManager.query).toHaveBeenCalledWith(expect.any(String), [
+        'donation', 'd1', -1, -1, -1, 0, 0, 0, 0,
+      ]);
+    });
+
     it('should throw if rating not found before deletion', async () => {
       mockRatingRepo.findOne.mockResolvedValue(null);
       await expect(service.remove('r1')).rejects.toThrow(NotFoundException);
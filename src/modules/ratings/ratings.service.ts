@@ -8,6 +8,9 @@ import { Donation } from '../../entities/donation.entity';
 import { SocialAction } from '../../entities/social_action.entity';
 import { CreateRatingDto } from './dto/create-rating.dto';
 import { UpdateRatingDto } from './dto/update-rating.dto';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
+import { RatingTargetType } from '../../entities/rating_summary.entity';
+import { RatingSummariesService, RatingSummaryView } from './rating-summaries.service';
 
 @Injectable()
 export class RatingsService {
@@ -20,6 +23,7 @@ export class RatingsService {
     private donationsRepository: Repository<Donation>,
     @InjectRepository(SocialAction)
     private socialActionsRepository: Repository<SocialAction>,
+    private ratingSummariesService: RatingSummariesService,
   ) {}
 
   async create(createRatingDto: CreateRatingDto): Promise<Rating> {
@@ -109,14 +113,22 @@ export class RatingsService {
       rating_date: new Date(),
     });
     
-    return this.ratingsRepository.save(newRating);
+    // La calificación y su resumen se guardan en la misma transacción
+    return this.ratingsRepository.manager.transaction(async (manager) => {
+      const savedRating = await manager.getRepository(Rating).save(newRating);
+      await this.ratingSummariesService.apply(manager, savedRating, 1);
+      return savedRating;
+    });
   }
 
-  async findAll(): Promise<Rating[]> {
-    return this.ratingsRepository.find({
-      relations: ['user', 'donation', 'social_action'],
-      order: { rating_date: 'DESC' },
-    });
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<Rating>> {
+    const query = this.ratingsRepository
+      .createQueryBuilder('rating')
+      .leftJoinAndSelect('rating.user', 'user')
+      .leftJoinAndSelect('rating.donation', 'donation')
+      .leftJoinAndSelect('rating.social_action', 'social_action');
+
+    return paginateByCursor(query, 'rating_date', page);
   }
 
   async findOne(id: string): Promise<Rating> {
@@ -157,71 +169,94 @@ export class RatingsService {
   }
 
   async getAverageForDonation(donationId: string): Promise<number> {
-    // Verificar si la donación existe
-    const donation = await this.donationsRepository.findOne({
-      where: { id: donationId },
-    });
+    const summary = await this.getSummaryForDonation(donationId);
+    return summary.average;
+  }
 
-    if (!donation) {
-      throw new NotFoundException(`Donation with ID "${donationId}" not found`);
-    }
+  async getAverageForSocialAction(socialActionId: string): Promise<number> {
+    const summary = await this.getSummaryForSocialAction(socialActionId);
+    return summary.average;
+  }
 
-    const ratings = await this.ratingsRepository.find({
-      where: { donation_id: donationId },
-    });
+  // rating_summaries no tiene FK: al eliminar la donación (también en cascada
+  // desde su usuario o fundación) su resumen queda, así que la existencia se
+  // verifica siempre, en paralelo con la lectura del resumen
+  async getSummaryForDonation(donationId: string): Promise<RatingSummaryView> {
+    const [exists, summary] = await Promise.all([
+      this.donationsRepository.exists({ where: { id: donationId } }),
+      this.ratingSummariesService.findOne(RatingTargetType.DONATION, donationId),
+    ]);
 
-    if (ratings.length === 0) {
-      return 0;
+    if (!exists) {
+      throw new NotFoundException(`Donation with ID "${donationId}" not found`);
     }
 
-    const sum = ratings.reduce((acc, rating) => acc + rating.rating, 0);
-    return sum / ratings.length;
+    return this.ratingSummariesService.toView(RatingTargetType.DONATION, donationId, summary);
   }
 
-  async getAverageForSocialAction(socialActionId: string): Promise<number> {
-    // Verificar si la acción social existe
-    const socialAction = await this.socialActionsRepository.findOne({
-      where: { id: socialActionId },
-    });
+  async getSummaryForSocialAction(socialActionId: string): Promise<RatingSummaryView> {
+    const [exists, summary] = await Promise.all([
+      this.socialActionsRepository.exists({ where: { id: socialActionId } }),
+      this.ratingSummariesService.findOne(RatingTargetType.SOCIAL_ACTION, socialActionId),
+    ]);
 
-    if (!socialAction) {
+    if (!exists) {
       throw new NotFoundException(`Social Action with ID "${socialActionId}" not found`);
     }
 
-    const ratings = await this.ratingsRepository.find({
-      where: { social_action_id: socialActionId },
-    });
-
-    if (ratings.length === 0) {
-      return 0;
-    }
+    return this.ratingSummariesService.toView(RatingTargetType.SOCIAL_ACTION, socialActionId, summary);
+  }
 
-    const sum = ratings.reduce((acc, rating) => acc + rating.rating, 0);
-    return sum / ratings.length;
+  async rebuildSummaries(): Promise<number> {
+    return this.ratingSummariesService.rebuild();
   }
 
   async update(id: string, updateRatingDto: UpdateRatingDto): Promise<Rating> {
-    const rating = await this.findOne(id);
-    
-    // Actualizar la calificación
-    await this.ratingsRepository.update(id, updateRatingDto);
+    await this.ratingsRepository.manager.transaction(async (manager) => {
+      const ratingsRepository = manager.getRepository(Rating);
+      // Se bloquea la fila para que el resumen descuente el valor que realmente se reemplaza
+      const rating = await ratingsRepository.findOne({
+        where: { id },
+        lock: { mode: 'pessimistic_write' },
+      });
+
+      if (!rating) {
+        throw new NotFoundException(`Rating with ID "${id}" not found`);
+      }
+
+      // Actualizar la calificación
+      await ratingsRepository.update(id, updateRatingDto);
+
+      if (updateRatingDto.rating !== undefined && updateRatingDto.rating !== rating.rating) {
+        await this.ratingSummariesService.apply(manager, rating, -1);
+        await this.ratingSummariesService.apply(manager, { ...rating, rating: updateRatingDto.rating }, 1);
+      }
+    });
     
     // Devolver la calificación actualizada
     return this.findOne(id);
   }
 
   async remove(id: string): Promise<void> {
-    const rating = await this.findOne(id);
-    
-    if (!rating) {
-      throw new NotFoundException(`Rating with ID "${id}" not found`);
-    }
-    
-    const result = await this.ratingsRepository.delete(id);
-    
-    if (result.affected === 0) {
-      throw new NotFoundException(`Rating with ID "${id}" not found`);
-    }
+    await this.ratingsRepository.manager.transaction(async (manager) => {
+      const ratingsRepository = manager.getRepository(Rating);
+      const rating = await ratingsRepository.findOne({
+        where: { id },
+        lock: { mode: 'pessimistic_write' },
+      });
+
+      if (!rating) {
+        throw new NotFoundException(`Rating with ID "${id}" not found`);
+      }
+
+      const result = await ratingsRepository.delete(id);
+
+      if (result.affected === 0) {
+        throw new NotFoundException(`Rating with ID "${id}" not found`);
+      }
+
+      await this.ratingSummariesService.apply(manager, rating, -1);
+    });
   }
 
   // Método adicional para verificar propiedad
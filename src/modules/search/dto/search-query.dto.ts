@@ -0,0 +1,27 @@
+import { IsEnum, IsNotEmpty, IsOptional, IsString, IsUUID, MaxLength } from 'class-validator';
+import { CursorPaginationDto } from '../../../shared/pagination/cursor-pagination';
+
+// Ventanas de fechas de una acción social respecto del momento de la búsqueda
+export enum SearchWindow {
+  UPCOMING = 'upcoming',
+  ACTIVE = 'active',
+  PAST = 'past',
+}
+
+export class SearchQueryDto extends CursorPaginationDto {
+  // Sintaxis de buscador web: "frase exacta", palabra -excluida, a or b
+  @IsNotEmpty()
+  @IsString()
+  @MaxLength(200)
+  q: string;
+}
+
+export class SocialActionSearchDto extends SearchQueryDto {
+  @IsOptional()
+  @IsUUID()
+  foundation_id?: string;
+
+  @IsOptional()
+  @IsEnum(SearchWindow)
+  window?: SearchWindow;
+}
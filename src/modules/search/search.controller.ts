@@ -0,0 +1,47 @@
+// src/modules/search/search.controller.ts
+import { Controller, Get, Query, Res } from '@nestjs/common';
+import { Foundation } from '../../entities/foundation.entity';
+import { NEXT_CURSOR_HEADER } from '../../shared/pagination/cursor-pagination';
+import { SearchQueryDto, SocialActionSearchDto } from './dto/search-query.dto';
+import { SearchPage, SearchService, SocialActionSearchPage } from './search.service';
+
+// Como sendPage: el cursor siguiente va en el header, no en el cuerpo
+function sendSearchPage<P extends SearchPage<unknown>>(res, page: P): Omit<P, 'next_cursor'> {
+  const { next_cursor, ...result } = page;
+  if (next_cursor) {
+    res.setHeader(NEXT_CURSOR_HEADER, next_cursor);
+  }
+  return result;
+}
+
+@Controller()
+export class SearchController {
+  constructor(private readonly searchService: SearchService) {}
+
+  // Fundaciones por razón social y dirección
+  @Get('search/foundations')
+  async searchFoundations(
+    @Query() search: SearchQueryDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Omit<SearchPage<Foundation>, 'next_cursor'>> {
+    return sendSearchPage(res, await this.searchService.searchFoundations(search));
+  }
+
+  // Acciones sociales por descripción, con facetas por fundación y ventana de fechas
+  @Get('search/social-actions')
+  async searchSocialActions(
+    @Query() search: SocialActionSearchDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Omit<SocialActionSearchPage, 'next_cursor'>> {
+    return sendSearchPage(res, await this.searchService.searchSocialActions(search));
+  }
+
+  // Búsqueda de oportunidades (compatible)
+  @Get('search/opportunities')
+  searchOpportunities(
+    @Query() search: SocialActionSearchDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<Omit<SocialActionSearchPage, 'next_cursor'>> {
+    return this.searchSocialActions(search, res);
+  }
+}
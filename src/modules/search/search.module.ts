@@ -0,0 +1,14 @@
+// src/modules/search/search.module.ts
+import { Module } from '@nestjs/common';
+import { TypeOrmModule } from '@nestjs/typeorm';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
+import { SearchController } from './search.controller';
+import { SearchService } from './search.service';
+
+@Module({
+  imports: [TypeOrmModule.forFeature([Foundation, SocialAction])],
+  controllers: [SearchController],
+  providers: [SearchService],
+})
+export class SearchModule {}
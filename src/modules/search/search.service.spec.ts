@@ -0,0 +1,120 @@
+import { Test, TestingModule } from '@nestjs/testing';
+import { getRepositoryToken } from '@nestjs/typeorm';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
+import { encodeCursor } from '../../shared/pagination/cursor-pagination';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
+import { SearchWindow } from './dto/search-query.dto';
+import { SearchService } from './search.service';
+
+describe('SearchService', () => {
+  let service: SearchService;
+
+  // Las filas crudas traen la relevancia de cada entidad como texto
+  const rankedQueryBuilder = (alias: string, entities: any[], count = entities.length) =>
+    mockQueryBuilder(alias, entities, {
+      raw: entities.map((entity) => ({ [`${alias}_id`]: entity.id, cursor_rank: '0.0607927' })),
+      count,
+    });
+
+  const mockManager = {
+    query: jest.fn(),
+    connection: {
+      driver: {
+        escapeQueryWithParameters: jest.fn((sql, parameters) => [sql, parameters]),
+      },
+    },
+  };
+
+  const mockFoundationRepo = {
+    createQueryBuilder: jest.fn(),
+  };
+
+  const mockSocialActionRepo = {
+    createQueryBuilder: jest.fn(),
+    manager: mockManager,
+  };
+
+  beforeEach(async () => {
+    const module: TestingModule = await Test.createTestingModule({
+      providers: [
+        SearchService,
+        { provide: getRepositoryToken(Foundation), useValue: mockFoundationRepo },
+        { provide: getRepositoryToken(SocialAction), useValue: mockSocialActionRepo },
+      ],
+    }).compile();
+
+    service = module.get<SearchService>(SearchService);
+  });
+
+  afterEach(() => jest.clearAllMocks());
+
+  describe('searchFoundations', () => {
+    it('debería devolver la página con el total y el cursor siguiente', async () => {
+      const page = rankedQueryBuilder('foundation', [{ id: 'f1' }, { id: 'f2' }, { id: 'f3' }], 7);
+      mockFoundationRepo.createQueryBuilder.mockReturnValue(page);
+
+      const result = await service.searchFoundations({ q: 'alimentos', limit: 2 });
+      expect(result).toEqual({
+        items: [{ id: 'f1' }, { id: 'f2' }],
+        total: 7,
+        next_cursor: encodeCursor('0.0607927', 'f2'),
+      });
+      expect(page.where).toHaveBeenCalledWith(expect.stringContaining("websearch_to_tsquery('spanish', :q)"), {
+        q: 'alimentos',
+      });
+      expect(page.limit).toHaveBeenCalledWith(3);
+    });
+
+    it('debería continuar desde la relevancia del cursor', async () => {
+      const page = rankedQueryBuilder('foundation', []);
+      mockFoundationRepo.createQueryBuilder.mockReturnValue(page);
+
+      await service.searchFoundations({ q: 'alimentos', cursor: encodeCursor('0.0607927', 'f2') });
+      expect(page.andWhere).toHaveBeenCalledWith(expect.stringContaining('CAST(:cursorRank AS real)'), {
+        cursorRank: '0.0607927',
+        cursorId: 'f2',
+      });
+    });
+  });
+
+  describe('searchSocialActions', () => {
+    const now = new Date('2026-01-01T12:00:00Z');
+    const facetsRow = {
+      windows: { upcoming: 4, active: 2, past: 9 },
+      foundations: [{ foundation_id: 'f1', legal_name: 'Banco de Alimentos', count: 6 }],
+    };
+
+    it('debería devolver los resultados con las facetas y el total de todas las ventanas', async () => {
+      mockSocialActionRepo.createQueryBuilder.mockReturnValue(rankedQueryBuilder('social_action', [{ id: 's1' }]));
+      mockManager.query.mockResolvedValue([facetsRow]);
+
+      const result = await service.searchSocialActions({ q: 'huerta' }, now);
+      expect(result).toEqual({ items: [{ id: 's1' }], next_cursor: null, total: 15, facets: facetsRow });
+
+      const [sql, parameters] = mockManager.connection.driver.escapeQueryWithParameters.mock.calls[0];
+      expect(sql).not.toContain('CAST(:foundationId AS uuid)');
+      expect(parameters).toMatchObject({ q: 'huerta', now, facetLimit: 20 });
+    });
+
+    it('debería filtrar por fundación y ventana, y contar cada faceta sin su propio filtro', async () => {
+      const page = rankedQueryBuilder('social_action', []);
+      mockSocialActionRepo.createQueryBuilder.mockReturnValue(page);
+      mockManager.query.mockResolvedValue([facetsRow]);
+
+      const result = await service.searchSocialActions(
+        { q: 'huerta', foundation_id: 'f1', window: SearchWindow.ACTIVE },
+        now,
+      );
+      expect(result.total).toBe(2);
+      expect(page.andWhere).toHaveBeenCalledWith('social_action.foundation_id = :foundationId', {
+        foundationId: 'f1',
+      });
+      expect(page.andWhere).toHaveBeenCalledWith('start_date <= :now AND end_date >= :now', { now });
+
+      const [sql] = mockManager.connection.driver.escapeQueryWithParameters.mock.calls[0];
+      expect(sql).toContain('FROM matches WHERE foundation_id = CAST(:foundationId AS uuid)) AS windows');
+      expect(sql).toContain('WHERE start_date <= :now AND end_date >= :now\n');
+    });
+  });
+});
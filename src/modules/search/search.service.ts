@@ -0,0 +1,182 @@
+// src/modules/search/search.service.ts
+import { Injectable } from '@nestjs/common';
+import { InjectRepository } from '@nestjs/typeorm';
+import { ObjectLiteral, Repository, SelectQueryBuilder } from 'typeorm';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
+import {
+  CursorPage,
+  DEFAULT_PAGE_SIZE,
+  MAX_PAGE_SIZE,
+  decodeCursor,
+  encodeCursor,
+} from '../../shared/pagination/cursor-pagination';
+import { SearchQueryDto, SearchWindow, SocialActionSearchDto } from './dto/search-query.dto';
+
+// Consulta del usuario con la configuración española (stemming y stopwords);
+// websearch_to_tsquery acepta cualquier texto sin errores de sintaxis
+const TSQUERY = `websearch_to_tsquery('spanish', :q)`;
+
+// Fundaciones con más resultados que se devuelven como faceta
+export const FOUNDATION_FACET_LIMIT = 20;
+
+// Condición de cada ventana sobre start_date/end_date, sin alias (solo
+// social_actions tiene esas columnas); :now es el momento de la búsqueda.
+// Las ventanas no se solapan: cada acción cuenta en una sola
+const WINDOW_CONDITIONS: Record<SearchWindow, string> = {
+  [SearchWindow.UPCOMING]: 'start_date > :now',
+  [SearchWindow.ACTIVE]: 'start_date <= :now AND end_date >= :now',
+  [SearchWindow.PAST]: 'start_date <= :now AND end_date < :now',
+};
+
+export interface SearchPage<T> extends CursorPage<T> {
+  // Resultados con todos los filtros aplicados, no solo los de la página
+  total: number;
+}
+
+export interface FoundationFacet {
+  foundation_id: string;
+  legal_name: string;
+  count: number;
+}
+
+// Cada faceta cuenta con los demás filtros aplicados pero no con el propio,
+// así el cliente ve cuántos resultados tendría al cambiarlo
+export interface SocialActionFacets {
+  foundations: FoundationFacet[];
+  windows: Record<SearchWindow, number>;
+}
+
+export interface SocialActionSearchPage extends SearchPage<SocialAction> {
+  facets: SocialActionFacets;
+}
+
+/**
+ * Pagina por keyset sobre (relevancia, id) en orden descendente.
+ *
+ * La relevancia del cursor se lee como texto desde Postgres: el real se
+ * imprime con la precisión justa para volver a leerse idéntico, así la
+ * comparación del cursor no pierde ni repite filas entre páginas.
+ */
+async function paginateByRank<T extends ObjectLiteral>(
+  query: SelectQueryBuilder<T>,
+  page: SearchQueryDto,
+): Promise<CursorPage<T>> {
+  const alias = query.alias;
+  const rank = `ts_rank(${alias}.search_vector, ${TSQUERY})`;
+  const limit = Math.min(page.limit ?? DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE);
+
+  if (page.cursor) {
+    const { at, id } = decodeCursor(page.cursor);
+    query.andWhere(`(${rank}, ${alias}.id) < (CAST(:cursorRank AS real), CAST(:cursorId AS uuid))`, {
+      cursorRank: at,
+      cursorId: id,
+    });
+  }
+
+  query
+    .addSelect(`${rank}::text`, 'cursor_rank')
+    .orderBy(rank, 'DESC')
+    .addOrderBy(`${alias}.id`, 'DESC')
+    // Una fila extra indica si existe una página siguiente
+    .limit(limit + 1);
+
+  const { entities, raw } = await query.getRawAndEntities();
+  const hasMore = entities.length > limit;
+  const items = hasMore ? entities.slice(0, limit) : entities;
+
+  let nextCursor: string | null = null;
+  if (hasMore) {
+    const last = items[items.length - 1];
+    const lastRow = raw.find((row) => row[`${alias}_id`] === last.id);
+    nextCursor = encodeCursor(lastRow.cursor_rank, last.id);
+  }
+
+  return { items, next_cursor: nextCursor };
+}
+
+/**
+ * Búsqueda de texto en fundaciones (razón social y dirección) y acciones
+ * sociales (descripción).
+ *
+ * Cada tabla tiene una columna tsvector generada por Postgres con índice GIN
+ * (ver la migración SearchVectors), así la búsqueda solo lee las filas que
+ * coinciden. Los resultados van por relevancia y se paginan por cursor.
+ */
+@Injectable()
+export class SearchService {
+  constructor(
+    @InjectRepository(Foundation)
+    private foundationsRepository: Repository<Foundation>,
+    @InjectRepository(SocialAction)
+    private socialActionsRepository: Repository<SocialAction>,
+  ) {}
+
+  async searchFoundations(search: SearchQueryDto): Promise<SearchPage<Foundation>> {
+    const matches = () =>
+      this.foundationsRepository
+        .createQueryBuilder('foundation')
+        .where(`foundation.search_vector @@ ${TSQUERY}`, { q: search.q });
+
+    const [page, total] = await Promise.all([paginateByRank(matches(), search), matches().getCount()]);
+    return { ...page, total };
+  }
+
+  async searchSocialActions(search: SocialActionSearchDto, now: Date = new Date()): Promise<SocialActionSearchPage> {
+    const query = this.socialActionsRepository
+      .createQueryBuilder('social_action')
+      .leftJoinAndSelect('social_action.foundation', 'foundation')
+      .where(`social_action.search_vector @@ ${TSQUERY}`, { q: search.q });
+
+    if (search.foundation_id) {
+      query.andWhere('social_action.foundation_id = :foundationId', { foundationId: search.foundation_id });
+    }
+    if (search.window) {
+      query.andWhere(WINDOW_CONDITIONS[search.window], { now });
+    }
+
+    const [page, facets] = await Promise.all([paginateByRank(query, search), this.socialActionFacets(search, now)]);
+    // Con los dos filtros aplicados, el total es el conteo de la ventana elegida
+    const total = search.window
+      ? facets.windows[search.window]
+      : Object.values(facets.windows).reduce((sum, count) => sum + count, 0);
+    return { ...page, total, facets };
+  }
+
+  // Las dos facetas en una consulta: las coincidencias se leen del índice una sola vez
+  private async socialActionFacets(search: SocialActionSearchDto, now: Date): Promise<SocialActionFacets> {
+    const windowCounts = Object.values(SearchWindow)
+      .map((window) => `'${window}', COUNT(*) FILTER (WHERE ${WINDOW_CONDITIONS[window]})`)
+      .join(', ');
+    const byFoundation = search.foundation_id ? 'WHERE foundation_id = CAST(:foundationId AS uuid)' : '';
+    const byWindow = search.window ? `WHERE ${WINDOW_CONDITIONS[search.window]}` : '';
+
+    const sql = `
+      WITH matches AS (
+        SELECT foundation_id, start_date, end_date
+        FROM social_actions
+        WHERE search_vector @@ ${TSQUERY}
+      )
+      SELECT
+        (SELECT json_build_object(${windowCounts}) FROM matches ${byFoundation}) AS windows,
+        (SELECT COALESCE(json_agg(top ORDER BY top.count DESC, top.legal_name), '[]')
+         FROM (
+           SELECT matches.foundation_id, foundations.legal_name, COUNT(*)::int AS count
+           FROM matches
+           JOIN foundations ON foundations.id = matches.foundation_id
+           ${byWindow}
+           GROUP BY matches.foundation_id, foundations.legal_name
+           ORDER BY count DESC, foundations.legal_name
+           LIMIT :facetLimit
+         ) top) AS foundations`;
+
+    const manager = this.socialActionsRepository.manager;
+    const [query, parameters] = manager.connection.driver.escapeQueryWithParameters(
+      sql,
+      { q: search.q, now, foundationId: search.foundation_id ?? null, facetLimit: FOUNDATION_FACET_LIMIT },
+      {},
+    );
+    const [row] = await manager.query(query, parameters);
+    return { foundations: row.foundations, windows: row.windows };
+  }
+}
@@ -0,0 +1,15 @@
+import { Transform } from 'class-transformer';
+import { IsIn, IsOptional } from 'class-validator';
+
+export const SOCIAL_ACTION_RELATIONS = ['foundation', 'participation_requests', 'comments', 'ratings'] as const;
+export type SocialActionRelation = (typeof SOCIAL_ACTION_RELATIONS)[number];
+
+export class SocialActionIncludeDto {
+  // ?include=comments,ratings o ?include=comments&include=ratings
+  @IsOptional()
+  @Transform(({ value }) =>
+    [].concat(value).flatMap((item: string) => item.split(',').map((name) => name.trim()).filter(Boolean)),
+  )
+  @IsIn(SOCIAL_ACTION_RELATIONS, { each: true })
+  include?: SocialActionRelation[];
+}
@@ -0,0 +1,88 @@
+import { ConfigService } from '@nestjs/config';
+import { LocalPubSub } from '../../shared/pubsub/pubsub';
+import { FeedSnapshot, SOCIAL_ACTION_FEED_CHANNEL, SocialActionFeedService } from './social-action-feed.service';
+
+describe('SocialActionFeedService', () => {
+  let service: SocialActionFeedService;
+  let pubsub: LocalPubSub;
+  let now: number;
+
+  const config = { get: () => 60000 } as unknown as ConfigService;
+
+  const snapshot = (items: unknown[], changesAt: Date | null = null): FeedSnapshot => ({ items, changesAt });
+
+  beforeEach(() => {
+    now = Date.parse('2026-01-01T12:00:10Z');
+    jest.spyOn(Date, 'now').mockImplementation(() => now);
+    pubsub = new LocalPubSub();
+    service = new SocialActionFeedService(pubsub, config);
+    service.onModuleInit();
+  });
+
+  afterEach(() => {
+    service.onModuleDestroy();
+    jest.restoreAllMocks();
+  });
+
+  it('debería consultar una sola vez por franja y devolver el JSON', async () => {
+    const loader = jest.fn().mockResolvedValue(snapshot([{ id: 's1' }]));
+
+    await service.getOrLoad('upcoming', loader);
+    now += 30000;
+    const json = await service.getOrLoad('upcoming', loader);
+
+    expect(json).toBe('[{"id":"s1"}]');
+    expect(loader).toHaveBeenCalledTimes(1);
+    expect(loader).toHaveBeenCalledWith(new Date('2026-01-01T12:00:10Z'));
+  });
+
+  it('debería volver a consultar al empezar otra franja', async () => {
+    const loader = jest.fn().mockResolvedValue(snapshot([]));
+
+    await service.getOrLoad('active', loader);
+    now = Date.parse('2026-01-01T12:01:00Z');
+    await service.getOrLoad('active', loader);
+
+    expect(loader).toHaveBeenCalledTimes(2);
+  });
+
+  it('debería volver a consultar cuando el listado cambia dentro de la franja', async () => {
+    const loader = jest.fn().mockResolvedValue(snapshot([], new Date('2026-01-01T12:00:20Z')));
+
+    await service.getOrLoad('upcoming', loader);
+    now = Date.parse('2026-01-01T12:00:20Z');
+    await service.getOrLoad('upcoming', loader);
+
+    expect(loader).toHaveBeenCalledTimes(2);
+  });
+
+  it('debería compartir una consulta entre peticiones simultáneas', async () => {
+    const loader = jest.fn().mockResolvedValue(snapshot([]));
+
+    await Promise.all([service.getOrLoad('upcoming', loader), service.getOrLoad('upcoming', loader)]);
+    expect(loader).toHaveBeenCalledTimes(1);
+  });
+
+  it('debería volver a consultar tras una invalidación de otra instancia', async () => {
+    const loader = jest.fn().mockResolvedValue(snapshot([]));
+
+    await service.getOrLoad('upcoming', loader);
+    await pubsub.publish(SOCIAL_ACTION_FEED_CHANNEL, 'invalidate');
+    await service.getOrLoad('upcoming', loader);
+
+    expect(loader).toHaveBeenCalledTimes(2);
+  });
+
+  it('no debería guardar una carga invalidada mientras estaba en curso', async () => {
+    let finish: (value: FeedSnapshot) => void;
+    const slowLoader = jest.fn(() => new Promise<FeedSnapshot>((resolve) => (finish = resolve)));
+    const loader = jest.fn().mockResolvedValue(snapshot([{ id: 's2' }]));
+
+    const pending = service.getOrLoad('upcoming', slowLoader);
+    service.invalidate();
+    finish(snapshot([{ id: 's1' }]));
+    await pending;
+
+    await expect(service.getOrLoad('upcoming', loader)).resolves.toBe('[{"id":"s2"}]');
+  });
+});
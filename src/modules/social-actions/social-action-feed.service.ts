@@ -0,0 +1,124 @@
+// src/modules/social-actions/social-action-feed.service.ts
+import { Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { LruTtlCache } from '../../shared/cache/lru-cache';
+import { PubSub } from '../../shared/pubsub/pubsub';
+
+export type SocialActionFeed = 'upcoming' | 'active';
+
+// Canal del pub/sub por el que las instancias se avisan de que los listados cambiaron
+export const SOCIAL_ACTION_FEED_CHANNEL = 'social-action-feed';
+
+// Un listado calculado en un instante dado
+export interface FeedSnapshot {
+  items: unknown[];
+  // Cuándo cambia el listado solo por el paso del tiempo (null si no cambia)
+  changesAt: Date | null;
+}
+
+interface FeedEntry {
+  json: string;
+  expiresAt: number;
+}
+
+/**
+ * Caché de los listados de acciones sociales próximas y activas, ya
+ * serializados a JSON.
+ *
+ * La clave es el listado y la franja de tiempo (SOCIAL_ACTION_FEED_BUCKET_MS)
+ * a la que pertenece la petición; todas las rutas de un mismo listado
+ * comparten la entrada. Una entrada dura como mucho hasta el fin de su franja
+ * o hasta que el listado cambie por el paso del tiempo (`changesAt`), lo que
+ * ocurra antes.
+ *
+ * Crear, modificar o eliminar una acción social (o su fundación) publica una
+ * invalidación en el pub/sub, que vacía la caché de todas las instancias.
+ */
+@Injectable()
+export class SocialActionFeedService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(SocialActionFeedService.name);
+  private readonly bucketMs: number;
+  // Dos listados, con la franja actual y, al cambiar de franja, la anterior
+  private readonly entries: LruTtlCache<FeedEntry>;
+  // Cargas en curso por clave: peticiones simultáneas comparten una consulta
+  private readonly loading = new Map<string, Promise<string>>();
+  // Aumenta con cada invalidación; una carga que empezó antes no se guarda
+  private generation = 0;
+  private unsubscribe: (() => void) | null = null;
+
+  constructor(
+    private readonly pubsub: PubSub,
+    configService: ConfigService,
+  ) {
+    this.bucketMs = configService.get('cache.feedBucketMs') ?? 60000;
+    this.entries = new LruTtlCache(4, this.bucketMs);
+  }
+
+  onModuleInit(): void {
+    this.unsubscribe = this.pubsub.subscribe(SOCIAL_ACTION_FEED_CHANNEL, () => this.clear());
+  }
+
+  onModuleDestroy(): void {
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+  }
+
+  // JSON del listado vigente; `loader` lo calcula para el instante que recibe
+  async getOrLoad(feed: SocialActionFeed, loader: (now: Date) => Promise<FeedSnapshot>): Promise<string> {
+    const now = Date.now();
+    const bucket = this.bucketMs > 0 ? Math.floor(now / this.bucketMs) : now;
+    const key = `${feed}:${bucket}`;
+
+    const cached = this.entries.get(key);
+    if (cached && cached.expiresAt > now) {
+      return cached.json;
+    }
+
+    const inFlight = this.loading.get(key);
+    if (inFlight) {
+      return inFlight;
+    }
+
+    const load = this.load(key, now, (bucket + 1) * this.bucketMs, loader);
+    this.loading.set(key, load);
+    try {
+      return await load;
+    } finally {
+      if (this.loading.get(key) === load) {
+        this.loading.delete(key);
+      }
+    }
+  }
+
+  // Vacía la caché local y avisa a las demás instancias
+  invalidate(): void {
+    this.clear();
+    this.pubsub
+      .publish(SOCIAL_ACTION_FEED_CHANNEL, 'invalidate')
+      .catch((error) => this.logger.warn(`Could not publish feed invalidation: ${error.message}`));
+  }
+
+  private async load(
+    key: string,
+    now: number,
+    bucketEnd: number,
+    loader: (now: Date) => Promise<FeedSnapshot>,
+  ): Promise<string> {
+    const generation = this.generation;
+    const { items, changesAt } = await loader(new Date(now));
+    const json = JSON.stringify(items);
+
+    // Si se invalidó mientras cargaba, el resultado puede estar desactualizado
+    if (generation === this.generation) {
+      const expiresAt = changesAt ? Math.min(bucketEnd, changesAt.getTime()) : bucketEnd;
+      this.entries.set(key, { json, expiresAt });
+    }
+    return json;
+  }
+
+  private clear(): void {
+    this.generation++;
+    this.entries.clear();
+    this.loading.clear();
+  }
+}
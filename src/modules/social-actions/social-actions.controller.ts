@@ -14,16 +14,24 @@ import {
   UseGuards,
   Req,
   ForbiddenException,
+  Query,
+  Res,
+  Header,
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { SocialActionsService } from './social-actions.service';
 import { CreateSocialActionDto } from './dto/create-social-action.dto';
 import { UpdateSocialActionDto } from './dto/update-social-action.dto';
 import { ApplyToSocialActionDto } from './dto/apply-to-social-action.dto';
+import { SocialActionIncludeDto } from './dto/social-action-include.dto';
 import { SocialAction } from '../../entities/social_action.entity';
 import { UserType } from '../../entities/user.entity';
+import { CursorPaginationDto, sendPage } from '../../shared/pagination/cursor-pagination';
 import { ParticipationRequest } from '../../entities/participation_request.entity';
 
+// Los listados próximos/activos llegan ya serializados desde la caché
+const FEED_CONTENT_TYPE = 'application/json; charset=utf-8';
+
 @Controller()
 export class SocialActionsController {
   constructor(private readonly socialActionsService: SocialActionsService) {}
@@ -104,38 +112,48 @@ export class SocialActionsController {
 
   // Endpoint para listar todas las acciones sociales
   @Get('social-actions')
-  findAllSocialActions(): Promise<SocialAction[]> {
-    return this.socialActionsService.findAll();
+  async findAllSocialActions(
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<SocialAction[]> {
+    return sendPage(res, await this.socialActionsService.findAll(page));
   }
 
   // Endpoint compatible con 'opportunities'
   @Get('opportunities')
-  findAllOpportunities(): Promise<SocialAction[]> {
-    return this.socialActionsService.findAll();
+  findAllOpportunities(
+    @Query() page: CursorPaginationDto,
+    @Res({ passthrough: true }) res,
+  ): Promise<SocialAction[]> {
+    return this.findAllSocialActions(page, res);
   }
 
   // Acciones sociales próximas
   @Get('social-actions/upcoming')
-  findUpcomingSocialActions(): Promise<SocialAction[]> {
-    return this.socialActionsService.findUpcoming();
+  @Header('Content-Type', FEED_CONTENT_TYPE)
+  findUpcomingSocialActions(): Promise<string> {
+    return this.socialActionsService.findUpcomingFeed();
   }
 
   // Oportunidades próximas (compatible)
   @Get('opportunities/upcoming')
-  findUpcomingOpportunities(): Promise<SocialAction[]> {
-    return this.socialActionsService.findUpcoming();
+  @Header('Content-Type', FEED_CONTENT_TYPE)
+  findUpcomingOpportunities(): Promise<string> {
+    return this.socialActionsService.findUpcomingFeed();
   }
 
   // Acciones sociales activas
   @Get('social-actions/active')
-  findActiveSocialActions(): Promise<SocialAction[]> {
-    return this.socialActionsService.findActive();
+  @Header('Content-Type', FEED_CONTENT_TYPE)
+  findActiveSocialActions(): Promise<string> {
+    return this.socialActionsService.findActiveFeed();
   }
 
   // Oportunidades activas (compatible)
   @Get('opportunities/active')
-  findActiveOpportunities(): Promise<SocialAction[]> {
-    return this.socialActionsService.findActive();
+  @Header('Content-Type', FEED_CONTENT_TYPE)
+  findActiveOpportunities(): Promise<string> {
+    return this.socialActionsService.findActiveFeed();
   }
 
   // Acciones sociales por fundación
@@ -150,16 +168,23 @@ export class SocialActionsController {
     return this.socialActionsService.findByFoundation(foundationId);
   }
 
-  // Detalle de acción social
+  // Detalle de acción social; ?include=participation_requests,comments,ratings
+  // agrega las relaciones pesadas
   @Get('social-actions/:id')
-  findOneSocialAction(@Param('id', ParseUUIDPipe) id: string): Promise<SocialAction> {
-    return this.socialActionsService.findOne(id);
+  findOneSocialAction(
+    @Param('id', ParseUUIDPipe) id: string,
+    @Query() query: SocialActionIncludeDto,
+  ): Promise<SocialAction> {
+    return this.socialActionsService.findOne(id, query.include);
   }
 
   // Detalle de oportunidad (compatible)
   @Get('opportunities/:id')
-  findOneOpportunity(@Param('id', ParseUUIDPipe) id: string): Promise<SocialAction> {
-    return this.socialActionsService.findOne(id);
+  findOneOpportunity(
+    @Param('id', ParseUUIDPipe) id: string,
+    @Query() query: SocialActionIncludeDto,
+  ): Promise<SocialAction> {
+    return this.socialActionsService.findOne(id, query.include);
   }
 
   // Actualizar acción social
@@ -175,7 +200,7 @@ export class SocialActionsController {
       return this.socialActionsService.updateAsAdmin(id, updateSocialActionDto);
     }
     
-    const socialAction = await this.socialActionsService.findOne(id);
+    const socialAction = await this.socialActionsService.findOwnership(id);
     
     // Usuarios con permisos de escritura pueden actualizar
     if (this.hasWriteAccess(req)) {
@@ -244,7 +269,7 @@ export class SocialActionsController {
       return this.socialActionsService.removeAsAdmin(id);
     }
     
-    const socialAction = await this.socialActionsService.findOne(id);
+    const socialAction = await this.socialActionsService.findOwnership(id);
     
     // Usuarios con permisos de eliminación pueden eliminar
     if (this.hasDeleteAccess(req)) {
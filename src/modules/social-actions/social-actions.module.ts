@@ -6,6 +6,7 @@ import { Foundation } from '../../entities/foundation.entity';
 import { ParticipationRequest } from '../../entities/participation_request.entity';
 import { SocialActionsController } from './social-actions.controller';
 import { SocialActionsService } from './social-actions.service';
+import { SocialActionFeedService } from './social-action-feed.service';
 import { FoundationsModule } from '../foundations/foundations.module';
 
 @Module({
@@ -14,7 +15,7 @@ import { FoundationsModule } from '../foundations/foundations.module';
     FoundationsModule
   ],
   controllers: [SocialActionsController],
-  providers: [SocialActionsService],
+  providers: [SocialActionsService, SocialActionFeedService],
   exports: [SocialActionsService],
 })
 export class SocialActionsModule {}
\ No newline at end of file
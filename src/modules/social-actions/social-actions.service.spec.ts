@@ -6,6 +6,8 @@ import { SocialAction } from '../../entities/social_action.entity';
 import { Foundation } from '../../entities/foundation.entity';
 import { ParticipationRequest, RequestStatus } from '../../entities/participation_request.entity';
 import { NotFoundException, ForbiddenException } from '@nestjs/common';
+import { SocialActionFeedService } from './social-action-feed.service';
+import { mockQueryBuilder } from '../../shared/pagination/query-builder.mock';
 
 describe('SocialActionsService', () => {
   let service: SocialActionsService;
@@ -16,10 +18,12 @@ describe('SocialActionsService', () => {
   const mockSocialActionRepo = {
     find: jest.fn(),
     findOne: jest.fn(),
+    exists: jest.fn(),
     create: jest.fn(),
     save: jest.fn(),
     update: jest.fn(),
     delete: jest.fn(),
+    createQueryBuilder: jest.fn(),
   };
 
   const mockFoundationRepo = {
@@ -28,10 +32,18 @@ describe('SocialActionsService', () => {
 
   const mockParticipationRequestRepo = {
     findOne: jest.fn(),
+    exists: jest.fn(),
     create: jest.fn(),
     save: jest.fn(),
   };
 
+  // Sin caché: serializa lo que calcula el loader en un instante fijo
+  const now = new Date('2026-01-01T12:00:00Z');
+  const mockFeedService = {
+    getOrLoad: jest.fn(async (feed, loader) => JSON.stringify(await loader(now))),
+    invalidate: jest.fn(),
+  };
+
   beforeEach(async () => {
     const module: TestingModule = await Test.createTestingModule({
       providers: [
@@ -39,6 +51,7 @@ describe('SocialActionsService', () => {
         { provide: getRepositoryToken(SocialAction), useValue: mockSocialActionRepo },
         { provide: getRepositoryToken(Foundation), useValue: mockFoundationRepo },
         { provide: getRepositoryToken(ParticipationRequest), useValue: mockParticipationRequestRepo },
+        { provide: SocialActionFeedService, useValue: mockFeedService },
       ],
     }).compile();
 
@@ -83,15 +96,16 @@ describe('SocialActionsService', () => {
 
       const result = await service.create({ foundation_id: 'f1' } as any, 'u1');
       expect(result).toBe(action);
+      expect(mockFeedService.invalidate).toHaveBeenCalled();
     });
   });
 
   describe('findAll', () => {
-    it('debería retornar todas las acciones sociales', async () => {
+    it('debería retornar la primera página de acciones sociales', async () => {
       const actions = [{ id: 's1' }];
-      mockSocialActionRepo.find.mockResolvedValue(actions);
+      mockSocialActionRepo.createQueryBuilder.mockReturnValue(mockQueryBuilder('social_action', actions));
       const result = await service.findAll();
-      expect(result).toEqual(actions);
+      expect(result).toEqual({ items: actions, next_cursor: null });
     });
   });
 
@@ -106,6 +120,46 @@ describe('SocialActionsService', () => {
       mockSocialActionRepo.findOne.mockResolvedValue(action);
       const result = await service.findOne('s1');
       expect(result).toBe(action);
+      expect(mockSocialActionRepo.findOne).toHaveBeenCalledWith(
+        expect.objectContaining({ relations: ['foundation'] }),
+      );
+    });
+
+    it('debería cargar las relaciones pedidas en consultas separadas', async () => {
+      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1' });
+      await service.findOne('s1', ['comments', 'foundation', 'ratings']);
+
+      expect(mockSocialActionRepo.findOne).toHaveBeenCalledWith({
+        where: { id: 's1' },
+        relations: ['foundation', 'comments', 'ratings'],
+        relationLoadStrategy: 'query',
+      });
+    });
+  });
+
+  describe('assertExists', () => {
+    it('debería lanzar error si no existe', async () => {
+      mockSocialActionRepo.exists.mockResolvedValue(false);
+      await expect(service.assertExists('s1')).rejects.toThrow(NotFoundException);
+    });
+
+    it('no debería cargar la acción social', async () => {
+      mockSocialActionRepo.exists.mockResolvedValue(true);
+      await expect(service.assertExists('s1')).resolves.toBeUndefined();
+      expect(mockSocialActionRepo.findOne).not.toHaveBeenCalled();
+    });
+  });
+
+  describe('findOwnership', () => {
+    it('debería seleccionar solo el id y la fundación', async () => {
+      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1', foundation_id: 'f1' });
+
+      const result = await service.findOwnership('s1');
+      expect(result).toEqual({ id: 's1', foundation_id: 'f1' });
+      expect(mockSocialActionRepo.findOne).toHaveBeenCalledWith({
+        where: { id: 's1' },
+        select: { id: true, foundation_id: true },
+      });
     });
   });
 
@@ -146,32 +200,50 @@ describe('SocialActionsService', () => {
   });
 
 
+  describe('findActiveFeed', () => {
+    it('debería vencer cuando termina la primera activa o empieza la próxima', async () => {
+      const actions = [{ id: 's1', end_date: new Date('2026-01-01T18:00:00Z') }];
+      mockSocialActionRepo.find.mockResolvedValue(actions);
+      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's2', start_date: new Date('2026-01-01T15:00:00Z') });
+
+      const json = await service.findActiveFeed();
+      expect(JSON.parse(json)).toEqual({
+        items: [{ id: 's1', end_date: '2026-01-01T18:00:00.000Z' }],
+        changesAt: '2026-01-01T15:00:00.000Z',
+      });
+      expect(mockSocialActionRepo.find).toHaveBeenCalledWith(expect.objectContaining({
+        where: { start_date: LessThanOrEqual(now), end_date: MoreThanOrEqual(now) },
+      }));
+    });
+  });
+
   describe('remove', () => {
     it('debería eliminar la acción', async () => {
       mockSocialActionRepo.delete.mockResolvedValue({ affected: 1 });
       await expect(service.remove('s1')).resolves.toBeUndefined();
+      expect(mockFeedService.invalidate).toHaveBeenCalled();
     });
 
     it('debería lanzar error si no se encuentra', async () => {
       mockSocialActionRepo.delete.mockResolvedValue({ affected: 0 });
       await expect(service.remove('s1')).rejects.toThrow(NotFoundException);
+      expect(mockFeedService.invalidate).not.toHaveBeenCalled();
     });
   });
 
   describe('applyToSocialAction', () => {
     it('debería lanzar error si ya hay una solicitud', async () => {
-      mockSocialActionRepo.findOne.mockResolvedValue({ id: 's1' });
-      mockParticipationRequestRepo.findOne.mockResolvedValue({ id: 'r1' });
+      mockSocialActionRepo.exists.mockResolvedValue(true);
+      mockParticipationRequestRepo.exists.mockResolvedValue(true);
 
       await expect(service.applyToSocialAction('s1', 'u1', {})).rejects.toThrow(ForbiddenException);
     });
 
     it('debería crear una solicitud válida', async () => {
-      const action = { id: 's1' };
       const newRequest = { id: 'r2' };
 
-      mockSocialActionRepo.findOne.mockResolvedValue(action);
-      mockParticipationRequestRepo.findOne.mockResolvedValue(null);
+      mockSocialActionRepo.exists.mockResolvedValue(true);
+      mockParticipationRequestRepo.exists.mockResolvedValue(false);
       mockParticipationRequestRepo.create.mockReturnValue(newRequest);
       mockParticipationRequestRepo.save.mockResolvedValue(newRequest);
 
@@ -8,7 +8,13 @@ import { Foundation } from '../../entities/foundation.entity';
 import { ParticipationRequest, RequestStatus } from '../../entities/participation_request.entity';
 import { CreateSocialActionDto } from './dto/create-social-action.dto';
 import { UpdateSocialActionDto } from './dto/update-social-action.dto';
+import { CursorPage, CursorPaginationDto, paginateByCursor } from '../../shared/pagination/cursor-pagination';
 import { ApplyToSocialActionDto } from './dto/apply-to-social-action.dto';
+import { SocialActionRelation } from './dto/social-action-include.dto';
+import { SocialActionFeedService } from './social-action-feed.service';
+
+// Relación que el detalle siempre incluye: una sola fila por acción social
+const DEFAULT_RELATIONS: SocialActionRelation[] = ['foundation'];
 
 @Injectable()
 export class SocialActionsService {
@@ -19,6 +25,7 @@ export class SocialActionsService {
     private foundationsRepository: Repository<Foundation>,
     @InjectRepository(ParticipationRequest)
     private participationRequestsRepository: Repository<ParticipationRequest>,
+    private feedService: SocialActionFeedService,
   ) {}
 
   private isAdminWithWriteAccess(email: string): boolean {
@@ -46,14 +53,17 @@ export class SocialActionsService {
     
     // Crear y guardar la nueva acción social sin verificar permisos
     const newSocialAction = this.socialActionsRepository.create(createSocialActionDto);
-    return this.socialActionsRepository.save(newSocialAction);
+    const saved = await this.socialActionsRepository.save(newSocialAction);
+    this.feedService.invalidate();
+    return saved;
   }
 
   async updateAsAdmin(id: string, updateSocialActionDto: UpdateSocialActionDto): Promise<SocialAction> {
-    const socialAction = await this.findOne(id);
+    await this.assertExists(id);
     
     // Actualizar la acción social sin verificar permisos
     await this.socialActionsRepository.update(id, updateSocialActionDto);
+    this.feedService.invalidate();
     
     // Devolver la acción social actualizada
     return this.findOne(id);
@@ -65,6 +75,7 @@ export class SocialActionsService {
     if (result.affected === 0) {
       throw new NotFoundException(`Social Action with ID "${id}" not found`);
     }
+    this.feedService.invalidate();
   }
 
   async applyToSocialActionAsAdmin(
@@ -73,7 +84,7 @@ export class SocialActionsService {
     applyDto: ApplyToSocialActionDto
   ): Promise<ParticipationRequest> {
     // Verificar que la acción social existe
-    const socialAction = await this.findOne(socialActionId);
+    await this.assertExists(socialActionId);
     
     // Crear la solicitud de participación sin verificar restricciones
     const newRequest = this.participationRequestsRepository.create({
@@ -134,20 +145,54 @@ export class SocialActionsService {
 
     // Crear y guardar la nueva acción social
     const newSocialAction = this.socialActionsRepository.create(createSocialActionDto);
-    return this.socialActionsRepository.save(newSocialAction);
+    const saved = await this.socialActionsRepository.save(newSocialAction);
+    this.feedService.invalidate();
+    return saved;
   }
 
-  async findAll(): Promise<SocialAction[]> {
-    return this.socialActionsRepository.find({
-      relations: ['foundation'],
-      order: { start_date: 'DESC' },
+  async findAll(page: CursorPaginationDto = {}): Promise<CursorPage<SocialAction>> {
+    const query = this.socialActionsRepository
+      .createQueryBuilder('social_action')
+      .leftJoinAndSelect('social_action.foundation', 'foundation');
+
+    return paginateByCursor(query, 'start_date', page);
+  }
+
+  /**
+   * Detalle de una acción social con su fundación y las relaciones de `include`.
+   *
+   * Solicitudes, comentarios y calificaciones pueden ser miles por acción, así
+   * que solo se cargan si se piden, y cada una en su propia consulta en vez
+   * de un JOIN que multiplicaría las filas entre sí.
+   */
+  async findOne(id: string, include: SocialActionRelation[] = []): Promise<SocialAction> {
+    const socialAction = await this.socialActionsRepository.findOne({
+      where: { id },
+      relations: [...new Set([...DEFAULT_RELATIONS, ...include])],
+      relationLoadStrategy: 'query',
     });
+
+    if (!socialAction) {
+      throw new NotFoundException(`Social Action with ID "${id}" not found`);
+    }
+
+    return socialAction;
   }
 
-  async findOne(id: string): Promise<SocialAction> {
+  // Comprobación de existencia sin cargar la acción social
+  async assertExists(id: string): Promise<void> {
+    const exists = await this.socialActionsRepository.exists({ where: { id } });
+
+    if (!exists) {
+      throw new NotFoundException(`Social Action with ID "${id}" not found`);
+    }
+  }
+
+  // Solo lo necesario para verificar a qué fundación pertenece la acción social
+  async findOwnership(id: string): Promise<Pick<SocialAction, 'id' | 'foundation_id'>> {
     const socialAction = await this.socialActionsRepository.findOne({
       where: { id },
-      relations: ['foundation', 'participation_requests', 'comments', 'ratings'],
+      select: { id: true, foundation_id: true },
     });
 
     if (!socialAction) {
@@ -164,8 +209,7 @@ export class SocialActionsService {
     });
   }
 
-  async findUpcoming(): Promise<SocialAction[]> {
-    const currentDate = new Date();
+  async findUpcoming(currentDate: Date = new Date()): Promise<SocialAction[]> {
     return this.socialActionsRepository.find({
       where: { start_date: MoreThan(currentDate) },
       relations: ['foundation'],
@@ -173,8 +217,7 @@ export class SocialActionsService {
     });
   }
 
-  async findActive(): Promise<SocialAction[]> {
-    const currentDate = new Date();
+  async findActive(currentDate: Date = new Date()): Promise<SocialAction[]> {
     return this.socialActionsRepository.find({
       where: { 
         start_date: LessThanOrEqual(currentDate),
@@ -185,23 +228,57 @@ export class SocialActionsService {
     });
   }
 
+  // Listados de la portada, ya serializados: ver SocialActionFeedService
+  findUpcomingFeed(): Promise<string> {
+    return this.feedService.getOrLoad('upcoming', async (now) => {
+      const items = await this.findUpcoming(now);
+      // La primera del listado deja de ser próxima cuando empieza
+      return { items, changesAt: items[0]?.start_date ?? null };
+    });
+  }
+
+  findActiveFeed(): Promise<string> {
+    return this.feedService.getOrLoad('active', async (now) => {
+      const [items, next] = await Promise.all([
+        this.findActive(now),
+        this.socialActionsRepository.findOne({
+          where: { start_date: MoreThan(now) },
+          select: { id: true, start_date: true },
+          order: { start_date: 'ASC' },
+        }),
+      ]);
+      // Cambia cuando termina la primera activa (justo después de su end_date)
+      // o cuando empieza la próxima
+      const changes: number[] = [];
+      if (items.length) {
+        changes.push(items[0].end_date.getTime() + 1);
+      }
+      if (next) {
+        changes.push(next.start_date.getTime());
+      }
+      return { items, changesAt: changes.length ? new Date(Math.min(...changes)) : null };
+    });
+  }
+
   async update(id: string, updateSocialActionDto: UpdateSocialActionDto, userEmail?: string): Promise<SocialAction> {
     // Si es admin@admin.com, permitir siempre
     if (userEmail && this.isFullAdmin(userEmail)) {
       return this.updateAsAdmin(id, updateSocialActionDto);
     }
     
-    const socialAction = await this.findOne(id);
+    await this.assertExists(id);
     
     // Si es un admin con permisos de escritura, no hace falta verificar
     if (userEmail && this.isAdminWithWriteAccess(userEmail)) {
       // Actualizar la acción social
       await this.socialActionsRepository.update(id, updateSocialActionDto);
+      this.feedService.invalidate();
       return this.findOne(id);
     }
     
     // Actualizar la acción social
     await this.socialActionsRepository.update(id, updateSocialActionDto);
+    this.feedService.invalidate();
     
     // Devolver la acción social actualizada
     return this.findOne(id);
@@ -219,6 +296,7 @@ export class SocialActionsService {
       if (result.affected === 0) {
         throw new NotFoundException(`Social Action with ID "${id}" not found`);
       }
+      this.feedService.invalidate();
       return;
     }
     
@@ -227,6 +305,7 @@ export class SocialActionsService {
     if (result.affected === 0) {
       throw new NotFoundException(`Social Action with ID "${id}" not found`);
     }
+    this.feedService.invalidate();
   }
 
   // Método para aplicar a una acción social (nuevo)
@@ -242,17 +321,17 @@ export class SocialActionsService {
     }
     
     // Verificar que la acción social existe
-    const socialAction = await this.findOne(socialActionId);
+    await this.assertExists(socialActionId);
     
     // Verificar si ya existe una solicitud pendiente
-    const existingRequest = await this.participationRequestsRepository.findOne({
+    const alreadyApplied = await this.participationRequestsRepository.exists({
       where: { 
         user_id: userId,
         social_action_id: socialActionId 
       }
     });
     
-    if (existingRequest) {
+    if (alreadyApplied) {
       throw new ForbiddenException('You have already applied to this social action');
     }
     
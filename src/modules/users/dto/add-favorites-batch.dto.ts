@@ -0,0 +1,13 @@
+import { Type } from 'class-transformer';
+import { ArrayMaxSize, ArrayMinSize, IsArray, ValidateNested } from 'class-validator';
+import { MAX_BATCH_SIZE } from '../../../shared/batch/batch';
+import { AddFavoriteDto } from './add-favorite.dto';
+
+export class AddFavoritesBatchDto {
+  @IsArray()
+  @ArrayMinSize(1)
+  @ArrayMaxSize(MAX_BATCH_SIZE)
+  @ValidateNested({ each: true })
+  @Type(() => AddFavoriteDto)
+  items: AddFavoriteDto[];
+}
@@ -0,0 +1,69 @@
+import { ConfigService } from '@nestjs/config';
+import { UserCacheService } from './user-cache.service';
+import { UserResponseDto } from './dto/user-response.dto';
+
+describe('UserCacheService', () => {
+  let service: UserCacheService;
+
+  const config = (values: Record<string, unknown>) =>
+    ({ get: (key: string) => values[key] }) as unknown as ConfigService;
+
+  const user = new UserResponseDto({ id: 'u1', email: 'a@b.com' });
+
+  beforeEach(() => {
+    service = new UserCacheService(config({ 'cache.userTtlMs': 1000, 'cache.userMaxEntries': 10 }));
+  });
+
+  it('should query the database only once per user', async () => {
+    const loader = jest.fn().mockResolvedValue(user);
+
+    await service.getOrLoad('u1', loader);
+    const result = await service.getOrLoad('u1', loader);
+
+    expect(result).toBe(user);
+    expect(loader).toHaveBeenCalledTimes(1);
+    expect(service.getStats()).toMatchObject({ hits: 1, misses: 1, hit_ratio: 0.5, size: 1 });
+  });
+
+  it('should share a single load between concurrent requests', async () => {
+    const loader = jest.fn().mockResolvedValue(user);
+
+    await Promise.all([service.getOrLoad('u1', loader), service.getOrLoad('u1', loader)]);
+    expect(loader).toHaveBeenCalledTimes(1);
+  });
+
+  it('should reload the user after invalidation', async () => {
+    const loader = jest.fn().mockResolvedValue(user);
+
+    await service.getOrLoad('u1', loader);
+    await service.invalidate('u1');
+    await service.getOrLoad('u1', loader);
+
+    expect(loader).toHaveBeenCalledTimes(2);
+    expect(service.getStats().invalidations).toBe(1);
+  });
+
+  it('should not cache a load that was invalidated while in flight', async () => {
+    let finish: (value: UserResponseDto) => void;
+    const slowLoader = jest.fn(() => new Promise<UserResponseDto>((resolve) => (finish = resolve)));
+
+    const pending = service.getOrLoad('u1', slowLoader);
+    await new Promise((resolve) => setImmediate(resolve));
+    await service.invalidate('u1');
+    finish(user);
+    await pending;
+
+    expect(service.getStats().size).toBe(0);
+  });
+
+  it('should not cache users that fail to load', async () => {
+    const loader = jest.fn().mockRejectedValue(new Error('not found'));
+
+    await expect(service.getOrLoad('u1', loader)).rejects.toThrow('not found');
+    expect(service.getStats().size).toBe(0);
+  });
+
+  it('should report that no shared backend is configured', () => {
+    expect(service.getStats().shared_backend).toBe(false);
+  });
+});
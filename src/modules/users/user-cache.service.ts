@@ -0,0 +1,135 @@
+// src/modules/users/user-cache.service.ts
+import { Injectable, Logger, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { LruTtlCache } from '../../shared/cache/lru-cache';
+import { RedisCache, SharedCache } from '../../shared/cache/redis-cache';
+import { UserResponseDto } from './dto/user-response.dto';
+
+export interface UserCacheStats {
+  hits: number;
+  shared_hits: number;
+  misses: number;
+  hit_ratio: number;
+  invalidations: number;
+  evictions: number;
+  shared_errors: number;
+  size: number;
+  max_entries: number;
+  ttl_ms: number;
+  shared_backend: boolean;
+}
+
+/**
+ * Caché de los usuarios que JwtStrategy carga en cada petición autenticada.
+ *
+ * Primer nivel: LRU en memoria con TTL. Segundo nivel opcional: Redis
+ * (CACHE_REDIS_URL), compartido entre instancias. UsersService invalida la
+ * entrada al actualizar o eliminar un usuario; en otras instancias la copia
+ * local expira a más tardar tras el TTL.
+ */
+@Injectable()
+export class UserCacheService implements OnModuleDestroy {
+  private readonly logger = new Logger(UserCacheService.name);
+  private readonly local: LruTtlCache<UserResponseDto>;
+  private readonly shared: SharedCache | null;
+  private readonly ttlMs: number;
+  // Cargas en curso por id: peticiones simultáneas del mismo usuario comparten una consulta
+  private readonly loading = new Map<string, Promise<UserResponseDto>>();
+  private readonly counters = { hits: 0, shared_hits: 0, misses: 0, invalidations: 0, shared_errors: 0 };
+
+  constructor(configService: ConfigService) {
+    this.ttlMs = configService.get('cache.userTtlMs') ?? 30000;
+    this.local = new LruTtlCache(configService.get('cache.userMaxEntries') ?? 10000, this.ttlMs);
+    const redisUrl = configService.get('cache.redisUrl');
+    this.shared = redisUrl ? new RedisCache(redisUrl) : null;
+  }
+
+  onModuleDestroy(): void {
+    this.shared?.close();
+  }
+
+  async getOrLoad(id: string, loader: () => Promise<UserResponseDto>): Promise<UserResponseDto> {
+    const cached = this.local.get(id);
+    if (cached) {
+      this.counters.hits++;
+      return cached;
+    }
+
+    const inFlight = this.loading.get(id);
+    if (inFlight) {
+      this.counters.hits++;
+      return inFlight;
+    }
+
+    const load = this.load(id, loader);
+    this.loading.set(id, load);
+    try {
+      const user = await load;
+      // Si se invalidó mientras cargaba, el resultado puede estar desactualizado
+      if (this.loading.get(id) === load) {
+        this.local.set(id, user);
+      }
+      return user;
+    } finally {
+      if (this.loading.get(id) === load) {
+        this.loading.delete(id);
+      }
+    }
+  }
+
+  async invalidate(id: string): Promise<void> {
+    this.counters.invalidations++;
+    this.local.delete(id);
+    this.loading.delete(id);
+    await this.sharedCall((shared) => shared.delete(this.sharedKey(id)));
+  }
+
+  getStats(): UserCacheStats {
+    const { hits, shared_hits, misses } = this.counters;
+    const lookups = hits + shared_hits + misses;
+    return {
+      ...this.counters,
+      hit_ratio: lookups ? (hits + shared_hits) / lookups : 0,
+      evictions: this.local.evictions,
+      size: this.local.size,
+      max_entries: this.local.maxEntries,
+      ttl_ms: this.ttlMs,
+      shared_backend: this.shared !== null,
+    };
+  }
+
+  private async load(id: string, loader: () => Promise<UserResponseDto>): Promise<UserResponseDto> {
+    const stored = await this.sharedCall((shared) => shared.get(this.sharedKey(id)));
+    if (stored) {
+      this.counters.shared_hits++;
+      return new UserResponseDto(JSON.parse(stored));
+    }
+
+    this.counters.misses++;
+    const user = await loader();
+    if (this.ttlMs > 0) {
+      await this.sharedCall((shared) => shared.set(this.sharedKey(id), JSON.stringify(user), this.ttlMs));
+    }
+    return user;
+  }
+
+  private sharedKey(id: string): string {
+    return `user:${id}`;
+  }
+
+  // Un fallo de Redis no debe tumbar la autenticación: se trata como un fallo de caché
+  private async sharedCall<T>(call: (shared: SharedCache) => Promise<T>): Promise<T | null> {
+    if (!this.shared) {
+      return null;
+    }
+    try {
+      return await call(this.shared);
+    } catch (error) {
+      // Con Redis caído cada petición fallaría aquí: se registra uno de cada mil errores
+      if (this.counters.shared_errors++ % 1000 === 0) {
+        this.logger.warn(`Shared user cache unavailable: ${error.message}`);
+      }
+      return null;
+    }
+  }
+}
@@ -16,11 +16,14 @@ import {
 } from '@nestjs/common';
 import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
 import { UsersService } from './users.service';
+import { UserCacheStats } from './user-cache.service';
 import { CreateUserDto } from './dto/create-user.dto';
 import { UpdateUserDto } from './dto/update-user.dto';
 import { UserResponseDto } from './dto/user-response.dto';
 import { AddFavoriteDto } from './dto/add-favorite.dto';
+import { AddFavoritesBatchDto } from './dto/add-favorites-batch.dto';
 import { FavoriteResponseDto } from './dto/favorite-response.dto';
+import { BatchResult } from '../../shared/batch/batch';
 
 @Controller()
 export class UsersController {
@@ -82,6 +85,17 @@ export class UsersController {
     throw new ForbiddenException('You do not have permission to view all users');
   }
 
+  // Contadores de la caché de usuarios autenticados, para dimensionarla
+  @UseGuards(JwtAuthGuard)
+  @Get('users/cache/stats')
+  getCacheStats(@Req() req): UserCacheStats {
+    if (!this.hasReadAccess(req)) {
+      throw new ForbiddenException('Only administrators can view cache statistics');
+    }
+
+    return this.usersService.getCacheStats();
+  }
+
   @UseGuards(JwtAuthGuard)
   @Get('users/:id')
   async findOne(
@@ -191,6 +205,23 @@ export class UsersController {
     return this.usersService.addFavorite(id, addFavoriteDto);
   }
 
+  // Alta de varios favoritos en una sola petición, con un resultado por elemento
+  @UseGuards(JwtAuthGuard)
+  @Post('users/:id/favorites/batch')
+  @HttpCode(HttpStatus.OK)
+  async addFavorites(
+    @Param('id', ParseUUIDPipe) id: string,
+    @Body() batchDto: AddFavoritesBatchDto,
+    @Req() req,
+  ): Promise<BatchResult<FavoriteResponseDto>> {
+    // Mismos permisos que el alta individual
+    if (!this.hasWriteAccess(req) && req.user.id !== id) {
+      throw new ForbiddenException('You do not have permission to add favorites for this user');
+    }
+
+    return this.usersService.addFavorites(id, batchDto.items);
+  }
+
   @UseGuards(JwtAuthGuard)
   @Delete('users/:id/favorites/:itemId')
   @HttpCode(HttpStatus.NO_CONTENT)
@@ -4,11 +4,13 @@ import { User } from '../../entities/user.entity';
 import { Favorite } from '../../entities/favorite.entity';
 import { UsersController } from './users.controller';
 import { UsersService } from './users.service';
+import { UserCacheService } from './user-cache.service';
+import { RatingSummariesModule } from '../ratings/rating-summaries.module';
 
 @Module({
-  imports: [TypeOrmModule.forFeature([User, Favorite])],
+  imports: [TypeOrmModule.forFeature([User, Favorite]), RatingSummariesModule],
   controllers: [UsersController],
-  providers: [UsersService],
+  providers: [UsersService, UserCacheService],
   exports: [UsersService],
 })
 export class UsersModule {}
\ No newline at end of file
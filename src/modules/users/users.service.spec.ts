@@ -3,9 +3,13 @@ import { UsersService } from './users.service';
 import { getRepositoryToken } from '@nestjs/typeorm';
 import { Repository } from 'typeorm';
 import * as bcrypt from 'bcrypt';
-import { User } from '../../entities/user.entity';
-import { Favorite } from '../../entities/favorite.entity';
+import { User, UserType } from '../../entities/user.entity';
+import { Favorite, FavoriteType } from '../../entities/favorite.entity';
+import { Foundation } from '../../entities/foundation.entity';
 import { ConflictException, NotFoundException } from '@nestjs/common';
+import { UserCacheService } from './user-cache.service';
+import { RatingSummariesService } from '../ratings/rating-summaries.service';
+import { PubSub } from '../../shared/pubsub/pubsub';
 
 jest.mock('bcrypt');
 
@@ -14,13 +18,23 @@ describe('UsersService', () => {
   let userRepo: Repository<User>;
   let favoriteRepo: Repository<Favorite>;
 
+  // EntityManager de las transacciones de addFavorites y remove
+  const mockManager = {
+    find: jest.fn(),
+    findOne: jest.fn(),
+    delete: jest.fn(),
+    create: jest.fn((_target, data) => ({ ...data })),
+    insert: jest.fn(async (_target, entities) => entities.forEach((entity, i) => (entity.id = `fav${i}`))),
+    transaction: jest.fn((work) => work(mockManager)),
+  };
+
   const mockUserRepo = {
     findOne: jest.fn(),
     find: jest.fn(),
     create: jest.fn(),
     save: jest.fn(),
     update: jest.fn(),
-    delete: jest.fn(),
+    manager: mockManager,
   };
 
   const mockFavoriteRepo = {
@@ -29,6 +43,21 @@ describe('UsersService', () => {
     create: jest.fn(),
     save: jest.fn(),
     remove: jest.fn(),
+    manager: mockManager,
+  };
+
+  const mockUserCache = {
+    getOrLoad: jest.fn((id, loader) => loader()),
+    invalidate: jest.fn(),
+    getStats: jest.fn(),
+  };
+
+  const mockRatingSummaries = {
+    subtractUserRatings: jest.fn(),
+  };
+
+  const mockPubSub = {
+    publish: jest.fn().mockResolvedValue(undefined),
   };
 
   beforeEach(async () => {
@@ -37,6 +66,9 @@ describe('UsersService', () => {
         UsersService,
         { provide: getRepositoryToken(User), useValue: mockUserRepo },
         { provide: getRepositoryToken(Favorite), useValue: mockFavoriteRepo },
+        { provide: UserCacheService, useValue: mockUserCache },
+        { provide: RatingSummariesService, useValue: mockRatingSummaries },
+        { provide: PubSub, useValue: mockPubSub },
       ],
     }).compile();
 
@@ -125,17 +157,60 @@ describe('UsersService', () => {
       const result = await service.update('u1', { password: 'newpass', name: 'Updated' });
       expect(result).toHaveProperty('id', 'u1');
     });
+
+    it('should invalidate the cached user', async () => {
+      mockUserRepo.findOne
+        .mockResolvedValueOnce({ id: 'u1', email: 'a@b.com' })
+        .mockResolvedValueOnce({ id: 'u1', email: 'a@b.com', name: 'Updated' });
+      mockUserRepo.update.mockResolvedValue(undefined);
+
+      await service.update('u1', { name: 'Updated' });
+      expect(mockUserCache.invalidate).toHaveBeenCalledWith('u1');
+    });
+  });
+
+  describe('findAuthenticated', () => {
+    it('should load the user through the cache', async () => {
+      mockUserRepo.findOne.mockResolvedValue({ id: 'u1', email: 'a@b.com' });
+
+      const result = await service.findAuthenticated('u1');
+      expect(mockUserCache.getOrLoad).toHaveBeenCalledWith('u1', expect.any(Function));
+      expect(result).toHaveProperty('id', 'u1');
+    });
   });
 
   describe('remove', () => {
     it('should remove user', async () => {
-      mockUserRepo.delete.mockResolvedValue({ affected: 1 });
+      mockManager.findOne.mockResolvedValue({ id: 'u1', user_type: UserType.USER });
+      mockManager.delete.mockResolvedValue({ affected: 1 });
       await expect(service.remove('u1')).resolves.toBeUndefined();
+      expect(mockUserCache.invalidate).toHaveBeenCalledWith('u1');
+      expect(mockPubSub.publish).not.toHaveBeenCalled();
+    });
+
+    it('should invalidate the social action feeds when removing a foundation user', async () => {
+      mockManager.findOne.mockResolvedValue({ id: 'u1', user_type: UserType.FOUNDATION });
+      mockManager.delete.mockResolvedValue({ affected: 1 });
+      await service.remove('u1');
+      expect(mockPubSub.publish).toHaveBeenCalledWith('social-action-feed', 'invalidate');
+    });
+
+    it('should subtract the user ratings from the summaries before the cascade delete', async () => {
+      mockManager.findOne.mockResolvedValue({ id: 'u1', user_type: UserType.USER });
+      mockManager.delete.mockResolvedValue({ affected: 1 });
+      await service.remove('u1');
+
+      expect(mockRatingSummaries.subtractUserRatings).toHaveBeenCalledWith(mockManager, 'u1');
+      expect(mockRatingSummaries.subtractUserRatings.mock.invocationCallOrder[0]).toBeLessThan(
+        mockManager.delete.mock.invocationCallOrder[0],
+      );
     });
 
     it('should throw if user not found', async () => {
-      mockUserRepo.delete.mockResolvedValue({ affected: 0 });
+      mockManager.findOne.mockResolvedValue(null);
       await expect(service.remove('u1')).rejects.toThrow(NotFoundException);
+      expect(mockManager.delete).not.toHaveBeenCalled();
+      expect(mockUserCache.invalidate).not.toHaveBeenCalled();
     });
   });
 
@@ -182,6 +257,36 @@ describe('UsersService', () => {
     });
   });
 
+  describe('addFavorites', () => {
+    it('should throw if user not found', async () => {
+      mockUserRepo.findOne.mockResolvedValue(null);
+      await expect(
+        service.addFavorites('u1', [{ item_id: 'fo1', item_type: FavoriteType.FOUNDATION }]),
+      ).rejects.toThrow(NotFoundException);
+    });
+
+    it('should insert new favorites once and report missing items and duplicates', async () => {
+      mockUserRepo.findOne.mockResolvedValue({ id: 'u1' });
+      mockManager.find.mockImplementation(async (target) => {
+        if (target === Foundation) return [{ id: 'fo1' }, { id: 'fo2' }];
+        if (target === Favorite) return [{ item_id: 'fo2', item_type: FavoriteType.FOUNDATION }];
+        return [];
+      });
+
+      const result = await service.addFavorites('u1', [
+        { item_id: 'fo1', item_type: FavoriteType.FOUNDATION },
+        { item_id: 'fo1', item_type: FavoriteType.FOUNDATION },
+        { item_id: 'fo2', item_type: FavoriteType.FOUNDATION },
+        { item_id: 'sa1', item_type: FavoriteType.OPPORTUNITY },
+      ]);
+
+      expect(mockManager.insert).toHaveBeenCalledTimes(1);
+      expect(result.created).toBe(1);
+      expect(result.results.map((item) => item.status)).toEqual([201, 409, 409, 404]);
+      expect(result.results[0].data).toMatchObject({ id: 'fav0', user_id: 'u1', item_id: 'fo1' });
+    });
+  });
+
   describe('removeFavorite', () => {
     it('should remove favorite if found', async () => {
       const fav = { id: 'f1' };
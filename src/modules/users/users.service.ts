@@ -1,22 +1,41 @@
-import { Injectable, NotFoundException, ConflictException } from '@nestjs/common';
+import { Injectable, Logger, NotFoundException, ConflictException } from '@nestjs/common';
 import { InjectRepository } from '@nestjs/typeorm';
-import { Repository } from 'typeorm';
+import { In, Repository } from 'typeorm';
 import * as bcrypt from 'bcrypt';
-import { User } from '../../entities/user.entity';
+import { User, UserType } from '../../entities/user.entity';
 import { Favorite, FavoriteType } from '../../entities/favorite.entity';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
 import { CreateUserDto } from './dto/create-user.dto';
 import { UpdateUserDto } from './dto/update-user.dto';
 import { UserResponseDto } from './dto/user-response.dto';
 import { AddFavoriteDto } from './dto/add-favorite.dto';
 import { FavoriteResponseDto } from './dto/favorite-response.dto';
+import { UserCacheService, UserCacheStats } from './user-cache.service';
+import { RatingSummariesService } from '../ratings/rating-summaries.service';
+import { PubSub } from '../../shared/pubsub/pubsub';
+import { SOCIAL_ACTION_FEED_CHANNEL } from '../social-actions/social-action-feed.service';
+import {
+  BatchItemResult,
+  BatchResult,
+  batchCreated,
+  batchFailed,
+  findExistingIds,
+  toBatchResult,
+} from '../../shared/batch/batch';
 
 @Injectable()
 export class UsersService {
+  private readonly logger = new Logger(UsersService.name);
+
   constructor(
     @InjectRepository(User)
     private usersRepository: Repository<User>,
     @InjectRepository(Favorite)
     private favoritesRepository: Repository<Favorite>,
+    private userCache: UserCacheService,
+    private ratingSummariesService: RatingSummariesService,
+    private pubsub: PubSub,
   ) {}
 
   async create(createUserDto: CreateUserDto): Promise<UserResponseDto> {
@@ -57,6 +76,15 @@ export class UsersService {
     return new UserResponseDto(user);
   }
 
+  // Usuario autenticado de cada petición (JwtStrategy); pasa por la caché
+  async findAuthenticated(id: string): Promise<UserResponseDto> {
+    return this.userCache.getOrLoad(id, () => this.findOne(id));
+  }
+
+  getCacheStats(): UserCacheStats {
+    return this.userCache.getStats();
+  }
+
   async findByEmail(email: string): Promise<User> {
     const user = await this.usersRepository.findOne({ where: { email } });
     
@@ -92,19 +120,40 @@ export class UsersService {
 
     // Actualizar usuario
     await this.usersRepository.update(id, updateUserDto);
+    await this.userCache.invalidate(id);
     const updatedUser = await this.usersRepository.findOne({ where: { id } });
     
     return new UserResponseDto(updatedUser);
   }
 
   async remove(id: string): Promise<void> {
-    const result = await this.usersRepository.delete(id);
-    
-    if (result.affected === 0) {
-      throw new NotFoundException(`User with ID "${id}" not found`);
+    const user = await this.usersRepository.manager.transaction(async (manager) => {
+      const user = await manager.findOne(User, { where: { id } });
+
+      if (!user) {
+        throw new NotFoundException(`User with ID "${id}" not found`);
+      }
+
+      // Sus calificaciones se borran en cascada: primero se descuentan de los resúmenes
+      await this.ratingSummariesService.subtractUserRatings(manager, id);
+      await manager.delete(User, id);
+      return user;
+    });
+
+    await this.userCache.invalidate(id);
+
+    // Su fundación y las acciones sociales de esta se borran en cascada
+    if (user.user_type === UserType.FOUNDATION) {
+      this.invalidateSocialActionFeeds();
     }
   }
 
+  private invalidateSocialActionFeeds(): void {
+    this.pubsub
+      .publish(SOCIAL_ACTION_FEED_CHANNEL, 'invalidate')
+      .catch((error) => this.logger.warn(`Could not publish feed invalidation: ${error.message}`));
+  }
+
   // Métodos para favoritos
   async getFavorites(userId: string): Promise<FavoriteResponseDto[]> {
     const user = await this.usersRepository.findOne({ where: { id: userId } });
@@ -151,6 +200,66 @@ export class UsersService {
     return new FavoriteResponseDto(savedFavorite);
   }
 
+  /**
+   * Añade varios favoritos de un usuario en una transacción.
+   *
+   * Fundaciones, acciones sociales y favoritos ya existentes se consultan con
+   * un IN (...) por tabla; los favoritos válidos se insertan con un único
+   * INSERT multi-fila. Los repetidos, ya sea en la base o dentro del mismo
+   * lote, se devuelven como conflicto.
+   */
+  async addFavorites(userId: string, items: AddFavoriteDto[]): Promise<BatchResult<FavoriteResponseDto>> {
+    const user = await this.usersRepository.findOne({ where: { id: userId } });
+
+    if (!user) {
+      throw new NotFoundException(`User with ID "${userId}" not found`);
+    }
+
+    return this.favoritesRepository.manager.transaction(async (manager) => {
+      const idsOfType = (type: FavoriteType) =>
+        items.filter((item) => item.item_type === type).map((item) => item.item_id);
+      const foundationIds = await findExistingIds(manager, Foundation, idsOfType(FavoriteType.FOUNDATION));
+      const socialActionIds = await findExistingIds(manager, SocialAction, idsOfType(FavoriteType.OPPORTUNITY));
+
+      const existingFavorites = await manager.find(Favorite, {
+        where: { user_id: userId, item_id: In([...new Set(items.map((item) => item.item_id))]) },
+      });
+      const favoriteKey = (item: AddFavoriteDto) => `${item.item_type}:${item.item_id}`;
+      const seen = new Set(existingFavorites.map(favoriteKey));
+
+      const results: BatchItemResult<FavoriteResponseDto>[] = [];
+      const accepted: number[] = [];
+      items.forEach((item, index) => {
+        if (item.item_type === FavoriteType.FOUNDATION && !foundationIds.has(item.item_id)) {
+          results.push(batchFailed(index, new NotFoundException(`Foundation with ID "${item.item_id}" not found`)));
+        } else if (item.item_type === FavoriteType.OPPORTUNITY && !socialActionIds.has(item.item_id)) {
+          results.push(batchFailed(index, new NotFoundException(`Social Action with ID "${item.item_id}" not found`)));
+        } else if (seen.has(favoriteKey(item))) {
+          results.push(batchFailed(index, new ConflictException('This item is already in favorites')));
+        } else {
+          seen.add(favoriteKey(item));
+          accepted.push(index);
+        }
+      });
+
+      const newFavorites = accepted.map((index) =>
+        manager.create(Favorite, {
+          user_id: userId,
+          item_id: items[index].item_id,
+          item_type: items[index].item_type,
+        }),
+      );
+      if (newFavorites.length) {
+        await manager.insert(Favorite, newFavorites);
+      }
+      accepted.forEach((index, position) =>
+        results.push(batchCreated(index, new FavoriteResponseDto(newFavorites[position]))),
+      );
+
+      return toBatchResult(results);
+    });
+  }
+
   async removeFavorite(userId: string, itemId: string): Promise<void> {
     const favorite = await this.favoritesRepository.findOne({
       where: { 
@@ -0,0 +1,39 @@
+import { NotFoundException } from '@nestjs/common';
+import { User } from '../../entities/user.entity';
+import { batchCreated, batchFailed, findExistingIds, toBatchResult } from './batch';
+
+describe('batch', () => {
+  describe('toBatchResult', () => {
+    it('debería ordenar los resultados por índice y contarlos', () => {
+      const result = toBatchResult([
+        batchCreated(2, { id: 'b' }),
+        batchFailed(1, new NotFoundException('User with ID "u2" not found')),
+        batchCreated(0, { id: 'a' }),
+      ]);
+
+      expect(result.created).toBe(2);
+      expect(result.failed).toBe(1);
+      expect(result.results.map((item) => item.index)).toEqual([0, 1, 2]);
+      expect(result.results[1]).toEqual({ index: 1, status: 404, error: 'User with ID "u2" not found' });
+    });
+  });
+
+  describe('findExistingIds', () => {
+    it('debería consultar cada id una sola vez', async () => {
+      const manager: any = { find: jest.fn().mockResolvedValue([{ id: 'u1' }]) };
+
+      const ids = await findExistingIds(manager, User, ['u1', 'u2', 'u1']);
+
+      expect(ids).toEqual(new Set(['u1']));
+      expect(manager.find).toHaveBeenCalledTimes(1);
+      expect(manager.find.mock.calls[0][1].where.id.value).toEqual(['u1', 'u2']);
+    });
+
+    it('no debería consultar si no hay ids', async () => {
+      const manager: any = { find: jest.fn() };
+
+      expect(await findExistingIds(manager, User, [])).toEqual(new Set());
+      expect(manager.find).not.toHaveBeenCalled();
+    });
+  });
+});
@@ -0,0 +1,53 @@
+// src/shared/batch/batch.ts
+import { HttpException, HttpStatus } from '@nestjs/common';
+import { EntityManager, EntityTarget, FindManyOptions, In } from 'typeorm';
+
+// Elementos por petición: mantiene el INSERT multi-fila lejos del límite de
+// parámetros de Postgres (65535)
+export const MAX_BATCH_SIZE = 500;
+
+export interface BatchItemResult<T> {
+  index: number;
+  status: number;
+  data?: T;
+  error?: string;
+}
+
+export interface BatchResult<T> {
+  created: number;
+  failed: number;
+  results: BatchItemResult<T>[];
+}
+
+export function batchCreated<T>(index: number, data: T): BatchItemResult<T> {
+  return { index, status: HttpStatus.CREATED, data };
+}
+
+// Reutiliza el estado y el mensaje de la excepción que lanzaría el endpoint individual
+export function batchFailed<T>(index: number, error: HttpException): BatchItemResult<T> {
+  return { index, status: error.getStatus(), error: error.message };
+}
+
+export function toBatchResult<T>(results: BatchItemResult<T>[]): BatchResult<T> {
+  results.sort((a, b) => a.index - b.index);
+  const created = results.filter((result) => result.status === HttpStatus.CREATED).length;
+  return { created, failed: results.length - created, results };
+}
+
+// Ids de `ids` que existen en la tabla de `target`, con una sola consulta IN (...)
+export async function findExistingIds<T extends { id: string }>(
+  manager: EntityManager,
+  target: EntityTarget<T>,
+  ids: string[],
+): Promise<Set<string>> {
+  const unique = [...new Set(ids)];
+  if (!unique.length) {
+    return new Set();
+  }
+
+  const rows = await manager.find(target, {
+    select: { id: true },
+    where: { id: In(unique) },
+  } as FindManyOptions<T>);
+  return new Set(rows.map((row) => row.id));
+}
@@ -0,0 +1,43 @@
+import { LruTtlCache } from './lru-cache';
+
+describe('LruTtlCache', () => {
+  let now: number;
+  const clock = () => now;
+
+  beforeEach(() => {
+    now = 0;
+  });
+
+  it('debería devolver el valor guardado', () => {
+    const cache = new LruTtlCache<string>(2, 1000, clock);
+    cache.set('a', 'uno');
+    expect(cache.get('a')).toBe('uno');
+  });
+
+  it('debería descartar las entradas vencidas', () => {
+    const cache = new LruTtlCache<string>(2, 1000, clock);
+    cache.set('a', 'uno');
+    now = 1000;
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.size).toBe(0);
+  });
+
+  it('debería expulsar la entrada menos usada al superar el máximo', () => {
+    const cache = new LruTtlCache<string>(2, 1000, clock);
+    cache.set('a', 'uno');
+    cache.set('b', 'dos');
+    cache.get('a');
+    cache.set('c', 'tres');
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBe('uno');
+    expect(cache.get('c')).toBe('tres');
+    expect(cache.evictions).toBe(1);
+  });
+
+  it('no debería guardar nada si está desactivada', () => {
+    const cache = new LruTtlCache<string>(0, 1000, clock);
+    cache.set('a', 'uno');
+    expect(cache.get('a')).toBeUndefined();
+  });
+});
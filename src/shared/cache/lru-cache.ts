@@ -0,0 +1,66 @@
+// src/shared/cache/lru-cache.ts
+
+interface CacheEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * Caché en memoria acotada por cantidad de entradas y por tiempo de vida.
+ *
+ * El `Map` conserva el orden de inserción: cada lectura vuelve a insertar la
+ * entrada al final, así la primera clave es siempre la menos usada y es la
+ * que se descarta al superar `maxEntries`.
+ */
+export class LruTtlCache<V> {
+  private readonly entries = new Map<string, CacheEntry<V>>();
+  evictions = 0;
+
+  constructor(
+    readonly maxEntries: number,
+    readonly ttlMs: number,
+    private readonly now: () => number = Date.now,
+  ) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    if (entry.expiresAt <= this.now()) {
+      return undefined;
+    }
+
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key: string, value: V): void {
+    if (this.maxEntries <= 0 || this.ttlMs <= 0) {
+      return;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + this.ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      this.entries.delete(oldestKey);
+      this.evictions++;
+    }
+  }
+
+  delete(key: string): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+}
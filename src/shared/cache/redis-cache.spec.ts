@@ -0,0 +1,143 @@
+import { AddressInfo, createServer, Server, Socket } from 'net';
+import { encodeCommand, parseReply, RedisCache } from './redis-cache';
+
+describe('redis-cache', () => {
+  describe('encodeCommand', () => {
+    it('debería codificar el comando en RESP', () => {
+      expect(encodeCommand(['SET', 'user:1', 'ñ'])).toBe('*3\r\n$3\r\nSET\r\n$6\r\nuser:1\r\n$2\r\nñ\r\n');
+    });
+  });
+
+  describe('parseReply', () => {
+    it('debería leer respuestas simples, enteros y nulos', () => {
+      expect(parseReply(Buffer.from('+OK\r\n'))).toEqual(['OK', 5]);
+      expect(parseReply(Buffer.from(':1\r\n'))).toEqual([1, 4]);
+      expect(parseReply(Buffer.from('$-1\r\n'))).toEqual([null, 5]);
+    });
+
+    it('debería leer un bulk string completo', () => {
+      expect(parseReply(Buffer.from('$5\r\nhello\r\n'))).toEqual(['hello', 11]);
+    });
+
+    it('debería esperar si la respuesta llegó incompleta', () => {
+      expect(parseReply(Buffer.from('$5\r\nhel'))).toBeNull();
+      expect(parseReply(Buffer.from('*2\r\n:1\r\n'))).toBeNull();
+    });
+
+    it('debería devolver los errores de Redis como Error', () => {
+      const [value] = parseReply(Buffer.from('-ERR wrong\r\n'));
+      expect(value).toBeInstanceOf(Error);
+    });
+
+    it('debería continuar desde el offset indicado', () => {
+      const buffer = Buffer.from('+OK\r\n:7\r\n');
+      expect(parseReply(buffer, 5)).toEqual([7, 9]);
+    });
+  });
+
+  describe('RedisCache', () => {
+    let server: Server;
+    let url: string;
+    let cache: RedisCache;
+    let connections: Socket[];
+    let commands: string[][];
+    // Respuesta del servidor simulado a cada comando recibido
+    let onCommand: (args: string[], socket: Socket) => void;
+
+    const wait = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+    beforeEach(async () => {
+      connections = [];
+      commands = [];
+      server = createServer((socket) => {
+        connections.push(socket);
+        let buffer = Buffer.alloc(0);
+        socket.on('data', (chunk) => {
+          buffer = Buffer.concat([buffer, chunk]);
+          let command: ReturnType<typeof parseReply>;
+          while ((command = parseReply(buffer))) {
+            buffer = buffer.subarray(command[1]);
+            commands.push(command[0] as string[]);
+            onCommand(command[0] as string[], socket);
+          }
+        });
+        socket.on('error', () => undefined);
+      });
+      await new Promise<void>((resolve) => server.listen(0, '127.0.0.1', resolve));
+      url = `redis://127.0.0.1:${(server.address() as AddressInfo).port}/2`;
+      onCommand = (args, socket) => socket.write('+OK\r\n');
+    });
+
+    afterEach(async () => {
+      cache.close();
+      connections.forEach((socket) => socket.destroy());
+      await new Promise((resolve) => server.close(resolve));
+    });
+
+    it('debería armar una respuesta que llega partida en varios paquetes', async () => {
+      cache = new RedisCache(url);
+      onCommand = (args, socket) => {
+        if (args[0] !== 'GET') {
+          return socket.write('+OK\r\n');
+        }
+        // El corte cae dentro de la "ñ", que ocupa dos bytes
+        const reply = Buffer.from('$6\r\nniño!\r\n');
+        socket.write(reply.subarray(0, 7));
+        setTimeout(() => socket.write(reply.subarray(7)), 10);
+      };
+
+      await expect(cache.get('user:1')).resolves.toBe('niño!');
+    });
+
+    it('debería repartir varias respuestas llegadas en un solo paquete', async () => {
+      cache = new RedisCache(url);
+      const replies: string[] = [];
+      onCommand = (args, socket) => {
+        replies.push({ SELECT: '+OK\r\n', GET: '$1\r\na\r\n', DEL: ':1\r\n' }[args[0]]);
+        // SELECT, GET y DEL se responden juntos
+        if (replies.length === 3) {
+          socket.write(replies.join(''));
+        }
+      };
+
+      await expect(Promise.all([cache.get('a'), cache.delete('b')])).resolves.toEqual(['a', undefined]);
+    });
+
+    it('debería esperar antes de reconectar y repetir SELECT en la conexión nueva', async () => {
+      cache = new RedisCache(url, 250, 50);
+      onCommand = (args, socket) => (args[0] === 'GET' ? socket.destroy() : socket.write('+OK\r\n'));
+      await expect(cache.get('a')).rejects.toThrow();
+
+      onCommand = (args, socket) => socket.write(args[0] === 'GET' ? '$1\r\nb\r\n' : '+OK\r\n');
+      // Durante la espera falla al instante, sin abrir otra conexión
+      await expect(cache.get('a')).rejects.toThrow('waiting to reconnect');
+      expect(connections).toHaveLength(1);
+
+      await wait(60);
+      await expect(cache.get('a')).resolves.toBe('b');
+      expect(connections).toHaveLength(2);
+      expect(commands.filter(([name]) => name === 'SELECT')).toEqual([
+        ['SELECT', '2'],
+        ['SELECT', '2'],
+      ]);
+    });
+
+    it('debería descartar la conexión si una respuesta no llega a tiempo', async () => {
+      cache = new RedisCache(url, 20, 0);
+      onCommand = (args, socket) => args[0] === 'SELECT' && socket.write('+OK\r\n');
+      await expect(cache.get('a')).rejects.toThrow('did not answer');
+
+      // La conexión nueva empieza sin respuestas pendientes de la anterior
+      onCommand = (args, socket) => socket.write(args[0] === 'GET' ? '$1\r\nc\r\n' : '+OK\r\n');
+      await expect(cache.get('a')).resolves.toBe('c');
+      expect(connections).toHaveLength(2);
+    });
+
+    it('debería rechazar una respuesta ilegible sin romper el proceso', async () => {
+      cache = new RedisCache(url);
+      onCommand = (args, socket) => socket.write(args[0] === 'GET' ? '?bad\r\n' : '+OK\r\n');
+
+      await expect(cache.get('a')).rejects.toThrow('Unexpected Redis reply type');
+    });
+  });
+});
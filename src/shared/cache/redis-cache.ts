@@ -0,0 +1,225 @@
+// src/shared/cache/redis-cache.ts
+import { createConnection, Socket } from 'net';
+
+// Caché compartida entre instancias de la API; los valores se guardan como texto
+export interface SharedCache {
+  get(key: string): Promise<string | null>;
+  set(key: string, value: string, ttlMs: number): Promise<void>;
+  delete(key: string): Promise<void>;
+  close(): void;
+}
+
+export type RespValue = string | number | null | RespValue[];
+
+interface PendingReply {
+  resolve: (value: RespValue) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+}
+
+export function encodeCommand(args: string[]): string {
+  let command = `*${args.length}\r\n`;
+  for (const arg of args) {
+    command += `$${Buffer.byteLength(arg)}\r\n${arg}\r\n`;
+  }
+  return command;
+}
+
+/**
+ * Lee una respuesta RESP2 desde `offset`.
+ *
+ * Devuelve el valor y la posición siguiente, o `null` si la respuesta todavía
+ * no llegó completa. Los errores de Redis se devuelven como instancias de Error.
+ */
+export function parseReply(buffer: Buffer, offset = 0): [RespValue | Error, number] | null {
+  const lineEnd = buffer.indexOf('\r\n', offset);
+  if (lineEnd === -1) {
+    return null;
+  }
+
+  const type = String.fromCharCode(buffer[offset]);
+  const line = buffer.toString('utf8', offset + 1, lineEnd);
+  const next = lineEnd + 2;
+
+  switch (type) {
+    case '+':
+      return [line, next];
+    case '-':
+      return [new Error(line), next];
+    case ':':
+      return [Number(line), next];
+    case '$': {
+      const length = Number(line);
+      if (length === -1) {
+        return [null, next];
+      }
+      if (buffer.length < next + length + 2) {
+        return null;
+      }
+      return [buffer.toString('utf8', next, next + length), next + length + 2];
+    }
+    case '*': {
+      const count = Number(line);
+      if (count === -1) {
+        return [null, next];
+      }
+      const items: RespValue[] = [];
+      let position = next;
+      for (let i = 0; i < count; i++) {
+        const item = parseReply(buffer, position);
+        if (!item) {
+          return null;
+        }
+        items.push(item[0] as RespValue);
+        position = item[1];
+      }
+      return [items, position];
+    }
+    default:
+      throw new Error(`Unexpected Redis reply type "${type}"`);
+  }
+}
+
+/**
+ * Cliente Redis mínimo (GET, SET PX, DEL) sobre una sola conexión.
+ *
+ * Se usa en lugar de ioredis/redis para no sumar dependencias por tres
+ * comandos. Redis responde en el mismo orden en que recibe los comandos, así
+ * que basta una cola de promesas pendientes; las respuestas pueden llegar
+ * partidas entre varios paquetes y se acumulan hasta estar completas.
+ *
+ * Si la conexión falla o una respuesta tarda más de `timeoutMs`, la conexión
+ * se descarta (las respuestas siguientes quedarían desalineadas) y se vuelve
+ * a abrir en el primer comando tras una espera que se duplica con cada fallo
+ * seguido, hasta `maxRetryDelayMs`. Mientras tanto los comandos fallan al
+ * instante, así un Redis caído no suma `timeoutMs` a cada petición.
+ */
+export class RedisCache implements SharedCache {
+  private socket: Socket | null = null;
+  private buffer = Buffer.alloc(0);
+  private pending: PendingReply[] = [];
+  private failures = 0;
+  private retryAt = 0;
+
+  constructor(
+    private readonly url: string,
+    private readonly timeoutMs = 250,
+    private readonly retryDelayMs = 100,
+    private readonly maxRetryDelayMs = 5000,
+  ) {}
+
+  async get(key: string): Promise<string | null> {
+    return (await this.command(['GET', key])) as string | null;
+  }
+
+  async set(key: string, value: string, ttlMs: number): Promise<void> {
+    await this.command(['SET', key, value, 'PX', String(ttlMs)]);
+  }
+
+  async delete(key: string): Promise<void> {
+    await this.command(['DEL', key]);
+  }
+
+  close(): void {
+    this.reset(new Error('Redis connection closed'), false);
+  }
+
+  private command(args: string[]): Promise<RespValue> {
+    if (!this.socket && Date.now() < this.retryAt) {
+      return Promise.reject(new Error('Redis unavailable, waiting to reconnect'));
+    }
+
+    const socket = this.connection();
+    return new Promise((resolve, reject) => {
+      const timer = setTimeout(
+        () => this.reset(new Error(`Redis did not answer within ${this.timeoutMs}ms`)),
+        this.timeoutMs,
+      );
+      this.pending.push({ resolve, reject, timer });
+      socket.write(encodeCommand(args));
+    });
+  }
+
+  private connection(): Socket {
+    if (this.socket) {
+      return this.socket;
+    }
+
+    const { hostname, port, username, password, pathname } = new URL(this.url);
+    const socket = createConnection({ host: hostname, port: Number(port) || 6379 });
+    socket.setNoDelay(true);
+    socket.on('data', (chunk) => this.onData(chunk));
+    // Una conexión ya descartada no debe cerrar la que la reemplazó
+    socket.on('error', (error) => this.socket === socket && this.reset(error));
+    socket.on('close', () => this.socket === socket && this.reset(new Error('Redis connection closed')));
+    this.socket = socket;
+
+    // Autenticación y base de datos de la URL (redis://:clave@host:6379/0)
+    const setup: string[][] = [];
+    if (password) {
+      const secret = decodeURIComponent(password);
+      setup.push(username ? ['AUTH', decodeURIComponent(username), secret] : ['AUTH', secret]);
+    }
+    const database = pathname.replace('/', '');
+    if (database) {
+      setup.push(['SELECT', database]);
+    }
+    for (const args of setup) {
+      this.command(args).catch(() => undefined);
+    }
+
+    return socket;
+  }
+
+  private onData(chunk: Buffer): void {
+    this.buffer = this.buffer.length ? Buffer.concat([this.buffer, chunk]) : chunk;
+
+    let offset = 0;
+    let reply: [RespValue | Error, number] | null;
+    while (this.pending.length) {
+      try {
+        reply = parseReply(this.buffer, offset);
+      } catch (error) {
+        // Respuesta ilegible: no se puede saber dónde empieza la siguiente
+        this.reset(error);
+        return;
+      }
+      if (!reply) {
+        break;
+      }
+
+      const [value, next] = reply;
+      offset = next;
+      // La conexión responde: el próximo fallo vuelve a la espera inicial
+      this.failures = 0;
+      const waiting = this.pending.shift();
+      clearTimeout(waiting.timer);
+      if (value instanceof Error) {
+        waiting.reject(value);
+      } else {
+        waiting.resolve(value);
+      }
+    }
+    this.buffer = this.buffer.subarray(offset);
+  }
+
+  private reset(error: Error, failed = true): void {
+    const socket = this.socket;
+    this.socket = null;
+    this.buffer = Buffer.alloc(0);
+    socket?.destroy();
+
+    if (failed && socket) {
+      const delay = Math.min(this.retryDelayMs * 2 ** this.failures, this.maxRetryDelayMs);
+      this.failures++;
+      this.retryAt = Date.now() + delay;
+    }
+
+    const pending = this.pending;
+    this.pending = [];
+    for (const waiting of pending) {
+      clearTimeout(waiting.timer);
+      waiting.reject(error);
+    }
+  }
+}
@@ -0,0 +1,69 @@
+// src/shared/context/request-context.ts
+import { Logger } from '@nestjs/common';
+import { AsyncLocalStorage } from 'async_hooks';
+import { BatchLoader, LoaderStats, emptyLoaderStats } from '../loaders/batch-loader';
+
+// Consultas SQL ejecutadas durante una petición
+export interface QueryStats {
+  count: number;
+  durationMs: number;
+  slow: number;
+  errors: number;
+}
+
+export function emptyQueryStats(): QueryStats {
+  return { count: 0, durationMs: 0, slow: 0, errors: 0 };
+}
+
+// Estado que vive lo que dura una petición HTTP
+export interface RequestContext {
+  method: string;
+  // URL hasta que MetricsInterceptor conoce el patrón de la ruta
+  route: string;
+  startedAt: number;
+  loaders: Map<string, BatchLoader<unknown>>;
+  loaderStats: LoaderStats;
+  queries: QueryStats;
+}
+
+const storage = new AsyncLocalStorage<RequestContext>();
+const logger = new Logger('RequestContext');
+
+export function currentRequestContext(): RequestContext | undefined {
+  return storage.getStore();
+}
+
+// Ejecuta `callback` con un contexto propio; fuera de él no hay memoización
+export function runWithRequestContext<T>(callback: () => T, method = '', route = ''): T {
+  const context: RequestContext = {
+    method,
+    route,
+    startedAt: performance.now(),
+    loaders: new Map(),
+    loaderStats: emptyLoaderStats(),
+    queries: emptyQueryStats(),
+  };
+  return storage.run(context, callback);
+}
+
+/**
+ * Middleware de Express que abre un contexto por petición.
+ *
+ * Al terminar la respuesta registra (en debug) cuántas consultas SQL hizo la
+ * petición y cuántas búsquedas resolvieron los loaders, para detectar N+1.
+ */
+export function requestContextMiddleware(req, res, next): void {
+  runWithRequestContext(() => {
+    const context = currentRequestContext();
+    res.on('finish', () => {
+      const { queries, loaderStats } = context;
+      if (queries.count || loaderStats.lookups) {
+        logger.debug(
+          `${req.method} ${req.originalUrl}: ${queries.count} queries in ${queries.durationMs.toFixed(1)}ms, ` +
+            `${loaderStats.queries} loader queries for ${loaderStats.lookups} lookups (${loaderStats.hits} cached)`,
+        );
+      }
+    });
+    next();
+  }, req.method, req.path);
+}
@@ -0,0 +1,107 @@
+import { Writable } from 'stream';
+import { ExportRow, sendExport, streamQuery } from './export-stream';
+
+describe('export-stream', () => {
+  // Respuesta HTTP mínima que acumula lo escrito
+  const mockResponse = () => {
+    const chunks: string[] = [];
+    const res: any = new Writable({
+      write(chunk, _encoding, callback) {
+        chunks.push(chunk.toString());
+        callback();
+      },
+    });
+    res.setHeader = jest.fn();
+    res.body = () => chunks.join('');
+    return res;
+  };
+
+  async function* rowsOf(rows: ExportRow[]) {
+    yield* rows;
+  }
+
+  const mockQueryRunner = (batches: ExportRow[][]) => {
+    const fetches = [...batches];
+    const queryRunner = {
+      isTransactionActive: false,
+      connect: jest.fn(),
+      startTransaction: jest.fn(() => (queryRunner.isTransactionActive = true)),
+      commitTransaction: jest.fn(() => (queryRunner.isTransactionActive = false)),
+      rollbackTransaction: jest.fn(() => (queryRunner.isTransactionActive = false)),
+      release: jest.fn(),
+      query: jest.fn((sql: string) => (sql.startsWith('FETCH') ? fetches.shift() ?? [] : undefined)),
+    };
+    const manager: any = { connection: { createQueryRunner: () => queryRunner } };
+    const query: any = { getQueryAndParameters: () => ['SELECT 1', []] };
+    return { queryRunner, manager, query };
+  };
+
+  describe('streamQuery', () => {
+    it('debería leer el cursor por tandas hasta agotarlo', async () => {
+      const { queryRunner, manager, query } = mockQueryRunner([[{ id: 1 }, { id: 2 }], [{ id: 3 }]]);
+
+      const rows = [];
+      for await (const row of streamQuery(manager, query, 2)) {
+        rows.push(row);
+      }
+
+      expect(rows).toEqual([{ id: 1 }, { id: 2 }, { id: 3 }]);
+      expect(queryRunner.query).toHaveBeenCalledWith('DECLARE export_cursor NO SCROLL CURSOR FOR SELECT 1', []);
+      expect(queryRunner.query).toHaveBeenCalledWith('FETCH FORWARD 2 FROM export_cursor');
+      expect(queryRunner.commitTransaction).toHaveBeenCalled();
+      expect(queryRunner.release).toHaveBeenCalled();
+    });
+
+    it('debería liberar la conexión si el consumidor abandona la lectura', async () => {
+      const { queryRunner, manager, query } = mockQueryRunner([[{ id: 1 }, { id: 2 }], [{ id: 3 }, { id: 4 }]]);
+
+      for await (const row of streamQuery(manager, query, 2)) {
+        if (row.id === 1) {
+          break;
+        }
+      }
+
+      expect(queryRunner.rollbackTransaction).toHaveBeenCalled();
+      expect(queryRunner.release).toHaveBeenCalled();
+    });
+  });
+
+  describe('sendExport en NDJSON', () => {
+    it('debería escribir una línea JSON por fila', async () => {
+      const res = mockResponse();
+      await sendExport(res, { columns: ['id'], rows: rowsOf([{ id: 'a' }, { id: 'b' }]) }, 'donations');
+
+      expect(res.body()).toBe('{"id":"a"}\n{"id":"b"}\n');
+      expect(res.setHeader).toHaveBeenCalledWith('Content-Disposition', 'attachment; filename="donations.ndjson"');
+    });
+  });
+
+  describe('sendExport en CSV', () => {
+    it('debería escribir el encabezado y escapar los valores', async () => {
+      const res = mockResponse();
+      const rows = rowsOf([{ id: 'a', text: 'hola, "mundo"', date: new Date('2024-01-01T00:00:00Z') }, { id: 'b' }]);
+
+      await sendExport(res, { columns: ['id', 'text', 'date'], rows }, 'comments', 'csv');
+
+      expect(res.body()).toBe('id,text,date\na,"hola, ""mundo""",2024-01-01T00:00:00.000Z\nb,,\n');
+    });
+
+    it('debería escribir solo el encabezado si no hay filas', async () => {
+      const res = mockResponse();
+      await sendExport(res, { columns: ['id', 'text'], rows: rowsOf([]) }, 'comments', 'csv');
+      expect(res.body()).toBe('id,text\n');
+    });
+  });
+
+  describe('sendExport', () => {
+    it('debería propagar los errores anteriores a la primera fila', async () => {
+      const res = mockResponse();
+      async function* failing(): AsyncGenerator<ExportRow> {
+        throw new Error('consulta inválida');
+      }
+
+      await expect(sendExport(res, { columns: [], rows: failing() }, 'donations')).rejects.toThrow('consulta inválida');
+      expect(res.setHeader).not.toHaveBeenCalled();
+    });
+  });
+});
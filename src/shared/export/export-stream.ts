@@ -0,0 +1,167 @@
+// src/shared/export/export-stream.ts
+import { Logger } from '@nestjs/common';
+import { IsIn, IsOptional } from 'class-validator';
+import { Readable, Transform } from 'stream';
+import { pipeline } from 'stream/promises';
+import { EntityManager, ObjectLiteral, SelectQueryBuilder } from 'typeorm';
+
+export const EXPORT_FORMATS = ['ndjson', 'csv'] as const;
+export type ExportFormat = (typeof EXPORT_FORMATS)[number];
+
+// Filas que se piden a Postgres en cada FETCH
+export const EXPORT_BATCH_SIZE = 1000;
+
+const CONTENT_TYPES: Record<ExportFormat, string> = {
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  csv: 'text/csv; charset=utf-8',
+};
+
+const logger = new Logger('ExportStream');
+
+export class ExportQueryDto {
+  @IsOptional()
+  @IsIn(EXPORT_FORMATS)
+  format?: ExportFormat;
+}
+
+export type ExportRow = Record<string, unknown>;
+
+export interface ExportSource {
+  columns: string[];
+  rows: AsyncIterable<ExportRow>;
+}
+
+// Selecciona columnas planas: { nombre_en_la_exportación: 'alias.columna' }
+export function selectColumns<T extends ObjectLiteral>(
+  query: SelectQueryBuilder<T>,
+  columns: Record<string, string>,
+): SelectQueryBuilder<T> {
+  query.select([]);
+  for (const [name, expression] of Object.entries(columns)) {
+    query.addSelect(expression, name);
+  }
+  return query;
+}
+
+/**
+ * Recorre el resultado de la consulta con un cursor de Postgres.
+ *
+ * Se piden `batchSize` filas por FETCH y la siguiente tanda solo se pide
+ * cuando el consumidor terminó con la anterior, así la memoria no depende
+ * del tamaño de la tabla. El cursor vive en su propia conexión y
+ * transacción, que se liberan aunque el consumidor abandone la lectura.
+ */
+export async function* streamQuery<T extends ObjectLiteral>(
+  manager: EntityManager,
+  query: SelectQueryBuilder<T>,
+  batchSize = EXPORT_BATCH_SIZE,
+): AsyncGenerator<ExportRow> {
+  const [sql, parameters] = query.getQueryAndParameters();
+  const queryRunner = manager.connection.createQueryRunner();
+  await queryRunner.connect();
+
+  try {
+    // Los cursores solo existen dentro de una transacción; REPEATABLE READ
+    // da una foto consistente de la tabla durante toda la exportación
+    await queryRunner.startTransaction('REPEATABLE READ');
+    await queryRunner.query(`DECLARE export_cursor NO SCROLL CURSOR FOR ${sql}`, parameters);
+
+    let rows: ExportRow[];
+    do {
+      rows = await queryRunner.query(`FETCH FORWARD ${batchSize} FROM export_cursor`);
+      yield* rows;
+    } while (rows.length === batchSize);
+
+    await queryRunner.commitTransaction();
+  } finally {
+    if (queryRunner.isTransactionActive) {
+      await queryRunner.rollbackTransaction();
+    }
+    await queryRunner.release();
+  }
+}
+
+export function toNdjson(): Transform {
+  return new Transform({
+    writableObjectMode: true,
+    transform(row: ExportRow, _encoding, callback) {
+      callback(null, `${JSON.stringify(row)}\n`);
+    },
+  });
+}
+
+function csvValue(value: unknown): string {
+  if (value === null || value === undefined) {
+    return '';
+  }
+  const text = value instanceof Date ? value.toISOString() : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+}
+
+export function toCsv(columns: string[]): Transform {
+  const header = `${columns.join(',')}\n`;
+  let headerSent = false;
+
+  return new Transform({
+    writableObjectMode: true,
+    transform(row: ExportRow, _encoding, callback) {
+      const line = `${columns.map((column) => csvValue(row[column])).join(',')}\n`;
+      callback(null, headerSent ? line : header + line);
+      headerSent = true;
+    },
+    flush(callback) {
+      // Una exportación vacía igual lleva el encabezado
+      callback(null, headerSent ? undefined : header);
+    },
+  });
+}
+
+// Entrega la primera fila antes y después el resto del iterador; cerrarlo
+// en el finally libera el cursor si el cliente se desconecta
+async function* resume(
+  first: IteratorResult<ExportRow>,
+  iterator: AsyncIterator<ExportRow>,
+): AsyncGenerator<ExportRow> {
+  try {
+    if (first.done) {
+      return;
+    }
+    yield first.value;
+    for (let next = await iterator.next(); !next.done; next = await iterator.next()) {
+      yield next.value;
+    }
+  } finally {
+    await iterator.return?.();
+  }
+}
+
+/**
+ * Escribe la exportación en la respuesta como NDJSON o CSV.
+ *
+ * La primera fila se lee antes de enviar los headers para que un error de
+ * la consulta todavía llegue al cliente como una respuesta HTTP normal. Un
+ * error posterior solo puede cortar la respuesta a medias.
+ */
+export async function sendExport(
+  res,
+  source: ExportSource,
+  filename: string,
+  format: ExportFormat = 'ndjson',
+): Promise<void> {
+  const iterator = source.rows[Symbol.asyncIterator]();
+  const first = await iterator.next();
+
+  res.setHeader('Content-Type', CONTENT_TYPES[format]);
+  res.setHeader('Content-Disposition', `attachment; filename="${filename}.${format}"`);
+
+  try {
+    await pipeline(
+      Readable.from(resume(first, iterator)),
+      format === 'csv' ? toCsv(source.columns) : toNdjson(),
+      res,
+    );
+  } catch (error) {
+    // pipeline ya destruyó la respuesta; no queda nada que enviar al cliente
+    logger.warn(`Export ${filename} interrupted: ${error.message}`);
+  }
+}
@@ -0,0 +1,54 @@
+import { BatchLoader } from './batch-loader';
+
+describe('BatchLoader', () => {
+  const fetchFrom = (rows: Record<string, string>) =>
+    jest.fn(async (keys: string[]) => new Map(keys.filter((key) => key in rows).map((key) => [key, rows[key]])));
+
+  it('debería agrupar búsquedas simultáneas en una sola consulta', async () => {
+    const fetch = fetchFrom({ a: 'A', b: 'B' });
+    const loader = new BatchLoader(fetch);
+
+    const result = await Promise.all([loader.load('a'), loader.load('b'), loader.load('a')]);
+
+    expect(result).toEqual(['A', 'B', 'A']);
+    expect(fetch).toHaveBeenCalledTimes(1);
+    expect(fetch).toHaveBeenCalledWith(['a', 'b']);
+    expect(loader.stats).toEqual({ queries: 1, lookups: 3, hits: 1 });
+  });
+
+  it('debería memorizar los ids ya cargados', async () => {
+    const fetch = fetchFrom({ a: 'A' });
+    const loader = new BatchLoader(fetch);
+
+    await loader.load('a');
+    await loader.load('a');
+
+    expect(fetch).toHaveBeenCalledTimes(1);
+  });
+
+  it('debería resolver null para los ids que no existen', async () => {
+    const loader = new BatchLoader(fetchFrom({ a: 'A' }));
+
+    expect(await loader.loadMany(['a', 'x'])).toEqual(['A', null]);
+  });
+
+  it('debería volver a consultar un id tras clear', async () => {
+    const fetch = fetchFrom({ a: 'A' });
+    const loader = new BatchLoader(fetch);
+
+    await loader.load('a');
+    loader.clear('a');
+    await loader.load('a');
+
+    expect(fetch).toHaveBeenCalledTimes(2);
+  });
+
+  it('debería rechazar el lote y olvidar sus ids si la consulta falla', async () => {
+    const fetch = jest.fn().mockRejectedValueOnce(new Error('db down')).mockResolvedValue(new Map([['a', 'A']]));
+    const loader = new BatchLoader<string>(fetch);
+
+    await expect(Promise.all([loader.load('a'), loader.load('b')])).rejects.toThrow('db down');
+    expect(await loader.load('a')).toBe('A');
+    expect(fetch).toHaveBeenCalledTimes(2);
+  });
+});
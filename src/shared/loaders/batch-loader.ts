@@ -0,0 +1,83 @@
+// src/shared/loaders/batch-loader.ts
+
+// Contadores de un loader (o de todos los de una petición)
+export interface LoaderStats {
+  queries: number;
+  lookups: number;
+  hits: number;
+}
+
+export function emptyLoaderStats(): LoaderStats {
+  return { queries: 0, lookups: 0, hits: 0 };
+}
+
+interface QueuedLoad<V> {
+  key: string;
+  resolve: (value: V | null) => void;
+  reject: (error: Error) => void;
+}
+
+/**
+ * Agrupa las búsquedas por id hechas en el mismo ciclo del event loop en una
+ * sola llamada a `fetch` y memoriza el resultado de cada id.
+ *
+ * `fetch` recibe ids sin repetir y devuelve las entidades encontradas por id;
+ * un id ausente se resuelve como null. Si `fetch` falla, se rechazan todas las
+ * búsquedas del lote y sus ids se olvidan para poder reintentarlos.
+ */
+export class BatchLoader<V> {
+  private readonly cache = new Map<string, Promise<V | null>>();
+  private queue: QueuedLoad<V>[] = [];
+
+  constructor(
+    private readonly fetch: (keys: string[]) => Promise<Map<string, V>>,
+    readonly stats: LoaderStats = emptyLoaderStats(),
+  ) {}
+
+  load(key: string): Promise<V | null> {
+    this.stats.lookups++;
+    const cached = this.cache.get(key);
+    if (cached) {
+      this.stats.hits++;
+      return cached;
+    }
+
+    const load = new Promise<V | null>((resolve, reject) => {
+      this.queue.push({ key, resolve, reject });
+      if (this.queue.length === 1) {
+        // Se despacha cuando ya corrieron las promesas pendientes, así también
+        // se agrupan las búsquedas que llegan tras un await ya resuelto
+        Promise.resolve().then(() => process.nextTick(() => this.dispatch()));
+      }
+    });
+    this.cache.set(key, load);
+    return load;
+  }
+
+  loadMany(keys: string[]): Promise<(V | null)[]> {
+    return Promise.all(keys.map((key) => this.load(key)));
+  }
+
+  // Olvida un id, p. ej. después de modificar la entidad
+  clear(key: string): void {
+    this.cache.delete(key);
+  }
+
+  private async dispatch(): Promise<void> {
+    const batch = this.queue;
+    this.queue = [];
+    this.stats.queries++;
+
+    try {
+      const values = await this.fetch(batch.map((item) => item.key));
+      for (const item of batch) {
+        item.resolve(values.get(item.key) ?? null);
+      }
+    } catch (error) {
+      for (const item of batch) {
+        this.cache.delete(item.key);
+        item.reject(error);
+      }
+    }
+  }
+}
@@ -0,0 +1,63 @@
+// src/shared/loaders/entity-loaders.ts
+import { Injectable } from '@nestjs/common';
+import { InjectEntityManager } from '@nestjs/typeorm';
+import { EntityManager, EntityTarget, FindManyOptions, In } from 'typeorm';
+import { User } from '../../entities/user.entity';
+import { Foundation } from '../../entities/foundation.entity';
+import { SocialAction } from '../../entities/social_action.entity';
+import { Donation } from '../../entities/donation.entity';
+import { BatchLoader } from './batch-loader';
+import { currentRequestContext } from '../context/request-context';
+
+/**
+ * Loaders por petición de las entidades que los servicios consultan una y
+ * otra vez para verificar existencia y permisos.
+ *
+ * Dentro de una petición cada id se consulta una sola vez y las búsquedas
+ * simultáneas se agrupan en un WHERE id IN (...). Fuera de una petición
+ * (tareas en segundo plano) se devuelve un loader nuevo en cada llamada.
+ * Las entidades se cargan sin relaciones.
+ */
+@Injectable()
+export class EntityLoaders {
+  constructor(
+    @InjectEntityManager()
+    private readonly manager: EntityManager,
+  ) {}
+
+  users(): BatchLoader<User> {
+    return this.loader('users', User);
+  }
+
+  foundations(): BatchLoader<Foundation> {
+    return this.loader('foundations', Foundation);
+  }
+
+  socialActions(): BatchLoader<SocialAction> {
+    return this.loader('social_actions', SocialAction);
+  }
+
+  donations(): BatchLoader<Donation> {
+    return this.loader('donations', Donation);
+  }
+
+  private loader<T extends { id: string }>(name: string, target: EntityTarget<T>): BatchLoader<T> {
+    const context = currentRequestContext();
+    if (!context) {
+      return new BatchLoader((ids) => this.fetch(target, ids));
+    }
+
+    let loader = context.loaders.get(name) as BatchLoader<T> | undefined;
+    if (!loader) {
+      // Todos los loaders de la petición suman en los mismos contadores
+      loader = new BatchLoader((ids) => this.fetch(target, ids), context.loaderStats);
+      context.loaders.set(name, loader);
+    }
+    return loader;
+  }
+
+  private async fetch<T extends { id: string }>(target: EntityTarget<T>, ids: string[]): Promise<Map<string, T>> {
+    const rows = await this.manager.find(target, { where: { id: In(ids) } } as FindManyOptions<T>);
+    return new Map(rows.map((row) => [row.id, row]));
+  }
+}
@@ -0,0 +1,10 @@
+import { Global, Module } from '@nestjs/common';
+import { EntityLoaders } from './entity-loaders';
+
+// Global: cualquier servicio puede inyectar EntityLoaders sin importar el módulo
+@Global()
+@Module({
+  providers: [EntityLoaders],
+  exports: [EntityLoaders],
+})
+export class LoadersModule {}
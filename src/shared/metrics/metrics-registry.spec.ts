@@ -0,0 +1,49 @@
+import { emptyQueryStats } from '../context/request-context';
+import { BACKGROUND_ROUTE, MetricsRegistry } from './metrics-registry';
+
+describe('MetricsRegistry', () => {
+  let registry: MetricsRegistry;
+
+  beforeEach(() => {
+    registry = new MetricsRegistry();
+  });
+
+  it('debería acumular peticiones y consultas por ruta', () => {
+    const queries = { ...emptyQueryStats(), count: 3, durationMs: 12, slow: 1 };
+    registry.recordRequest('GET', '/api/donations/:id', 200, 40, queries);
+    registry.recordRequest('GET', '/api/donations/:id', 404, 10, { ...emptyQueryStats(), count: 1 });
+
+    const text = registry.render();
+
+    expect(text).toContain('http_requests_total{method="GET",route="/api/donations/:id",status="200"} 1');
+    expect(text).toContain('http_requests_total{method="GET",route="/api/donations/:id",status="404"} 1');
+    expect(text).toContain('http_request_duration_seconds_sum{method="GET",route="/api/donations/:id"} 0.05');
+    expect(text).toContain('http_request_duration_seconds_count{method="GET",route="/api/donations/:id"} 2');
+    expect(text).toContain('db_queries_total{method="GET",route="/api/donations/:id"} 4');
+    expect(text).toContain('db_query_duration_seconds_total{method="GET",route="/api/donations/:id"} 0.012');
+    expect(text).toContain('db_slow_queries_total{method="GET",route="/api/donations/:id"} 1');
+  });
+
+  it('debería registrar las consultas sin petición en la ruta de segundo plano', () => {
+    registry.recordBackgroundQueries({ ...emptyQueryStats(), count: 2 });
+
+    const text = registry.render();
+
+    expect(text).toContain(`db_queries_total{method="",route="${BACKGROUND_ROUTE}"} 2`);
+    expect(text).not.toContain(`http_requests_total{method=""`);
+  });
+
+  it('debería escapar las comillas de las etiquetas', () => {
+    registry.recordRequest('GET', '/a"b', 200, 1, emptyQueryStats());
+
+    expect(registry.render()).toContain('route="/a\\"b"');
+  });
+
+  it('debería declarar el tipo de cada métrica', () => {
+    const text = registry.render();
+
+    expect(text).toContain('# TYPE http_requests_total counter');
+    expect(text).toContain('# TYPE http_request_duration_seconds summary');
+    expect(text.endsWith('\n')).toBe(true);
+  });
+});
@@ -0,0 +1,134 @@
+// src/shared/metrics/metrics-registry.ts
+import { QueryStats } from '../context/request-context';
+
+// Etiqueta de ruta para las consultas hechas fuera de una petición (tareas en segundo plano)
+export const BACKGROUND_ROUTE = '(background)';
+
+interface RouteMetrics {
+  method: string;
+  route: string;
+  requests: number;
+  durationMs: number;
+  statuses: Map<number, number>;
+  queries: number;
+  queryMs: number;
+  slowQueries: number;
+  queryErrors: number;
+}
+
+// Escapa un valor de etiqueta según el formato de texto de Prometheus
+function label(value: string): string {
+  return value.replace(/\\/g, '\\\\').replace(/"/g, '\\"').replace(/\n/g, '\\n');
+}
+
+function seconds(ms: number): string {
+  return String(ms / 1000);
+}
+
+/**
+ * Acumula, por método y ruta, las peticiones atendidas y las consultas SQL que
+ * hicieron, y las publica en el formato de texto de Prometheus.
+ *
+ * La ruta es el patrón de Express (/api/donations/:id), no la URL, para que el
+ * número de series no crezca con los ids.
+ */
+export class MetricsRegistry {
+  private readonly routes = new Map<string, RouteMetrics>();
+
+  recordRequest(method: string, route: string, status: number, durationMs: number, queries: QueryStats): void {
+    const metrics = this.routeMetrics(method, route);
+    metrics.requests++;
+    metrics.durationMs += durationMs;
+    metrics.statuses.set(status, (metrics.statuses.get(status) ?? 0) + 1);
+    this.addQueries(metrics, queries);
+  }
+
+  // Consultas sin petición asociada: se acumulan en cuanto terminan
+  recordBackgroundQueries(queries: QueryStats): void {
+    this.addQueries(this.routeMetrics('', BACKGROUND_ROUTE), queries);
+  }
+
+  render(): string {
+    const routes = [...this.routes.values()];
+    const requests = routes.filter((metrics) => metrics.requests);
+    const lines: string[] = [];
+    const metric = (name: string, type: string, help: string, samples: string[]) => {
+      lines.push(`# HELP ${name} ${help}`, `# TYPE ${name} ${type}`, ...samples);
+    };
+    const labels = (metrics: RouteMetrics) => `method="${label(metrics.method)}",route="${label(metrics.route)}"`;
+
+    metric(
+      'http_requests_total',
+      'counter',
+      'HTTP requests handled, by route and status code.',
+      requests.flatMap((metrics) =>
+        [...metrics.statuses].map(([status, count]) => `http_requests_total{${labels(metrics)},status="${status}"} ${count}`),
+      ),
+    );
+    metric('http_request_duration_seconds', 'summary', 'Time spent handling HTTP requests.', [
+      ...requests.map((metrics) => `http_request_duration_seconds_sum{${labels(metrics)}} ${seconds(metrics.durationMs)}`),
+      ...requests.map((metrics) => `http_request_duration_seconds_count{${labels(metrics)}} ${metrics.requests}`),
+    ]);
+    metric(
+      'db_queries_total',
+      'counter',
+      'SQL queries executed, by the route that issued them.',
+      routes.map((metrics) => `db_queries_total{${labels(metrics)}} ${metrics.queries}`),
+    );
+    metric(
+      'db_query_duration_seconds_total',
+      'counter',
+      'Time spent waiting for SQL queries, by the route that issued them.',
+      routes.map((metrics) => `db_query_duration_seconds_total{${labels(metrics)}} ${seconds(metrics.queryMs)}`),
+    );
+    metric(
+      'db_slow_queries_total',
+      'counter',
+      'SQL queries slower than the configured threshold.',
+      routes.map((metrics) => `db_slow_queries_total{${labels(metrics)}} ${metrics.slowQueries}`),
+    );
+    metric(
+      'db_query_errors_total',
+      'counter',
+      'SQL queries that failed.',
+      routes.map((metrics) => `db_query_errors_total{${labels(metrics)}} ${metrics.queryErrors}`),
+    );
+
+    return lines.join('\n') + '\n';
+  }
+
+  reset(): void {
+    this.routes.clear();
+  }
+
+  private routeMetrics(method: string, route: string): RouteMetrics {
+    const key = `${method} ${route}`;
+    let metrics = this.routes.get(key);
+    if (!metrics) {
+      metrics = {
+        method,
+        route,
+        requests: 0,
+        durationMs: 0,
+        statuses: new Map(),
+        queries: 0,
+        queryMs: 0,
+        slowQueries: 0,
+        queryErrors: 0,
+      };
+      this.routes.set(key, metrics);
+    }
+    return metrics;
+  }
+
+  private addQueries(metrics: RouteMetrics, queries: QueryStats): void {
+    metrics.queries += queries.count;
+    metrics.queryMs += queries.durationMs;
+    metrics.slowQueries += queries.slow;
+    metrics.queryErrors += queries.errors;
+  }
+}
+
+// El logger de TypeORM se crea en la configuración, fuera del contenedor de Nest,
+// así que el registro es un singleton de módulo que comparten ambos lados
+export const metricsRegistry = new MetricsRegistry();
@@ -0,0 +1,79 @@
+// src/shared/metrics/metrics.controller.ts
+import {
+  Controller,
+  ForbiddenException,
+  Get,
+  Header,
+  Headers,
+  Req,
+  UnauthorizedException,
+  UseGuards,
+} from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { timingSafeEqual } from 'crypto';
+import { JwtAuthGuard } from '../../auth/guards/jwt-auth.guard';
+import { metricsRegistry } from './metrics-registry';
+import { SlowQueryReport } from './slow-query-recorder';
+import { SlowQueryService } from './slow-query.service';
+
+@Controller()
+export class MetricsController {
+  private readonly token: string | null;
+
+  constructor(
+    configService: ConfigService,
+    private readonly slowQueryService: SlowQueryService,
+  ) {
+    this.token = configService.get('metrics.token') ?? null;
+  }
+
+  // Función auxiliar para verificar roles de admin
+  private isFullAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@admin.com';
+  }
+
+  private isReadOnlyAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@lector.com';
+  }
+
+  private isWriterAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@escritor.com';
+  }
+
+  private isDeleterAdmin(req): boolean {
+    return req.user && req.user.email === 'admin@eliminador.com';
+  }
+
+  private hasReadAccess(req): boolean {
+    return this.isFullAdmin(req) || this.isReadOnlyAdmin(req) ||
+           this.isWriterAdmin(req) || this.isDeleterAdmin(req);
+  }
+
+  // Formato de texto de Prometheus; pensado para un scraper, no usa JWT
+  @Get('metrics')
+  @Header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+  getMetrics(@Headers('authorization') authorization?: string): string {
+    if (this.token && !this.isAuthorized(authorization)) {
+      throw new UnauthorizedException('A valid metrics token is required');
+    }
+
+    return metricsRegistry.render();
+  }
+
+  // Consultas lentas recientes (SQL normalizado, sin parámetros) y planes muestreados
+  @UseGuards(JwtAuthGuard)
+  @Get('metrics/slow-queries')
+  getSlowQueries(@Req() req): SlowQueryReport {
+    if (!this.hasReadAccess(req)) {
+      throw new ForbiddenException('Only administrators can view slow queries');
+    }
+
+    return this.slowQueryService.getReport();
+  }
+
+  private isAuthorized(authorization?: string): boolean {
+    const expected = Buffer.from(`Bearer ${this.token}`);
+    const received = Buffer.from(authorization ?? '');
+    return received.length === expected.length && timingSafeEqual(received, expected);
+  }
+}
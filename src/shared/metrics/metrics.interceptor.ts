@@ -0,0 +1,63 @@
+// src/shared/metrics/metrics.interceptor.ts
+import { CallHandler, ExecutionContext, Injectable, NestInterceptor } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Observable, tap } from 'rxjs';
+import { RequestContext, currentRequestContext } from '../context/request-context';
+import { metricsRegistry } from './metrics-registry';
+
+// Etiqueta de las peticiones que no llegaron a resolver una ruta
+const UNMATCHED_ROUTE = '(unmatched)';
+
+export function serverTimingHeader(context: RequestContext, now = performance.now()): string {
+  const { count, durationMs } = context.queries;
+  return `db;dur=${durationMs.toFixed(1)};desc="${count} queries", total;dur=${(now - context.startedAt).toFixed(1)}`;
+}
+
+/**
+ * Atribuye a la ruta de cada petición sus consultas SQL y su duración, y
+ * opcionalmente (METRICS_SERVER_TIMING) las publica en el header Server-Timing.
+ *
+ * Las métricas se registran en 'finish', de modo que también cuentan las
+ * consultas de las respuestas en streaming.
+ */
+@Injectable()
+export class MetricsInterceptor implements NestInterceptor {
+  private readonly serverTiming: boolean;
+
+  constructor(configService: ConfigService) {
+    this.serverTiming = configService.get('metrics.serverTiming') ?? false;
+  }
+
+  intercept(context: ExecutionContext, next: CallHandler): Observable<unknown> {
+    const requestContext = currentRequestContext();
+    if (context.getType() !== 'http' || !requestContext) {
+      return next.handle();
+    }
+
+    const req = context.switchToHttp().getRequest();
+    const res = context.switchToHttp().getResponse();
+    // Desde aquí las consultas lentas se atribuyen al patrón, no a la URL
+    requestContext.route = req.route?.path ?? UNMATCHED_ROUTE;
+    res.once('finish', () => {
+      metricsRegistry.recordRequest(
+        req.method,
+        requestContext.route,
+        res.statusCode,
+        performance.now() - requestContext.startedAt,
+        requestContext.queries,
+      );
+    });
+
+    if (!this.serverTiming) {
+      return next.handle();
+    }
+
+    // Antes de que Nest escriba la respuesta, también si termina en excepción
+    const setHeader = () => {
+      if (!res.headersSent) {
+        res.setHeader('Server-Timing', serverTimingHeader(requestContext));
+      }
+    };
+    return next.handle().pipe(tap({ next: setHeader, error: setHeader }));
+  }
+}
@@ -0,0 +1,11 @@
+import { Module } from '@nestjs/common';
+import { APP_INTERCEPTOR } from '@nestjs/core';
+import { MetricsController } from './metrics.controller';
+import { MetricsInterceptor } from './metrics.interceptor';
+import { SlowQueryService } from './slow-query.service';
+
+@Module({
+  controllers: [MetricsController],
+  providers: [SlowQueryService, { provide: APP_INTERCEPTOR, useClass: MetricsInterceptor }],
+})
+export class MetricsModule {}
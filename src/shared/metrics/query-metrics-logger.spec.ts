@@ -0,0 +1,62 @@
+import { currentRequestContext, runWithRequestContext } from '../context/request-context';
+import { MetricsRegistry } from './metrics-registry';
+import { QueryMetricsLogger } from './query-metrics-logger';
+import { SlowQueryRecorder } from './slow-query-recorder';
+
+describe('QueryMetricsLogger', () => {
+  let registry: MetricsRegistry;
+  let recorder: SlowQueryRecorder;
+  let logger: QueryMetricsLogger;
+
+  beforeEach(() => {
+    registry = new MetricsRegistry();
+    recorder = new SlowQueryRecorder();
+    logger = new QueryMetricsLogger(null, registry, recorder);
+  });
+
+  it('debería contar las consultas de la petición en curso', () => {
+    const queries = runWithRequestContext(() => {
+      logger.logQuery('SELECT 1');
+      logger.logQuery('SELECT 2');
+      logger.logQueryError('boom', 'SELECT 3');
+      return currentRequestContext().queries;
+    });
+
+    expect(queries).toMatchObject({ count: 2, errors: 1 });
+    expect(registry.render()).not.toContain('db_queries_total{');
+  });
+
+  it('debería contar y registrar las consultas lentas', () => {
+    const queries = runWithRequestContext(() => {
+      logger.logQuerySlow(350, 'SELECT pg_sleep(1)');
+      return currentRequestContext().queries;
+    });
+
+    expect(queries.slow).toBe(1);
+    expect(recorder.report().recent).toHaveLength(1);
+  });
+
+  it('debería atribuir al segundo plano las consultas fuera de una petición', () => {
+    logger.logQuery('SELECT 1');
+
+    expect(registry.render()).toContain('db_queries_total{method="",route="(background)"} 1');
+  });
+
+  it('debería reenviar los mensajes al logger de consola', () => {
+    const output = {
+      logQuery: jest.fn(),
+      logQueryError: jest.fn(),
+      logQuerySlow: jest.fn(),
+      logSchemaBuild: jest.fn(),
+      logMigration: jest.fn(),
+      log: jest.fn(),
+    };
+    logger = new QueryMetricsLogger(output, registry, recorder);
+
+    logger.logQuery('SELECT 1', []);
+    logger.log('info', 'hola');
+
+    expect(output.logQuery).toHaveBeenCalledWith('SELECT 1', [], undefined);
+    expect(output.log).toHaveBeenCalledWith('info', 'hola', undefined);
+  });
+});
@@ -0,0 +1,85 @@
+// src/shared/metrics/query-metrics-logger.ts
+import { Logger as NestLogger } from '@nestjs/common';
+import { AfterQueryEvent, EntitySubscriberInterface, Logger, QueryRunner } from 'typeorm';
+import { QueryStats, currentRequestContext, emptyQueryStats } from '../context/request-context';
+import { MetricsRegistry, metricsRegistry } from './metrics-registry';
+import { SlowQueryRecorder, slowQueryRecorder } from './slow-query-recorder';
+
+// Longitud máxima del SQL que se escribe en el aviso de consulta lenta
+const MAX_LOGGED_QUERY_LENGTH = 500;
+
+// Suma a la petición en curso o, fuera de una petición, directamente al registro
+function record(registry: MetricsRegistry, update: (stats: QueryStats) => void): void {
+  const context = currentRequestContext();
+  if (context) {
+    update(context.queries);
+    return;
+  }
+  const stats = emptyQueryStats();
+  update(stats);
+  registry.recordBackgroundQueries(stats);
+}
+
+/**
+ * Logger de TypeORM que cuenta las consultas, las lentas (más de
+ * `maxQueryExecutionTime`) y las fallidas de cada petición. Las lentas
+ * además se guardan en SlowQueryRecorder.
+ *
+ * Si recibe `output` (el logger de consola cuando `logging` está activo) le
+ * reenvía todos los mensajes, así que no cambia lo que se ve en consola.
+ */
+export class QueryMetricsLogger implements Logger {
+  private readonly logger = new NestLogger('SlowQuery');
+
+  constructor(
+    private readonly output: Logger | null = null,
+    private readonly registry: MetricsRegistry = metricsRegistry,
+    private readonly recorder: SlowQueryRecorder = slowQueryRecorder,
+  ) {}
+
+  logQuery(query: string, parameters?: any[], queryRunner?: QueryRunner) {
+    record(this.registry, (stats) => stats.count++);
+    this.output?.logQuery(query, parameters, queryRunner);
+  }
+
+  logQueryError(error: string | Error, query: string, parameters?: any[], queryRunner?: QueryRunner) {
+    record(this.registry, (stats) => stats.errors++);
+    this.output?.logQueryError(error, query, parameters, queryRunner);
+  }
+
+  logQuerySlow(time: number, query: string, parameters?: any[], queryRunner?: QueryRunner) {
+    record(this.registry, (stats) => stats.slow++);
+    this.recorder.record(time, query, parameters);
+    if (this.output) {
+      this.output.logQuerySlow(time, query, parameters, queryRunner);
+    } else {
+      // Se avisa aunque el logging de consultas esté desactivado
+      this.logger.warn(`${time}ms: ${query.slice(0, MAX_LOGGED_QUERY_LENGTH)}`);
+    }
+  }
+
+  logSchemaBuild(message: string, queryRunner?: QueryRunner) {
+    this.output?.logSchemaBuild(message, queryRunner);
+  }
+
+  logMigration(message: string, queryRunner?: QueryRunner) {
+    this.output?.logMigration(message, queryRunner);
+  }
+
+  log(level: 'log' | 'info' | 'warn', message: any, queryRunner?: QueryRunner) {
+    this.output?.log(level, message, queryRunner);
+  }
+}
+
+/**
+ * El logger no recibe la duración de cada consulta, así que el tiempo de SQL
+ * se suma desde el evento afterQuery, que TypeORM emite con `executionTime`.
+ * TypeORM instancia la clase desde la opción `subscribers`.
+ */
+export class QueryTimingSubscriber implements EntitySubscriberInterface {
+  afterQuery(event: AfterQueryEvent<unknown>): void {
+    if (event.executionTime !== undefined) {
+      record(metricsRegistry, (stats) => (stats.durationMs += event.executionTime));
+    }
+  }
+}
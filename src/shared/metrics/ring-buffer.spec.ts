@@ -0,0 +1,25 @@
+import { RingBuffer } from './ring-buffer';
+
+describe('RingBuffer', () => {
+  it('debería devolver los elementos del más reciente al más antiguo', () => {
+    const buffer = new RingBuffer<number>(3);
+    [1, 2].forEach((item) => buffer.push(item));
+
+    expect(buffer.toArray()).toEqual([2, 1]);
+  });
+
+  it('debería descartar los más antiguos al superar la capacidad', () => {
+    const buffer = new RingBuffer<number>(3);
+    [1, 2, 3, 4, 5].forEach((item) => buffer.push(item));
+
+    expect(buffer.toArray()).toEqual([5, 4, 3]);
+    expect(buffer.size).toBe(3);
+  });
+
+  it('no debería guardar nada con capacidad 0', () => {
+    const buffer = new RingBuffer<number>(0);
+    buffer.push(1);
+
+    expect(buffer.toArray()).toEqual([]);
+  });
+});
@@ -0,0 +1,31 @@
+// src/shared/metrics/ring-buffer.ts
+
+// Guarda los últimos `capacity` elementos; al llenarse pisa el más antiguo
+export class RingBuffer<T> {
+  private readonly items: T[] = [];
+  private next = 0;
+
+  constructor(readonly capacity: number) {}
+
+  push(item: T): void {
+    if (this.capacity <= 0) {
+      return;
+    }
+    if (this.items.length < this.capacity) {
+      this.items.push(item);
+    } else {
+      this.items[this.next] = item;
+    }
+    this.next = (this.next + 1) % this.capacity;
+  }
+
+  // Del más reciente al más antiguo
+  toArray(): T[] {
+    const ordered = [...this.items.slice(this.next), ...this.items.slice(0, this.next)];
+    return ordered.reverse();
+  }
+
+  get size(): number {
+    return this.items.length;
+  }
+}
@@ -0,0 +1,64 @@
+import { runWithRequestContext } from '../context/request-context';
+import { SlowQueryRecorder, normalizeSql } from './slow-query-recorder';
+
+describe('slow-query-recorder', () => {
+  describe('normalizeSql', () => {
+    it('debería reemplazar literales y colapsar listas IN', () => {
+      expect(normalizeSql(`SELECT * FROM users  WHERE id IN ($1, $2, $3) AND name = 'Ana' LIMIT 10`)).toBe(
+        'SELECT * FROM users WHERE id IN (...) AND name = ? LIMIT ?',
+      );
+    });
+
+    it('no debería tocar los números dentro de identificadores', () => {
+      expect(normalizeSql('SELECT "s"."count_1" FROM rating_summaries "s"')).toBe(
+        'SELECT "s"."count_1" FROM rating_summaries "s"',
+      );
+    });
+  });
+
+  describe('SlowQueryRecorder', () => {
+    let recorder: SlowQueryRecorder;
+
+    beforeEach(() => {
+      recorder = new SlowQueryRecorder();
+    });
+
+    it('debería atribuir la consulta a la ruta de la petición', () => {
+      runWithRequestContext(() => recorder.record(300, 'SELECT 1'), 'GET', '/api/notifications/unread');
+
+      expect(recorder.report().recent[0]).toMatchObject({
+        method: 'GET',
+        route: '/api/notifications/unread',
+        duration_ms: 300,
+      });
+    });
+
+    it('debería agrupar por SQL normalizado', () => {
+      recorder.record(300, 'SELECT * FROM donations WHERE id = $1');
+      recorder.record(500, 'SELECT * FROM donations  WHERE id = $1');
+      recorder.record(250, 'SELECT * FROM users');
+
+      const [first, second] = recorder.report().statements;
+      expect(first).toMatchObject({ count: 2, total_ms: 800, max_ms: 500 });
+      expect(second).toMatchObject({ count: 1, total_ms: 250 });
+    });
+
+    it('debería elegir como candidata la lectura más lenta y vaciarla al tomarla', () => {
+      recorder.record(300, 'SELECT 1', [1]);
+      recorder.record(900, 'UPDATE users SET name = $1', ['x']);
+      recorder.record(500, 'SELECT 2', [2]);
+      recorder.record(400, 'SELECT 3');
+
+      expect(recorder.takeCandidate()).toMatchObject({ sql: 'SELECT 2', parameters: [2], durationMs: 500 });
+      expect(recorder.takeCandidate()).toBeNull();
+    });
+
+    it('no debería proponer lecturas con bloqueo ni registrar los EXPLAIN', () => {
+      recorder.record(300, 'SELECT * FROM users FOR UPDATE');
+      recorder.record(300, 'EXPLAIN (ANALYZE) SELECT 1');
+
+      expect(recorder.takeCandidate()).toBeNull();
+      expect(recorder.report().recent).toHaveLength(1);
+    });
+  });
+});
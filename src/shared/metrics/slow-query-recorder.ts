@@ -0,0 +1,147 @@
+// src/shared/metrics/slow-query-recorder.ts
+import { currentRequestContext } from '../context/request-context';
+import { BACKGROUND_ROUTE } from './metrics-registry';
+import { RingBuffer } from './ring-buffer';
+
+// Consultas lentas recientes y planes de EXPLAIN que se conservan
+const SLOW_QUERY_CAPACITY = 200;
+const PLAN_CAPACITY = 20;
+
+export interface SlowQuery {
+  captured_at: string;
+  duration_ms: number;
+  method: string;
+  route: string;
+  sql: string;
+}
+
+// Consultas lentas recientes agrupadas por SQL normalizado
+export interface SlowStatement {
+  sql: string;
+  count: number;
+  total_ms: number;
+  max_ms: number;
+  routes: string[];
+  last_seen: string;
+}
+
+export interface QueryPlan {
+  captured_at: string;
+  sql: string;
+  route: string;
+  duration_ms: number;
+  plan: unknown;
+}
+
+export interface SlowQueryReport {
+  recent: SlowQuery[];
+  statements: SlowStatement[];
+  plans: QueryPlan[];
+}
+
+// Consulta elegida para el próximo EXPLAIN; los parámetros nunca se publican
+export interface ExplainCandidate {
+  sql: string;
+  parameters: unknown[];
+  route: string;
+  durationMs: number;
+}
+
+/**
+ * Normaliza el SQL para agrupar consultas iguales: reemplaza literales por ?,
+ * reduce las listas IN ($1, $2, ...) a IN (...) y colapsa los espacios.
+ */
+export function normalizeSql(sql: string): string {
+  return sql
+    .replace(/'(?:[^']|'')*'/g, '?')
+    .replace(/\b\d+(?:\.\d+)?\b/g, '?')
+    .replace(/\$\?/g, '$n')
+    .replace(/\(\s*\$n(?:\s*,\s*\$n)*\s*\)/g, '(...)')
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+// Solo se analizan lecturas: EXPLAIN ANALYZE ejecuta la consulta de verdad
+function isExplainable(sql: string): boolean {
+  return /^\s*SELECT\b/i.test(sql) && !/\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b/i.test(sql);
+}
+
+/**
+ * Registro en memoria de las consultas que superan `maxQueryExecutionTime`,
+ * con la ruta que las hizo, y de los planes de EXPLAIN muestreados.
+ *
+ * Entre muestreo y muestreo guarda como candidata la lectura más lenta; el
+ * muestreo (SlowQueryService) la toma y la vacía.
+ */
+export class SlowQueryRecorder {
+  private readonly queries = new RingBuffer<SlowQuery>(SLOW_QUERY_CAPACITY);
+  private readonly plans = new RingBuffer<QueryPlan>(PLAN_CAPACITY);
+  private candidate: ExplainCandidate | null = null;
+
+  record(durationMs: number, sql: string, parameters: unknown[] = []): void {
+    // Los propios EXPLAIN del muestreo no cuentan
+    if (/^\s*EXPLAIN\b/i.test(sql)) {
+      return;
+    }
+
+    const context = currentRequestContext();
+    const route = context?.route || BACKGROUND_ROUTE;
+    this.queries.push({
+      captured_at: new Date().toISOString(),
+      duration_ms: durationMs,
+      method: context?.method ?? '',
+      route,
+      sql: normalizeSql(sql),
+    });
+
+    if (isExplainable(sql) && durationMs > (this.candidate?.durationMs ?? -1)) {
+      this.candidate = { sql, parameters, route, durationMs };
+    }
+  }
+
+  takeCandidate(): ExplainCandidate | null {
+    const candidate = this.candidate;
+    this.candidate = null;
+    return candidate;
+  }
+
+  addPlan(candidate: ExplainCandidate, plan: unknown): QueryPlan {
+    const entry = {
+      captured_at: new Date().toISOString(),
+      sql: normalizeSql(candidate.sql),
+      route: candidate.route,
+      duration_ms: candidate.durationMs,
+      plan,
+    };
+    this.plans.push(entry);
+    return entry;
+  }
+
+  report(): SlowQueryReport {
+    const recent = this.queries.toArray();
+    const statements = new Map<string, SlowStatement>();
+    for (const query of recent) {
+      let statement = statements.get(query.sql);
+      if (!statement) {
+        // `recent` va del más nuevo al más antiguo: la primera aparición es la última vista
+        statement = { sql: query.sql, count: 0, total_ms: 0, max_ms: 0, routes: [], last_seen: query.captured_at };
+        statements.set(query.sql, statement);
+      }
+      statement.count++;
+      statement.total_ms += query.duration_ms;
+      statement.max_ms = Math.max(statement.max_ms, query.duration_ms);
+      if (!statement.routes.includes(query.route)) {
+        statement.routes.push(query.route);
+      }
+    }
+
+    return {
+      recent,
+      statements: [...statements.values()].sort((a, b) => b.total_ms - a.total_ms),
+      plans: this.plans.toArray(),
+    };
+  }
+}
+
+// Compartido con QueryMetricsLogger, que se crea fuera del contenedor de Nest
+export const slowQueryRecorder = new SlowQueryRecorder();
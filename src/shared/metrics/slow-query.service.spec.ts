@@ -0,0 +1,61 @@
+import { ConfigService } from '@nestjs/config';
+import { DataSource } from 'typeorm';
+import { SlowQueryService } from './slow-query.service';
+import { slowQueryRecorder } from './slow-query-recorder';
+
+describe('SlowQueryService', () => {
+  let service: SlowQueryService;
+
+  const queryRunner = {
+    isTransactionActive: false,
+    startTransaction: jest.fn(async () => {
+      queryRunner.isTransactionActive = true;
+    }),
+    rollbackTransaction: jest.fn(async () => {
+      queryRunner.isTransactionActive = false;
+    }),
+    query: jest.fn(),
+    release: jest.fn(),
+  };
+  const dataSource = { createQueryRunner: () => queryRunner } as unknown as DataSource;
+  const config = { get: () => undefined } as unknown as ConfigService;
+
+  beforeEach(() => {
+    service = new SlowQueryService(dataSource, config);
+    slowQueryRecorder.takeCandidate();
+  });
+
+  afterEach(() => {
+    jest.clearAllMocks();
+  });
+
+  it('no debería consultar si no hay candidata', async () => {
+    expect(await service.sample()).toBeNull();
+    expect(queryRunner.query).not.toHaveBeenCalled();
+  });
+
+  it('debería guardar el plan y revertir la transacción', async () => {
+    const plan = [{ Plan: { 'Node Type': 'Seq Scan' } }];
+    queryRunner.query.mockResolvedValueOnce(undefined).mockResolvedValueOnce([{ 'QUERY PLAN': plan }]);
+    slowQueryRecorder.record(400, 'SELECT * FROM notifications WHERE user_id = $1', ['u1']);
+
+    const result = await service.sample();
+
+    expect(queryRunner.query).toHaveBeenLastCalledWith(
+      'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) SELECT * FROM notifications WHERE user_id = $1',
+      ['u1'],
+    );
+    expect(result).toMatchObject({ duration_ms: 400, plan });
+    expect(queryRunner.rollbackTransaction).toHaveBeenCalled();
+    expect(queryRunner.release).toHaveBeenCalled();
+    expect(service.getReport().plans[0]).toBe(result);
+  });
+
+  it('debería devolver null si el EXPLAIN falla', async () => {
+    queryRunner.query.mockResolvedValueOnce(undefined).mockRejectedValueOnce(new Error('canceling statement'));
+    slowQueryRecorder.record(400, 'SELECT 1');
+
+    expect(await service.sample()).toBeNull();
+    expect(queryRunner.release).toHaveBeenCalled();
+  });
+});
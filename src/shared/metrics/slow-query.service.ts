@@ -0,0 +1,81 @@
+// src/shared/metrics/slow-query.service.ts
+import { Injectable, Logger, OnModuleDestroy, OnModuleInit } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { InjectDataSource } from '@nestjs/typeorm';
+import { DataSource } from 'typeorm';
+import { QueryPlan, SlowQueryReport, slowQueryRecorder } from './slow-query-recorder';
+
+/**
+ * Muestrea periódicamente la lectura más lenta registrada desde el muestreo
+ * anterior y guarda su plan de EXPLAIN (ANALYZE, BUFFERS).
+ *
+ * EXPLAIN ANALYZE ejecuta la consulta, así que corre dentro de una transacción
+ * que siempre se revierte y con statement_timeout propio.
+ */
+@Injectable()
+export class SlowQueryService implements OnModuleInit, OnModuleDestroy {
+  private readonly logger = new Logger(SlowQueryService.name);
+  private readonly recorder = slowQueryRecorder;
+  private readonly intervalMs: number;
+  private readonly timeoutMs: number;
+  private timer: NodeJS.Timeout | null = null;
+  private sampling = false;
+
+  constructor(
+    @InjectDataSource()
+    private readonly dataSource: DataSource,
+    configService: ConfigService,
+  ) {
+    this.intervalMs = configService.get('metrics.explainIntervalMs') ?? 60000;
+    this.timeoutMs = configService.get('metrics.explainTimeoutMs') ?? 5000;
+  }
+
+  onModuleInit(): void {
+    if (this.intervalMs > 0) {
+      this.timer = setInterval(() => this.sample(), this.intervalMs);
+      // El muestreo no debe mantener vivo el proceso
+      this.timer.unref();
+    }
+  }
+
+  onModuleDestroy(): void {
+    if (this.timer) {
+      clearInterval(this.timer);
+    }
+  }
+
+  getReport(): SlowQueryReport {
+    return this.recorder.report();
+  }
+
+  async sample(): Promise<QueryPlan | null> {
+    if (this.sampling) {
+      return null;
+    }
+    const candidate = this.recorder.takeCandidate();
+    if (!candidate) {
+      return null;
+    }
+
+    this.sampling = true;
+    const queryRunner = this.dataSource.createQueryRunner();
+    try {
+      await queryRunner.startTransaction();
+      await queryRunner.query(`SET LOCAL statement_timeout = ${Math.max(1, this.timeoutMs)}`);
+      const [row] = await queryRunner.query(
+        `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ${candidate.sql}`,
+        candidate.parameters,
+      );
+      return this.recorder.addPlan(candidate, row['QUERY PLAN']);
+    } catch (error) {
+      this.logger.warn(`EXPLAIN of a sampled slow query failed: ${error.message}`);
+      return null;
+    } finally {
+      if (queryRunner.isTransactionActive) {
+        await queryRunner.rollbackTransaction().catch(() => undefined);
+      }
+      await queryRunner.release();
+      this.sampling = false;
+    }
+  }
+}
@@ -0,0 +1,86 @@
+import { BadRequestException } from '@nestjs/common';
+import {
+  DEFAULT_PAGE_SIZE,
+  MAX_PAGE_SIZE,
+  NEXT_CURSOR_HEADER,
+  decodeCursor,
+  encodeCursor,
+  paginateByCursor,
+  sendPage,
+} from './cursor-pagination';
+import { mockQueryBuilder } from './query-builder.mock';
+
+describe('cursor-pagination', () => {
+  describe('encodeCursor / decodeCursor', () => {
+    it('debería recuperar la fecha y el id codificados', () => {
+      const cursor = encodeCursor('2024-05-01T10:00:00.123456', 'd1');
+      expect(decodeCursor(cursor)).toEqual({ at: '2024-05-01T10:00:00.123456', id: 'd1' });
+    });
+
+    it('debería lanzar error con un cursor mal formado', () => {
+      expect(() => decodeCursor('no-es-un-cursor')).toThrow(BadRequestException);
+    });
+  });
+
+  describe('paginateByCursor', () => {
+    it('debería pedir una fila extra y usar el tamaño por defecto', async () => {
+      const qb = mockQueryBuilder('donation', [{ id: 'd1' }]);
+
+      const page = await paginateByCursor(qb, 'donation_date');
+
+      expect(qb.limit).toHaveBeenCalledWith(DEFAULT_PAGE_SIZE + 1);
+      expect(qb.andWhere).not.toHaveBeenCalled();
+      expect(page).toEqual({ items: [{ id: 'd1' }], next_cursor: null });
+    });
+
+    it('debería limitar el tamaño de página al máximo', async () => {
+      const qb = mockQueryBuilder('donation');
+      await paginateByCursor(qb, 'donation_date', { limit: MAX_PAGE_SIZE * 10 });
+      expect(qb.limit).toHaveBeenCalledWith(MAX_PAGE_SIZE + 1);
+    });
+
+    it('debería devolver el cursor de la última fila cuando hay más páginas', async () => {
+      const qb = mockQueryBuilder('donation', [{ id: 'd2' }, { id: 'd1' }], {
+        raw: [
+          { donation_id: 'd2', cursor_at: '2024-05-02T00:00:00.000001' },
+          { donation_id: 'd1', cursor_at: '2024-05-01T00:00:00.000001' },
+        ],
+      });
+
+      const page = await paginateByCursor(qb, 'donation_date', { limit: 1 });
+
+      expect(page.items).toEqual([{ id: 'd2' }]);
+      expect(decodeCursor(page.next_cursor)).toEqual({
+        at: '2024-05-02T00:00:00.000001',
+        id: 'd2',
+      });
+    });
+
+    it('debería filtrar a partir del cursor recibido', async () => {
+      const qb = mockQueryBuilder('donation');
+      const cursor = encodeCursor('2024-05-02T00:00:00.000001', 'd2');
+
+      await paginateByCursor(qb, 'donation_date', { cursor });
+
+      expect(qb.andWhere).toHaveBeenCalledWith(expect.stringContaining('donation.donation_date'), {
+        cursorAt: '2024-05-02T00:00:00.000001',
+        cursorId: 'd2',
+      });
+    });
+  });
+
+  describe('sendPage', () => {
+    it('debería publicar el cursor siguiente en el header', () => {
+      const res = { setHeader: jest.fn() };
+      const items = sendPage(res, { items: [{ id: 'd1' }], next_cursor: 'abc' });
+      expect(items).toEqual([{ id: 'd1' }]);
+      expect(res.setHeader).toHaveBeenCalledWith(NEXT_CURSOR_HEADER, 'abc');
+    });
+
+    it('no debería enviar header en la última página', () => {
+      const res = { setHeader: jest.fn() };
+      sendPage(res, { items: [], next_cursor: null });
+      expect(res.setHeader).not.toHaveBeenCalled();
+    });
+  });
+});
@@ -0,0 +1,104 @@
+// src/shared/pagination/cursor-pagination.ts
+import { BadRequestException } from '@nestjs/common';
+import { Type } from 'class-transformer';
+import { IsInt, IsOptional, IsString, Max, Min } from 'class-validator';
+import { ObjectLiteral, SelectQueryBuilder } from 'typeorm';
+
+export const DEFAULT_PAGE_SIZE = 50;
+export const MAX_PAGE_SIZE = 200;
+
+// Header con el cursor de la página siguiente (ausente en la última página)
+export const NEXT_CURSOR_HEADER = 'X-Next-Cursor';
+
+export class CursorPaginationDto {
+  @IsOptional()
+  @IsString()
+  cursor?: string;
+
+  @IsOptional()
+  @Type(() => Number)
+  @IsInt()
+  @Min(1)
+  @Max(MAX_PAGE_SIZE)
+  limit?: number;
+}
+
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+interface DecodedCursor {
+  at: string;
+  id: string;
+}
+
+// El cursor es opaco para el cliente: base64url de [fecha, id] de la última fila
+export function encodeCursor(at: string, id: string): string {
+  return Buffer.from(JSON.stringify([at, id])).toString('base64url');
+}
+
+export function decodeCursor(cursor: string): DecodedCursor {
+  try {
+    const [at, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+    if (typeof at === 'string' && typeof id === 'string') {
+      return { at, id };
+    }
+  } catch {
+    // Se responde abajo con el mismo error para cualquier cursor mal formado
+  }
+  throw new BadRequestException('Invalid pagination cursor');
+}
+
+/**
+ * Pagina por keyset sobre (columna, id) en orden descendente.
+ *
+ * La fecha del cursor se lee como texto desde Postgres para conservar los
+ * microsegundos: un `Date` de JavaScript los truncaría y se perderían filas
+ * entre páginas. Las relaciones unidas deben ser muchos-a-uno para que
+ * cada fila del LIMIT corresponda a una entidad.
+ */
+export async function paginateByCursor<T extends ObjectLiteral>(
+  query: SelectQueryBuilder<T>,
+  column: string,
+  page: CursorPaginationDto = {},
+): Promise<CursorPage<T>> {
+  const alias = query.alias;
+  const limit = Math.min(page.limit ?? DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE);
+
+  if (page.cursor) {
+    const { at, id } = decodeCursor(page.cursor);
+    query.andWhere(
+      `(${alias}.${column}, ${alias}.id) < (CAST(:cursorAt AS timestamp), CAST(:cursorId AS uuid))`,
+      { cursorAt: at, cursorId: id },
+    );
+  }
+
+  query
+    .addSelect(`to_char(${alias}.${column}, 'YYYY-MM-DD"T"HH24:MI:SS.US')`, 'cursor_at')
+    .orderBy(`${alias}.${column}`, 'DESC')
+    .addOrderBy(`${alias}.id`, 'DESC')
+    // Una fila extra indica si existe una página siguiente
+    .limit(limit + 1);
+
+  const { entities, raw } = await query.getRawAndEntities();
+  const hasMore = entities.length > limit;
+  const items = hasMore ? entities.slice(0, limit) : entities;
+
+  let nextCursor: string | null = null;
+  if (hasMore) {
+    const last = items[items.length - 1];
+    const lastRow = raw.find((row) => row[`${alias}_id`] === last.id);
+    nextCursor = encodeCursor(lastRow.cursor_at, last.id);
+  }
+
+  return { items, next_cursor: nextCursor };
+}
+
+// Devuelve los elementos de la página y publica el cursor siguiente en el header
+export function sendPage<T>(res, page: CursorPage<T>): T[] {
+  if (page.next_cursor) {
+    res.setHeader(NEXT_CURSOR_HEADER, page.next_cursor);
+  }
+  return page.items;
+}
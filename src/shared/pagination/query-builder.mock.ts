@@ -0,0 +1,26 @@
+// Solo para pruebas (excluido del build, ver tsconfig.build.json)
+
+// Métodos encadenables que usan los listados paginados
+const CHAIN_METHODS = ['leftJoinAndSelect', 'where', 'andWhere', 'addSelect', 'orderBy', 'addOrderBy', 'limit'];
+
+export interface MockQueryBuilderOptions {
+  // Filas crudas de getRawAndEntities (cursor_at de cada entidad, por ejemplo)
+  raw?: any[];
+  // Resultado de getCount; por defecto, la cantidad de entidades
+  count?: number;
+}
+
+/**
+ * QueryBuilder simulado para paginateByCursor y los servicios que lo usan:
+ * cada método de la cadena devuelve el mismo objeto y getRawAndEntities
+ * resuelve `entities`. `alias` es el de createQueryBuilder en el servicio.
+ */
+export function mockQueryBuilder(alias: string, entities: any[] = [], options: MockQueryBuilderOptions = {}): any {
+  const qb: any = {
+    alias,
+    getRawAndEntities: jest.fn().mockResolvedValue({ entities, raw: options.raw ?? [] }),
+    getCount: jest.fn().mockResolvedValue(options.count ?? entities.length),
+  };
+  CHAIN_METHODS.forEach((method) => (qb[method] = jest.fn().mockReturnValue(qb)));
+  return qb;
+}
@@ -0,0 +1,75 @@
+import { EventEmitter } from 'events';
+import { MAX_NOTIFY_PAYLOAD_BYTES, PG_PUBSUB_CHANNEL, PostgresPubSub } from './postgres-pubsub';
+
+// pg.Client simulado: NOTIFY vuelve como evento 'notification', igual que en Postgres
+class FakeClient extends EventEmitter {
+  connect = jest.fn().mockResolvedValue(undefined);
+  end = jest.fn().mockResolvedValue(undefined);
+  query = jest.fn(async (sql: string, parameters?: unknown[]) => {
+    if (sql.startsWith('SELECT pg_notify')) {
+      setImmediate(() => this.emit('notification', { channel: parameters[0], payload: parameters[1] }));
+    }
+    return { rows: [] };
+  });
+}
+
+const settle = () => new Promise((resolve) => setImmediate(resolve));
+
+describe('PostgresPubSub', () => {
+  let clients: FakeClient[];
+  let pubsub: PostgresPubSub;
+
+  beforeEach(() => {
+    clients = [];
+    pubsub = new PostgresPubSub(() => {
+      const client = new FakeClient();
+      clients.push(client);
+      return client;
+    }, 0);
+  });
+
+  afterEach(() => pubsub.close());
+
+  it('debería escuchar el canal compartido y entregar por canal lógico', async () => {
+    const handler = jest.fn();
+    const other = jest.fn();
+    pubsub.subscribe('notifications', handler);
+    pubsub.subscribe('otro', other);
+
+    await pubsub.publish('notifications', '{"type":"created"}');
+    await settle();
+
+    expect(clients).toHaveLength(1);
+    expect(clients[0].query).toHaveBeenCalledWith(`LISTEN ${PG_PUBSUB_CHANNEL}`);
+    expect(handler).toHaveBeenCalledWith('{"type":"created"}');
+    expect(other).not.toHaveBeenCalled();
+  });
+
+  it('debería rechazar mensajes que no entran en un NOTIFY', async () => {
+    await expect(pubsub.publish('notifications', 'x'.repeat(MAX_NOTIFY_PAYLOAD_BYTES))).rejects.toThrow(
+      'NOTIFY payload limit',
+    );
+    expect(clients).toHaveLength(0);
+  });
+
+  it('debería reconectarse si se pierde la conexión y hay suscriptores', async () => {
+    pubsub.subscribe('notifications', jest.fn());
+    await settle();
+
+    clients[0].emit('error', new Error('connection reset'));
+    await new Promise((resolve) => setTimeout(resolve, 5));
+
+    expect(clients[0].end).toHaveBeenCalled();
+    expect(clients).toHaveLength(2);
+    expect(clients[1].query).toHaveBeenCalledWith(`LISTEN ${PG_PUBSUB_CHANNEL}`);
+  });
+
+  it('debería ignorar mensajes de otros canales de Postgres', async () => {
+    const handler = jest.fn();
+    pubsub.subscribe('notifications', handler);
+    await settle();
+
+    clients[0].emit('notification', { channel: 'otro', payload: '{"channel":"notifications","message":"x"}' });
+    expect(handler).not.toHaveBeenCalled();
+  });
+});
@@ -0,0 +1,132 @@
+// src/shared/pubsub/postgres-pubsub.ts
+import { Logger } from '@nestjs/common';
+import { LocalPubSub, MessageHandler, PubSub } from './pubsub';
+
+// Canal de Postgres que comparten todas las instancias; el canal lógico va en el mensaje
+export const PG_PUBSUB_CHANNEL = 'app_pubsub';
+
+// Límite de NOTIFY: el payload debe medir menos de 8000 bytes
+export const MAX_NOTIFY_PAYLOAD_BYTES = 7999;
+
+const RECONNECT_DELAY_MS = 1000;
+
+// Lo que se usa de pg.Client: una conexión propia, fuera del pool de TypeORM
+export interface ListenClient {
+  connect(): Promise<unknown>;
+  query(sql: string, parameters?: unknown[]): Promise<unknown>;
+  end(): Promise<void>;
+  on(event: string, listener: (...args: any[]) => void): unknown;
+}
+
+interface Envelope {
+  channel: string;
+  message: string;
+}
+
+/**
+ * Pub/sub entre instancias de la API con LISTEN/NOTIFY de Postgres.
+ *
+ * Una sola conexión escucha PG_PUBSUB_CHANNEL y reparte cada mensaje a los
+ * suscriptores locales del canal lógico. Los mensajes propios también vuelven
+ * por NOTIFY, así todas las instancias entregan por el mismo camino.
+ *
+ * NOTIFY no guarda nada: lo publicado mientras la conexión está caída se
+ * pierde. La conexión se reabre sola mientras haya suscriptores.
+ */
+export class PostgresPubSub extends PubSub {
+  private readonly logger = new Logger(PostgresPubSub.name);
+  private readonly local = new LocalPubSub();
+  private connecting: Promise<ListenClient> | null = null;
+  private reconnectTimer: NodeJS.Timeout | null = null;
+  private closed = false;
+
+  constructor(
+    private readonly createClient: () => ListenClient,
+    private readonly reconnectDelayMs = RECONNECT_DELAY_MS,
+  ) {
+    super();
+  }
+
+  async publish(channel: string, message: string): Promise<void> {
+    const envelope: Envelope = { channel, message };
+    const payload = JSON.stringify(envelope);
+    if (Buffer.byteLength(payload) > MAX_NOTIFY_PAYLOAD_BYTES) {
+      throw new Error(`Message for "${channel}" exceeds the NOTIFY payload limit`);
+    }
+
+    const client = await this.connection();
+    await client.query('SELECT pg_notify($1, $2)', [PG_PUBSUB_CHANNEL, payload]);
+  }
+
+  subscribe(channel: string, handler: MessageHandler): () => void {
+    // Empieza a escuchar con el primer suscriptor
+    this.connection().catch(() => undefined);
+    return this.local.subscribe(channel, handler);
+  }
+
+  async close(): Promise<void> {
+    this.closed = true;
+    clearTimeout(this.reconnectTimer);
+    const connecting = this.connecting;
+    this.connecting = null;
+    await this.local.close();
+    const client = await connecting?.catch(() => null);
+    await client?.end().catch(() => undefined);
+  }
+
+  private connection(): Promise<ListenClient> {
+    if (this.closed) {
+      return Promise.reject(new Error('Pub/sub is closed'));
+    }
+    if (!this.connecting) {
+      const client = this.createClient();
+      const connecting = this.connect(client);
+      this.connecting = connecting;
+      // Una conexión ya descartada no debe tirar la que la reemplazó
+      client.on('error', (error: Error) => this.drop(connecting, error));
+      client.on('end', () => this.drop(connecting, new Error('Postgres connection closed')));
+      connecting.catch((error) => this.drop(connecting, error));
+    }
+    return this.connecting;
+  }
+
+  private async connect(client: ListenClient): Promise<ListenClient> {
+    client.on('notification', ({ channel, payload }) => {
+      if (channel === PG_PUBSUB_CHANNEL && payload) {
+        this.dispatch(payload);
+      }
+    });
+
+    await client.connect();
+    await client.query(`LISTEN ${PG_PUBSUB_CHANNEL}`);
+    return client;
+  }
+
+  private dispatch(payload: string): void {
+    let envelope: Envelope;
+    try {
+      envelope = JSON.parse(payload);
+    } catch {
+      this.logger.warn(`Ignoring malformed message on ${PG_PUBSUB_CHANNEL}`);
+      return;
+    }
+    this.local.deliver(envelope.channel, envelope.message);
+  }
+
+  private drop(connecting: Promise<ListenClient>, error: Error): void {
+    if (this.connecting !== connecting || this.closed) {
+      return;
+    }
+    this.connecting = null;
+    this.logger.warn(`LISTEN connection lost: ${error.message}`);
+    connecting.then((client) => client.end()).catch(() => undefined);
+
+    if (this.local.subscriberCount() && !this.reconnectTimer) {
+      this.reconnectTimer = setTimeout(() => {
+        this.reconnectTimer = null;
+        this.connection().catch(() => undefined);
+      }, this.reconnectDelayMs);
+      this.reconnectTimer.unref();
+    }
+  }
+}
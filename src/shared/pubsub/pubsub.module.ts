@@ -0,0 +1,35 @@
+import { Global, Module, OnModuleDestroy } from '@nestjs/common';
+import { ConfigService } from '@nestjs/config';
+import { Client } from 'pg';
+import { DataSource } from 'typeorm';
+import { ListenClient, PostgresPubSub } from './postgres-pubsub';
+import { LocalPubSub, PubSub } from './pubsub';
+
+// Conexión de LISTEN con los mismos datos que la de TypeORM
+function listenClientFactory(dataSource: DataSource): () => ListenClient {
+  const { host, port, username, password, database } = dataSource.options as any;
+  return () => new Client({ host, port, user: username, password, database });
+}
+
+// Global: cualquier servicio puede inyectar PubSub sin importar el módulo
+@Global()
+@Module({
+  providers: [
+    {
+      provide: PubSub,
+      inject: [ConfigService, DataSource],
+      useFactory: (configService: ConfigService, dataSource: DataSource): PubSub =>
+        configService.get('realtime.pubsubBackend') === 'postgres'
+          ? new PostgresPubSub(listenClientFactory(dataSource))
+          : new LocalPubSub(),
+    },
+  ],
+  exports: [PubSub],
+})
+export class PubSubModule implements OnModuleDestroy {
+  constructor(private readonly pubsub: PubSub) {}
+
+  async onModuleDestroy(): Promise<void> {
+    await this.pubsub.close();
+  }
+}
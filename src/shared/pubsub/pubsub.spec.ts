@@ -0,0 +1,36 @@
+import { LocalPubSub } from './pubsub';
+
+describe('LocalPubSub', () => {
+  it('debería entregar el mensaje solo a los suscriptores del canal', async () => {
+    const pubsub = new LocalPubSub();
+    const received: string[] = [];
+    pubsub.subscribe('a', (message) => received.push(`a:${message}`));
+    pubsub.subscribe('b', (message) => received.push(`b:${message}`));
+
+    await pubsub.publish('a', 'hola');
+    expect(received).toEqual(['a:hola']);
+  });
+
+  it('debería dejar de entregar al cancelar la suscripción', async () => {
+    const pubsub = new LocalPubSub();
+    const handler = jest.fn();
+    const unsubscribe = pubsub.subscribe('a', handler);
+
+    unsubscribe();
+    await pubsub.publish('a', 'hola');
+    expect(handler).not.toHaveBeenCalled();
+    expect(pubsub.subscriberCount()).toBe(0);
+  });
+
+  it('debería seguir entregando si un suscriptor falla', async () => {
+    const pubsub = new LocalPubSub();
+    const handler = jest.fn();
+    pubsub.subscribe('a', () => {
+      throw new Error('boom');
+    });
+    pubsub.subscribe('a', handler);
+
+    await pubsub.publish('a', 'hola');
+    expect(handler).toHaveBeenCalledWith('hola');
+  });
+});
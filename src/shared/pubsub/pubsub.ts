@@ -0,0 +1,73 @@
+// src/shared/pubsub/pubsub.ts
+import { Logger } from '@nestjs/common';
+
+export type MessageHandler = (message: string) => void;
+
+/**
+ * Publicación y suscripción de mensajes de texto por canal.
+ *
+ * Es también el token de inyección: PubSubModule elige la implementación
+ * según PUBSUB_BACKEND. Un mensaje publicado llega a los suscriptores de
+ * todas las instancias que comparten el backend, incluida la que publica.
+ */
+export abstract class PubSub {
+  abstract publish(channel: string, message: string): Promise<void>;
+
+  // Devuelve la función que cancela la suscripción
+  abstract subscribe(channel: string, handler: MessageHandler): () => void;
+
+  abstract close(): Promise<void>;
+}
+
+/**
+ * Pub/sub en memoria para una sola instancia de la API.
+ *
+ * Entrega en el mismo tick a cada suscriptor; el error de uno no impide que
+ * el mensaje llegue a los demás.
+ */
+export class LocalPubSub extends PubSub {
+  private readonly logger = new Logger(LocalPubSub.name);
+  private readonly channels = new Map<string, Set<MessageHandler>>();
+
+  async publish(channel: string, message: string): Promise<void> {
+    this.deliver(channel, message);
+  }
+
+  deliver(channel: string, message: string): void {
+    for (const handler of this.channels.get(channel) ?? []) {
+      try {
+        handler(message);
+      } catch (error) {
+        this.logger.error(`Subscriber of "${channel}" failed: ${error.message}`);
+      }
+    }
+  }
+
+  subscribe(channel: string, handler: MessageHandler): () => void {
+    let handlers = this.channels.get(channel);
+    if (!handlers) {
+      handlers = new Set();
+      this.channels.set(channel, handlers);
+    }
+    handlers.add(handler);
+
+    return () => {
+      handlers.delete(handler);
+      if (!handlers.size && this.channels.get(channel) === handlers) {
+        this.channels.delete(channel);
+      }
+    };
+  }
+
+  subscriberCount(): number {
+    let count = 0;
+    for (const handlers of this.channels.values()) {
+      count += handlers.size;
+    }
+    return count;
+  }
+
+  async close(): Promise<void> {
+    this.channels.clear();
+  }
+}
@@ -0,0 +1,190 @@
+"""Cliente HTTP compartido por los scripts de pruebas de la API
+
+Todas las peticiones pasan por una única `requests.Session` con un pool de
+conexiones keep-alive, de modo que miles de llamadas reutilizan un puñado de
+sockets hacia el servidor. Cada usuario autenticado obtiene una
+`AuthorizedSession` cacheada por su id: los headers con el token JWT se
+construyen una sola vez y se reutilizan en cada petición.
+"""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "http://localhost:3001/api"
+
+DEFAULT_POOL_SIZE = 16  # Conexiones keep-alive por host
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.3  # Espera entre reintentos: 0.3s, 0.6s, 1.2s...
+DEFAULT_TIMEOUT = 30  # Segundos por petición
+RETRY_STATUSES = (500, 502, 503, 504)
+
+# Header con el que la API publica el cursor de la página siguiente
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+class AuthorizedSession:
+    """Vista de la sesión compartida con los headers de un usuario
+
+    No abre conexiones propias: delega en el pool del `ApiClient`.
+    """
+
+    def __init__(self, client, token=None):
+        self.client = client
+        self.token = token
+        if token:
+            self.headers = {**JSON_HEADERS, "Authorization": f"Bearer {token}"}
+        else:
+            self.headers = dict(JSON_HEADERS)
+
+    def request(self, method, url, **kwargs):
+        headers = kwargs.pop("headers", None) or self.headers
+        return self.client.request(method, url, headers=headers, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def iter_pages(self, url, limit=None, **kwargs):
+        kwargs.setdefault("headers", self.headers)
+        return self.client.iter_pages(url, limit=limit, **kwargs)
+
+
+class ApiClient:
+    """Sesión HTTP con pool de conexiones, reintentos y tokens por usuario
+
+    - `tokens` es el diccionario usuario_id -> token JWT que usan los scripts.
+    - `as_user(user_id)` devuelve la sesión autorizada cacheada del usuario;
+      si no tiene token usa la de `fallback_user` o, en su defecto, la pública.
+    - Los reintentos con backoff cubren respuestas 5xx y conexiones caídas en
+      métodos idempotentes. Los POST solo se reintentan si la conexión no llegó
+      a establecerse, para no duplicar entidades en el servidor.
+    """
+
+    def __init__(self, base_url=BASE_URL, pool_size=DEFAULT_POOL_SIZE,
+                 retries=DEFAULT_RETRIES, backoff_factor=DEFAULT_BACKOFF,
+                 timeout=DEFAULT_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.tokens = {}
+        self.fallback_user = None
+        self.session = requests.Session()
+        self.public = AuthorizedSession(self)
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self.configure_pool(pool_size)
+
+    def configure_pool(self, pool_size):
+        """Ajusta el tamaño del pool de conexiones keep-alive
+
+        Con `pool_block=True` los hilos esperan una conexión libre en lugar de
+        abrir sockets desechables cuando el pool está lleno.
+        """
+        self.pool_size = max(1, pool_size)
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"PATCH"},
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def url(self, path):
+        """Acepta URLs absolutas o rutas relativas a `base_url`"""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("headers", JSON_HEADERS)
+        return self.session.request(method, self.url(url), **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request("DELETE", url, **kwargs)
+
+    def iter_pages(self, url, limit=None, **kwargs):
+        """Recorre un listado paginado por cursor y entrega cada respuesta
+
+        Sigue el header `X-Next-Cursor` hasta la última página. Si una página
+        responde con error se entrega esa respuesta y el recorrido termina,
+        así que el llamador decide cómo reportarlo.
+        """
+        params = dict(kwargs.pop("params", None) or {})
+        if limit is not None:
+            params["limit"] = limit
+        while True:
+            response = self.get(url, params=params, **kwargs)
+            yield response
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if response.status_code >= 400 or not cursor:
+                return
+            params["cursor"] = cursor
+
+    def set_token(self, user_id, token):
+        self.tokens[user_id] = token
+
+    def as_user(self, user_id=None):
+        """Sesión autorizada del usuario, cacheada por id
+
+        Si el token del usuario cambió desde la última llamada, la sesión se
+        reconstruye.
+        """
+        if user_id is not None and user_id in self.tokens:
+            key = user_id
+        elif self.fallback_user is not None and self.fallback_user in self.tokens:
+            key = self.fallback_user
+        else:
+            return self.public
+
+        token = self.tokens[key]
+        session = self._sessions.get(key)
+        if session is None or session.token != token:
+            with self._lock:
+                session = self._sessions.get(key)
+                if session is None or session.token != token:
+                    session = AuthorizedSession(self, token)
+                    self._sessions[key] = session
+        return session
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,218 @@
+"""Latency benchmark for the GET endpoints listed in testEndpoints.py
+
+Creates the same test fixtures as testEndpoints.py, then replays every entry
+of its GET endpoint table N times with a fixed number of concurrent requests.
+Per endpoint it records p50/p90/p95/p99 latency, throughput and response size,
+and writes a JSON report (with raw samples, for compareBenchmarks.py) and an
+optional CSV summary.
+
+With --server-metrics the API's /metrics counters are scraped around each
+endpoint's measured requests, adding SQL queries and SQL time per request.
+
+Usage:
+    python benchmarkEndpoints.py --iterations 100 --concurrency 8 \
+        --label main --output bench-main.json --csv bench-main.csv
+"""
+import argparse
+import csv
+import functools
+import json
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import server_metrics
+import testEndpoints
+from latency import PERCENTILES, summarize
+
+DEFAULT_ITERATIONS = 50
+DEFAULT_CONCURRENCY = 8
+DEFAULT_WARMUP = 3  # Unmeasured requests per endpoint (JIT, caches, pool)
+
+CSV_FIELDS = [
+    "name", "url", "requests", "errors", "throughput_rps", "mean_bytes",
+    "mean_ms", "min_ms", "max_ms",
+] + [f"p{pct}_ms" for pct in PERCENTILES] + [
+    "db_queries_per_request", "db_ms_per_request", "slow_queries",
+]
+
+
+def timed_get(endpoint):
+    """Run one GET and return (latency_ms, status_code, response_bytes)"""
+    start = time.perf_counter()
+    try:
+        response = testEndpoints.api.get(
+            endpoint["url"], headers=endpoint["auth_headers"])
+        elapsed = (time.perf_counter() - start) * 1000
+        return elapsed, response.status_code, len(response.content)
+    except Exception:
+        return (time.perf_counter() - start) * 1000, None, 0
+
+
+def benchmark_endpoint(endpoint, executor, iterations, warmup, scrape=None):
+    """Measure one endpoint; errors are counted but kept out of the latencies
+
+    `scrape`, when given, reads the server's /metrics counters; it runs just
+    before and after the measured requests so the warmup is left out.
+    """
+    for _ in range(warmup):
+        timed_get(endpoint)
+
+    if scrape:
+        before = scrape()
+    start = time.perf_counter()
+    results = list(executor.map(
+        lambda _: timed_get(endpoint), range(iterations)))
+    wall_seconds = time.perf_counter() - start
+    server = {}
+    if scrape:
+        totals = server_metrics.request_totals(before, scrape())
+        server = {
+            "db_queries_per_request": totals["db_queries_per_request"],
+            "db_ms_per_request": totals["db_ms_per_request"],
+            "slow_queries": totals["slow_queries"],
+        }
+
+    ok = [result for result in results
+          if result[1] is not None and result[1] < 400]
+    latencies = [latency for latency, _, _ in ok]
+    statuses = Counter(str(status) for _, status, _ in results)
+
+    return {
+        "name": endpoint["name"],
+        "url": endpoint["url"],
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "status_codes": dict(statuses),
+        "seconds": wall_seconds,
+        "throughput_rps": len(results) / wall_seconds if wall_seconds > 0 else 0.0,
+        "mean_bytes": sum(size for _, _, size in ok) / len(ok) if ok else 0,
+        **summarize(latencies),
+        **server,
+        "samples_ms": [round(latency, 3) for latency in latencies],
+    }
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value:.1f}ms"
+
+
+def format_server(result):
+    queries = result.get("db_queries_per_request")
+    if queries is None:
+        return ""
+    return (f" queries/req={queries:.1f} "
+            f"sql/req={format_ms(result['db_ms_per_request'])}")
+
+
+def run_benchmark(endpoints, iterations, concurrency, warmup, scrape=None):
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for endpoint in endpoints:
+            result = benchmark_endpoint(
+                endpoint, executor, iterations, warmup, scrape)
+            results.append(result)
+            print(
+                f"{result['name']:<48} p50={format_ms(result['p50_ms'])} "
+                f"p99={format_ms(result['p99_ms'])} "
+                f"{result['throughput_rps']:.1f} req/s errors={result['errors']}"
+                f"{format_server(result)}")
+    return results
+
+
+def write_json(path, report):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def write_csv(path, results):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the GET endpoints from testEndpoints.py")
+    parser.add_argument(
+        "--iterations", type=int, default=DEFAULT_ITERATIONS,
+        help="measured requests per endpoint (default: %(default)s)")
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+        help="requests in flight per endpoint (default: %(default)s)")
+    parser.add_argument(
+        "--warmup", type=int, default=DEFAULT_WARMUP,
+        help="unmeasured requests per endpoint before measuring (default: %(default)s)")
+    parser.add_argument(
+        "--endpoint", action="append", default=[],
+        help="only benchmark endpoints whose name contains this text (repeatable)")
+    parser.add_argument(
+        "--label", default="",
+        help="name of the build being measured, stored in the report")
+    parser.add_argument(
+        "--output", default="benchmark_report.json",
+        help="JSON report path (default: %(default)s)")
+    parser.add_argument("--csv", help="also write a CSV summary to this path")
+    parser.add_argument(
+        "--server-metrics", action="store_true",
+        help="scrape /metrics to report SQL queries and SQL time per request")
+    parser.add_argument(
+        "--metrics-token",
+        help="bearer token for /metrics when the API sets METRICS_TOKEN")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    concurrency = max(1, args.concurrency)
+    testEndpoints.api.configure_pool(concurrency)
+
+    print("=== PREPARING BENCHMARK DATA ===")
+    testEndpoints.setup_test_data()
+    endpoints = testEndpoints.get_endpoint_table()
+    if endpoints is None:
+        testEndpoints.print_status(
+            "Missing required users for the benchmark", False)
+        return 1
+    if args.endpoint:
+        endpoints = [endpoint for endpoint in endpoints
+                     if any(text.lower() in endpoint["name"].lower() for text in args.endpoint)]
+
+    print(f"\n=== BENCHMARKING {len(endpoints)} GET ENDPOINTS ===")
+    print(f"{args.iterations} requests per endpoint, concurrency {concurrency}")
+    started_at = datetime.now(timezone.utc).isoformat()
+    try:
+        scrape = None
+        if args.server_metrics:
+            scrape = functools.partial(
+                server_metrics.scrape, testEndpoints.api, args.metrics_token)
+        results = run_benchmark(
+            endpoints, args.iterations, concurrency, args.warmup, scrape)
+    finally:
+        testEndpoints.token_cache.save()
+        testEndpoints.api.close()
+
+    report = {
+        "label": args.label,
+        "started_at": started_at,
+        "base_url": testEndpoints.BASE_URL,
+        "iterations": args.iterations,
+        "concurrency": concurrency,
+        "warmup": args.warmup,
+        "server_metrics": args.server_metrics,
+        "endpoints": results,
+    }
+    write_json(args.output, report)
+    testEndpoints.print_status(f"JSON report written to {args.output}")
+    if args.csv:
+        write_csv(args.csv, results)
+        testEndpoints.print_status(f"CSV summary written to {args.csv}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+"""Regression gate comparing benchmarkEndpoints.py reports of two API builds
+
+An endpoint is flagged when its change is both larger than the threshold and
+statistically significant:
+
+- p95 latency: the candidate's p95 grew more than --latency-threshold and a
+  one-sided Mann-Whitney U test on the raw latency samples says the
+  candidate is slower (p <= --alpha);
+- throughput: the candidate's mean throughput dropped more than
+  --throughput-threshold and a permutation test over the per-run
+  throughputs says it is lower (p <= --alpha). This needs several runs per
+  build: with three reports per side the smallest possible p-value is 0.05,
+  so use at least three (more for a stricter --alpha).
+
+Exits with status 1 when any endpoint regressed, 2 on invalid input.
+
+Usage:
+    python compareBenchmarks.py --baseline main-1.json main-2.json main-3.json \
+        --candidate pr-1.json pr-2.json pr-3.json
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+from latency import mann_whitney_greater, percentile, permutation_greater
+
+DEFAULT_LATENCY_THRESHOLD = 0.10  # +10% p95
+DEFAULT_THROUGHPUT_THRESHOLD = 0.10  # -10% req/s
+DEFAULT_ALPHA = 0.05
+
+
+def load_reports(paths):
+    """Pool the samples and per-run throughputs of each endpoint by name"""
+    endpoints = defaultdict(lambda: {"samples": [], "throughputs": []})
+    for path in paths:
+        with open(path, encoding="utf-8") as file:
+            report = json.load(file)
+        for result in report["endpoints"]:
+            endpoint = endpoints[result["name"]]
+            endpoint["samples"].extend(result.get("samples_ms", []))
+            endpoint["throughputs"].append(result["throughput_rps"])
+    return endpoints
+
+
+def compare_endpoint(baseline, candidate, args):
+    base_p95 = percentile(sorted(baseline["samples"]), 95)
+    cand_p95 = percentile(sorted(candidate["samples"]), 95)
+    latency_change = (cand_p95 / base_p95 - 1) if base_p95 and cand_p95 is not None else None
+    latency_p = mann_whitney_greater(baseline["samples"], candidate["samples"])
+    latency_regressed = (
+        latency_change is not None and latency_p is not None
+        and latency_change > args.latency_threshold and latency_p <= args.alpha)
+
+    base_tps = sum(baseline["throughputs"]) / len(baseline["throughputs"])
+    cand_tps = sum(candidate["throughputs"]) / len(candidate["throughputs"])
+    throughput_change = (cand_tps / base_tps - 1) if base_tps else None
+    throughput_p = None
+    if len(baseline["throughputs"]) > 1 and len(candidate["throughputs"]) > 1:
+        # One-sided: is the baseline throughput higher than the candidate?
+        throughput_p = permutation_greater(candidate["throughputs"], baseline["throughputs"])
+    throughput_regressed = (
+        throughput_change is not None and throughput_p is not None
+        and -throughput_change > args.throughput_threshold and throughput_p <= args.alpha)
+
+    return {
+        "baseline_p95_ms": base_p95,
+        "candidate_p95_ms": cand_p95,
+        "p95_change": latency_change,
+        "latency_p_value": latency_p,
+        "baseline_rps": base_tps,
+        "candidate_rps": cand_tps,
+        "throughput_change": throughput_change,
+        "throughput_p_value": throughput_p,
+        "regressed": latency_regressed or throughput_regressed,
+        "reasons": [reason for reason, flagged in (
+            ("p95", latency_regressed), ("throughput", throughput_regressed)) if flagged],
+    }
+
+
+def format_change(value):
+    return "n/a" if value is None else f"{value:+.1%}"
+
+
+def format_p(value):
+    return "n/a" if value is None else f"{value:.3f}"
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare two sets of benchmarkEndpoints.py reports and fail on regressions")
+    parser.add_argument("--baseline", nargs="+", required=True,
+                        help="reports of the reference build (one per run)")
+    parser.add_argument("--candidate", nargs="+", required=True,
+                        help="reports of the build under test (one per run)")
+    parser.add_argument("--latency-threshold", type=float, default=DEFAULT_LATENCY_THRESHOLD,
+                        help="relative p95 increase tolerated (default: %(default)s)")
+    parser.add_argument("--throughput-threshold", type=float, default=DEFAULT_THROUGHPUT_THRESHOLD,
+                        help="relative throughput drop tolerated (default: %(default)s)")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA,
+                        help="significance level of the tests (default: %(default)s)")
+    parser.add_argument("--output", help="write the comparison as JSON to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        baseline = load_reports(args.baseline)
+        candidate = load_reports(args.candidate)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ Could not read the reports: {e}")
+        return 2
+
+    common = [name for name in baseline if name in candidate]
+    if not common:
+        print("❌ The reports have no endpoints in common")
+        return 2
+    if len(args.baseline) < 2 or len(args.candidate) < 2:
+        print("⚠️  Throughput is only tested with two or more reports per side")
+
+    comparisons = {}
+    print(f"\n{'endpoint':<48} {'p95 base':>9} {'p95 cand':>9} {'change':>8} {'p':>6} "
+          f"{'rps change':>11} {'p':>6}  verdict")
+    for name in common:
+        result = compare_endpoint(baseline[name], candidate[name], args)
+        comparisons[name] = result
+        verdict = f"❌ REGRESSION ({', '.join(result['reasons'])})" if result["regressed"] else "✅"
+        print(
+            f"{name:<48} {format_ms(result['baseline_p95_ms']):>9} "
+            f"{format_ms(result['candidate_p95_ms']):>9} "
+            f"{format_change(result['p95_change']):>8} {format_p(result['latency_p_value']):>6} "
+            f"{format_change(result['throughput_change']):>11} "
+            f"{format_p(result['throughput_p_value']):>6}  {verdict}")
+
+    for name in sorted(set(baseline) ^ set(candidate)):
+        side = "baseline" if name in baseline else "candidate"
+        print(f"⚠️  {name}: only in the {side} reports, not compared")
+
+    regressions = [name for name, result in comparisons.items() if result["regressed"]]
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"regressions": regressions, "endpoints": comparisons}, file, indent=2)
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} endpoint(s) regressed: {', '.join(regressions)}")
+        return 1
+    print(f"\n✅ No regressions across {len(common)} endpoints")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
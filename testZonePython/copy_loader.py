@@ -0,0 +1,198 @@
+"""Carga masiva directa a PostgreSQL con COPY, sin pasar por la API REST
+
+Lo usa `populateDB.py --mode=copy`. Las filas se escriben en buffers de
+tamaño fijo que se envían con `COPY ... FROM STDIN`, así la memoria no crece
+con el número de filas. Las tablas deben existir: basta con haber levantado la
+API una vez (TypeORM `synchronize` crea el esquema de `src/entities`).
+
+Dependencias opcionales (solo para este modo): `psycopg2` y `bcrypt`.
+"""
+import io
+import os
+import time
+
+COPY_BUFFER_ROWS = 10000  # Filas por cada COPY enviado al servidor
+
+# Columnas de cada tabla, tal como las definen las entidades de TypeORM
+TABLE_COLUMNS = {
+    "users": ("id", "name", "email", "password", "user_type", "created_at"),
+    "foundations": ("id", "user_id", "legal_name", "address", "phone", "website"),
+    "donations": ("id", "user_id", "foundation_id", "amount", "donation_date"),
+    "social_actions": ("id", "foundation_id", "description", "start_date", "end_date"),
+    "comments": ("id", "user_id", "donation_id", "social_action_id", "foundation_id",
+                 "text", "comment_date"),
+    "ratings": ("id", "user_id", "donation_id", "social_action_id", "rating",
+                "rating_date"),
+    "participation_requests": ("id", "user_id", "social_action_id", "status",
+                               "request_date"),
+    "certificates": ("id", "user_id", "description", "issue_date"),
+    "notifications": ("id", "user_id", "message", "read", "notification_date"),
+    "suggestions": ("id", "user_id", "content", "processed", "created_at"),
+    "favorites": ("id", "user_id", "item_id", "item_type"),
+}
+
+# Orden que respeta las llaves foráneas (también para TRUNCATE)
+LOAD_ORDER = tuple(TABLE_COLUMNS)
+
+# Tablas que la API deriva de las anteriores; se vacían y recalculan, no se cargan
+DERIVED_TABLES = ("rating_summaries", "notification_counters")
+
+# Misma agregación que RatingSummariesService.rebuild en la API
+REBUILD_RATING_SUMMARIES_SQL = """
+    INSERT INTO rating_summaries
+        (target_type, target_id, rating_count, rating_sum,
+         count_1, count_2, count_3, count_4, count_5, updated_at)
+    SELECT
+        CASE WHEN donation_id IS NOT NULL THEN 'donation' ELSE 'social_action' END,
+        COALESCE(donation_id, social_action_id),
+        COUNT(*),
+        SUM(rating),
+        COUNT(*) FILTER (WHERE rating = 1),
+        COUNT(*) FILTER (WHERE rating = 2),
+        COUNT(*) FILTER (WHERE rating = 3),
+        COUNT(*) FILTER (WHERE rating = 4),
+        COUNT(*) FILTER (WHERE rating = 5),
+        now()
+    FROM ratings
+    WHERE donation_id IS NOT NULL OR social_action_id IS NOT NULL
+    GROUP BY 1, 2
+"""
+
+# Mismo conteo que NotificationCountersService.rebuild en la API
+REBUILD_NOTIFICATION_COUNTERS_SQL = """
+    INSERT INTO notification_counters (user_id, unread_count, version, updated_at)
+    SELECT user_id, COUNT(*), 1, now()
+    FROM notifications
+    WHERE read = false
+    GROUP BY user_id
+"""
+
+
+def connect():
+    """Abre una conexión con la misma configuración que database.config.ts"""
+    try:
+        import psycopg2
+    except ImportError:
+        raise RuntimeError(
+            "El modo copy necesita psycopg2: pip install psycopg2-binary")
+
+    return psycopg2.connect(
+        host=os.environ.get("DB_HOST", "localhost"),
+        port=int(os.environ.get("DB_PORT", "5432")),
+        user=os.environ.get("DB_USERNAME", "postgres"),
+        password=os.environ.get("DB_PASSWORD", "postgres"),
+        dbname=os.environ.get("DB_DATABASE", "social_donations"),
+    )
+
+
+def hash_password(password):
+    """Calcula una sola vez el hash bcrypt compartido por todos los usuarios
+
+    Usa el mismo costo (10) que `UsersService.create`, de modo que el login
+    por la API funciona con los usuarios cargados.
+    """
+    try:
+        import bcrypt
+    except ImportError:
+        raise RuntimeError(
+            "El modo copy necesita bcrypt para el hash de contraseñas: pip install bcrypt")
+
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=10)).decode()
+
+
+def _format_value(value):
+    """Serializa un valor al formato text de COPY"""
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    text = str(value)
+    return (text.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+class CopyWriter:
+    """Escribe filas de una tabla en lotes de COPY FROM STDIN"""
+
+    def __init__(self, connection, table, buffer_rows=COPY_BUFFER_ROWS):
+        self.connection = connection
+        self.table = table
+        self.columns = TABLE_COLUMNS[table]
+        self.buffer_rows = buffer_rows
+        self.rows = 0
+        self.started = time.perf_counter()
+        self._buffer = io.StringIO()
+        self._pending = 0
+        self._statement = (
+            f'COPY "{table}" ({", ".join(self.columns)}) FROM STDIN WITH (FORMAT text)')
+
+    def write(self, row):
+        """Agrega una fila (tupla en el orden de TABLE_COLUMNS)"""
+        self._buffer.write("\t".join(_format_value(value) for value in row))
+        self._buffer.write("\n")
+        self._pending += 1
+        self.rows += 1
+        if self._pending >= self.buffer_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        self._buffer.seek(0)
+        with self.connection.cursor() as cursor:
+            cursor.copy_expert(self._statement, self._buffer)
+        self._buffer = io.StringIO()
+        self._pending = 0
+
+    def close(self):
+        """Envía lo pendiente y devuelve (filas, segundos)"""
+        self.flush()
+        return self.rows, time.perf_counter() - self.started
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.flush()
+
+
+def truncate_all(connection):
+    """Vacía todas las tablas del esquema de la aplicación"""
+    tables = ", ".join(f'"{table}"' for table in LOAD_ORDER + DERIVED_TABLES)
+    with connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables} CASCADE")
+
+
+def rebuild_rating_summaries(connection):
+    """Recalcula los resúmenes de calificaciones tras cargar `ratings`
+
+    Las calificaciones insertadas con COPY no pasan por la API, que es la que
+    mantiene `rating_summaries` al día. Devuelve cuántos destinos se resumieron.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM rating_summaries")
+        cursor.execute(REBUILD_RATING_SUMMARIES_SQL)
+        return cursor.rowcount
+
+
+def rebuild_notification_counters(connection):
+    """Recalcula los contadores de no leídas tras cargar `notifications`
+
+    Igual que con las calificaciones, la API mantiene `notification_counters`
+    al día y COPY la saltea. Devuelve cuántos usuarios tienen no leídas.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM notification_counters")
+        cursor.execute(REBUILD_NOTIFICATION_COUNTERS_SQL)
+        return cursor.rowcount
+
+
+def email_exists(connection, email):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM users WHERE email = %s", (email,))
+        return cursor.fetchone() is not None
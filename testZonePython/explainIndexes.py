@@ -0,0 +1,278 @@
+"""Before/after query plans for the indexes of the QueryShapeIndexes,
+SearchVectors and KeysetIndexes migrations
+
+Runs the service query shapes the indexes were designed for directly against
+PostgreSQL with EXPLAIN (ANALYZE, BUFFERS). The "before" plans run inside a
+transaction that drops the indexes first and is then rolled back, so the
+database is left unchanged. Parameters are taken from the seeded data: each
+shape uses the id with the most rows (e.g. the user with most notifications).
+
+The GIN search indexes exist only after the migrations have run: the API's
+schema synchronization creates every other index here, but not those. Outside
+production run `npm run migration:run` (or start the API with
+DB_MIGRATIONS_RUN=true) before measuring the search shapes.
+
+Dropping an index locks its table until the rollback: run this against a
+benchmark database seeded with populateDB.py (--mode=copy for large sizes),
+not against a shared one. Needs psycopg2, like populateDB.py --mode=copy.
+
+Usage:
+    python explainIndexes.py --repeat 5 --output index-plans.json
+"""
+import argparse
+import json
+import statistics
+import sys
+
+import copy_loader
+
+# GIN indexes of src/migrations/1792497600000-SearchVectors.ts, created only
+# by the migration (schema synchronization skips them)
+SEARCH_INDEXES = (
+    "IDX_foundations_search",
+    "IDX_social_actions_search",
+)
+
+# Same names as src/migrations/1792324800000-QueryShapeIndexes.ts
+QUERY_SHAPE_INDEXES = (
+    "IDX_notifications_user_date",
+    "IDX_notifications_user_unread",
+    "IDX_comments_user_date",
+    "IDX_comments_donation_date",
+    "IDX_comments_social_action_date",
+    "IDX_comments_foundation_date",
+    "IDX_ratings_user_date",
+    "IDX_ratings_donation_date",
+    "IDX_ratings_social_action_date",
+    "IDX_participation_requests_user_date",
+    "IDX_participation_requests_action_date",
+    "IDX_participation_requests_action_user",
+    "IDX_participation_requests_action_pending",
+    "IDX_favorites_user_item",
+    "IDX_certificates_user_date",
+    "IDX_suggestions_user_date",
+    "IDX_suggestions_unprocessed",
+    # (date, id) indexes of src/migrations/1792584000000-KeysetIndexes.ts
+    "IDX_donations_date_id",
+    "IDX_comments_date_id",
+    "IDX_ratings_date_id",
+    "IDX_notifications_date_id",
+    "IDX_participation_requests_date_id",
+    "IDX_social_actions_start_id",
+    *SEARCH_INDEXES,
+)
+
+DEFAULT_REPEAT = 3
+
+
+def common_lexeme(table):
+    """SQL returning a lexeme of `table`.search_vector found in many, but not
+    most, rows (twice: the search shapes use the query for match and rank)"""
+    return (f"SELECT word, word FROM ts_stat('SELECT search_vector FROM {table}') "
+            f"ORDER BY ndoc DESC OFFSET 20 LIMIT 1")
+
+
+def keyset_page(table, column):
+    """Shape of the second page of a global listing (paginateByCursor, 50 per
+    page): the cursor is the last row of the first page"""
+    return (f"{table}.findAll",
+            f"SELECT * FROM {table} WHERE ({column}, id) < (%s, %s) "
+            f"ORDER BY {column} DESC, id DESC LIMIT 51",
+            f"SELECT {column}, id FROM {table} ORDER BY {column} DESC, id DESC OFFSET 49 LIMIT 1")
+
+
+def busiest(table, column, where="TRUE"):
+    """SQL returning the value of `column` with the most rows in `table`"""
+    return (f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL AND {where} "
+            f"GROUP BY {column} ORDER BY count(*) DESC LIMIT 1")
+
+
+# (name, SQL as the service issues it, SQL that picks its parameters)
+QUERY_SHAPES = (
+    ("notifications.findByUser",
+     "SELECT * FROM notifications WHERE user_id = %s ORDER BY notification_date DESC",
+     busiest("notifications", "user_id")),
+    ("notifications.findUnreadByUser",
+     "SELECT * FROM notifications WHERE user_id = %s AND read = false "
+     "ORDER BY notification_date DESC",
+     busiest("notifications", "user_id", "read = false")),
+    ("notifications.markAllAsRead",
+     "UPDATE notifications SET read = true WHERE user_id = %s AND read = false",
+     busiest("notifications", "user_id", "read = false")),
+    ("comments.findByUser",
+     "SELECT * FROM comments WHERE user_id = %s ORDER BY comment_date DESC",
+     busiest("comments", "user_id")),
+    ("comments.findByDonation",
+     "SELECT * FROM comments WHERE donation_id = %s ORDER BY comment_date DESC",
+     busiest("comments", "donation_id")),
+    ("comments.findBySocialAction",
+     "SELECT * FROM comments WHERE social_action_id = %s ORDER BY comment_date DESC",
+     busiest("comments", "social_action_id")),
+    ("ratings.findByDonation",
+     "SELECT * FROM ratings WHERE donation_id = %s ORDER BY rating_date DESC",
+     busiest("ratings", "donation_id")),
+    ("ratings.findByUser",
+     "SELECT * FROM ratings WHERE user_id = %s ORDER BY rating_date DESC",
+     busiest("ratings", "user_id")),
+    ("participationRequests.findBySocialAction",
+     "SELECT * FROM participation_requests WHERE social_action_id = %s "
+     "ORDER BY request_date DESC",
+     busiest("participation_requests", "social_action_id")),
+    ("participationRequests.findPendingBySocialAction",
+     "SELECT * FROM participation_requests WHERE social_action_id = %s "
+     "AND status = 'pending' ORDER BY request_date ASC",
+     busiest("participation_requests", "social_action_id", "status = 'pending'")),
+    ("participationRequests.acceptedParticipant",
+     "SELECT 1 FROM participation_requests WHERE social_action_id = %s "
+     "AND user_id = %s AND status = 'accepted' LIMIT 1",
+     "SELECT social_action_id, user_id FROM participation_requests "
+     "WHERE status = 'accepted' LIMIT 1"),
+    ("users.findFavorite",
+     "SELECT * FROM favorites WHERE user_id = %s AND item_id = %s AND item_type = %s LIMIT 1",
+     "SELECT user_id, item_id, item_type FROM favorites LIMIT 1"),
+    ("certificates.findByUser",
+     "SELECT * FROM certificates WHERE user_id = %s ORDER BY issue_date DESC",
+     busiest("certificates", "user_id")),
+    ("suggestions.findUnprocessed",
+     "SELECT * FROM suggestions WHERE processed = false ORDER BY created_at ASC",
+     None),
+    keyset_page("donations", "donation_date"),
+    keyset_page("comments", "comment_date"),
+    keyset_page("ratings", "rating_date"),
+    keyset_page("notifications", "notification_date"),
+    keyset_page("participation_requests", "request_date"),
+    keyset_page("social_actions", "start_date"),
+    ("search.searchFoundations",
+     "SELECT id FROM foundations WHERE search_vector @@ websearch_to_tsquery('spanish', %s) "
+     "ORDER BY ts_rank(search_vector, websearch_to_tsquery('spanish', %s)) DESC, id DESC LIMIT 51",
+     common_lexeme("foundations")),
+    ("search.searchSocialActions",
+     "SELECT id FROM social_actions WHERE search_vector @@ websearch_to_tsquery('spanish', %s) "
+     "ORDER BY ts_rank(search_vector, websearch_to_tsquery('spanish', %s)) DESC, id DESC LIMIT 51",
+     common_lexeme("social_actions")),
+)
+
+
+def plan_nodes(node):
+    """Scan nodes of a plan tree as 'Node Type on index/table'"""
+    nodes = []
+    if "Scan" in node["Node Type"]:
+        target = node.get("Index Name") or node.get("Relation Name", "")
+        nodes.append(f"{node['Node Type']} on {target}")
+    for child in node.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def explain(connection, sql, params, repeat, drop_indexes):
+    """Median execution time, buffers and scan nodes over `repeat` runs
+
+    Every run is rolled back: UPDATE shapes change nothing, and the dropped
+    indexes come back.
+    """
+    times = []
+    for _ in range(repeat):
+        with connection.cursor() as cursor:
+            if drop_indexes:
+                for name in drop_indexes:
+                    cursor.execute(f'DROP INDEX IF EXISTS "{name}"')
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}", params)
+            result = cursor.fetchone()[0][0]
+        connection.rollback()
+        times.append(result["Execution Time"])
+
+    plan = result["Plan"]
+    return {
+        "execution_ms": statistics.median(times),
+        "shared_hit_blocks": plan.get("Shared Hit Blocks", 0),
+        "shared_read_blocks": plan.get("Shared Read Blocks", 0),
+        "scans": plan_nodes(plan),
+    }
+
+
+def existing_indexes(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indexname FROM pg_indexes WHERE indexname = ANY(%s)",
+            (list(QUERY_SHAPE_INDEXES),))
+        return {row[0] for row in cursor.fetchall()}
+
+
+def pick_params(connection, pick_sql):
+    if pick_sql is None:
+        return ()
+    with connection.cursor() as cursor:
+        cursor.execute(pick_sql)
+        return cursor.fetchone()
+
+
+def run(connection, repeat, shape_filter):
+    present = existing_indexes(connection)
+    missing = [name for name in QUERY_SHAPE_INDEXES if name not in present]
+    missing_search = [name for name in missing if name in SEARCH_INDEXES]
+    missing = [name for name in missing if name not in SEARCH_INDEXES]
+    if missing:
+        print(f"Missing indexes (run the migrations or start the API once): {', '.join(missing)}")
+    if missing_search:
+        print(f"Missing search indexes (created only by the migrations: npm run migration:run): "
+              f"{', '.join(missing_search)}")
+
+    results = []
+    for name, sql, pick_sql in QUERY_SHAPES:
+        if shape_filter and not any(text.lower() in name.lower() for text in shape_filter):
+            continue
+        params = pick_params(connection, pick_sql)
+        connection.rollback()
+        if params is None:
+            print(f"{name:<50} skipped: no seeded rows")
+            continue
+
+        before = explain(connection, sql, params, repeat, sorted(present))
+        after = explain(connection, sql, params, repeat, None)
+        speedup = (before["execution_ms"] / after["execution_ms"]
+                   if after["execution_ms"] else None)
+        results.append({"name": name, "sql": sql, "before": before,
+                        "after": after, "speedup": speedup})
+        print(f"{name:<50} {before['execution_ms']:9.2f}ms -> "
+              f"{after['execution_ms']:8.2f}ms "
+              f"({'n/a' if speedup is None else f'{speedup:.1f}x'})")
+        print(f"{'':<50} before: {', '.join(before['scans']) or '-'}")
+        print(f"{'':<50} after:  {', '.join(after['scans']) or '-'}")
+    return results
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Compare query plans with and without the query-shape indexes")
+    parser.add_argument(
+        "--repeat", type=int, default=DEFAULT_REPEAT,
+        help="EXPLAIN ANALYZE runs per plan; the median time is reported (default: %(default)s)")
+    parser.add_argument(
+        "--shape", action="append", default=[],
+        help="only run shapes whose name contains this text (repeatable)")
+    parser.add_argument("--output", help="write the plans summary as JSON to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    connection = copy_loader.connect()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM notifications")
+            notifications = cursor.fetchone()[0]
+        connection.rollback()
+        print(f"=== QUERY PLANS ({notifications} notifications seeded) ===")
+        results = run(connection, max(1, args.repeat), args.shape)
+    finally:
+        connection.close()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"repeat": args.repeat, "shapes": results}, file, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
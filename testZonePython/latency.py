@@ -0,0 +1,154 @@
+"""Latency statistics shared by the benchmark and load-testing scripts
+
+All latencies are in milliseconds. The significance tests are one-sided:
+they ask whether `candidate` is larger than `baseline`.
+"""
+import itertools
+import math
+import random
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+def percentile(sorted_samples, pct):
+    """Percentile with linear interpolation between closest ranks
+
+    `sorted_samples` must already be sorted in ascending order.
+    """
+    if not sorted_samples:
+        return None
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    fraction = rank - low
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * fraction
+
+
+def summarize(samples):
+    """Count, mean, min, max and the standard percentiles of a sample list"""
+    ordered = sorted(samples)
+    summary = {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) if ordered else None,
+        "min_ms": ordered[0] if ordered else None,
+        "max_ms": ordered[-1] if ordered else None,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(ordered, pct)
+    return summary
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with bounded memory
+
+    Each bucket is `precision` (1% by default) wider than the previous one,
+    so percentiles are accurate to that relative error no matter how many
+    values are recorded. Not thread-safe: callers serialize `record`.
+    """
+
+    def __init__(self, precision=0.01, lowest_ms=0.01):
+        self.lowest_ms = lowest_ms
+        self._log_base = math.log1p(precision)
+        self._buckets = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def _bucket(self, value_ms):
+        if value_ms <= self.lowest_ms:
+            return 0
+        return int(math.log(value_ms / self.lowest_ms) / self._log_base) + 1
+
+    def _upper_bound(self, bucket):
+        return self.lowest_ms * math.exp(bucket * self._log_base)
+
+    def record(self, value_ms):
+        bucket = self._bucket(value_ms)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the `pct` percentile"""
+        if not self.count:
+            return None
+        target = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= target:
+                return min(self._upper_bound(bucket), self.max_ms)
+        return self.max_ms
+
+    def summary(self, percentiles=PERCENTILES + (99.9,)):
+        summary = {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else None,
+            "max_ms": self.max_ms if self.count else None,
+        }
+        for pct in percentiles:
+            summary[f"p{pct:g}_ms"] = self.percentile(pct)
+        return summary
+
+
+def mann_whitney_greater(baseline, candidate):
+    """One-sided Mann-Whitney U test: p-value that `candidate` is stochastically larger
+
+    Uses the normal approximation with tie correction, which is accurate for
+    the sample sizes a benchmark produces (tens of samples or more per side).
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return None
+
+    pooled = sorted([(value, 0) for value in baseline] + [(value, 1) for value in candidate])
+    rank_sum = 0.0
+    tie_term = 0.0
+    index = 0
+    while index < len(pooled):
+        end = index
+        while end + 1 < len(pooled) and pooled[end + 1][0] == pooled[index][0]:
+            end += 1
+        ties = end - index + 1
+        average_rank = (index + end) / 2 + 1
+        rank_sum += average_rank * sum(1 for _, side in pooled[index:end + 1] if side)
+        tie_term += ties ** 3 - ties
+        index = end + 1
+
+    u = rank_sum - n2 * (n2 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def permutation_greater(baseline, candidate, rounds=10000, seed=0):
+    """One-sided permutation test on the difference of means
+
+    Exact when the number of relabelings is small (e.g. a few runs per
+    side); otherwise estimated with `rounds` random relabelings.
+    """
+    n1, n2 = len(baseline), len(candidate)
+    if not n1 or not n2:
+        return None
+
+    pooled = list(baseline) + list(candidate)
+    total = sum(pooled)
+    observed = sum(candidate) / n2 - sum(baseline) / n1
+
+    def difference(candidate_sum):
+        return candidate_sum / n2 - (total - candidate_sum) / n1
+
+    if math.comb(n1 + n2, n2) <= rounds:
+        labelings = [sum(combo) for combo in itertools.combinations(pooled, n2)]
+    else:
+        rng = random.Random(seed)
+        labelings = [sum(rng.sample(pooled, n2)) for _ in range(rounds)]
+    extreme = sum(1 for candidate_sum in labelings
+                  if difference(candidate_sum) >= observed - 1e-12)
+    return extreme / len(labelings)
@@ -0,0 +1,444 @@
+"""Open-loop load generator for the DonAccion API
+
+Starts user journeys at a fixed target arrival rate, regardless of how fast
+the API answers (open loop), so a slow server builds a queue instead of
+silently lowering the offered load. Each journey is measured twice:
+
+- service time: from the moment a worker actually starts it;
+- corrected time: from the moment it was *scheduled* to start. This is the
+  coordinated-omission correction: time spent waiting behind a slow request
+  counts as latency, as it would for a real donor.
+
+Journeys run on a pool of virtual users that share the keep-alive
+connection pool of `ApiClient`. Users and ids come from the manifest that
+populateDB.py writes, so seed the database first.
+
+Usage:
+    python populateDB.py --scale 10 -y
+    python loadTest.py --rate 50 --duration 60 --users 100 --output load.json
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from api_client import ApiClient, BASE_URL
+from latency import LatencyHistogram
+from manifest import SeedManifest, DEFAULT_MANIFEST_PATH
+from token_cache import TokenCache
+
+DEFAULT_RATE = 20.0  # Journeys started per second
+DEFAULT_DURATION = 30  # Seconds
+DEFAULT_USERS = 50  # Virtual users (distinct accounts and concurrent workers)
+DEFAULT_PASSWORD = "Password123"
+
+# name=weight pairs; weights are relative
+DEFAULT_MIX = ("browse=30,view_foundation=20,donate=15,comment=10,rate=5,"
+               "apply=10,notifications=10")
+
+# Random picks tried before an apply journey gives up on finding an open
+# action the user has not applied to yet
+APPLY_PICK_ATTEMPTS = 20
+
+COMMENTS = [
+    "Excelente trabajo, sigan así.",
+    "Muy transparentes con el uso de las donaciones.",
+    "Gracias por el impacto que generan en la comunidad.",
+]
+
+api = ApiClient(BASE_URL)
+token_cache = TokenCache(BASE_URL)
+
+# (user id, social action id) pairs applied to during this run
+applied = set()
+applied_lock = threading.Lock()
+
+
+class Journey:
+    """One journey execution: runs its steps and records their service time"""
+
+    def __init__(self, recorder, user, data):
+        self.recorder = recorder
+        self.user = user
+        self.data = data
+        self.session = api.as_user(user["id"])
+        self.ok = True
+
+    def step(self, name, method, path, expected=(200, 201), **kwargs):
+        """Run one request; statuses outside `expected` count as errors"""
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, path, **kwargs)
+            success = response.status_code in expected
+        except Exception:
+            response = None
+            success = False
+        self.recorder.record_step(name, (time.perf_counter() - start) * 1000, success)
+        self.ok = self.ok and success
+        return response if success else None
+
+
+def journey_browse(journey):
+    journey.step("GET /social-actions/upcoming", "GET", "social-actions/upcoming")
+
+
+def journey_view_foundation(journey):
+    foundation = random.choice(journey.data["foundations"])
+    journey.step("GET /foundations/{id}", "GET", f"foundations/{foundation['id']}")
+
+
+def _donate(journey):
+    foundation = random.choice(journey.data["foundations"])
+    return journey.step("POST /donations", "POST", "donations", json={
+        "user_id": journey.user["id"],
+        "foundation_id": foundation["id"],
+        "amount": round(random.uniform(10, 500), 2),
+    })
+
+
+def journey_donate(journey):
+    journey.step("GET /foundations/{id}", "GET",
+                 f"foundations/{random.choice(journey.data['foundations'])['id']}")
+    _donate(journey)
+
+
+def journey_comment(journey):
+    foundation = random.choice(journey.data["foundations"])
+    journey.step("POST /comments", "POST", "comments", json={
+        "user_id": journey.user["id"],
+        "foundation_id": foundation["id"],
+        "text": random.choice(COMMENTS),
+    })
+
+
+def journey_rate(journey):
+    # Only the donor may rate a donation: donate first, then rate it
+    response = _donate(journey)
+    if response is None:
+        return
+    journey.step("POST /ratings", "POST", "ratings", json={
+        "user_id": journey.user["id"],
+        "donation_id": response.json()["id"],
+        "rating": random.randint(3, 5),
+    })
+
+
+def _claim_open_action(journey):
+    """An action that has not ended and this user has not applied to in this
+    run, reserved for them; None if a few random picks find none"""
+    open_actions = journey.data["open_actions"]
+    if not open_actions:
+        return None
+    with applied_lock:
+        for _ in range(APPLY_PICK_ATTEMPTS):
+            action = random.choice(open_actions)
+            pair = (journey.user["id"], action["id"])
+            if pair not in applied:
+                applied.add(pair)
+                return action
+    return None
+
+
+def journey_apply(journey):
+    journey.step("GET /social-actions/upcoming", "GET", "social-actions/upcoming")
+    action = _claim_open_action(journey)
+    if action is None:
+        return
+    # 403: the user applied before this run (seeding or an earlier load test)
+    journey.step("POST /opportunities/{id}/apply", "POST",
+                 f"opportunities/{action['id']}/apply", expected=(200, 201, 403),
+                 json={"message": "Me gustaría participar"})
+
+
+def journey_notifications(journey):
+    # The badge poll comes first; the list is only opened afterwards
+    journey.step("GET /notifications/unread/count", "GET", "notifications/unread/count")
+    journey.step("GET /notifications/unread", "GET", "notifications/unread")
+
+
+JOURNEYS = {
+    "browse": journey_browse,
+    "view_foundation": journey_view_foundation,
+    "donate": journey_donate,
+    "comment": journey_comment,
+    "rate": journey_rate,
+    "apply": journey_apply,
+    "notifications": journey_notifications,
+}
+
+
+class Recorder:
+    """Thread-safe histograms per journey (service and corrected) and per step"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.service = defaultdict(LatencyHistogram)
+        self.corrected = defaultdict(LatencyHistogram)
+        self.steps = defaultdict(LatencyHistogram)
+        self.errors = defaultdict(int)
+        self.step_errors = defaultdict(int)
+        self.start_lag = LatencyHistogram()
+
+    def record_step(self, name, latency_ms, success):
+        with self._lock:
+            self.steps[name].record(latency_ms)
+            if not success:
+                self.step_errors[name] += 1
+
+    def record_journey(self, name, intended, started, finished, success):
+        with self._lock:
+            self.service[name].record((finished - started) * 1000)
+            self.corrected[name].record((finished - intended) * 1000)
+            self.start_lag.record((started - intended) * 1000)
+            if not success:
+                self.errors[name] += 1
+
+
+def parse_mix(text):
+    """'browse=30,donate=10' -> [("browse", 30.0), ("donate", 10.0)]"""
+    mix = []
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in JOURNEYS:
+            raise ValueError(f"Unknown journey '{name}'; choose from {', '.join(JOURNEYS)}")
+        mix.append((name, float(weight or 1)))
+    return mix
+
+
+def login(user):
+    """Token for a seeded user, from the on-disk cache or a fresh login"""
+    token = token_cache.get(user["email"], user["id"])
+    if token:
+        return token
+    try:
+        response = api.public.post("auth/login", json={
+            "email": user["email"], "password": user.get("password", DEFAULT_PASSWORD)})
+    except Exception:
+        return None
+    if response.status_code in (200, 201):
+        token = response.json().get("access_token")
+        if token:
+            token_cache.set(user["email"], token)
+        return token
+    return None
+
+
+def ends_in_future(action, now):
+    """Whether a seeded social action is still open to applications"""
+    if not action.get("end_date"):
+        return False
+    end_date = datetime.fromisoformat(action["end_date"].replace("Z", "+00:00"))
+    # populateDB.py writes naive local times for the COPY loader
+    if end_date.tzinfo is None:
+        end_date = end_date.astimezone()
+    return end_date > now
+
+
+def load_dataset(manifest_path, user_count):
+    """Regular users, foundations and social actions seeded by populateDB.py"""
+    manifest = SeedManifest(manifest_path)
+    if not manifest.load():
+        raise RuntimeError(
+            f"No manifest at {manifest_path}; run populateDB.py first")
+
+    data = defaultdict(list)
+    for kind, record in manifest.records:
+        if kind == "users" and record.get("user_type") == "user":
+            data["users"].append(record)
+        elif kind in ("foundations", "social_actions"):
+            data[kind].append(record)
+    if not data["users"] or not data["foundations"] or not data["social_actions"]:
+        raise RuntimeError("The manifest has no users, foundations or social actions")
+
+    now = datetime.now(timezone.utc)
+    data["open_actions"] = [action for action in data["social_actions"]
+                            if ends_in_future(action, now)]
+
+    random.shuffle(data["users"])
+    data["users"] = data["users"][:user_count]
+    return data
+
+
+def authenticate(users, workers):
+    """Log in every virtual user in parallel; returns the ones with a token"""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        tokens = list(executor.map(login, users))
+    ready = []
+    for user, token in zip(users, tokens):
+        if token:
+            api.set_token(user["id"], token)
+            ready.append(user)
+    token_cache.save()
+    return ready
+
+
+def run_load(data, mix, rate, duration, workers, arrival):
+    """Schedule journeys open-loop for `duration` seconds at `rate` per second"""
+    recorder = Recorder()
+    names = [name for name, _ in mix]
+    weights = [weight for _, weight in mix]
+    idle_users = list(data["users"])
+    users_lock = threading.Lock()
+
+    def run_journey(name, intended):
+        started = time.perf_counter()
+        # Each virtual user runs one journey at a time
+        with users_lock:
+            user = idle_users.pop() if idle_users else random.choice(data["users"])
+        try:
+            journey = Journey(recorder, user, data)
+            try:
+                JOURNEYS[name](journey)
+            except Exception:
+                journey.ok = False
+            recorder.record_journey(name, intended, started, time.perf_counter(), journey.ok)
+        finally:
+            with users_lock:
+                idle_users.append(user)
+
+    scheduled = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        next_start = start
+        deadline = start + duration
+        while next_start < deadline:
+            delay = next_start - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            name = random.choices(names, weights)[0]
+            # Submitted with its scheduled time: if every worker is busy, the
+            # wait in the queue counts as latency (coordinated omission)
+            executor.submit(run_journey, name, next_start)
+            scheduled += 1
+            if arrival == "poisson":
+                next_start += random.expovariate(rate)
+            else:
+                next_start += 1 / rate
+        # Taken before leaving the with block, which waits for queued journeys:
+        # the achieved rate is measured over the scheduling window only
+        schedule_seconds = time.perf_counter() - start
+    drain_seconds = time.perf_counter() - start - schedule_seconds
+    return recorder, scheduled, schedule_seconds, drain_seconds
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value:.1f}"
+
+
+def print_report(recorder, scheduled, elapsed, drain, rate):
+    print("\n=== LOAD TEST RESULTS ===")
+    print(f"Target rate: {rate:.1f}/s  Achieved: {scheduled / elapsed:.1f}/s  "
+          f"Journeys: {scheduled}  Scheduling: {elapsed:.1f}s  Drain: {drain:.1f}s")
+    lag = recorder.start_lag.summary()
+    print(f"Start lag behind schedule: p50={format_ms(lag['p50_ms'])}ms "
+          f"p99={format_ms(lag['p99_ms'])}ms max={format_ms(lag['max_ms'])}ms")
+
+    print(f"\n{'journey':<18} {'count':>7} {'errors':>7}   "
+          f"{'corrected p50/p99/p99.9 (ms)':<30} {'service p50/p99 (ms)':<22}")
+    for name in sorted(recorder.corrected):
+        corrected = recorder.corrected[name].summary()
+        service = recorder.service[name].summary()
+        print(
+            f"{name:<18} {corrected['count']:>7} {recorder.errors[name]:>7}   "
+            f"{format_ms(corrected['p50_ms']):>8} {format_ms(corrected['p99_ms']):>9} "
+            f"{format_ms(corrected['p99.9_ms']):>10}    "
+            f"{format_ms(service['p50_ms']):>8} {format_ms(service['p99_ms']):>9}")
+
+    print(f"\n{'step':<34} {'count':>7} {'errors':>7} {'p50':>8} {'p90':>8} {'p99':>8}")
+    for name in sorted(recorder.steps):
+        step = recorder.steps[name].summary()
+        print(
+            f"{name:<34} {step['count']:>7} {recorder.step_errors[name]:>7} "
+            f"{format_ms(step['p50_ms']):>8} {format_ms(step['p90_ms']):>8} "
+            f"{format_ms(step['p99_ms']):>8}")
+
+
+def build_report(recorder, scheduled, elapsed, drain, args):
+    return {
+        "target_rate": args.rate,
+        "achieved_rate": scheduled / elapsed if elapsed > 0 else 0.0,
+        "duration_seconds": elapsed,
+        "drain_seconds": drain,
+        "virtual_users": args.users,
+        "arrival": args.arrival,
+        "mix": args.mix,
+        "start_lag": recorder.start_lag.summary(),
+        "journeys": {
+            name: {
+                "errors": recorder.errors[name],
+                "corrected": recorder.corrected[name].summary(),
+                "service": recorder.service[name].summary(),
+            }
+            for name in recorder.corrected
+        },
+        "steps": {
+            name: {"errors": recorder.step_errors[name], **recorder.steps[name].summary()}
+            for name in recorder.steps
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Open-loop load generator with a weighted user-journey mix")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE,
+                        help="journeys started per second (default: %(default)s)")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION,
+                        help="seconds to generate load (default: %(default)s)")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS,
+                        help="virtual users; also the number of worker threads "
+                             "and pooled connections (default: %(default)s)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help="journey weights as name=weight pairs (default: %(default)s)")
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson",
+                        help="spacing between journey starts (default: %(default)s)")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST_PATH,
+                        help="populateDB.py manifest with the seeded entities")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.rate <= 0 or args.duration <= 0:
+        print("❌ --rate and --duration must be greater than 0")
+        return 1
+    try:
+        mix = parse_mix(args.mix)
+        data = load_dataset(args.manifest, max(1, args.users))
+    except (ValueError, RuntimeError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    workers = len(data["users"])
+    api.configure_pool(workers)
+    try:
+        print(f"Logging in {workers} virtual users...")
+        data["users"] = authenticate(data["users"], workers)
+        if not data["users"]:
+            print("❌ No virtual user could log in")
+            return 1
+
+        print(f"Generating {args.rate:g} journeys/s for {args.duration:g}s "
+              f"with {len(data['users'])} virtual users...")
+        recorder, scheduled, elapsed, drain = run_load(
+            data, mix, args.rate, args.duration, workers, args.arrival)
+    finally:
+        api.close()
+
+    print_report(recorder, scheduled, elapsed, drain, args.rate)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(build_report(recorder, scheduled, elapsed, drain, args), file, indent=2)
+        print(f"\n✅ JSON report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
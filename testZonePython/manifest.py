@@ -0,0 +1,95 @@
+"""Manifiesto en disco de una corrida de populateDB.py, para poder reanudarla
+
+Es un archivo JSONL de solo anexar. Cada línea es uno de estos eventos:
+
+- `{"run": {...}}`: parámetros de la corrida (escala, URL de la API y semilla
+  de los datos generados, que al reanudar se reutiliza).
+- `{"phase": ..., "task": n, "kind": ..., "record": {...}}`: entidad creada
+  por la tarea `n` de una fase, en forma compacta.
+- `{"phase": ..., "complete": true}`: la fase terminó.
+
+Cada línea se escribe y se vacía al disco en cuanto la entidad existe en el
+servidor, así que si el proceso muere solo se pierde la tarea en curso. Una
+línea final truncada por la caída se ignora al leer.
+"""
+import json
+import os
+import threading
+
+DEFAULT_MANIFEST_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".seed_manifest.jsonl")
+
+
+class SeedManifest:
+    def __init__(self, path=DEFAULT_MANIFEST_PATH):
+        self.path = path
+        self.run = {}
+        self.records = []  # (kind, record) en orden de creación
+        self._completed = set()
+        self._done_tasks = {}  # fase -> ordinales de tareas terminadas
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self):
+        """Lee un manifiesto existente; devuelve False si no hay ninguno"""
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                lines = file.readlines()
+        except FileNotFoundError:
+            return False
+
+        for line in lines:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue  # Última línea a medio escribir
+            if "run" in event:
+                self.run = event["run"]
+            elif event.get("complete"):
+                self._completed.add(event["phase"])
+            elif "record" in event:
+                self.records.append((event["kind"], event["record"]))
+                self._done_tasks.setdefault(
+                    event["phase"], set()).add(event["task"])
+        return True
+
+    def start(self, run, resume=False):
+        """Abre el manifiesto para anexar; sin `resume` empieza uno nuevo"""
+        self._file = open(self.path, "a" if resume else "w", encoding="utf-8")
+        if resume and self._file.tell() > 0:
+            # Separar de una última línea que quedó a medio escribir
+            with open(self.path, "rb") as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    self._file.write("\n")
+        if not resume:
+            self.run = run
+            self._write({"run": run})
+
+    def _write(self, event):
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(json.dumps(event, default=str) + "\n")
+            self._file.flush()
+
+    def add(self, phase, task, kind, record):
+        """Registra una entidad creada por la tarea `task` de `phase`"""
+        self._write({"phase": phase, "task": task, "kind": kind, "record": record})
+
+    def complete(self, phase):
+        self._completed.add(phase)
+        self._write({"phase": phase, "complete": True})
+
+    def is_complete(self, phase):
+        return phase in self._completed
+
+    def done_tasks(self, phase):
+        """Ordinales de las tareas de `phase` que ya crearon su entidad"""
+        return self._done_tasks.get(phase, set())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
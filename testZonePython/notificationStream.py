@@ -0,0 +1,210 @@
+"""Delivery test for the notifications SSE stream (GET /notifications/stream)
+
+Creates a throwaway user, opens its event stream and then creates, reads and
+marks notifications through the REST API. Every change must arrive on the
+stream; the latency of each event is measured from just before the REST call
+that caused it until the event is read from the stream, on this machine's
+monotonic clock. Each event also carries the user's unread count, which is
+checked against the expected value.
+
+Exits with status 1 if an event is missing, an unread count is wrong or the
+p95 latency exceeds --max-latency-ms.
+
+Usage:
+    python notificationStream.py --notifications 50 --max-latency-ms 250
+"""
+import argparse
+import json
+import queue
+import random
+import sys
+import threading
+import time
+
+import requests
+
+from api_client import BASE_URL, ApiClient
+from latency import summarize
+
+DEFAULT_NOTIFICATIONS = 20
+DEFAULT_MAX_LATENCY_MS = 500
+EVENT_TIMEOUT = 5  # Seconds to wait for each expected event
+
+
+class EventStream:
+    """Reads an SSE response in a background thread
+
+    Events are queued as (arrival perf_counter, event type, data) tuples;
+    "ping" heartbeats are dropped.
+    """
+
+    def __init__(self, url, token):
+        self.events = queue.Queue()
+        self.response = requests.get(
+            url, stream=True, timeout=(5, None),
+            headers={"Authorization": f"Bearer {token}", "Accept": "text/event-stream"})
+        self.response.raise_for_status()
+        self.thread = threading.Thread(target=self._read, daemon=True)
+        self.thread.start()
+
+    def _read(self):
+        event_type, data = "message", []
+        try:
+            for line in self.response.iter_lines(decode_unicode=True):
+                if line.startswith("event:"):
+                    event_type = line[6:].strip()
+                elif line.startswith("data:"):
+                    data.append(line[5:].strip())
+                elif not line and data:
+                    if event_type != "ping":
+                        self.events.put((time.perf_counter(), event_type, json.loads("\n".join(data))))
+                    event_type, data = "message", []
+        except (requests.RequestException, AttributeError):
+            pass  # Closed by close()
+
+    def expect(self, event_type, timeout=EVENT_TIMEOUT):
+        """Next event, which must be of `event_type`; (arrival, data) or None"""
+        try:
+            arrival, received_type, data = self.events.get(timeout=timeout)
+        except queue.Empty:
+            print(f"  missing {event_type} event after {timeout}s")
+            return None
+        if received_type != event_type:
+            print(f"  expected a {event_type} event, got {received_type}: {data}")
+            return None
+        return arrival, data
+
+    def close(self):
+        self.response.close()
+
+
+def create_user(api):
+    """Register a throwaway user and return (user, token)"""
+    suffix = random.randint(100000, 999999)
+    user = {
+        "name": f"Stream Test {suffix}",
+        "email": f"stream.test{suffix}@ejemplo.com",
+        "password": "Password123",
+        "user_type": "user",
+    }
+    response = api.post(f"{BASE_URL}/users", json=user)
+    response.raise_for_status()
+    created = response.json()
+    response = api.post(f"{BASE_URL}/auth/login",
+                        json={"email": user["email"], "password": user["password"]})
+    response.raise_for_status()
+    return created, response.json()["access_token"]
+
+
+def timed(stream, event_type, expected_unread, action):
+    """Run `action` and wait for its event; returns the latency in ms or None"""
+    start = time.perf_counter()
+    response = action()
+    if response.status_code >= 400:
+        print(f"  {event_type}: API returned {response.status_code}: {response.text}")
+        return None
+    received = stream.expect(event_type)
+    if received is None:
+        return None
+    arrival, data = received
+    if data.get("unread_count") != expected_unread:
+        print(f"  {event_type}: unread_count {data.get('unread_count')}, expected {expected_unread}")
+        return None
+    return (arrival - start) * 1000
+
+
+def run(notifications):
+    api = ApiClient(BASE_URL)
+    user, token = create_user(api)
+    api.set_token(user["id"], token)
+    session = api.as_user(user["id"])
+
+    stream = EventStream(f"{BASE_URL}/notifications/stream", token)
+    latencies = {"created": [], "read": []}
+    failures = 0
+    try:
+        # The stream opens with the current unread count
+        initial = stream.expect("unread_count")
+        if initial is None or initial[1]["unread_count"] != 0:
+            print("  stream did not start with unread_count 0")
+            failures += 1
+
+        created_ids = []
+        for index in range(notifications):
+            def create():
+                response = session.post(f"{BASE_URL}/notifications", json={
+                    "user_id": user["id"], "message": f"Stream test {index}"})
+                if response.status_code < 400:
+                    created_ids.append(response.json()["id"])
+                return response
+            latency = timed(stream, "created", index + 1, create)
+            if latency is None:
+                failures += 1
+            else:
+                latencies["created"].append(latency)
+
+        # Read half one by one, then the rest at once
+        unread = len(created_ids)
+        for notification_id in created_ids[: len(created_ids) // 2]:
+            unread -= 1
+            latency = timed(stream, "read", unread, lambda: session.patch(
+                f"{BASE_URL}/notifications/{notification_id}/read"))
+            if latency is None:
+                failures += 1
+            else:
+                latencies["read"].append(latency)
+        latency = timed(stream, "read", 0, lambda: session.post(
+            f"{BASE_URL}/notifications/mark-all-read"))
+        if latency is None:
+            failures += 1
+        else:
+            latencies["read"].append(latency)
+    finally:
+        stream.close()
+
+    return latencies, failures
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Check delivery and latency of the notifications SSE stream")
+    parser.add_argument(
+        "--notifications", type=int, default=DEFAULT_NOTIFICATIONS,
+        help="notifications to create (default: %(default)s)")
+    parser.add_argument(
+        "--max-latency-ms", type=float, default=DEFAULT_MAX_LATENCY_MS,
+        help="fail if the p95 delivery latency is above this (default: %(default)s)")
+    parser.add_argument("--output", help="write the latency summary as JSON to this path")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    latencies, failures = run(max(1, args.notifications))
+
+    report = {}
+    slow = False
+    print("=== SSE DELIVERY LATENCY ===")
+    for event_type, samples in latencies.items():
+        summary = summarize(samples)
+        report[event_type] = summary
+        if not samples:
+            continue
+        print(f"{event_type:<8} n={summary['count']:<4} p50={summary['p50_ms']:7.1f}ms "
+              f"p95={summary['p95_ms']:7.1f}ms max={summary['max_ms']:7.1f}ms")
+        slow = slow or summary["p95_ms"] > args.max_latency_ms
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"failures": failures, "events": report}, file, indent=2)
+        print(f"Report written to {args.output}")
+
+    if failures:
+        print(f"FAILED: {failures} events missing or with a wrong unread count")
+    if slow:
+        print(f"FAILED: p95 latency above {args.max_latency_ms}ms")
+    return 1 if failures or slow else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,40 @@
-import requests
+import argparse
+import asyncio
+import csv
+import io
+import itertools
 import json
 import random
+import threading
 import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import partial
 from faker import Faker
+from api_client import ApiClient
+from scale import profile_for_scale, print_estimate
+from registry import EntityRegistry
+from token_cache import TokenCache, decode_jwt_payload
+from manifest import SeedManifest
+import copy_loader
 
 # Configuración
 BASE_URL = "http://localhost:3001/api"
 # Corregido: la autenticación está en /auth, no en /api/auth
 AUTH_URL = f"{BASE_URL}/auth"
-headers = {"Content-Type": "application/json"}
-# Será actualizado con el token JWT
-auth_headers = {"Content-Type": "application/json"}
+ADMIN_EMAIL = "admin@ejemplo.com"
+# Cliente HTTP compartido: pool de conexiones keep-alive y sesiones por usuario
+api = ApiClient(BASE_URL)
+# Tokens JWT en disco por email: las corridas repetidas no vuelven a hacer login
+token_cache = TokenCache(BASE_URL)
 fake = Faker(['es_ES', 'es_MX'])  # Generador para español
+# Azar de los datos generados. Solo lo usan los generadores de tareas (en el
+# hilo principal) y run_phase lo reinicia en cada fase con la semilla de la
+# corrida: al reanudar, la tarea n de una fase vuelve a ser la misma
+rng = random.Random()
+RUN_SEED = None  # Semilla de la corrida, guardada en el manifiesto
 
 # Número de entidades a crear
 NUM_REGULAR_USERS = 20
@@ -27,20 +49,47 @@ NOTIFICATIONS = 40
 SUGGESTIONS = 25
 FAVORITES_PER_USER = 5
 
+# Perfil de scale=1; --scale deriva todos los conteos a partir de él
+BASE_PROFILE = {
+    "NUM_REGULAR_USERS": NUM_REGULAR_USERS,
+    "NUM_FOUNDATION_USERS": NUM_FOUNDATION_USERS,
+    "DONATIONS_PER_USER": DONATIONS_PER_USER,
+    "SOCIAL_ACTIONS_PER_FOUNDATION": SOCIAL_ACTIONS_PER_FOUNDATION,
+    "COMMENTS_PER_ENTITY": COMMENTS_PER_ENTITY,
+    "MAX_RATINGS": MAX_RATINGS,
+    "PARTICIPATION_REQUESTS": PARTICIPATION_REQUESTS,
+    "CERTIFICATES": CERTIFICATES,
+    "NOTIFICATIONS": NOTIFICATIONS,
+    "SUGGESTIONS": SUGGESTIONS,
+    "FAVORITES_PER_USER": FAVORITES_PER_USER,
+}
+
+# Ejecución de las fases: "sync" (una petición a la vez), "async"
+# (peticiones concurrentes dentro de cada fase) o "copy" (COPY directo a
+# PostgreSQL, sin pasar por la API)
+SEED_MODE = "sync"
+CONCURRENCY = 16  # Máximo de peticiones simultáneas por fase en modo async
+# Elementos por petición a los endpoints /batch (la API acepta hasta 500)
+BATCH_SIZE = 200
+
 # Almacenamiento para IDs y otros datos
-users = []  # Lista de diccionarios con info de usuarios
+# Índices por id, por tipo de usuario y de fundación -> usuario dueño
+registry = EntityRegistry()
+users = registry.records("users")  # Lista de diccionarios con info de usuarios
 admin_token = None  # Token JWT para administrador
-user_tokens = {}  # Diccionario de tokens JWT por usuario_id
-foundations = []  # Lista de diccionarios con info de fundaciones
-donations = []  # Lista de IDs de donaciones
-social_actions = []  # Lista de IDs de acciones sociales
-comments = []  # Lista de IDs de comentarios
-ratings = []  # Lista de IDs de calificaciones
-participation_requests = []  # Lista de IDs de solicitudes
-certificates = []  # Lista de IDs de certificados
-notifications = []  # Lista de IDs de notificaciones
-suggestions = []  # Lista de IDs de sugerencias
-favorites = []  # Lista de IDs de favoritos
+user_tokens = api.tokens  # Diccionario de tokens JWT por usuario_id
+foundations = registry.records("foundations")  # Lista de diccionarios con info de fundaciones
+# Solo las primeras donaciones se reutilizan (comentarios y calificaciones),
+# así que no se guardan todas: la memoria no crece con la escala
+donations = []  # Lista compacta de las primeras donaciones
+social_actions = registry.records("social_actions")  # Lista compacta de acciones sociales
+# Las entidades hoja no se reutilizan en fases posteriores: solo se cuentan
+created_counts = Counter()
+# Manifiesto en disco de lo creado, para reanudar una corrida interrumpida
+manifest = SeedManifest()
+_current_task = threading.local()  # (fase, ordinal) de la tarea en ejecución
+_created_lock = threading.Lock()
+phase_stats = []  # Métricas de rendimiento de cada fase
 
 # Datos realistas para fundaciones
 foundation_prefixes = [
@@ -151,6 +200,25 @@ suggestions_list = [
     "Sería útil tener una calculadora de impacto que muestre el efecto de cada donación."
 ]
 
+# Mensajes de notificaciones
+notification_templates = [
+    "¡Nueva acción social disponible cerca de ti!",
+    "Tu donación ha sido recibida con éxito.",
+    "Una fundación ha respondido a tu comentario.",
+    "Tu solicitud de participación ha sido aceptada.",
+    "¡Felicidades! Has recibido un nuevo certificado.",
+    "Han valorado positivamente tu comentario.",
+    "Una acción social que te interesa comienza pronto.",
+    "Se ha añadido un nuevo método de donación.",
+    "Actualización importante sobre una acción social.",
+    "Recordatorio: Evento de voluntariado mañana.",
+    "¡Gracias por tu apoyo constante!",
+    "Una fundación ha publicado nuevas fotos.",
+    "¡Has completado tu primer año como colaborador!",
+    "Alguien ha comentado en una donación tuya.",
+    "Se han actualizado nuestros términos de servicio."
+]
+
 # Certificados para usuarios
 certificate_descriptions = [
     "Certificado de voluntariado en campañas de reforestación",
@@ -179,8 +247,85 @@ def print_status(message, success=True):
         print(f"❌ {message}")
 
 
-def login_user(email, password):
-    """Inicia sesión y obtiene token JWT"""
+def remember(kind, record):
+    """Anota en el manifiesto una entidad creada por la tarea actual"""
+    phase = getattr(_current_task, "phase", None)
+    if phase is not None:
+        manifest.add(phase, _current_task.index, kind, record)
+
+
+def add_entity(kind, record):
+    """Registra una entidad reutilizada por fases posteriores"""
+    registry.add(kind, record)
+    remember(kind, record)
+    return record
+
+
+def record_created(kind, record=None):
+    """Cuenta una entidad creada (seguro entre hilos)"""
+    with _created_lock:
+        created_counts[kind] += 1
+    remember(kind, record or {})
+
+
+def response_id(response):
+    """Registro compacto con el id de la entidad creada, si la API lo devuelve"""
+    try:
+        return {"id": response.json().get("id")}
+    except (ValueError, AttributeError):
+        return {}
+
+
+def keep_donation(donation):
+    """Guarda la donación si está entre las que se reutilizan después"""
+    with _created_lock:
+        if len(donations) < donations_to_keep():
+            donations.append(donation)
+
+
+def donations_to_keep():
+    """Número de donaciones que usan las fases de comentarios y calificaciones"""
+    return max(COMMENTS_PER_ENTITY * 3, MAX_RATINGS)
+
+
+def unique_email(email, index):
+    """Hace único un email generado para que no colisione a gran escala"""
+    local, domain = email.split("@", 1)
+    return f"{local}.{index}@{domain}"
+
+
+def apply_scale(scale):
+    """Ajusta los conteos globales según el factor de escala"""
+    global NUM_REGULAR_USERS, NUM_FOUNDATION_USERS, DONATIONS_PER_USER
+    global SOCIAL_ACTIONS_PER_FOUNDATION, COMMENTS_PER_ENTITY, MAX_RATINGS
+    global PARTICIPATION_REQUESTS, CERTIFICATES, NOTIFICATIONS, SUGGESTIONS
+    global FAVORITES_PER_USER
+
+    profile = profile_for_scale(BASE_PROFILE, scale)
+    NUM_REGULAR_USERS = profile["NUM_REGULAR_USERS"]
+    NUM_FOUNDATION_USERS = profile["NUM_FOUNDATION_USERS"]
+    DONATIONS_PER_USER = profile["DONATIONS_PER_USER"]
+    SOCIAL_ACTIONS_PER_FOUNDATION = profile["SOCIAL_ACTIONS_PER_FOUNDATION"]
+    COMMENTS_PER_ENTITY = profile["COMMENTS_PER_ENTITY"]
+    MAX_RATINGS = profile["MAX_RATINGS"]
+    PARTICIPATION_REQUESTS = profile["PARTICIPATION_REQUESTS"]
+    CERTIFICATES = profile["CERTIFICATES"]
+    NOTIFICATIONS = profile["NOTIFICATIONS"]
+    SUGGESTIONS = profile["SUGGESTIONS"]
+    FAVORITES_PER_USER = profile["FAVORITES_PER_USER"]
+    return profile
+
+
+def login_user(email, password, user_id=None):
+    """Inicia sesión y obtiene token JWT
+
+    Usa el token cacheado del email si sigue vigente (y pertenece a
+    `user_id`, cuando se conoce); si no, inicia sesión y lo guarda en caché.
+    """
+    token = token_cache.get(email, user_id)
+    if token:
+        return token
+
     login_data = {
         "email": email,
         "password": password
@@ -188,8 +333,8 @@ def login_user(email, password):
 
     try:
         # Corregido: Usar la URL de autenticación correcta
-        response = requests.post(
-            f"{AUTH_URL}/login", json=login_data, headers=headers)
+        response = api.public.post(
+            f"{AUTH_URL}/login", json=login_data)
 
         # Imprime para diagnóstico
         if response.status_code == 200 or response.status_code == 201:
@@ -197,6 +342,7 @@ def login_user(email, password):
             token = token_data.get('access_token')
             if token:
                 print_status(f"Inicio de sesión exitoso para: {email}")
+                token_cache.set(email, token)
                 return token
             else:
                 print_status(
@@ -211,356 +357,658 @@ def login_user(email, password):
         return None
 
 
-def get_auth_headers(user_id=None):
-    """Obtiene los headers con el token JWT"""
-    if user_id and user_id in user_tokens:
-        token = user_tokens[user_id]
-    elif admin_token:
-        token = admin_token
-    else:
-        return headers  # Sin token, retornar headers básicos
+def restore_from_manifest():
+    """Recarga lo creado por una corrida anterior según el manifiesto"""
+    for kind, record in manifest.records:
+        if kind in ("users", "foundations", "social_actions"):
+            registry.add(kind, record)
+            if kind == "users" and record.get("email") == ADMIN_EMAIL:
+                api.fallback_user = record["id"]
+        else:
+            created_counts[kind] += 1
+            if kind == "donations":
+                keep_donation(record)
 
-    return {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}"
-    }
+    print_status(
+        f"Manifiesto recargado: {len(users)} usuarios, {len(foundations)} fundaciones, "
+        f"{len(social_actions)} acciones sociales, {sum(created_counts.values())} otras entidades")
 
 
-def create_users():
-    """Crear usuarios regulares y fundaciones"""
-    global users, admin_token, user_tokens
+def _run_task(task):
+    """Ejecuta una tarea capturando errores inesperados"""
+    try:
+        return bool(task())
+    except Exception as e:
+        print_status(f"Error inesperado en tarea: {str(e)}", False)
+        return False
 
-    print("\n=== Creando usuarios regulares ===")
 
-    # Crear un usuario admin primero para facilitar operaciones
-    admin_data = {
-        "name": "Administrador",
-        "email": "admin@ejemplo.com",
-        "password": "Password123",
-        "user_type": "foundation"  # Admin como fundación
-    }
+def _run_numbered(phase, index, task):
+    """Ejecuta la tarea `index` de una fase; lo que cree queda en el manifiesto"""
+    _current_task.phase = phase
+    _current_task.index = index
+    try:
+        return task()
+    finally:
+        _current_task.phase = None
+
+
+def seed_generators(phase):
+    """Reinicia rng y Faker con la semilla de la corrida y el nombre de la fase"""
+    key = f"{RUN_SEED}:{phase}"
+    rng.seed(key)
+    Faker.seed(key)
+
+
+def _pending_tasks(name, tasks):
+    """Numera las tareas de la fase y omite las que ya constan en el manifiesto"""
+    done = manifest.done_tasks(name)
+    if done:
+        print_status(f"{name}: se reanudan omitiendo {len(done)} tareas ya hechas")
+    for index, task in enumerate(tasks):
+        if index not in done:
+            yield partial(_run_numbered, name, index, task)
+
+
+def _run_tasks_sync(tasks):
+    """Ejecuta las tareas una por una, en orden"""
+    total = 0
+    succeeded = 0
+    for task in tasks:
+        total += 1
+        if _run_task(task):
+            succeeded += 1
+    return total, succeeded
+
+
+async def _run_tasks_async(tasks, concurrency):
+    """Ejecuta las tareas con a lo sumo `concurrency` peticiones en vuelo
+
+    Las peticiones siguen siendo bloqueantes (requests), así que se delegan a
+    un pool de hilos del tamaño del límite. Las tareas se consumen de forma
+    perezosa: nunca se materializa la fase completa en memoria.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    in_flight = set()
+    counters = {"total": 0, "succeeded": 0}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        async def run_one(task):
+            try:
+                if await loop.run_in_executor(executor, _run_task, task):
+                    counters["succeeded"] += 1
+            finally:
+                semaphore.release()
+
+        for task in tasks:
+            await semaphore.acquire()
+            counters["total"] += 1
+            future = asyncio.ensure_future(run_one(task))
+            in_flight.add(future)
+            future.add_done_callback(in_flight.discard)
+
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    return counters["total"], counters["succeeded"]
+
+
+def run_phase(name, tasks, concurrent=False):
+    """Ejecuta las tareas de una fase y reporta su rendimiento
+
+    Cada tarea es un callable sin argumentos que hace sus propias peticiones
+    y devuelve True si tuvo éxito. Las fases siempre se ejecutan en orden;
+    en modo async (o con `concurrent=True`) solo se paralelizan las tareas
+    dentro de la fase.
+    """
+    start = time.perf_counter()
+    # Los generadores son perezosos: nada se sorteó todavía
+    seed_generators(name)
+    tasks = _pending_tasks(name, tasks)
+    if SEED_MODE == "async" or concurrent:
+        total, succeeded = asyncio.run(_run_tasks_async(tasks, CONCURRENCY))
+    else:
+        total, succeeded = _run_tasks_sync(tasks)
+    _record_phase(name, total, succeeded, time.perf_counter() - start)
+
+
+def _record_phase(name, total, succeeded, elapsed):
+    """Guarda e imprime las métricas de una fase"""
+    throughput = total / elapsed if elapsed > 0 else 0.0
+    phase_stats.append({
+        "phase": name,
+        "tasks": total,
+        "succeeded": succeeded,
+        "seconds": elapsed,
+        "throughput": throughput,
+    })
+    print(
+        f"⏱️  {name}: {succeeded}/{total} tareas en {elapsed:.2f}s ({throughput:.1f} tareas/s)")
+
 
+def _create_admin(admin_data):
+    """Crea el usuario administrador"""
     try:
         # Corregido: usar /register para el admin también
-        response = requests.post(
-            f"{BASE_URL}/users", json=admin_data, headers=headers)
+        response = api.public.post(
+            f"{BASE_URL}/users", json=admin_data)
 
         if response.status_code in [200, 201]:
             admin_info = response.json()
-            users.append(admin_info)
+            admin_info['password'] = admin_data["password"]
+            add_entity("users", admin_info)
+            # Usuarios sin token usan las credenciales del admin
+            api.fallback_user = admin_info["id"]
             print_status(f"Usuario administrador creado: {admin_info['name']}")
-
-            # Iniciar sesión con el admin para obtener token
-            admin_token = login_user(
-                admin_data["email"], admin_data["password"])
-            if admin_token:
-                user_tokens[admin_info["id"]] = admin_token
-                print_status("Administrador autenticado con éxito")
-            else:
-                print_status("Error al autenticar administrador", False)
+            return True
+        elif response.status_code == 409:
+            return _adopt_existing_admin(admin_data)
         else:
             print_status(
                 f"Error al crear administrador: {response.text}", False)
     except Exception as e:
         print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
-    for i in range(NUM_REGULAR_USERS):
-        # Generar datos de usuario regular
-        first_name = fake.first_name()
-        last_name = fake.last_name()
-        email = fake.email()
-        password = "Password123"
-
-        user_data = {
-            "name": f"{first_name} {last_name}",
-            "email": email,
-            "password": password,
-            "user_type": "user"
-        }
 
-        try:
-            response = requests.post(
-                f"{BASE_URL}/users", json=user_data, headers=headers)
-
-            if response.status_code in [200, 201]:
-                user_info = response.json()
-                # Guardar para uso posterior
-                user_info['first_name'] = first_name
-                # Guardar contraseña para autenticación
-                user_info['password'] = password
-                users.append(user_info)
-
-                # Obtener token JWT para el usuario
-                token = login_user(email, password)
-                if token:
-                    user_tokens[user_info["id"]] = token
-                    print_status(f"Token guardado para: {user_info['name']}")
+def _adopt_existing_admin(admin_data):
+    """Reutiliza el administrador de una corrida anterior contra la misma base
 
-                print_status(f"Usuario regular creado: {user_info['name']}")
-            else:
-                print_status(
-                    f"Error al crear usuario regular: {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+    El id se toma del claim `sub` de su token, así que no hace falta ninguna
+    ruta de búsqueda por email.
+    """
+    token = login_user(admin_data["email"], admin_data["password"])
+    payload = decode_jwt_payload(token) if token else None
+    if not payload or "sub" not in payload:
+        print_status(
+            "El administrador ya existe y no se pudo iniciar sesión con él", False)
+        return False
+
+    admin_info = {
+        "id": payload["sub"],
+        "name": admin_data["name"],
+        "email": admin_data["email"],
+        "user_type": admin_data["user_type"],
+        "password": admin_data["password"],
+    }
+    add_entity("users", admin_info)
+    user_tokens[admin_info["id"]] = token
+    api.fallback_user = admin_info["id"]
+    print_status("El administrador ya existía, se reutiliza")
+    return True
 
-    print("\n=== Creando usuarios de fundaciones ===")
 
-    for i in range(NUM_FOUNDATION_USERS):
-        # Generar datos de usuario de fundación
-        foundation_name = f"{random.choice(foundation_prefixes)} {random.choice(foundation_themes)} {random.choice(foundation_focuses)}"
-        email = fake.company_email()
-        password = "Password123"
-
-        user_data = {
-            "name": foundation_name,
-            "email": email,
-            "password": password,
-            "user_type": "foundation"
+def _create_regular_user(user_data, first_name):
+    """Registra un usuario regular"""
+    try:
+        response = api.public.post(
+            f"{BASE_URL}/users", json=user_data)
+
+        if response.status_code in [200, 201]:
+            user_info = response.json()
+            # Guardar para uso posterior
+            user_info['first_name'] = first_name
+            # Guardar contraseña para autenticación
+            user_info['password'] = user_data["password"]
+            add_entity("users", user_info)
+
+            print_status(f"Usuario regular creado: {user_info['name']}")
+            return True
+        else:
+            print_status(
+                f"Error al crear usuario regular: {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
+
+
+def _create_foundation_user(user_data):
+    """Registra un usuario de tipo fundación"""
+    try:
+        response = api.public.post(
+            f"{BASE_URL}/register", json=user_data)
+
+        if response.status_code in [200, 201]:
+            user_info = response.json()
+            # Guardar para uso posterior
+            user_info['foundation_name'] = user_data["name"]
+            # Guardar contraseña para autenticación
+            user_info['password'] = user_data["password"]
+            add_entity("users", user_info)
+
+            print_status(
+                f"Usuario de fundación creado: {user_info['name']}")
+            return True
+        else:
+            print_status(
+                f"Error al crear usuario de fundación: {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
+
+
+def create_users():
+    """Crear usuarios regulares y fundaciones"""
+
+    def tasks():
+        print("\n=== Creando usuarios regulares ===")
+
+        # Crear un usuario admin primero para facilitar operaciones
+        admin_data = {
+            "name": "Administrador",
+            "email": ADMIN_EMAIL,
+            "password": "Password123",
+            "user_type": "foundation"  # Admin como fundación
         }
+        yield partial(_create_admin, admin_data)
+
+        for i in range(NUM_REGULAR_USERS):
+            # Generar datos de usuario regular
+            first_name = fake.first_name()
+            last_name = fake.last_name()
+            user_data = {
+                "name": f"{first_name} {last_name}",
+                "email": unique_email(fake.email(), i),
+                "password": "Password123",
+                "user_type": "user"
+            }
+            yield partial(_create_regular_user, user_data, first_name)
+
+        print("\n=== Creando usuarios de fundaciones ===")
+
+        for i in range(NUM_FOUNDATION_USERS):
+            # Generar datos de usuario de fundación
+            foundation_name = random_foundation_name()
+            user_data = {
+                "name": foundation_name,
+                "email": unique_email(fake.company_email(), i),
+                "password": "Password123",
+                "user_type": "foundation"
+            }
+            yield partial(_create_foundation_user, user_data)
 
-        try:
-            response = requests.post(
-                f"{BASE_URL}/register", json=user_data, headers=headers)
-
-            if response.status_code in [200, 201]:
-                user_info = response.json()
-                # Guardar para uso posterior
-                user_info['foundation_name'] = foundation_name
-                # Guardar contraseña para autenticación
-                user_info['password'] = password
-                users.append(user_info)
-
-                # Obtener token JWT para el usuario
-                token = login_user(email, password)
-                if token:
-                    user_tokens[user_info["id"]] = token
-                    print_status(f"Token guardado para: {user_info['name']}")
+    run_phase("Usuarios", tasks())
 
-                print_status(
-                    f"Usuario de fundación creado: {user_info['name']}")
+
+def _authenticate_user(user):
+    """Obtiene el token JWT de un usuario (de la caché o con login)"""
+    global admin_token
+
+    token = login_user(user["email"], user["password"], user["id"])
+    if not token:
+        print_status(f"No se pudo obtener token para {user['name']}", False)
+        return False
+
+    user_tokens[user["id"]] = token
+    if user["id"] == api.fallback_user:
+        admin_token = token
+    return True
+
+
+def authenticate_users():
+    """Autentica en paralelo a todos los usuarios creados
+
+    Los logins son independientes entre sí y cada uno paga una comparación
+    bcrypt en el servidor, así que se hacen siempre de forma concurrente,
+    incluso en modo sync. Los tokens vigentes de la caché no se piden de nuevo.
+    """
+    print("\n=== Iniciando sesión de usuarios ===")
+
+    hits_before = token_cache.hits
+
+    def tasks():
+        for user in users:
+            if user["id"] not in user_tokens:
+                yield partial(_authenticate_user, user)
+
+    run_phase("Inicio de sesión", tasks(), concurrent=True)
+    print_status(
+        f"Tokens reutilizados de la caché: {token_cache.hits - hits_before}")
+    token_cache.save()
+
+
+def _create_foundation(user, foundation_data):
+    """Crea el perfil de fundación de un usuario de tipo fundación"""
+    try:
+        # Asegurarse de que tenemos un token para este usuario
+        if user["id"] not in user_tokens:
+            print_status(
+                f"No hay token para {user['name']}, intentando login", False)
+            token = login_user(user["email"], user["password"])
+            if token:
+                user_tokens[user["id"]] = token
             else:
                 print_status(
-                    f"Error al crear usuario de fundación: {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+                    f"No se pudo obtener token para {user['name']}", False)
+                return False
+
+        user_session = api.as_user(user["id"])
+        print_status(f"Creando fundación para {user['name']} con token")
+
+        response = user_session.post(
+            f"{BASE_URL}/foundations", json=foundation_data)
+
+        if response.status_code in [200, 201]:
+            foundation_info = response.json()
+            add_entity("foundations", {
+                "id": foundation_info["id"],
+                "user_id": foundation_info["user_id"],
+                "legal_name": foundation_info["legal_name"],
+            })
+            print_status(
+                f"Perfil de fundación creado: {foundation_info['legal_name']}")
+            return True
+        elif response.status_code == 409:
+            # Ya tiene fundación (p. ej. el admin de una corrida anterior)
+            existing = user_session.get(
+                f"{BASE_URL}/foundations/user/{user['id']}")
+            if existing.status_code == 200:
+                foundation_info = existing.json()
+                add_entity("foundations", {
+                    "id": foundation_info["id"],
+                    "user_id": foundation_info["user_id"],
+                    "legal_name": foundation_info["legal_name"],
+                })
+                print_status(
+                    f"Se reutiliza la fundación existente: {foundation_info['legal_name']}")
+                return True
+            print_status(
+                f"Error al obtener fundación existente: {existing.status_code} - {existing.text}", False)
+        else:
+            print_status(
+                f"Error al crear perfil de fundación: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
 
 def create_foundations():
     """Crear perfil de fundación para usuarios de tipo fundación"""
-    global foundations
-
     print("\n=== Creando perfiles de fundaciones ===")
 
-    foundation_users = [
-        user for user in users if user["user_type"] == "foundation"]
+    foundation_users = registry.users_of_type("foundation")
 
-    for user in foundation_users:
-        # Generar datos de la fundación
-        foundation_data = {
-            "user_id": user["id"],
-            "legal_name": user.get("foundation_name", user["name"]),
-            "address": fake.address(),
-            "phone": fake.phone_number(),
-            "website": f"https://www.{user['name'].lower().replace(' ', '')}.org"
-        }
+    def tasks():
+        for user in foundation_users:
+            # Generar datos de la fundación
+            foundation_data = {
+                "user_id": user["id"],
+                "legal_name": user.get("foundation_name", user["name"]),
+                "address": fake.address(),
+                "phone": fake.phone_number(),
+                "website": f"https://www.{user['name'].lower().replace(' ', '')}.org"
+            }
+            yield partial(_create_foundation, user, foundation_data)
 
-        try:
-            # Asegurarse de que tenemos un token para este usuario
-            if user["id"] not in user_tokens:
-                print_status(
-                    f"No hay token para {user['name']}, intentando login", False)
-                token = login_user(user["email"], user["password"])
-                if token:
-                    user_tokens[user["id"]] = token
-                else:
-                    print_status(
-                        f"No se pudo obtener token para {user['name']}", False)
-                    continue
+    run_phase("Fundaciones", tasks())
 
-            user_auth_headers = get_auth_headers(user["id"])
-            print_status(f"Creando fundación para {user['name']} con token")
 
-            response = requests.post(
-                f"{BASE_URL}/foundations", json=foundation_data, headers=user_auth_headers)
+def _post_batch(session, url, items, label, on_created):
+    """Envía un lote a un endpoint /batch y procesa el resultado de cada elemento
 
-            if response.status_code in [200, 201]:
-                foundation_info = response.json()
-                foundations.append(foundation_info)
-                print_status(
-                    f"Perfil de fundación creado: {foundation_info['legal_name']}")
-            else:
-                print_status(
-                    f"Error al crear perfil de fundación: {response.status_code} - {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+    `on_created` recibe cada elemento creado tal como lo devuelve la API.
+    Devuelve True si se creó al menos un elemento del lote.
+    """
+    try:
+        response = session.post(url, json={"items": items})
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+        return False
+
+    if response.status_code not in [200, 201]:
+        print_status(
+            f"Error al crear lote de {label}: {response.status_code} - {response.text}", False)
+        return False
+
+    batch = response.json()
+    for result in batch["results"]:
+        if result["status"] == 201:
+            on_created(result["data"])
+        else:
+            print_status(
+                f"Elemento {result['index']} del lote de {label} rechazado: {result['error']}", False)
+    print_status(f"Lote de {label}: {batch['created']}/{len(items)} elementos creados")
+    return batch["created"] > 0
+
+
+def _user_session(user):
+    """Sesión autenticada del usuario, iniciando sesión si hace falta"""
+    if user["id"] not in user_tokens:
+        token = login_user(user["email"], user["password"])
+        if not token:
+            print_status(
+                f"No se pudo obtener token para {user['name']}", False)
+            return None
+        user_tokens[user["id"]] = token
+    return api.as_user(user["id"])
+
+
+def _chunks(items, size):
+    """Divide `items` en listas de a lo sumo `size` elementos"""
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _create_donations(user, donations_data):
+    """Crea en un solo lote las donaciones de un usuario regular"""
+    user_session = _user_session(user)
+    if not user_session:
+        return False
+
+    def on_created(donation_info):
+        donation = {
+            "id": donation_info["id"],
+            "user_id": donation_info["user_id"],
+            "foundation_id": donation_info["foundation_id"],
+        }
+        record_created("donations", donation)
+        keep_donation(donation)
+
+    return _post_batch(
+        user_session, f"{BASE_URL}/donations/batch", donations_data, "donaciones", on_created)
 
 
 def create_donations():
     """Crear donaciones de usuarios regulares a fundaciones"""
-    global donations
-
     print("\n=== Creando donaciones ===")
 
-    regular_users = [user for user in users if user["user_type"] == "user"]
+    regular_users = registry.users_of_type("user")
 
     if not foundations:
         print_status("No hay fundaciones para recibir donaciones", False)
         return
 
-    for user in regular_users:
-        # Decidir cuántas donaciones hará este usuario
-        num_donations = random.randint(1, DONATIONS_PER_USER)
+    def tasks():
+        for user in regular_users:
+            # Decidir cuántas donaciones hará este usuario
+            num_donations = rng.randint(1, DONATIONS_PER_USER)
 
-        for _ in range(num_donations):
-            # Seleccionar una fundación aleatoria
-            foundation = random.choice(foundations)
+            donations_data = []
+            for _ in range(num_donations):
+                # Seleccionar una fundación aleatoria
+                foundation = rng.choice(foundations)
 
-            # Generar monto de donación (entre 10 y 1000)
-            amount = round(random.uniform(10, 1000), 2)
+                # Generar monto de donación (entre 10 y 1000)
+                amount = round(rng.uniform(10, 1000), 2)
 
-            donation_data = {
-                "user_id": user["id"],
-                "foundation_id": foundation["id"],
-                "amount": amount
-            }
+                donations_data.append({
+                    "user_id": user["id"],
+                    "foundation_id": foundation["id"],
+                    "amount": amount
+                })
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user["id"] not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user["id"]] = token
-                    else:
-                        print_status(
-                            f"No se pudo obtener token para {user['name']}", False)
-                        continue
+            # Cada usuario dona en su propio nombre: un lote por usuario
+            for chunk in _chunks(donations_data, BATCH_SIZE):
+                yield partial(_create_donations, user, chunk)
 
-                user_auth_headers = get_auth_headers(user["id"])
-                response = requests.post(
-                    f"{BASE_URL}/donations", json=donation_data, headers=user_auth_headers)
+    run_phase("Donaciones", tasks())
 
-                if response.status_code in [200, 201]:
-                    donation_info = response.json()
-                    donations.append(donation_info)
-                    print_status(
-                        f"Donación creada: ${amount} a {foundation['legal_name']}")
+
+def _create_social_action(foundation_user_id, social_action_data, endpoint):
+    """Crea una acción social con el token del usuario de la fundación"""
+    try:
+        # Asegurarse de tener un token para el usuario de la fundación
+        if foundation_user_id not in user_tokens:
+            # Buscar el usuario de la fundación
+            foundation_user = registry.get("users", foundation_user_id)
+            if foundation_user:
+                token = login_user(
+                    foundation_user["email"], foundation_user["password"])
+                if token:
+                    user_tokens[foundation_user_id] = token
                 else:
                     print_status(
-                        f"Error al crear donación: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
+                        f"No se pudo obtener token para la fundación", False)
+                    return False
+            else:
+                print_status(
+                    "Usuario de fundación no encontrado", False)
+                return False
+
+        # Usar el token de la fundación
+        user_session = api.as_user(foundation_user_id)
+
+        response = user_session.post(
+            endpoint, json=social_action_data)
+
+        if response.status_code in [200, 201]:
+            action_info = response.json()
+            add_entity("social_actions", {
+                "id": action_info["id"],
+                "foundation_id": action_info["foundation_id"],
+                "end_date": action_info.get("end_date"),
+            })
+            print_status(
+                f"Acción social creada: {social_action_data['description'][:50]}...")
+            return True
+        else:
+            print_status(
+                f"Error al crear acción social: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
+
+
+def random_social_action_dates():
+    """Genera fechas coherentes para una acción futura, en curso o pasada"""
+    today = datetime.now()
+
+    # Decidir si la acción está en el futuro, en curso o ya terminó
+    action_status = rng.choice(["future", "current", "past"])
+
+    if action_status == "future":
+        # Acción futura
+        start_date = today + timedelta(days=rng.randint(5, 60))
+        end_date = start_date + timedelta(days=rng.randint(1, 14))
+    elif action_status == "current":
+        # Acción en curso
+        start_date = today - timedelta(days=rng.randint(1, 10))
+        end_date = today + timedelta(days=rng.randint(1, 20))
+    else:
+        # Acción pasada
+        end_date = today - timedelta(days=rng.randint(5, 60))
+        start_date = end_date - timedelta(days=rng.randint(1, 14))
+
+    return start_date, end_date
+
+
+def random_social_action_description():
+    """Genera la descripción de una acción social"""
+    return f"{rng.choice(social_action_types)} {rng.choice(social_action_locations)} {rng.choice(social_action_details)}"
+
+
+def random_foundation_name():
+    return f"{rng.choice(foundation_prefixes)} {rng.choice(foundation_themes)} {rng.choice(foundation_focuses)}"
 
 
 def create_social_actions():
     """Crear acciones sociales para las fundaciones"""
-    global social_actions
-
     print("\n=== Creando acciones sociales ===")
 
     if not foundations:
         print_status("No hay fundaciones para crear acciones sociales", False)
         return
 
-    for foundation in foundations:
-        # Obtener el user_id asociado a la fundación
-        foundation_user_id = foundation["user_id"]
-
-        # Decidir cuántas acciones sociales creará esta fundación
-        num_actions = random.randint(1, SOCIAL_ACTIONS_PER_FOUNDATION)
-
-        for _ in range(num_actions):
-            # Generar fechas coherentes
-            today = datetime.now()
-
-            # Decidir si la acción está en el futuro, en curso o ya terminó
-            action_status = random.choice(["future", "current", "past"])
-
-            if action_status == "future":
-                # Acción futura
-                start_date = today + timedelta(days=random.randint(5, 60))
-                end_date = start_date + timedelta(days=random.randint(1, 14))
-            elif action_status == "current":
-                # Acción en curso
-                start_date = today - timedelta(days=random.randint(1, 10))
-                end_date = today + timedelta(days=random.randint(1, 20))
-            else:
-                # Acción pasada
-                end_date = today - timedelta(days=random.randint(5, 60))
-                start_date = end_date - timedelta(days=random.randint(1, 14))
-
-            # Generar descripción de la acción social
-            description = f"{random.choice(social_action_types)} {random.choice(social_action_locations)} {random.choice(social_action_details)}"
+    def tasks():
+        for foundation in foundations:
+            # Obtener el user_id asociado a la fundación
+            foundation_user_id = foundation["user_id"]
 
-            social_action_data = {
-                "foundation_id": foundation["id"],
-                "description": description,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat()
-            }
-
-            try:
-                # Asegurarse de tener un token para el usuario de la fundación
-                if foundation_user_id not in user_tokens:
-                    # Buscar el usuario de la fundación
-                    foundation_user = next(
-                        (u for u in users if u["id"] == foundation_user_id), None)
-                    if foundation_user:
-                        token = login_user(
-                            foundation_user["email"], foundation_user["password"])
-                        if token:
-                            user_tokens[foundation_user_id] = token
-                        else:
-                            print_status(
-                                f"No se pudo obtener token para la fundación", False)
-                            continue
-                    else:
-                        print_status(
-                            "Usuario de fundación no encontrado", False)
-                        continue
+            # Decidir cuántas acciones sociales creará esta fundación
+            num_actions = rng.randint(1, SOCIAL_ACTIONS_PER_FOUNDATION)
 
-                # Usar el token de la fundación
-                user_auth_headers = get_auth_headers(foundation_user_id)
+            for _ in range(num_actions):
+                start_date, end_date = random_social_action_dates()
+                description = random_social_action_description()
 
+                social_action_data = {
+                    "foundation_id": foundation["id"],
+                    "description": description,
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat()
+                }
                 # Aleatoriamente usar /social-actions o /opportunities para variedad
-                endpoint = random.choice(
+                endpoint = rng.choice(
                     [f"{BASE_URL}/social-actions", f"{BASE_URL}/opportunities"])
+                yield partial(_create_social_action, foundation_user_id, social_action_data, endpoint)
 
-                response = requests.post(
-                    endpoint, json=social_action_data, headers=user_auth_headers)
+    run_phase("Acciones sociales", tasks())
 
-                if response.status_code in [200, 201]:
-                    action_info = response.json()
-                    social_actions.append(action_info)
-                    print_status(
-                        f"Acción social creada: {description[:50]}...")
-                else:
-                    print_status(
-                        f"Error al crear acción social: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
+
+def _create_comment(user, comment_data, endpoint, success_message):
+    """Crea un comentario con el token del usuario que comenta"""
+    user_id = user["id"]
+    try:
+        # Asegurarse de tener un token para este usuario
+        if user_id not in user_tokens:
+            token = login_user(user["email"], user["password"])
+            if token:
+                user_tokens[user_id] = token
+            else:
+                return False
+
+        user_session = api.as_user(user_id)
+        response = user_session.post(
+            endpoint, json=comment_data)
+
+        if response.status_code in [200, 201]:
+            record_created("comments", response_id(response))
+            print_status(success_message)
+            return True
+        else:
+            print_status(
+                f"Error al crear comentario: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
 
 def create_comments():
     """Crear comentarios para donaciones y acciones sociales"""
-    global comments
 
-    print("\n=== Creando comentarios para donaciones ===")
+    def donation_comment_tasks():
+        print("\n=== Creando comentarios para donaciones ===")
+
+        if not donations:
+            print_status("No hay donaciones para crear comentarios", False)
+            return
 
-    if not donations:
-        print_status("No hay donaciones para crear comentarios", False)
-    else:
         # Comentarios para donaciones
         for donation in donations[:COMMENTS_PER_ENTITY * 3]:
             # Para cada donación, el comentario debe ser del usuario donante o de la fundación
             # Primero, intentamos con el usuario donante
             user_id = donation.get('user_id')
-            foundation_id = donation.get('foundation_id')
 
             if not user_id:
                 continue  # Si no hay user_id, saltamos esta donación
 
             # Buscar el usuario
-            user = next((u for u in users if u["id"] == user_id), None)
+            user = registry.get("users", user_id)
 
             if not user:
                 continue  # Si no encontramos el usuario, saltamos esta donación
@@ -568,37 +1016,19 @@ def create_comments():
             comment_data = {
                 "user_id": user_id,
                 "donation_id": donation["id"],
-                "text": random.choice(donation_comments)
+                "text": rng.choice(donation_comments)
             }
+            yield partial(_create_comment, user, comment_data,
+                          f"{BASE_URL}/comments", "Comentario creado para donación")
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user_id not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user_id] = token
-                    else:
-                        continue
-
-                user_auth_headers = get_auth_headers(user_id)
-                response = requests.post(
-                    f"{BASE_URL}/comments", json=comment_data, headers=user_auth_headers)
-
-                if response.status_code in [200, 201]:
-                    comment_info = response.json()
-                    comments.append(comment_info)
-                    print_status(f"Comentario creado para donación")
-                else:
-                    print_status(
-                        f"Error al crear comentario: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
+    def social_action_comment_tasks():
+        print("\n=== Creando comentarios para acciones sociales ===")
 
-    print("\n=== Creando comentarios para acciones sociales ===")
+        if not social_actions:
+            print_status(
+                "No hay acciones sociales para crear comentarios", False)
+            return
 
-    if not social_actions:
-        print_status("No hay acciones sociales para crear comentarios", False)
-    else:
         # Para las acciones sociales, necesitamos primero asegurarnos que haya participaciones aceptadas
         for action in social_actions[:COMMENTS_PER_ENTITY * 2]:
             # Buscar la fundación asociada
@@ -606,59 +1036,30 @@ def create_comments():
             if not foundation_id:
                 continue
 
-            foundation = next(
-                (f for f in foundations if f["id"] == foundation_id), None)
-            if not foundation:
-                continue
-
-            # Conseguir el user_id de la fundación
-            foundation_user_id = foundation.get("user_id")
-            if not foundation_user_id:
-                continue
-
-            # Buscar el usuario de la fundación
-            foundation_user = next(
-                (u for u in users if u["id"] == foundation_user_id), None)
+            # Buscar el usuario dueño de la fundación
+            foundation_user = registry.foundation_owner(foundation_id)
             if not foundation_user:
                 continue
+            foundation_user_id = foundation_user["id"]
 
             comment_data = {
                 "user_id": foundation_user_id,
                 "social_action_id": action["id"],
-                "text": random.choice(social_action_comments)
+                "text": rng.choice(social_action_comments)
             }
+            yield partial(_create_comment, foundation_user, comment_data,
+                          f"{BASE_URL}/comments",
+                          "Comentario creado para acción social desde fundación")
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if foundation_user_id not in user_tokens:
-                    token = login_user(
-                        foundation_user["email"], foundation_user["password"])
-                    if token:
-                        user_tokens[foundation_user_id] = token
-                    else:
-                        continue
-
-                user_auth_headers = get_auth_headers(foundation_user_id)
-                response = requests.post(
-                    f"{BASE_URL}/comments", json=comment_data, headers=user_auth_headers)
+    def foundation_comment_tasks():
+        print("\n=== Creando comentarios para fundaciones ===")
 
-                if response.status_code in [200, 201]:
-                    comment_info = response.json()
-                    comments.append(comment_info)
-                    print_status(
-                        f"Comentario creado para acción social desde fundación")
-                else:
-                    print_status(
-                        f"Error al crear comentario: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
-    print("\n=== Creando comentarios para fundaciones ===")
+        if not foundations:
+            print_status("No hay fundaciones para crear comentarios", False)
+            return
 
-    if not foundations:
-        print_status("No hay fundaciones para crear comentarios", False)
-    else:
         # Comentarios para fundaciones
-        regular_users = [user for user in users if user["user_type"] == "user"]
+        regular_users = registry.users_of_type("user")
         if not regular_users:
             print_status(
                 "No hay usuarios para crear comentarios de fundaciones", False)
@@ -666,104 +1067,180 @@ def create_comments():
 
         for foundation in foundations[:COMMENTS_PER_ENTITY * 2]:
             # Para cada fundación, seleccionamos un usuario regular aleatorio para comentar
-            user = random.choice(regular_users)
+            user = rng.choice(regular_users)
 
             comment_data = {
                 "user_id": user["id"],
                 "foundation_id": foundation["id"],
-                "text": random.choice(foundation_comments)
+                "text": rng.choice(foundation_comments)
             }
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user["id"] not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user["id"]] = token
-                    else:
-                        continue
+            # 50% de probabilidad de usar el endpoint normal, 50% el endpoint específico
+            if rng.random() < 0.5:
+                # Usar endpoint general de comentarios
+                endpoint = f"{BASE_URL}/comments"
+            else:
+                # Usar nuevo endpoint específico para comentarios de fundaciones
+                endpoint = f"{BASE_URL}/foundation-detail/comment"
 
-                user_auth_headers = get_auth_headers(user["id"])
+            yield partial(_create_comment, user, comment_data, endpoint,
+                          f"Comentario creado para fundación: {foundation['legal_name'][:20]}...")
 
-                # 50% de probabilidad de usar el endpoint normal, 50% el endpoint específico
-                if random.random() < 0.5:
-                    # Usar endpoint general de comentarios
-                    response = requests.post(
-                        f"{BASE_URL}/comments", json=comment_data, headers=user_auth_headers)
-                else:
-                    # Usar nuevo endpoint específico para comentarios de fundaciones
-                    response = requests.post(
-                        f"{BASE_URL}/foundation-detail/comment", json=comment_data, headers=user_auth_headers)
+    # Los tres grupos de comentarios son independientes entre sí
+    run_phase("Comentarios", itertools.chain(
+        donation_comment_tasks(),
+        social_action_comment_tasks(),
+        foundation_comment_tasks()))
 
-                if response.status_code in [200, 201]:
-                    comment_info = response.json()
-                    comments.append(comment_info)
-                    print_status(
-                        f"Comentario creado para fundación: {foundation['legal_name'][:20]}...")
-                else:
-                    print_status(
-                        f"Error al crear comentario para fundación: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
 
+def _create_rating(user, rating_data):
+    """Crea una calificación con el token del donante"""
+    user_id = user["id"]
+    try:
+        # Asegurarse de tener un token para este usuario
+        if user_id not in user_tokens:
+            token = login_user(user["email"], user["password"])
+            if token:
+                user_tokens[user_id] = token
+            else:
+                return False
+
+        user_session = api.as_user(user_id)
+        response = user_session.post(
+            f"{BASE_URL}/ratings", json=rating_data)
+
+        if response.status_code in [200, 201]:
+            record_created("ratings", response_id(response))
+            print_status(
+                f"Calificación {rating_data['rating']} creada para donación")
+            return True
+        else:
+            print_status(
+                f"Error al crear calificación: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
-def create_ratings():
-    """Crear calificaciones para donaciones y acciones sociales"""
-    global ratings
 
+def create_ratings():
+    """Crear calificaciones para donaciones y acciones sociales"""
     print("\n=== Creando calificaciones para donaciones ===")
 
     if not donations:
         print_status("No hay donaciones para crear calificaciones", False)
-    else:
+        return
+
+    def tasks():
         # Para cada donación, solo el donante puede calificar
         for donation in donations[:MAX_RATINGS]:
             user_id = donation.get('user_id')
             if not user_id:
                 continue
 
-            user = next((u for u in users if u["id"] == user_id), None)
+            user = registry.get("users", user_id)
             if not user:
                 continue
 
             rating_data = {
                 "user_id": user_id,
                 "donation_id": donation["id"],
-                "rating": random.randint(3, 5)  # Tendencia positiva
+                "rating": rng.randint(3, 5)  # Tendencia positiva
             }
+            yield partial(_create_rating, user, rating_data)
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user_id not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user_id] = token
-                    else:
-                        continue
+    run_phase("Calificaciones", tasks())
 
-                user_auth_headers = get_auth_headers(user_id)
-                response = requests.post(
-                    f"{BASE_URL}/ratings", json=rating_data, headers=user_auth_headers)
 
-                if response.status_code in [200, 201]:
-                    rating_info = response.json()
-                    ratings.append(rating_info)
-                    print_status(
-                        f"Calificación {rating_data['rating']} creada para donación")
-                else:
-                    print_status(
-                        f"Error al crear calificación: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
+def _update_participation_request_status(action, request_info, status):
+    """Acepta o rechaza una solicitud con el token de la fundación dueña"""
+    update_data = {"status": status}
+
+    # Necesitamos token de administrador/fundación para aprobar/rechazar
+    # Buscar el usuario de la fundación asociada a la acción social
+    foundation_id = action.get("foundation_id")
+    if not foundation_id:
+        return
+
+    foundation_user = registry.foundation_owner(foundation_id)
+    if not foundation_user:
+        return
+
+    foundation_user_id = foundation_user["id"]
+    if foundation_user_id in user_tokens:
+        foundation_session = api.as_user(foundation_user_id)
+        update_response = foundation_session.patch(
+            f"{BASE_URL}/participation-requests/{request_info['id']}",
+            json=update_data)
+
+        if update_response.status_code in [200, 201]:
+            print_status(f"Solicitud {status}")
+        else:
+            print_status(
+                f"Error al actualizar solicitud: {update_response.status_code} - {update_response.text}", False)
+
+
+def _create_participation_request(user, action, use_opportunities, status):
+    """Crea una solicitud de participación y, opcionalmente, la resuelve
+
+    La actualización de estado depende de la solicitud recién creada, por eso
+    ambas peticiones forman una sola tarea.
+    """
+    try:
+        # Asegurarse de tener un token para este usuario
+        if user["id"] not in user_tokens:
+            token = login_user(user["email"], user["password"])
+            if token:
+                user_tokens[user["id"]] = token
+            else:
+                print_status(
+                    f"No se pudo obtener token para {user['name']}", False)
+                return False
+
+        user_session = api.as_user(user["id"])
+
+        if use_opportunities:
+            # Usar endpoint de oportunidades para aplicar
+            response = user_session.post(
+                f"{BASE_URL}/opportunities/{action['id']}/apply",
+                json={"message": "Me gustaría participar en esta actividad"})
+        else:
+            # Usar endpoint normal de solicitudes
+            request_data = {
+                "user_id": user["id"],
+                "social_action_id": action["id"]
+            }
+            response = user_session.post(
+                f"{BASE_URL}/participation-requests", json=request_data)
+
+        source = "opportunities" if use_opportunities else "normal"
+
+        if response.status_code in [200, 201]:
+            request_info = response.json()
+            record_created("participation_requests", response_id(response))
+            print_status(
+                f"Solicitud de participación creada (endpoint {source})")
+
+            # Para algunas solicitudes, cambiar el estado
+            if status:
+                _update_participation_request_status(
+                    action, request_info, status)
+            return True
+        else:
+            if "already" in response.text.lower():
+                print_status(f"Solicitud ya existe ({source})", False)
+            else:
+                print_status(
+                    f"Error al crear solicitud: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
 
 def create_participation_requests():
     """Crear solicitudes de participación en acciones sociales"""
-    global participation_requests
-
     print("\n=== Creando solicitudes de participación ===")
 
-    regular_users = [user for user in users if user["user_type"] == "user"]
+    regular_users = registry.users_of_type("user")
 
     if not social_actions or not regular_users:
         print_status(
@@ -780,7 +1257,7 @@ def create_participation_requests():
                 action["end_date"].replace('Z', '+00:00'))
             if end_date > now:
                 valid_actions.append(action)
-        except (KeyError, ValueError):
+        except (KeyError, ValueError, TypeError):
             # Si hay problemas con la fecha, asumimos que es válida
             valid_actions.append(action)
 
@@ -789,154 +1266,57 @@ def create_participation_requests():
             "No hay acciones sociales vigentes para solicitar participación", False)
         return
 
-    for _ in range(min(PARTICIPATION_REQUESTS, len(regular_users) * len(valid_actions))):
-        # Seleccionar un usuario y acción aleatorios
-        user = random.choice(regular_users)
-        action = random.choice(valid_actions)
+    def tasks():
+        for _ in range(min(PARTICIPATION_REQUESTS, len(regular_users) * len(valid_actions))):
+            # Seleccionar un usuario y acción aleatorios
+            user = rng.choice(regular_users)
+            action = rng.choice(valid_actions)
 
-        # 50% de probabilidad de usar el endpoint normal, 50% el endpoint de oportunidades
-        if random.random() < 0.5:
-            # Usar endpoint normal de solicitudes
-            request_data = {
-                "user_id": user["id"],
-                "social_action_id": action["id"]
-            }
+            # 50% de probabilidad de usar el endpoint normal, 50% el endpoint de oportunidades
+            use_opportunities = rng.random() >= 0.5
 
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user["id"] not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user["id"]] = token
-                    else:
-                        print_status(
-                            f"No se pudo obtener token para {user['name']}", False)
-                        continue
+            # Para algunas solicitudes (70%), cambiar el estado
+            status = None
+            if rng.random() < 0.7:
+                status = rng.choice(["accepted", "rejected"])
 
-                user_auth_headers = get_auth_headers(user["id"])
-                response = requests.post(
-                    f"{BASE_URL}/participation-requests", json=request_data, headers=user_auth_headers)
+            yield partial(_create_participation_request, user, action,
+                          use_opportunities, status)
 
-                if response.status_code in [200, 201]:
-                    request_info = response.json()
-                    participation_requests.append(request_info)
-                    print_status(
-                        f"Solicitud de participación creada (endpoint normal)")
-
-                    # Para algunas solicitudes, cambiar el estado
-                    if random.random() < 0.7:  # 70% de probabilidad
-                        status = random.choice(["accepted", "rejected"])
-                        update_data = {"status": status}
-
-                        # Necesitamos token de administrador/fundación para aprobar/rechazar
-                        # Buscar el usuario de la fundación asociada a la acción social
-                        foundation_id = action.get("foundation_id")
-                        if foundation_id:
-                            foundation = next(
-                                (f for f in foundations if f["id"] == foundation_id), None)
-                            if foundation:
-                                foundation_user_id = foundation.get("user_id")
-                                if foundation_user_id and foundation_user_id in user_tokens:
-                                    admin_auth_headers = get_auth_headers(
-                                        foundation_user_id)
-                                    update_response = requests.patch(
-                                        f"{BASE_URL}/participation-requests/{request_info['id']}",
-                                        json=update_data,
-                                        headers=admin_auth_headers
-                                    )
-
-                                    if update_response.status_code in [200, 201]:
-                                        print_status(f"Solicitud {status}")
-                                    else:
-                                        print_status(
-                                            f"Error al actualizar solicitud: {update_response.status_code} - {update_response.text}", False)
-                else:
-                    if "already exists" in response.text:
-                        print_status(f"Solicitud ya existe (normal)", False)
-                    else:
-                        print_status(
-                            f"Error al crear solicitud: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
-        else:
-            # Usar endpoint de oportunidades para aplicar
-            try:
-                # Asegurarse de tener un token para este usuario
-                if user["id"] not in user_tokens:
-                    token = login_user(user["email"], user["password"])
-                    if token:
-                        user_tokens[user["id"]] = token
-                    else:
-                        print_status(
-                            f"No se pudo obtener token para {user['name']}", False)
-                        continue
+    run_phase("Solicitudes de participación", tasks())
 
-                user_auth_headers = get_auth_headers(user["id"])
-                response = requests.post(
-                    f"{BASE_URL}/opportunities/{action['id']}/apply",
-                    json={"message": "Me gustaría participar en esta actividad"},
-                    headers=user_auth_headers
-                )
 
-                if response.status_code in [200, 201]:
-                    request_info = response.json()
-                    participation_requests.append(request_info)
-                    print_status(
-                        f"Solicitud de participación creada (endpoint opportunities)")
-
-                    # Para algunas solicitudes, cambiar el estado
-                    if random.random() < 0.7:  # 70% de probabilidad
-                        status = random.choice(["accepted", "rejected"])
-                        update_data = {"status": status}
-
-                        # Necesitamos token de administrador/fundación para aprobar/rechazar
-                        # Buscar el usuario de la fundación asociada a la acción social
-                        foundation_id = action.get("foundation_id")
-                        if foundation_id:
-                            foundation = next(
-                                (f for f in foundations if f["id"] == foundation_id), None)
-                            if foundation:
-                                foundation_user_id = foundation.get("user_id")
-                                if foundation_user_id and foundation_user_id in user_tokens:
-                                    admin_auth_headers = get_auth_headers(
-                                        foundation_user_id)
-                                    update_response = requests.patch(
-                                        f"{BASE_URL}/participation-requests/{request_info['id']}",
-                                        json=update_data,
-                                        headers=admin_auth_headers
-                                    )
-
-                                    if update_response.status_code in [200, 201]:
-                                        print_status(f"Solicitud {status}")
-                                    else:
-                                        print_status(
-                                            f"Error al actualizar solicitud: {update_response.status_code} - {update_response.text}", False)
-                else:
-                    if "already" in response.text.lower():
-                        print_status(
-                            f"Solicitud ya existe (opportunities)", False)
-                    else:
-                        print_status(
-                            f"Error al crear solicitud: {response.status_code} - {response.text}", False)
-            except Exception as e:
-                print_status(f"Error de conexión: {str(e)}", False)
+def _create_certificate(certificate_data, foundation_session):
+    """Crea un certificado para un usuario regular"""
+    try:
+        response = foundation_session.post(
+            f"{BASE_URL}/certificates", json=certificate_data)
+
+        if response.status_code in [200, 201]:
+            record_created("certificates", response_id(response))
+            print_status(
+                f"Certificado creado: {certificate_data['description'][:30]}...")
+            return True
+        else:
+            print_status(
+                f"Error al crear certificado: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
 
 def create_certificates():
     """Crear certificados para usuarios"""
-    global certificates
-
     print("\n=== Creando certificados ===")
 
-    regular_users = [user for user in users if user["user_type"] == "user"]
+    regular_users = registry.users_of_type("user")
 
     if not regular_users:
         print_status("No hay usuarios para crear certificados", False)
         return
 
     # Necesitamos un token de fundación para crear certificados
-    foundation_user = next(
-        (user for user in users if user["user_type"] == "foundation"), None)
+    foundation_user = registry.first_user_of_type("foundation")
 
     if not foundation_user:
         print_status("No hay fundación para crear certificados", False)
@@ -952,37 +1332,31 @@ def create_certificates():
             print_status(f"No se pudo obtener token para la fundación", False)
             return
 
-    foundation_auth_headers = get_auth_headers(foundation_user["id"])
+    foundation_session = api.as_user(foundation_user["id"])
 
-    for _ in range(min(CERTIFICATES, len(regular_users) * 2)):
-        # Seleccionar un usuario aleatorio
-        user = random.choice(regular_users)
+    def tasks():
+        for _ in range(min(CERTIFICATES, len(regular_users) * 2)):
+            # Seleccionar un usuario aleatorio
+            user = rng.choice(regular_users)
 
-        certificate_data = {
-            "user_id": user["id"],
-            "description": random.choice(certificate_descriptions)
-        }
+            certificate_data = {
+                "user_id": user["id"],
+                "description": rng.choice(certificate_descriptions)
+            }
+            yield partial(_create_certificate, certificate_data, foundation_session)
 
-        try:
-            response = requests.post(
-                f"{BASE_URL}/certificates", json=certificate_data, headers=foundation_auth_headers)
+    run_phase("Certificados", tasks())
 
-            if response.status_code in [200, 201]:
-                certificate_info = response.json()
-                certificates.append(certificate_info)
-                print_status(
-                    f"Certificado creado: {certificate_data['description'][:30]}...")
-            else:
-                print_status(
-                    f"Error al crear certificado: {response.status_code} - {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+
+def _create_notifications(notifications_data, foundation_session):
+    """Crea un lote de notificaciones con el token de una fundación"""
+    return _post_batch(
+        foundation_session, f"{BASE_URL}/notifications/batch", notifications_data, "notificaciones",
+        lambda notification: record_created("notifications", {"id": notification["id"]}))
 
 
 def create_notifications():
     """Crear notificaciones para usuarios"""
-    global notifications
-
     print("\n=== Creando notificaciones ===")
 
     all_users = users  # Tanto regulares como fundaciones pueden recibir notificaciones
@@ -992,8 +1366,7 @@ def create_notifications():
         return
 
     # Necesitamos un token de fundación para crear notificaciones para otros
-    foundation_user = next(
-        (user for user in users if user["user_type"] == "foundation"), None)
+    foundation_user = registry.first_user_of_type("foundation")
 
     if not foundation_user:
         print_status("No hay fundación para crear notificaciones", False)
@@ -1009,134 +1382,124 @@ def create_notifications():
             print_status(f"No se pudo obtener token para la fundación", False)
             return
 
-    foundation_auth_headers = get_auth_headers(foundation_user["id"])
-
-    notification_templates = [
-        "¡Nueva acción social disponible cerca de ti!",
-        "Tu donación ha sido recibida con éxito.",
-        "Una fundación ha respondido a tu comentario.",
-        "Tu solicitud de participación ha sido aceptada.",
-        "¡Felicidades! Has recibido un nuevo certificado.",
-        "Han valorado positivamente tu comentario.",
-        "Una acción social que te interesa comienza pronto.",
-        "Se ha añadido un nuevo método de donación.",
-        "Actualización importante sobre una acción social.",
-        "Recordatorio: Evento de voluntariado mañana.",
-        "¡Gracias por tu apoyo constante!",
-        "Una fundación ha publicado nuevas fotos.",
-        "¡Has completado tu primer año como colaborador!",
-        "Alguien ha comentado en una donación tuya.",
-        "Se han actualizado nuestros términos de servicio."
-    ]
-
-    for _ in range(min(NOTIFICATIONS, len(all_users) * 3)):
-        # Seleccionar un usuario aleatorio
-        user = random.choice(all_users)
-
-        # Decidir si la notificación ya fue leída
-        read_status = random.random() < 0.4  # 40% de probabilidad de que esté leída
-
-        notification_data = {
-            "user_id": user["id"],
-            "message": random.choice(notification_templates),
-            "read": read_status
-        }
+    foundation_session = api.as_user(foundation_user["id"])
 
-        try:
-            response = requests.post(
-                f"{BASE_URL}/notifications", json=notification_data, headers=foundation_auth_headers)
+    def notifications_data():
+        for _ in range(min(NOTIFICATIONS, len(all_users) * 3)):
+            # Seleccionar un usuario aleatorio
+            user = rng.choice(all_users)
 
-            if response.status_code in [200, 201]:
-                notification_info = response.json()
-                notifications.append(notification_info)
-                print_status(f"Notificación creada para {user['name']}")
-            else:
-                print_status(
-                    f"Error al crear notificación: {response.status_code} - {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+            # Decidir si la notificación ya fue leída
+            read_status = rng.random() < 0.4  # 40% de probabilidad de que esté leída
+
+            yield {
+                "user_id": user["id"],
+                "message": rng.choice(notification_templates),
+                "read": read_status
+            }
+
+    def tasks():
+        # La fundación puede notificar a cualquier usuario: lotes de BATCH_SIZE
+        for chunk in _chunks(notifications_data(), BATCH_SIZE):
+            yield partial(_create_notifications, chunk, foundation_session)
+
+    run_phase("Notificaciones", tasks())
+
+
+def _create_suggestion(user, suggestion_data):
+    """Crea una sugerencia y la marca como procesada si corresponde"""
+    # Asegurarse de tener un token para este usuario
+    if user["id"] not in user_tokens:
+        token = login_user(user["email"], user["password"])
+        if token:
+            user_tokens[user["id"]] = token
+        else:
+            print_status(
+                f"No se pudo obtener token para {user['name']}", False)
+            return False
+
+    user_session = api.as_user(user["id"])
+
+    try:
+        response = user_session.post(
+            f"{BASE_URL}/suggestions", json=suggestion_data)
+
+        if response.status_code in [200, 201]:
+            suggestion_info = response.json()
+            record_created("suggestions", response_id(response))
+            print_status(
+                f"Sugerencia creada: {suggestion_data['content'][:30]}...")
+
+            # Si ya estaba marcada como procesada, actualizarla
+            if suggestion_data["processed"]:
+                # Necesitamos token de fundación para marcar como procesada
+                foundation_user = registry.first_user_of_type("foundation")
+                if foundation_user and foundation_user["id"] in user_tokens:
+                    foundation_session = api.as_user(
+                        foundation_user["id"])
+                    process_response = foundation_session.patch(
+                        f"{BASE_URL}/suggestions/{suggestion_info['id']}/process")
+
+                    if process_response.status_code in [200, 201]:
+                        print_status(f"Sugerencia marcada como procesada")
+                    else:
+                        print_status(
+                            f"Error al marcar sugerencia como procesada: {process_response.status_code} - {process_response.text}", False)
+            return True
+        else:
+            print_status(
+                f"Error al crear sugerencia: {response.status_code} - {response.text}", False)
+    except Exception as e:
+        print_status(f"Error de conexión: {str(e)}", False)
+    return False
 
 
 def create_suggestions():
     """Crear sugerencias de usuarios"""
-    global suggestions
-
     print("\n=== Creando sugerencias ===")
 
-    regular_users = [user for user in users if user["user_type"] == "user"]
+    regular_users = registry.users_of_type("user")
 
     if not regular_users:
         print_status("No hay usuarios para crear sugerencias", False)
         return
 
-    for _ in range(min(SUGGESTIONS, len(regular_users) * 2)):
-        # Seleccionar un usuario aleatorio
-        user = random.choice(regular_users)
+    def tasks():
+        for _ in range(min(SUGGESTIONS, len(regular_users) * 2)):
+            # Seleccionar un usuario aleatorio
+            user = rng.choice(regular_users)
 
-        # Asegurarse de tener un token para este usuario
-        if user["id"] not in user_tokens:
-            token = login_user(user["email"], user["password"])
-            if token:
-                user_tokens[user["id"]] = token
-            else:
-                print_status(
-                    f"No se pudo obtener token para {user['name']}", False)
-                continue
+            # Decidir si la sugerencia ya fue procesada
+            # 30% de probabilidad de que esté procesada
+            processed_status = rng.random() < 0.3
 
-        user_auth_headers = get_auth_headers(user["id"])
+            suggestion_data = {
+                "user_id": user["id"],
+                "content": rng.choice(suggestions_list),
+                "processed": processed_status
+            }
+            yield partial(_create_suggestion, user, suggestion_data)
 
-        # Decidir si la sugerencia ya fue procesada
-        # 30% de probabilidad de que esté procesada
-        processed_status = random.random() < 0.3
+    run_phase("Sugerencias", tasks())
 
-        suggestion_data = {
-            "user_id": user["id"],
-            "content": random.choice(suggestions_list),
-            "processed": processed_status
-        }
 
-        try:
-            response = requests.post(
-                f"{BASE_URL}/suggestions", json=suggestion_data, headers=user_auth_headers)
+def _create_favorites(user, favorites_data):
+    """Marca en un solo lote fundaciones u oportunidades como favoritas de un usuario"""
+    user_session = _user_session(user)
+    if not user_session:
+        return False
 
-            if response.status_code in [200, 201]:
-                suggestion_info = response.json()
-                suggestions.append(suggestion_info)
-                print_status(
-                    f"Sugerencia creada: {suggestion_data['content'][:30]}...")
-
-                # Si ya estaba marcada como procesada, actualizarla
-                if processed_status:
-                    # Necesitamos token de fundación para marcar como procesada
-                    foundation_user = next(
-                        (u for u in users if u["user_type"] == "foundation"), None)
-                    if foundation_user and foundation_user["id"] in user_tokens:
-                        foundation_auth_headers = get_auth_headers(
-                            foundation_user["id"])
-                        process_response = requests.patch(
-                            f"{BASE_URL}/suggestions/{suggestion_info['id']}/process",
-                            headers=foundation_auth_headers
-                        )
-
-                        if process_response.status_code in [200, 201]:
-                            print_status(f"Sugerencia marcada como procesada")
-                        else:
-                            print_status(
-                                f"Error al marcar sugerencia como procesada: {process_response.status_code} - {process_response.text}", False)
-            else:
-                print_status(
-                    f"Error al crear sugerencia: {response.status_code} - {response.text}", False)
-        except Exception as e:
-            print_status(f"Error de conexión: {str(e)}", False)
+    # Los repetidos vuelven como 409 en el resultado del elemento, sin cortar el lote
+    return _post_batch(
+        user_session, f"{BASE_URL}/users/{user['id']}/favorites/batch", favorites_data, "favoritos",
+        lambda favorite: record_created("favorites", {"id": favorite["id"]}))
 
 
 def create_favorites():
     """Crear favoritos para usuarios"""
-    global favorites
-
     print("\n=== Creando favoritos ===")
 
-    regular_users = [user for user in users if user["user_type"] == "user"]
+    regular_users = registry.users_of_type("user")
 
     if not regular_users:
         print_status("No hay usuarios para crear favoritos", False)
@@ -1147,110 +1510,566 @@ def create_favorites():
             "No hay fundaciones o acciones sociales para marcar como favoritas", False)
         return
 
-    for user in regular_users:
-        # Decidir cuántos favoritos creará este usuario
-        num_favorites = random.randint(1, FAVORITES_PER_USER)
+    def tasks():
+        for user in regular_users:
+            # Decidir cuántos favoritos creará este usuario
+            num_favorites = rng.randint(1, FAVORITES_PER_USER)
+
+            # Crear favoritos combinando fundaciones y acciones sociales
+            favorites_data = []
+            for _ in range(num_favorites):
+                # Decidir si es fundación u oportunidad
+                is_foundation = rng.choice([True, False])
+
+                if is_foundation and foundations:
+                    # Marcar una fundación como favorita
+                    foundation = rng.choice(foundations)
+                    favorite_data = {
+                        "item_id": foundation["id"],
+                        "item_type": "foundation"
+                    }
+                elif not is_foundation and social_actions:
+                    # Marcar una acción social como favorita
+                    action = rng.choice(social_actions)
+                    favorite_data = {
+                        "item_id": action["id"],
+                        "item_type": "opportunity"
+                    }
+                else:
+                    continue
 
-        # Asegurarse de tener un token para este usuario
-        if user["id"] not in user_tokens:
-            token = login_user(user["email"], user["password"])
-            if token:
-                user_tokens[user["id"]] = token
+                favorites_data.append(favorite_data)
+
+            for chunk in _chunks(favorites_data, BATCH_SIZE):
+                yield partial(_create_favorites, user, chunk)
+
+    run_phase("Favoritos", tasks())
+
+
+# --- Modo copy: carga directa a PostgreSQL ---------------------------------
+
+def _past_datetime(days=180):
+    """Fecha aleatoria dentro de los últimos `days` días"""
+    return datetime.now() - timedelta(seconds=rng.randint(0, days * 86400))
+
+
+def _copy_phase(connection, table, rows):
+    """Escribe con COPY las filas generadas para una tabla"""
+    with copy_loader.CopyWriter(connection, table) as writer:
+        for row in rows:
+            writer.write(row)
+        total, elapsed = writer.close()
+    created_counts[table] += total
+    _record_phase(table, total, total, elapsed)
+
+
+def _copy_users(password_hash, include_admin):
+    if include_admin:
+        admin = registry.add("users", {
+            "id": str(uuid.uuid4()),
+            "name": "Administrador",
+            "email": ADMIN_EMAIL,
+            "user_type": "foundation",
+        })
+        yield (admin["id"], admin["name"], admin["email"], password_hash,
+               admin["user_type"], _past_datetime())
+
+    for i in range(NUM_REGULAR_USERS):
+        first_name = fake.first_name()
+        user = registry.add("users", {
+            "id": str(uuid.uuid4()),
+            "name": f"{first_name} {fake.last_name()}",
+            "email": unique_email(fake.email(), i),
+            "user_type": "user",
+        })
+        yield (user["id"], user["name"], user["email"], password_hash,
+               user["user_type"], _past_datetime())
+
+    for i in range(NUM_FOUNDATION_USERS):
+        user = registry.add("users", {
+            "id": str(uuid.uuid4()),
+            "name": random_foundation_name(),
+            "email": unique_email(fake.company_email(), i),
+            "user_type": "foundation",
+        })
+        yield (user["id"], user["name"], user["email"], password_hash,
+               user["user_type"], _past_datetime())
+
+
+def _copy_foundations():
+    for user in registry.users_of_type("foundation"):
+        foundation = registry.add("foundations", {
+            "id": str(uuid.uuid4()),
+            "user_id": user["id"],
+            "legal_name": user["name"],
+        })
+        yield (foundation["id"], user["id"], foundation["legal_name"],
+               fake.address(), fake.phone_number(),
+               f"https://www.{user['name'].lower().replace(' ', '')}.org")
+
+
+def _copy_donations():
+    for user in registry.users_of_type("user"):
+        for _ in range(rng.randint(1, DONATIONS_PER_USER)):
+            foundation = rng.choice(foundations)
+            donation_id = str(uuid.uuid4())
+            if len(donations) < donations_to_keep():
+                donations.append({
+                    "id": donation_id,
+                    "user_id": user["id"],
+                    "foundation_id": foundation["id"],
+                })
+            yield (donation_id, user["id"], foundation["id"],
+                   round(rng.uniform(10, 1000), 2), _past_datetime())
+
+
+def _copy_social_actions():
+    for foundation in foundations:
+        for _ in range(rng.randint(1, SOCIAL_ACTIONS_PER_FOUNDATION)):
+            start_date, end_date = random_social_action_dates()
+            action = registry.add("social_actions", {
+                "id": str(uuid.uuid4()),
+                "foundation_id": foundation["id"],
+                "end_date": end_date.isoformat(),
+            })
+            yield (action["id"], foundation["id"],
+                   random_social_action_description(), start_date, end_date)
+
+
+def _copy_comments():
+    for donation in donations[:COMMENTS_PER_ENTITY * 3]:
+        yield (str(uuid.uuid4()), donation["user_id"], donation["id"], None,
+               None, rng.choice(donation_comments), _past_datetime(30))
+
+    for action in social_actions[:COMMENTS_PER_ENTITY * 2]:
+        owner = registry.foundation_owner(action["foundation_id"])
+        if owner:
+            yield (str(uuid.uuid4()), owner["id"], None, action["id"], None,
+                   rng.choice(social_action_comments), _past_datetime(30))
+
+    regular_users = registry.users_of_type("user")
+    if regular_users:
+        for foundation in foundations[:COMMENTS_PER_ENTITY * 2]:
+            user = rng.choice(regular_users)
+            yield (str(uuid.uuid4()), user["id"], None, None, foundation["id"],
+                   rng.choice(foundation_comments), _past_datetime(30))
+
+
+def _copy_ratings():
+    for donation in donations[:MAX_RATINGS]:
+        yield (str(uuid.uuid4()), donation["user_id"], donation["id"], None,
+               rng.randint(3, 5), _past_datetime(30))
+
+
+def _copy_participation_requests():
+    regular_users = registry.users_of_type("user")
+    now = datetime.now()
+    valid_actions = [action for action in social_actions
+                     if datetime.fromisoformat(action["end_date"]) > now]
+    if not regular_users or not valid_actions:
+        return
+
+    # La API rechaza solicitudes repetidas del mismo usuario a la misma acción
+    seen = set()
+    for _ in range(min(PARTICIPATION_REQUESTS, len(regular_users) * len(valid_actions))):
+        user = rng.choice(regular_users)
+        action = rng.choice(valid_actions)
+        if (user["id"], action["id"]) in seen:
+            continue
+        seen.add((user["id"], action["id"]))
+
+        status = "pending"
+        if rng.random() < 0.7:
+            status = rng.choice(["accepted", "rejected"])
+        yield (str(uuid.uuid4()), user["id"], action["id"], status,
+               _past_datetime(30))
+
+
+def _copy_certificates():
+    regular_users = registry.users_of_type("user")
+    for _ in range(min(CERTIFICATES, len(regular_users) * 2)):
+        user = rng.choice(regular_users)
+        yield (str(uuid.uuid4()), user["id"],
+               rng.choice(certificate_descriptions), _past_datetime())
+
+
+def _copy_notifications():
+    for _ in range(min(NOTIFICATIONS, len(users) * 3)):
+        user = rng.choice(users)
+        yield (str(uuid.uuid4()), user["id"],
+               rng.choice(notification_templates), rng.random() < 0.4,
+               _past_datetime(30))
+
+
+def _copy_suggestions():
+    regular_users = registry.users_of_type("user")
+    for _ in range(min(SUGGESTIONS, len(regular_users) * 2)):
+        user = rng.choice(regular_users)
+        yield (str(uuid.uuid4()), user["id"], rng.choice(suggestions_list),
+               rng.random() < 0.3, _past_datetime())
+
+
+def _copy_favorites():
+    for user in registry.users_of_type("user"):
+        # La API no permite marcar dos veces el mismo elemento
+        seen = set()
+        for _ in range(rng.randint(1, FAVORITES_PER_USER)):
+            if rng.choice([True, False]) and foundations:
+                item = (rng.choice(foundations)["id"], "foundation")
+            elif social_actions:
+                item = (rng.choice(social_actions)["id"], "opportunity")
             else:
-                print_status(
-                    f"No se pudo obtener token para {user['name']}", False)
                 continue
+            if item in seen:
+                continue
+            seen.add(item)
+            yield (str(uuid.uuid4()), user["id"], *item)
 
-        user_auth_headers = get_auth_headers(user["id"])
 
-        # Crear favoritos combinando fundaciones y acciones sociales
-        for _ in range(num_favorites):
-            # Decidir si es fundación u oportunidad
-            is_foundation = random.choice([True, False])
+def seed_with_copy(truncate=False):
+    """Genera el mismo grafo de entidades y lo carga con COPY
 
-            if is_foundation and foundations:
-                # Marcar una fundación como favorita
-                foundation = random.choice(foundations)
-                favorite_data = {
-                    "item_id": foundation["id"],
-                    "item_type": "foundation"
-                }
+    Evita el costo por fila de la API: el hash bcrypt se calcula una sola vez
+    para todos los usuarios, los UUID se generan en el cliente y no hay
+    validaciones de existencia por entidad. Todo se carga en una transacción.
+    Las notificaciones que la API genera como efecto secundario (solicitudes,
+    certificados, sugerencias) no se reproducen.
+    """
+    connection = copy_loader.connect()
+    try:
+        password_hash = copy_loader.hash_password("Password123")
+        if truncate:
+            copy_loader.truncate_all(connection)
+            include_admin = True
+        else:
+            include_admin = not copy_loader.email_exists(
+                connection, ADMIN_EMAIL)
+            if not include_admin:
+                print_status(
+                    "El administrador ya existe, se omite su creación", False)
+
+        phases = [
+            ("users", _copy_users(password_hash, include_admin)),
+            ("foundations", _copy_foundations()),
+            ("donations", _copy_donations()),
+            ("social_actions", _copy_social_actions()),
+            ("comments", _copy_comments()),
+            ("ratings", _copy_ratings()),
+            ("participation_requests", _copy_participation_requests()),
+            ("certificates", _copy_certificates()),
+            ("notifications", _copy_notifications()),
+            ("suggestions", _copy_suggestions()),
+            ("favorites", _copy_favorites()),
+        ]
+        for table, rows in phases:
+            _copy_phase(connection, table, rows)
+        targets = copy_loader.rebuild_rating_summaries(connection)
+        print_status(f"Resúmenes de calificaciones recalculados: {targets}")
+        users = copy_loader.rebuild_notification_counters(connection)
+        print_status(f"Contadores de notificaciones recalculados: {users}")
+        connection.commit()
+        print_status("Carga con COPY confirmada")
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+
+
+def parse_args():
+    """Lee las opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Puebla la base de datos de DonAccion a través de la API REST")
+    parser.add_argument(
+        "--scale", type=float, default=1.0,
+        help="factor de escala del volumen de datos; 1 equivale al perfil base (por defecto: %(default)s)")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="solo imprimir la estimación de filas por tabla y salir")
+    parser.add_argument(
+        "--mode", choices=["sync", "async", "copy"], default=SEED_MODE,
+        help="sync: una petición a la vez; async: peticiones concurrentes dentro de cada fase; "
+             "copy: COPY directo a PostgreSQL sin pasar por la API")
+    parser.add_argument(
+        "--truncate", action="store_true",
+        help="en modo copy, vaciar todas las tablas antes de cargar")
+    parser.add_argument(
+        "--concurrency", type=int, default=CONCURRENCY,
+        help="máximo de peticiones simultáneas por fase en modo async (por defecto: %(default)s)")
+    parser.add_argument(
+        "--batch-size", type=int, default=BATCH_SIZE,
+        help="elementos por petición en las fases que usan los endpoints /batch (por defecto: %(default)s)")
+    parser.add_argument(
+        "--pool-size", type=int, default=None,
+        help="conexiones keep-alive hacia la API (por defecto: igual a --concurrency)")
+    parser.add_argument(
+        "--manifest", default=manifest.path,
+        help="archivo JSONL donde se anotan las entidades creadas (por defecto: %(default)s)")
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="reanudar la corrida del manifiesto desde la primera fase incompleta")
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="semilla de los datos generados (por defecto: una al azar, guardada en el manifiesto)")
+    parser.add_argument(
+        "--no-token-cache", action="store_true",
+        help="no leer ni guardar la caché de tokens JWT en disco")
+    parser.add_argument(
+        "--verify", action="store_true",
+        help="al terminar, recorrer los listados paginados y las exportaciones de la API y validar sus filas")
+    parser.add_argument(
+        "-y", "--yes", action="store_true",
+        help="no esperar confirmación antes de comenzar")
+    return parser.parse_args()
+
+
+def print_phase_summary():
+    """Imprime el rendimiento de cada fase ejecutada"""
+    if not phase_stats:
+        return
 
-                try:
-                    response = requests.post(
-                        f"{BASE_URL}/users/{user['id']}/favorites",
-                        json=favorite_data,
-                        headers=user_auth_headers
-                    )
-
-                    if response.status_code in [200, 201]:
-                        favorite_info = response.json()
-                        favorites.append(favorite_info)
-                        print_status(f"Fundación marcada como favorita")
-                    else:
-                        if "already in favorites" in response.text:
-                            print_status(
-                                "Fundación ya estaba en favoritos", False)
-                        else:
-                            print_status(
-                                f"Error al marcar favorito: {response.status_code} - {response.text}", False)
-                except Exception as e:
-                    print_status(f"Error de conexión: {str(e)}", False)
-
-            elif not is_foundation and social_actions:
-                # Marcar una acción social como favorita
-                action = random.choice(social_actions)
-                favorite_data = {
-                    "item_id": action["id"],
-                    "item_type": "opportunity"
-                }
+    print("\n=== RENDIMIENTO POR FASE ===")
+    total_tasks = 0
+    total_seconds = 0.0
+    for stats in phase_stats:
+        total_tasks += stats["tasks"]
+        total_seconds += stats["seconds"]
+        print(
+            f"{stats['phase']:<30} {stats['succeeded']:>6}/{stats['tasks']:<6} "
+            f"{stats['seconds']:>8.2f}s {stats['throughput']:>8.1f} tareas/s")
+    overall = total_tasks / total_seconds if total_seconds > 0 else 0.0
+    print(f"{'Total':<30} {total_tasks:>13} {total_seconds:>8.2f}s {overall:>8.1f} tareas/s")
+
+
+# Listados paginados que --verify recorre con la sesión del administrador
+VERIFY_LISTINGS = [
+    ("donations", "Donaciones"),
+    ("comments", "Comentarios"),
+    ("ratings", "Calificaciones"),
+    ("participation-requests", "Solicitudes de participación"),
+    ("social-actions", "Acciones sociales"),
+    ("notifications", "Notificaciones del usuario"),
+]
+VERIFY_PAGE_SIZE = 200  # Tamaño máximo de página que acepta la API
+
+
+def verify_listings():
+    """Recorre los listados paginados de la API y cuenta sus elementos
+
+    Sigue el cursor de cada página, de modo que funciona aunque la base tenga
+    cientos de miles de filas, y avisa si alguna fila aparece repetida.
+    Devuelve la cantidad de elementos de cada listado recorrido completo.
+    """
+    print("\n=== VERIFICACIÓN DE LISTADOS PAGINADOS ===")
+    session = api.as_user()
+    counts = {}
+    for path, label in VERIFY_LISTINGS:
+        seen = set()
+        pages = 0
+        duplicates = 0
+        try:
+            for response in session.iter_pages(f"{BASE_URL}/{path}", limit=VERIFY_PAGE_SIZE):
+                if response.status_code != 200:
+                    print_status(
+                        f"{label}: error {response.status_code} en la página {pages + 1}", False)
+                    break
+                pages += 1
+                for item in response.json():
+                    if item["id"] in seen:
+                        duplicates += 1
+                    seen.add(item["id"])
+            else:
+                message = f"{label}: {len(seen)} en {pages} páginas"
+                if duplicates:
+                    message += f" ({duplicates} repetidos)"
+                print_status(message, duplicates == 0)
+                counts[path] = len(seen)
+        except Exception as e:
+            print_status(f"Error al recorrer {label}: {str(e)}", False)
+    return counts
 
-                try:
-                    response = requests.post(
-                        f"{BASE_URL}/users/{user['id']}/favorites",
-                        json=favorite_data,
-                        headers=user_auth_headers
-                    )
-
-                    if response.status_code in [200, 201]:
-                        favorite_info = response.json()
-                        favorites.append(favorite_info)
-                        print_status(f"Oportunidad marcada como favorita")
-                    else:
-                        if "already in favorites" in response.text:
-                            print_status(
-                                "Oportunidad ya estaba en favoritos", False)
+
+# Exportaciones en streaming que --verify lee completas en ambos formatos
+VERIFY_EXPORTS = [
+    ("donations", "Donaciones"),
+    ("comments", "Comentarios"),
+    ("notifications", "Notificaciones"),
+]
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def read_export(response, export_format):
+    """Itera las filas de una exportación a medida que llegan por la red
+
+    Lee el cuerpo como flujo de texto, sin cargarlo entero en memoria. En
+    CSV el lector respeta los saltos de línea dentro de campos entre comillas.
+    """
+    response.raw.decode_content = True
+    text = io.TextIOWrapper(response.raw, encoding="utf-8", newline="")
+    if export_format == "csv":
+        yield from csv.DictReader(text)
+        return
+    for line in text:
+        if line.strip():
+            yield json.loads(line)
+
+
+def verify_exports(expected_counts=None):
+    """Descarga cada exportación en streaming y valida sus filas
+
+    Cuenta filas, ids repetidos y filas sin id, y compara el total con el del
+    listado paginado equivalente cuando se recorrió antes.
+    """
+    print("\n=== VERIFICACIÓN DE EXPORTACIONES ===")
+    expected_counts = expected_counts or {}
+    session = api.as_user()
+    for path, label in VERIFY_EXPORTS:
+        for export_format in EXPORT_FORMATS:
+            name = f"{label} ({export_format})"
+            try:
+                response = session.get(
+                    f"{BASE_URL}/{path}/export", params={"format": export_format}, stream=True)
+                with response:
+                    if response.status_code != 200:
+                        print_status(f"{name}: error {response.status_code}", False)
+                        continue
+                    seen = set()
+                    rows = duplicates = missing_ids = 0
+                    started = time.perf_counter()
+                    for row in read_export(response, export_format):
+                        rows += 1
+                        row_id = row.get("id")
+                        if not row_id:
+                            missing_ids += 1
+                        elif row_id in seen:
+                            duplicates += 1
                         else:
-                            print_status(
-                                f"Error al marcar favorito: {response.status_code} - {response.text}", False)
-                except Exception as e:
-                    print_status(f"Error de conexión: {str(e)}", False)
+                            seen.add(row_id)
+                    seconds = time.perf_counter() - started
+
+                expected = expected_counts.get(path)
+                problems = []
+                if duplicates:
+                    problems.append(f"{duplicates} repetidos")
+                if missing_ids:
+                    problems.append(f"{missing_ids} sin id")
+                if expected is not None and expected != rows:
+                    problems.append(f"el listado paginado tiene {expected}")
+                message = f"{name}: {rows} filas en {seconds:.2f}s"
+                if problems:
+                    message += f" ({', '.join(problems)})"
+                print_status(message, not problems)
+            except Exception as e:
+                print_status(f"Error al leer la exportación {name}: {str(e)}", False)
+
+
+def print_created_summary():
+    print("\n=== POBLACIÓN DE LA BASE DE DATOS COMPLETADA ===")
+    print(f"Usuarios creados: {len(users)}")
+    print(f"Fundaciones creadas: {len(foundations)}")
+    print(f"Donaciones creadas: {created_counts['donations']}")
+    print(f"Acciones sociales creadas: {len(social_actions)}")
+    print(f"Comentarios creados: {created_counts['comments']}")
+    print(f"Calificaciones creadas: {created_counts['ratings']}")
+    print(
+        f"Solicitudes de participación creadas: {created_counts['participation_requests']}")
+    print(f"Certificados creados: {created_counts['certificates']}")
+    print(f"Notificaciones creadas: {created_counts['notifications']}")
+    print(f"Sugerencias creadas: {created_counts['suggestions']}")
+    print(f"Favoritos creados: {created_counts['favorites']}")
+
+
+def main_copy(args):
+    """Carga los datos directamente en PostgreSQL con COPY"""
+    print("\nModo copy: se escribe directo en PostgreSQL (variables DB_* del .env)")
+    print("Las tablas deben existir: levanta la API una vez para que TypeORM cree el esquema.")
+    if args.truncate:
+        print("Se vaciarán todas las tablas antes de cargar.")
+    if not args.yes:
+        input("Presiona Enter para comenzar la carga...")
+
+    try:
+        # La carga no se reanuda, pero con --seed se repite el mismo grafo
+        seed_generators("copy")
+        seed_with_copy(truncate=args.truncate)
+        print_created_summary()
+    except Exception as e:
+        print(f"\nERROR GENERAL: {str(e)}")
+        print("Carga revertida debido a un error.")
+    except KeyboardInterrupt:
+        print("\nProceso interrumpido por el usuario.")
+    finally:
+        print_phase_summary()
 
 
 def main():
     """Función principal que ejecuta el proceso de población de la base de datos"""
+    global SEED_MODE, CONCURRENCY, BATCH_SIZE, RUN_SEED
+
+    args = parse_args()
+    SEED_MODE = args.mode
+    CONCURRENCY = max(1, args.concurrency)
+    BATCH_SIZE = min(max(1, args.batch_size), 500)
+    # Un socket por petición en vuelo basta para no abrir conexiones desechables
+    api.configure_pool(args.pool_size or CONCURRENCY)
+    token_cache.enabled = not args.no_token_cache
+    manifest.path = args.manifest
+
+    resuming = False
+    if args.resume and SEED_MODE != "copy":
+        resuming = manifest.load()
+        if not resuming:
+            print_status("No hay manifiesto que reanudar, se empieza de cero", False)
+        elif manifest.run.get("scale", args.scale) != args.scale:
+            # Reanudar con otra escala mezclaría dos perfiles distintos
+            args.scale = manifest.run["scale"]
+            print_status(f"Se usa la escala de la corrida original: {args.scale:g}")
+
+    # Al reanudar se reutiliza la semilla original: la fase interrumpida vuelve a
+    # generar las mismas tareas, así que omitirlas por posición es correcto
+    if resuming and "seed" in manifest.run:
+        if args.seed is not None and args.seed != manifest.run["seed"]:
+            print_status(f"Se usa la semilla de la corrida original: {manifest.run['seed']}")
+        RUN_SEED = manifest.run["seed"]
+    else:
+        if resuming:
+            print_status("El manifiesto no tiene semilla: la fase interrumpida se reanudará "
+                         "con otros datos", False)
+        RUN_SEED = args.seed if args.seed is not None else random.SystemRandom().randrange(2 ** 32)
+
+    try:
+        profile = apply_scale(args.scale)
+    except ValueError as e:
+        print_status(str(e), False)
+        return
+
     print("=== INICIANDO POBLACIÓN DE LA BASE DE DATOS ===")
     print("Este script creará datos realistas y relacionados entre sí.")
-    print("Se crearán:")
-    print(f"- {NUM_REGULAR_USERS} usuarios regulares")
-    print(f"- {NUM_FOUNDATION_USERS} usuarios de fundaciones")
-    print(
-        f"- Donaciones (aproximadamente {NUM_REGULAR_USERS * DONATIONS_PER_USER / 2})")
-    print(
-        f"- Acciones sociales (aproximadamente {NUM_FOUNDATION_USERS * SOCIAL_ACTIONS_PER_FOUNDATION})")
-    print(f"- Y muchos otros datos relacionados (comentarios, calificaciones, etc.)")
+    print_estimate(profile, args.scale)
+    if args.dry_run:
+        return
+    if SEED_MODE == "copy":
+        main_copy(args)
+        return
+    if SEED_MODE == "async":
+        print(f"Modo async: hasta {CONCURRENCY} peticiones simultáneas por fase")
 
     # Esperar a que el servidor esté listo
     print(f"\nAsegúrate de que el servidor esté en ejecución en {BASE_URL}")
     print(f"API URL: {BASE_URL}")
     print(f"Auth URL: {AUTH_URL}")
-    input("Presiona Enter para comenzar la población de datos...")
+    if not args.yes:
+        input("Presiona Enter para comenzar la población de datos...")
+
+    if resuming:
+        restore_from_manifest()
+    manifest.start({"scale": args.scale, "base_url": BASE_URL, "seed": RUN_SEED}, resume=resuming)
 
     try:
         # Probar conexión a la API
         print("\nProbando conexión a la API...")
         try:
-            response = requests.get(f"{BASE_URL}/users")
+            response = api.public.get(f"{BASE_URL}/users")
             print(f"Respuesta de API: {response.status_code}")
             if response.status_code == 401:
                 print("Respuesta 401 - Autenticación requerida (esperado)")
@@ -1264,57 +2083,45 @@ def main():
             input("Presione Enter para continuar de todos modos...")
 
         # Crear datos en el orden correcto para mantener integridad referencial
-        create_users()
-        time.sleep(1)  # Pequeña pausa entre operaciones
-
-        create_foundations()
-        time.sleep(1)
-
-        create_donations()
-        time.sleep(1)
-
-        create_social_actions()
-        time.sleep(1)
-
-        create_comments()
-        time.sleep(1)
-
-        create_ratings()
-        time.sleep(1)
-
-        create_participation_requests()
-        time.sleep(1)
-
-        create_certificates()
-        time.sleep(1)
-
-        create_notifications()
-        time.sleep(1)
-
-        create_suggestions()
-        time.sleep(1)
-
-        create_favorites()
+        phases = [
+            create_users,
+            authenticate_users,
+            create_foundations,
+            create_donations,
+            create_social_actions,
+            create_comments,
+            create_ratings,
+            create_participation_requests,
+            create_certificates,
+            create_notifications,
+            create_suggestions,
+            create_favorites,
+        ]
+        for index, phase in enumerate(phases):
+            # El inicio de sesión siempre se repite: los tokens viven en memoria
+            if phase is not authenticate_users and manifest.is_complete(phase.__name__):
+                print_status(f"Fase ya completada, se omite: {phase.__name__}")
+                continue
+            phase()
+            manifest.complete(phase.__name__)
+            # Pequeña pausa entre operaciones (innecesaria en modo async)
+            if SEED_MODE == "sync" and index < len(phases) - 1:
+                time.sleep(1)
 
-        print("\n=== POBLACIÓN DE LA BASE DE DATOS COMPLETADA ===")
-        print(f"Usuarios creados: {len(users)}")
-        print(f"Fundaciones creadas: {len(foundations)}")
-        print(f"Donaciones creadas: {len(donations)}")
-        print(f"Acciones sociales creadas: {len(social_actions)}")
-        print(f"Comentarios creados: {len(comments)}")
-        print(f"Calificaciones creadas: {len(ratings)}")
-        print(
-            f"Solicitudes de participación creadas: {len(participation_requests)}")
-        print(f"Certificados creados: {len(certificates)}")
-        print(f"Notificaciones creadas: {len(notifications)}")
-        print(f"Sugerencias creadas: {len(suggestions)}")
-        print(f"Favoritos creados: {len(favorites)}")
+        print_created_summary()
+        if args.verify:
+            verify_exports(verify_listings())
 
     except Exception as e:
         print(f"\nERROR GENERAL: {str(e)}")
         print("Proceso interrumpido debido a un error.")
     except KeyboardInterrupt:
         print("\nProceso interrumpido por el usuario.")
+    finally:
+        print_phase_summary()
+        manifest.close()
+        token_cache.save()
+        api.close()
 
 
 if __name__ == "__main__":
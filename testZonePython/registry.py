@@ -0,0 +1,74 @@
+"""Registro en memoria de las entidades creadas por populateDB.py
+
+Reemplaza las búsquedas lineales (`next(u for u in users if ...)`) por
+índices de acceso O(1):
+
+- id -> registro, por tipo de entidad
+- user_type -> lista de usuarios
+- foundation_id -> usuario dueño de la fundación
+
+Es seguro entre hilos, ya que las fases en modo async registran entidades
+desde varios hilos a la vez.
+"""
+import threading
+
+
+class EntityRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records = {}  # tipo -> lista de registros en orden de creación
+        self._by_id = {}  # tipo -> {id: registro}
+        self._users_by_type = {}  # user_type -> lista de usuarios
+        self._foundation_owner = {}  # foundation_id -> usuario dueño
+        self._foundation_by_user = {}  # user_id -> fundación
+
+    def records(self, kind):
+        """Lista viva de los registros de un tipo, en orden de creación"""
+        with self._lock:
+            return self._ensure(kind)
+
+    def _ensure(self, kind):
+        if kind not in self._records:
+            self._records[kind] = []
+            self._by_id[kind] = {}
+        return self._records[kind]
+
+    def add(self, kind, record):
+        """Registra una entidad e indexa su id"""
+        with self._lock:
+            self._ensure(kind).append(record)
+            self._by_id[kind][record["id"]] = record
+
+            if kind == "users":
+                self._users_by_type.setdefault(
+                    record.get("user_type"), []).append(record)
+            elif kind == "foundations":
+                owner = self._by_id.get("users", {}).get(record.get("user_id"))
+                if owner is not None:
+                    self._foundation_owner[record["id"]] = owner
+                self._foundation_by_user[record.get("user_id")] = record
+        return record
+
+    def get(self, kind, entity_id):
+        """Registro por id, o None si no existe"""
+        return self._by_id.get(kind, {}).get(entity_id)
+
+    def count(self, kind):
+        return len(self._records.get(kind, ()))
+
+    def users_of_type(self, user_type):
+        """Lista viva de usuarios de un tipo ("user" o "foundation")"""
+        with self._lock:
+            return self._users_by_type.setdefault(user_type, [])
+
+    def first_user_of_type(self, user_type):
+        users = self._users_by_type.get(user_type)
+        return users[0] if users else None
+
+    def foundation_owner(self, foundation_id):
+        """Usuario dueño de una fundación, o None si no se conoce"""
+        return self._foundation_owner.get(foundation_id)
+
+    def foundation_of_user(self, user_id):
+        """Fundación de un usuario de tipo fundación, o None"""
+        return self._foundation_by_user.get(user_id)
@@ -0,0 +1,77 @@
+"""Factor de escala para el volumen de datos de populateDB.py
+
+Un único número (`--scale`, como en los benchmarks TPC) deriva todos los
+conteos a partir del perfil base de scale=1. Las perillas "por entidad"
+(donaciones por usuario, acciones por fundación, favoritos por usuario) son
+distribuciones y no cambian con la escala: el volumen crece porque crecen los
+usuarios y fundaciones. Las perillas globales crecen linealmente.
+"""
+
+# Perillas que describen una distribución por entidad padre
+PER_ENTITY_KNOBS = (
+    "DONATIONS_PER_USER",
+    "SOCIAL_ACTIONS_PER_FOUNDATION",
+    "FAVORITES_PER_USER",
+)
+
+
+def profile_for_scale(base, scale):
+    """Devuelve una copia de `base` con los conteos globales escalados"""
+    if scale <= 0:
+        raise ValueError("El factor de escala debe ser mayor que 0")
+
+    profile = {}
+    for knob, value in base.items():
+        if knob in PER_ENTITY_KNOBS:
+            profile[knob] = value
+        else:
+            profile[knob] = max(1, round(value * scale))
+    return profile
+
+
+def estimate_rows(profile):
+    """Estima las filas por tabla que generará un perfil
+
+    Usa el valor esperado de cada distribución uniforme (p. ej. entre 1 y
+    DONATIONS_PER_USER donaciones por usuario) y los mismos topes que aplican
+    las fases de populateDB.py.
+    """
+    regular_users = profile["NUM_REGULAR_USERS"]
+    foundation_users = profile["NUM_FOUNDATION_USERS"]
+    users = 1 + regular_users + foundation_users  # +1 por el administrador
+    foundations = foundation_users + 1  # El admin también es fundación
+
+    donations = round(regular_users * (1 + profile["DONATIONS_PER_USER"]) / 2)
+    social_actions = round(
+        foundations * (1 + profile["SOCIAL_ACTIONS_PER_FOUNDATION"]) / 2)
+    comments_per_entity = profile["COMMENTS_PER_ENTITY"]
+    comments = (min(comments_per_entity * 3, donations)
+                + min(comments_per_entity * 2, social_actions)
+                + min(comments_per_entity * 2, foundations))
+
+    return {
+        "users": users,
+        "foundations": foundations,
+        "donations": donations,
+        "social_actions": social_actions,
+        "comments": comments,
+        "ratings": min(profile["MAX_RATINGS"], donations),
+        # Cerca de un tercio de las acciones sigue vigente al solicitar
+        "participation_requests": min(
+            profile["PARTICIPATION_REQUESTS"],
+            regular_users * max(1, social_actions // 3)),
+        "certificates": min(profile["CERTIFICATES"], regular_users * 2),
+        "notifications": min(profile["NOTIFICATIONS"], users * 3),
+        "suggestions": min(profile["SUGGESTIONS"], regular_users * 2),
+        "favorites": round(regular_users * (1 + profile["FAVORITES_PER_USER"]) / 2),
+    }
+
+
+def print_estimate(profile, scale):
+    """Imprime la estimación de filas por tabla antes de comenzar"""
+    rows = estimate_rows(profile)
+    print(f"Estimación de filas para scale={scale:g}:")
+    for table, count in rows.items():
+        print(f"  {table:<24} {count:>12,}")
+    print(f"  {'total':<24} {sum(rows.values()):>12,}")
+    return rows
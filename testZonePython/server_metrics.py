@@ -0,0 +1,64 @@
+"""Scrape the per-route counters the API publishes at /api/metrics
+
+The API attributes every SQL query, and the time spent waiting for it, to
+the route that issued it (Prometheus text format). `scrape` reads the
+counters; `request_totals` diffs two scrapes into per-request numbers, so a
+benchmark can report how many queries and how much SQL time each endpoint
+costs on the server side.
+"""
+import re
+
+METRICS_PATH = "metrics"
+
+# Routes left out of the totals: the scrape itself and queries without a request
+IGNORED_ROUTES = {"/api/metrics", "(background)"}
+
+SAMPLE_RE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_RE = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse(text):
+    """Map (metric, labels) -> value; labels are a sorted tuple of pairs"""
+    samples = {}
+    for line in text.splitlines():
+        match = SAMPLE_RE.match(line.strip())
+        if not match:
+            continue  # Comments (# HELP / # TYPE) and blank lines
+        name, labels, value = match.groups()
+        pairs = tuple(sorted(
+            (key, raw.replace('\\"', '"').replace("\\n", "\n").replace("\\\\", "\\"))
+            for key, raw in LABEL_RE.findall(labels or "")))
+        samples[(name, pairs)] = float(value)
+    return samples
+
+
+def scrape(api, token=None):
+    """Current counters; raises if the endpoint is missing or rejects the token"""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    response = api.get(METRICS_PATH, headers=headers)
+    response.raise_for_status()
+    return parse(response.text)
+
+
+def request_totals(before, after):
+    """Requests, SQL queries and SQL time handled between two scrapes"""
+    totals = {"requests": 0, "db_queries": 0, "db_ms": 0.0, "slow_queries": 0}
+    metrics = {
+        "http_requests_total": "requests",
+        "db_queries_total": "db_queries",
+        "db_query_duration_seconds_total": "db_ms",
+        "db_slow_queries_total": "slow_queries",
+    }
+    for key, value in after.items():
+        name, labels = key
+        if name not in metrics or dict(labels).get("route") in IGNORED_ROUTES:
+            continue
+        change = value - before.get(key, 0)
+        if name == "db_query_duration_seconds_total":
+            change *= 1000
+        totals[metrics[name]] += change
+
+    requests = totals["requests"]
+    totals["db_queries_per_request"] = totals["db_queries"] / requests if requests else None
+    totals["db_ms_per_request"] = totals["db_ms"] / requests if requests else None
+    return totals
@@ -1,21 +1,25 @@
-import requests
 import json
 import random
 import time
 import os
 from datetime import datetime, timedelta
 from faker import Faker
+from api_client import ApiClient
+from token_cache import TokenCache
 
 # Configuration
 BASE_URL = "http://localhost:3001/api"
 AUTH_URL = f"{BASE_URL}/auth"
-headers = {"Content-Type": "application/json"}
-auth_headers = {"Content-Type": "application/json"}
+# Shared HTTP client: keep-alive connection pool and per-user sessions
+api = ApiClient(BASE_URL)
+api.fallback_user = 'admin'  # Users without a token fall back to the admin
+headers = api.public.headers
+token_cache = TokenCache(BASE_URL)  # On-disk JWT cache shared with populateDB.py
 fake = Faker(['es_ES', 'es_MX'])
 
 # Storage for test data
 users = []  # List of dictionaries with user info
-user_tokens = {}  # Dictionary of JWT tokens by user_id
+user_tokens = api.tokens  # Dictionary of JWT tokens by user_id
 foundations = []  # List of dictionaries with foundation info
 donations = []  # List of donation IDs
 social_actions = []  # List of social action IDs
@@ -41,13 +45,17 @@ def print_status(message, success=True):
 
 
 def login_user(email, password):
-    """Login and get JWT token"""
+    """Login and get JWT token, reusing a cached token while it is valid"""
+    token = token_cache.get(email)
+    if token:
+        return token
+
     login_data = {
         "email": email,
         "password": password
     }
     try:
-        response = requests.post(
+        response = api.post(
             f"{AUTH_URL}/login", json=login_data, headers=headers)
 
         if response.status_code == 200 or response.status_code == 201:
@@ -55,6 +63,7 @@ def login_user(email, password):
             token = token_data.get('access_token')
             if token:
                 print_status(f"Login successful for: {email}")
+                token_cache.set(email, token)
                 return token
             else:
                 print_status(
@@ -70,18 +79,8 @@ def login_user(email, password):
 
 
 def get_auth_headers(user_id=None):
-    """Get headers with JWT token"""
-    if user_id and user_id in user_tokens:
-        token = user_tokens[user_id]
-    elif 'admin' in user_tokens:
-        token = user_tokens['admin']
-    else:
-        return headers  # No token, return basic headers
-
-    return {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {token}"
-    }
+    """Get headers with JWT token (cached per user)"""
+    return api.as_user(user_id).headers
 
 # Setup function to create necessary users and resources
 
@@ -102,7 +101,7 @@ def setup_test_data():
     }
 
     try:
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/users", json=admin_data, headers=headers)
 
         if response.status_code in [200, 201]:
@@ -134,7 +133,7 @@ def setup_test_data():
     }
 
     try:
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/users", json=user_data, headers=headers)
 
         if response.status_code in [200, 201]:
@@ -170,7 +169,7 @@ def setup_test_data():
 
         admin_auth_headers = get_auth_headers(admin_user["id"])
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/foundations", json=foundation_data, headers=admin_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -214,7 +213,7 @@ def create_test_resources():
 
         try:
             user_auth_headers = get_auth_headers(regular_user["id"])
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/donations", json=donation_data, headers=user_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -243,7 +242,7 @@ def create_test_resources():
 
         try:
             admin_auth_headers = get_auth_headers(admin_user["id"])
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/social-actions", json=action_data, headers=admin_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -266,7 +265,7 @@ def create_test_resources():
 
         try:
             user_auth_headers = get_auth_headers(regular_user["id"])
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/participation-requests", json=request_data, headers=user_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -278,7 +277,7 @@ def create_test_resources():
                 admin_auth_headers = get_auth_headers(admin_user["id"])
                 update_data = {"status": "accepted"}
 
-                update_response = requests.patch(
+                update_response = api.patch(
                     f"{BASE_URL}/participation-requests/{request_info['id']}",
                     json=update_data,
                     headers=admin_auth_headers
@@ -305,7 +304,7 @@ def create_test_resources():
 
         try:
             user_auth_headers = get_auth_headers(regular_user["id"])
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/foundation-detail/comment", json=foundation_comment_data, headers=user_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -328,7 +327,7 @@ def create_test_resources():
 
         try:
             user_auth_headers = get_auth_headers(regular_user["id"])
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/comments", json=foundation_comment_data, headers=user_auth_headers)
 
             if response.status_code in [200, 201]:
@@ -343,18 +342,19 @@ def create_test_resources():
             print_status(f"Connection error: {str(e)}", False)
 
 
-def test_get_endpoints():
-    """Test GET endpoints that weren't covered in the original script"""
-    print("\n=== TESTING GET ENDPOINTS ===")
+def get_endpoint_table():
+    """Build the table of GET endpoints with the auth headers each one needs
 
+    Returns None when the test users are missing. Shared by
+    test_get_endpoints() and benchmarkEndpoints.py.
+    """
     regular_user = next(
         (user for user in users if user["user_type"] == "user"), None)
     admin_user = next(
         (user for user in users if user["user_type"] == "foundation"), None)
 
     if not regular_user or not admin_user:
-        print_status("Missing required users for GET endpoint testing", False)
-        return
+        return None
 
     user_auth_headers = get_auth_headers(regular_user["id"])
     admin_auth_headers = get_auth_headers(admin_user["id"])
@@ -390,6 +390,8 @@ def test_get_endpoints():
             "name": "Get all social actions"},
         {"url": f"{BASE_URL}/social-actions/{social_actions[0]['id']}", "auth_headers": headers,
             "name": "Get social action by ID"} if social_actions else None,
+        {"url": f"{BASE_URL}/social-actions/{social_actions[0]['id']}?include=participation_requests,comments,ratings",
+            "auth_headers": headers, "name": "Get social action with related records"} if social_actions else None,
         {"url": f"{BASE_URL}/social-actions/upcoming",
             "auth_headers": headers, "name": "Get upcoming social actions"},
         {"url": f"{BASE_URL}/social-actions/active",
@@ -409,6 +411,14 @@ def test_get_endpoints():
         {"url": f"{BASE_URL}/opportunities/foundation/{foundations[0]['id']}",
             "auth_headers": headers, "name": "Get opportunities by foundation"} if foundations else None,
 
+        # Search
+        {"url": f"{BASE_URL}/search/foundations?q=fundación&limit=10",
+            "auth_headers": headers, "name": "Search foundations"},
+        {"url": f"{BASE_URL}/search/social-actions?q=ayuda&window=upcoming",
+            "auth_headers": headers, "name": "Search social actions"},
+        {"url": f"{BASE_URL}/search/opportunities?q=ayuda",
+            "auth_headers": headers, "name": "Search opportunities"},
+
         # Comments
         {"url": f"{BASE_URL}/comments", "auth_headers": admin_auth_headers,
             "name": "Get all comments"},
@@ -432,10 +442,14 @@ def test_get_endpoints():
             "auth_headers": headers, "name": "Get ratings by donation"} if donations else None,
         {"url": f"{BASE_URL}/ratings/donation/{donations[0]['id']}/average",
             "auth_headers": headers, "name": "Get average rating for donation"} if donations else None,
+        {"url": f"{BASE_URL}/ratings/donation/{donations[0]['id']}/summary",
+            "auth_headers": headers, "name": "Get rating summary for donation"} if donations else None,
         {"url": f"{BASE_URL}/ratings/social-action/{social_actions[0]['id']}",
             "auth_headers": headers, "name": "Get ratings by social action"} if social_actions else None,
         {"url": f"{BASE_URL}/ratings/social-action/{social_actions[0]['id']}/average",
             "auth_headers": headers, "name": "Get average rating for social action"} if social_actions else None,
+        {"url": f"{BASE_URL}/ratings/social-action/{social_actions[0]['id']}/summary",
+            "auth_headers": headers, "name": "Get rating summary for social action"} if social_actions else None,
         {"url": f"{BASE_URL}/ratings/opportunity/{social_actions[0]['id']}",
             "auth_headers": headers, "name": "Get ratings by opportunity"} if social_actions else None,
         {"url": f"{BASE_URL}/ratings/opportunity/{social_actions[0]['id']}/average",
@@ -463,9 +477,11 @@ def test_get_endpoints():
 
         # Notifications
         {"url": f"{BASE_URL}/notifications",
-            "auth_headers": admin_auth_headers, "name": "Get all notifications"},
+            "auth_headers": admin_auth_headers, "name": "Get my notifications"},
         {"url": f"{BASE_URL}/notifications/unread",
             "auth_headers": user_auth_headers, "name": "Get unread notifications"},
+        {"url": f"{BASE_URL}/notifications/unread/count",
+            "auth_headers": user_auth_headers, "name": "Get unread notifications count"},
         {"url": f"{BASE_URL}/notifications/user/{regular_user['id']}",
             "auth_headers": admin_auth_headers, "name": "Get notifications by user"},
         {"url": f"{BASE_URL}/notifications/user/{regular_user['id']}/unread",
@@ -482,13 +498,22 @@ def test_get_endpoints():
     ]
 
     # Filter None values (endpoints that depend on data that might not exist)
-    get_endpoints = [
-        endpoint for endpoint in get_endpoints if endpoint is not None]
+    return [endpoint for endpoint in get_endpoints if endpoint is not None]
+
+
+def test_get_endpoints():
+    """Test GET endpoints that weren't covered in the original script"""
+    print("\n=== TESTING GET ENDPOINTS ===")
+
+    get_endpoints = get_endpoint_table()
+    if get_endpoints is None:
+        print_status("Missing required users for GET endpoint testing", False)
+        return
 
     # Test each endpoint
     for endpoint in get_endpoints:
         try:
-            response = requests.get(
+            response = api.get(
                 endpoint["url"], headers=endpoint["auth_headers"])
             if response.status_code in [200, 201, 204]:
                 print_status(f"{endpoint['name']}: {response.status_code}")
@@ -499,6 +524,81 @@ def test_get_endpoints():
             print_status(f"Error with {endpoint['name']}: {str(e)}", False)
 
 
+PAGE_WALK_SIZE = 2  # Small pages so the test data spans several of them
+
+
+def walk_pages(url, auth_headers, limit=PAGE_WALK_SIZE):
+    """Follow X-Next-Cursor through a list endpoint
+
+    Returns (items, pages, error_response); error_response is None when
+    every page answered 200.
+    """
+    items = []
+    pages = 0
+    for response in api.iter_pages(url, limit=limit, headers=auth_headers):
+        if response.status_code != 200:
+            return items, pages, response
+        pages += 1
+        items.extend(response.json())
+    return items, pages, None
+
+
+def test_paginated_endpoints():
+    """Walk every cursor-paginated list and check pages don't overlap"""
+    print("\n=== TESTING PAGINATED LIST ENDPOINTS ===")
+
+    regular_user = next(
+        (user for user in users if user["user_type"] == "user"), None)
+    foundation_user = next(
+        (user for user in users if user["user_type"] == "foundation"), None)
+    if not regular_user or not foundation_user:
+        print_status("Missing required users for pagination testing", False)
+        return
+
+    foundation_auth_headers = get_auth_headers(foundation_user["id"])
+    paginated_endpoints = [
+        {"url": f"{BASE_URL}/donations", "auth_headers": foundation_auth_headers,
+            "name": "Donations"},
+        {"url": f"{BASE_URL}/comments", "auth_headers": foundation_auth_headers,
+            "name": "Comments"},
+        {"url": f"{BASE_URL}/ratings", "auth_headers": headers, "name": "Ratings"},
+        {"url": f"{BASE_URL}/notifications/all", "auth_headers": foundation_auth_headers,
+            "name": "Notifications"},
+        {"url": f"{BASE_URL}/notifications/user/{regular_user['id']}",
+            "auth_headers": foundation_auth_headers, "name": "Notifications by user"},
+        {"url": f"{BASE_URL}/notifications/user/{regular_user['id']}/unread",
+            "auth_headers": foundation_auth_headers, "name": "Unread notifications by user"},
+        {"url": f"{BASE_URL}/participation-requests",
+            "auth_headers": foundation_auth_headers, "name": "Participation requests"},
+        {"url": f"{BASE_URL}/social-actions", "auth_headers": headers,
+            "name": "Social actions"},
+    ]
+
+    for endpoint in paginated_endpoints:
+        try:
+            items, pages, error = walk_pages(endpoint["url"], endpoint["auth_headers"])
+            if error is not None:
+                print_status(
+                    f"{endpoint['name']} page {pages + 1}: {error.status_code} - {error.text}", False)
+                continue
+            ids = [item["id"] for item in items]
+            duplicates = len(ids) - len(set(ids))
+            print_status(
+                f"{endpoint['name']}: {len(ids)} items in {pages} pages"
+                + (f", {duplicates} duplicated" if duplicates else ""),
+                duplicates == 0)
+        except Exception as e:
+            print_status(f"Error walking {endpoint['name']}: {str(e)}", False)
+
+    try:
+        response = api.get(f"{BASE_URL}/ratings", params={"cursor": "not-a-cursor"},
+                           headers=headers)
+        print_status(f"Invalid cursor rejected: {response.status_code}",
+                     response.status_code == 400)
+    except Exception as e:
+        print_status(f"Error with invalid cursor test: {str(e)}", False)
+
+
 def test_update_endpoints():
     """Test PUT/PATCH endpoints that weren't covered in the original script"""
     print("\n=== TESTING UPDATE ENDPOINTS ===")
@@ -522,7 +622,7 @@ def test_update_endpoints():
     }
 
     try:
-        response = requests.patch(
+        response = api.patch(
             f"{BASE_URL}/users/{regular_user['id']}", json=user_update, headers=user_auth_headers)
         if response.status_code in [200, 201, 204]:
             print_status(f"Update user: {response.status_code}")
@@ -539,7 +639,7 @@ def test_update_endpoints():
         }
 
         try:
-            response = requests.patch(
+            response = api.patch(
                 f"{BASE_URL}/foundations/{foundations[0]['id']}", json=foundation_update, headers=admin_auth_headers)
             if response.status_code in [200, 201, 204]:
                 print_status(f"Update foundation: {response.status_code}")
@@ -559,7 +659,7 @@ def test_update_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/comments", json=comment_data, headers=user_auth_headers)
             if response.status_code in [200, 201]:
                 comment = response.json()
@@ -571,7 +671,7 @@ def test_update_endpoints():
                     "text": "Updated test comment"
                 }
 
-                update_response = requests.patch(
+                update_response = api.patch(
                     f"{BASE_URL}/comments/{comment['id']}", json=comment_update, headers=user_auth_headers)
                 if update_response.status_code in [200, 201, 204]:
                     print_status(
@@ -593,7 +693,7 @@ def test_update_endpoints():
         }
 
         try:
-            response = requests.patch(
+            response = api.patch(
                 f"{BASE_URL}/comments/{foundation_comment['id']}", json=comment_update, headers=user_auth_headers)
             if response.status_code in [200, 201, 204]:
                 print_status(
@@ -614,7 +714,7 @@ def test_update_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/ratings", json=rating_data, headers=user_auth_headers)
             if response.status_code in [200, 201]:
                 rating = response.json()
@@ -626,7 +726,7 @@ def test_update_endpoints():
                     "rating": 5
                 }
 
-                update_response = requests.patch(
+                update_response = api.patch(
                     f"{BASE_URL}/ratings/{rating['id']}", json=rating_update, headers=user_auth_headers)
                 if update_response.status_code in [200, 201, 204]:
                     print_status(
@@ -650,7 +750,7 @@ def test_update_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/notifications", json=notification_data, headers=admin_auth_headers)
             if response.status_code in [200, 201]:
                 notification = response.json()
@@ -658,7 +758,7 @@ def test_update_endpoints():
                 print_status("Notification created for update test")
 
                 # Now mark as read
-                read_response = requests.patch(
+                read_response = api.patch(
                     f"{BASE_URL}/notifications/{notification['id']}/read", headers=user_auth_headers)
                 if read_response.status_code in [200, 201, 204]:
                     print_status(
@@ -675,7 +775,7 @@ def test_update_endpoints():
 
     # Test mark all notifications as read
     try:
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/notifications/mark-all-read", headers=user_auth_headers)
         if response.status_code in [200, 201, 204]:
             print_status(
@@ -714,14 +814,14 @@ def test_delete_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/comments", json=comment_data, headers=user_auth_headers)
             if response.status_code in [200, 201]:
                 comment = response.json()
                 print_status("Comment created for delete test")
 
                 # Now delete it
-                delete_response = requests.delete(
+                delete_response = api.delete(
                     f"{BASE_URL}/comments/{comment['id']}", headers=user_auth_headers)
                 if delete_response.status_code in [200, 201, 204]:
                     print_status(
@@ -744,14 +844,14 @@ def test_delete_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/foundation-detail/comment", json=comment_data, headers=user_auth_headers)
             if response.status_code in [200, 201]:
                 comment = response.json()
                 print_status("Foundation comment created for delete test")
 
                 # Now delete it
-                delete_response = requests.delete(
+                delete_response = api.delete(
                     f"{BASE_URL}/comments/{comment['id']}", headers=user_auth_headers)
                 if delete_response.status_code in [200, 201, 204]:
                     print_status(
@@ -775,14 +875,14 @@ def test_delete_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/notifications", json=notification_data, headers=admin_auth_headers)
             if response.status_code in [200, 201]:
                 notification = response.json()
                 print_status("Notification created for delete test")
 
                 # Now delete it
-                delete_response = requests.delete(
+                delete_response = api.delete(
                     f"{BASE_URL}/notifications/{notification['id']}", headers=user_auth_headers)
                 if delete_response.status_code in [200, 201, 204]:
                     print_status(
@@ -805,14 +905,14 @@ def test_delete_endpoints():
         }
 
         try:
-            response = requests.post(
+            response = api.post(
                 f"{BASE_URL}/users/{regular_user['id']}/favorites", json=favorite_data, headers=user_auth_headers)
             if response.status_code in [200, 201]:
                 favorite = response.json()
                 print_status("Favorite created for delete test")
 
                 # Now delete it
-                delete_response = requests.delete(
+                delete_response = api.delete(
                     f"{BASE_URL}/users/{regular_user['id']}/favorites/{foundations[0]['id']}", headers=user_auth_headers)
                 if delete_response.status_code in [200, 201, 204]:
                     print_status(
@@ -837,6 +937,7 @@ def main():
 
     # Run tests
     test_get_endpoints()
+    test_paginated_endpoints()
     test_update_endpoints()
     test_delete_endpoints()
 
@@ -851,6 +952,9 @@ def main():
     print(f"Participation requests created: {len(participation_requests)}")
     print(f"Notifications created: {len(notifications)}")
 
+    token_cache.save()
+    api.close()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,110 @@
+"""Caché en disco de tokens JWT, compartida por los scripts de la API
+
+Cada login cuesta una comparación bcrypt en `AuthService.validateUser`. Los
+tokens se guardan por email (y por URL de la API, para no mezclar servidores)
+y se reutilizan mientras no estén por vencer, así las corridas repetidas
+contra la misma base de datos no vuelven a autenticar a nadie.
+
+La expiración se lee del claim `exp` del propio token; la firma no se
+verifica porque eso lo hace el servidor.
+"""
+import base64
+import json
+import os
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".token_cache.json")
+EXPIRY_MARGIN = 60  # Segundos antes de `exp` en que el token ya no se usa
+
+
+def decode_jwt_payload(token):
+    """Devuelve el payload de un JWT sin verificar la firma, o None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return json.loads(base64.urlsafe_b64decode(payload))
+    except (IndexError, ValueError, AttributeError):
+        return None
+
+
+def token_is_fresh(token, margin=EXPIRY_MARGIN, now=None):
+    """True si el token tiene `exp` y no vence dentro de `margin` segundos"""
+    payload = decode_jwt_payload(token)
+    if not payload or "exp" not in payload:
+        return False
+    now = time.time() if now is None else now
+    return payload["exp"] - margin > now
+
+
+class TokenCache:
+    """Tokens JWT por email, persistidos en un archivo JSON
+
+    - `get(email, user_id)` devuelve el token solo si sigue vigente y, cuando
+      se conoce el id del usuario, si su claim `sub` coincide (una base de
+      datos recreada asigna ids nuevos a los mismos emails).
+    - `save()` escribe de forma atómica y solo si hubo cambios.
+    """
+
+    def __init__(self, base_url, path=DEFAULT_CACHE_PATH, enabled=True):
+        self.base_url = base_url.rstrip("/")
+        self.path = path
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data = self._load() if enabled else {}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _tokens(self):
+        return self._data.setdefault(self.base_url, {})
+
+    def get(self, email, user_id=None):
+        """Token vigente del email, o None si hay que iniciar sesión"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            token = self._tokens().get(email)
+            if token and not token_is_fresh(token):
+                del self._tokens()[email]
+                self._dirty = True
+                token = None
+            if token and user_id is not None:
+                payload = decode_jwt_payload(token)
+                if payload.get("sub") != user_id:
+                    token = None
+            if token:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return token
+
+    def set(self, email, token):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._tokens()[email] = token
+            self._dirty = True
+
+    def save(self):
+        if not self.enabled or not self._dirty:
+            return
+        with self._lock:
+            # Descartar tokens vencidos de todas las URLs antes de escribir
+            for tokens in self._data.values():
+                for email in [e for e, t in tokens.items() if not token_is_fresh(t)]:
+                    del tokens[email]
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._data, file)
+            os.replace(temp_path, self.path)
+            self._dirty = False